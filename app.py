@@ -1,234 +1,619 @@
 import eventlet
 eventlet.monkey_patch()
-import random
-from collections import Counter
-import functools
+import os
+import secrets
 import time
-from flask import Flask, render_template, request
-from flask_socketio import SocketIO, emit
 
+from engineio import packet as eio_packet
+from eventlet import tpool
+from flask import Flask, jsonify, render_template, request
+from flask_socketio import SocketIO, disconnect, join_room
+from socketio import packet as sio_packet
 
 
-from game_logic import Tile, get_combination_info, is_stronger_combination
+
+from assets import Assets
+from bots import BOTS, game_from_room
+from cluster import make_client_manager, owner_of
+from metrics import metrics
+from game_logic import RULES_VERSION, TILES, combination_table, get_combination_info, is_stronger_combination, mask_to_tiles, tiles_to_mask
+from game_room import RoomManager, combo_info_to_dict
+from guard import Guard, check_connect, check_join_queue, check_play_hand, check_start_game
+from lobby import QUEUE_SIZES, Lobby
+from persistence import open_store
+from ratings import entry_dict, open_ratings, player_id
+from replay import open_replays
+from spectators import SpectatorFeed
+from turn_clock import TimerWheel
+import wire
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'a_very_secret_key'
-socketio = SocketIO(app)
-
-players = {} 
-game_state = {}
-player_money = []
-round_number = 1
-num_players = 0
-tiles_per_player = 0
-
-def start_new_game(is_first_game=True):
-    global game_state, round_number, player_money
-    if is_first_game:
-        player_money = [48] * num_players
-        round_number = 1
-    else:
-        round_number += 1
-    
-    suits, ranks = ["cloud", "star", "moon", "sun"], list(range(1, 16))
-    deck = [Tile(suit, rank) for suit in suits for rank in ranks]
-    random.shuffle(deck)
-    player_hands = [[] for _ in range(num_players)]
-    for _ in range(tiles_per_player):
-        for i in range(num_players): player_hands[i].append(deck.pop())
-    for hand in player_hands: hand.sort()
-    
-    start_player_index = random.randint(0, num_players - 1)
-    starting_tile = Tile("cloud", 3)
-    for i, hand in enumerate(player_hands):
-        if starting_tile in hand:
-            start_player_index = i
-            break
-    
-    game_state = {
-        "player_hands": player_hands, "current_player_index": start_player_index,
-        "last_played_hand_info": (None, None), "last_played_tiles": [],
-        "players_who_passed_this_round": [], "last_player_to_act_index": start_player_index,
-        "game_log": [f"라운드 {round_number} 시작!"]
-    }
-    print(f"✨ Round {round_number} started! Starting player is {start_player_index + 1}")
-
-def handle_end_of_round(winner_index):
-    global player_money
-    final_card_counts = [len(hand) for hand in game_state['player_hands']]
-    payments = []
-    for i in range(num_players):
-        for j in range(num_players):
-            if i == j: continue
-            if final_card_counts[j] > final_card_counts[i]:
-                payment_amount = final_card_counts[j] - final_card_counts[i]
-                if i == winner_index and any(tile.rank == 2 for tile in game_state['player_hands'][j]):
-                    payment_amount *= 2
-                player_money[i] += payment_amount
-                player_money[j] -= payment_amount
-                payments.append(f"P{j + 1} → P{i + 1}에게 {payment_amount}원 지불")
-    
-    socketio.emit('round_result', {'winner': winner_index + 1, 'payments': payments, 'money_status': player_money})
-    return any(money <= 0 for money in player_money)
-
-def get_final_rankings():
-    survivors = sorted([(money, i + 1) for i, money in enumerate(player_money) if money > 0], reverse=True)
-    bankrupt_players = [i + 1 for i, money in enumerate(player_money) if money <= 0]
-    ranking_text = [f"{rank + 1}등: P{p_num} ({money}원)" for rank, (money, p_num) in enumerate(survivors)]
-    return {'rankings': ranking_text, 'bankrupt': [str(p) for p in bankrupt_players]}
-
-def broadcast_game_state(is_start=False):
-    game_state_for_client = game_state.copy()
-    game_state_for_client['player_hands'] = [[tile.to_dict() for tile in hand] for hand in game_state['player_hands']]
-    game_state_for_client['last_played_tiles'] = [tile.to_dict() for tile in game_state['last_played_tiles']]
-    game_state_for_client['player_money'] = player_money
-    combo_name, rep_info = game_state['last_played_hand_info']
-    if isinstance(rep_info, tuple): rep_info_dict = [tile.to_dict() for tile in rep_info]
-    elif isinstance(rep_info, Tile): rep_info_dict = rep_info.to_dict()
-    else: rep_info_dict = None
-    game_state_for_client['last_played_hand_info'] = (combo_name, rep_info_dict)
-    event_name = 'game_started' if is_start else 'game_update'
-    socketio.emit(event_name, game_state_for_client)
-
-def reset_game():
-    global players, game_state, num_players
-    players.clear(); game_state.clear(); num_players = 0
-    print("🔄 Game has been reset.")
-    socketio.emit('show_lobby')
-
-def advance_turn():
-    if not game_state: return
-    print(f"--- ADVANCE TURN ---") # 디버깅 메시지
-    print(f"Before advancing, current player is {game_state['current_player_index'] + 1}") # 디버깅 메시지
-    print(f"Pass list is: {game_state['players_who_passed_this_round']}") # 디버깅 메시지
-    
-    current_player = game_state['current_player_index']
-    next_player = (current_player + 1) % num_players
-    for _ in range(num_players):
-        if next_player not in game_state['players_who_passed_this_round']:
-            game_state['current_player_index'] = next_player
-            print(f"Next active player found: {next_player + 1}") # 디버깅 메시지
-            return
-        print(f"Player {next_player + 1} has passed, skipping.") # 디버깅 메시지
-        next_player = (next_player + 1) % num_players
+assets = Assets(app) # /assets/ 의 해시 이름 정적 파일 (python assets.py 로 빌드)
+# 여러 워커로 돌릴 때: LEXIO_WORKERS=N LEXIO_WORKER_ID=i LEXIO_MESSAGE_QUEUE=lexio://127.0.0.1:5600 (또는 redis://...)
+WORKERS = int(os.environ.get('LEXIO_WORKERS', 1))
+WORKER_ID = int(os.environ.get('LEXIO_WORKER_ID', 0))
+MESSAGE_QUEUE = os.environ.get('LEXIO_MESSAGE_QUEUE')
+if MESSAGE_QUEUE:
+    socketio = SocketIO(app, client_manager=make_client_manager(MESSAGE_QUEUE, WORKER_ID, lambda event, sid, args: dispatch(event, sid, *args)))
+    # 이 워커에 직접 붙은 연결이 없어도 전달받은 액션을 처리하도록 큐 구독을 바로 시작한다
+    socketio.server.manager_initialized = True
+    socketio.server.manager.initialize()
+else:
+    socketio = SocketIO(app)
+combination_table() # 첫 요청이 조합 테이블 생성을 기다리지 않도록 미리 만든다
+
+rooms = RoomManager()
+DEFAULT_ROOM = 'main'
+LOBBY_ROOM = 'lobby'   # 매치메이킹 대기열을 가진 워커를 정하는 데만 쓰는 이름
+BOT_MOVE_DELAY = 0.6
+RECONNECT_GRACE = 60   # 접속이 끊긴 자리를 비우지 않고 기다리는 시간(초)
+PERSIST_INTERVAL = 0.05 # 쌓인 이벤트를 디스크에 쓰는 주기(초)
+TURN_SECONDS = 30      # 한 차례의 제한 시간(초). 넘기면 자동으로 패스(선두면 가장 약한 싱글)
+CLOCK_TICK = 0.1       # 턴 시계 휠의 한 칸(초)
+MATCH_INTERVAL = 0.5   # 대기열을 테이블로 묶는 주기(초)
+MATCH_ACCEPT_SECONDS = 20 # 매치가 잡힌 뒤 그 방으로 들어오기까지 기다리는 시간(초)
+SPECTATOR_INTERVAL = 0.25 # 관전자에게 최신 상태를 내보내는 주기(초)
+SPECTATOR_DELAY = float(os.environ.get('LEXIO_SPECTATOR_DELAY', 0)) # 관전 화면을 이만큼 늦게 보여 준다(초)
+clock = TimerWheel(tick=CLOCK_TICK, now=time.monotonic())
+store = open_store(os.environ.get('LEXIO_DB', 'lexio.db' if WORKERS == 1 else f"lexio-{WORKER_ID}.db"))
+replays = open_replays(os.environ.get('LEXIO_REPLAYS', 'replays.lxr' if WORKERS == 1 else f"replays-{WORKER_ID}.lxr"))
+# 레이팅은 대기열과 같이 로비의 주인 워커 하나가 갖는다. 다른 워커는 끝난 게임 결과를 그 워커로 넘긴다.
+ratings = open_ratings(os.environ.get('LEXIO_RATINGS', 'ratings.db') if owner_of(LOBBY_ROOM, WORKERS) == WORKER_ID else '')
+connection_rooms = {} # 이 워커에 붙은 연결 sid -> room id
+compact_sids = {}     # 압축 프로토콜(wire.py)을 쓰는 플레이어 sid -> room id (방의 주인 워커가 관리)
+compact_rooms = {}    # room id -> 그 방에서 압축 프로토콜을 쓰는 플레이어 수
+player_ids = {}       # 플레이어 sid -> 레이팅 플레이어 id (방의 주인 워커가 관리)
+connection_players = {} # 이 워커에 붙은 연결 sid -> 레이팅 플레이어 id (대기열에 넘길 때 쓴다)
+lobby = Lobby()
+# 연결/IP 별 요청 제한과 페이로드 검사 (guard.py). 프록시 뒤에서는 LEXIO_TRUSTED_PROXY=1 로 X-Forwarded-For 의 마지막 주소를 쓴다.
+guard = Guard(enabled=os.environ.get('LEXIO_GUARD', '1') != '0')
+TRUSTED_PROXY = os.environ.get('LEXIO_TRUSTED_PROXY') == '1'
+queued_connections = set() # 이 워커에 붙어 대기열에 들어간 연결 (끊기면 대기열에서 빼도록 알린다)
+
+# 상태를 바꾼 이벤트는 저장소(복구용)와 리플레이 기록 양쪽에 남긴다
+def record(room, kind, **data):
+    store.record(room, kind, **data)
+    replays.record(room, kind, **data)
+
+# 압축 프로토콜을 쓰는 플레이어는 room id 대신 room:bin 방에 들어 있다. 방으로 보내는 이벤트는 거기에 한 번 더 보낸다.
+def emit(event, *args, to=None):
+    if metrics.enabled: metrics.observe_emit(event, args)
+    if to in compact_sids: return emit_compact(event, args, to)
+    socketio.emit(event, *args, to=to)
+    if compact_rooms.get(to): emit_compact(event, args, wire.compact_room(to))
+
+# 방 하나에 프레임을 한 번만 만든다. 압축 형식이 없는 이벤트는 JSON 으로 보낸다.
+def emit_compact(event, args, to):
+    frame = wire.encode(event, *args)
+    if frame is None: socketio.emit(event, *args, to=to)
+    else: socketio.emit(wire.EVENT, frame, to=to)
+
+# ===================================================================
+# 관전 전송: 방마다 engine.io 패킷을 한 번 만들어 관전자 소켓에 그대로 넣는다
+# ===================================================================
+# 관전자는 engine.io sid 로 구분하고, 그 소켓의 보내기 큐가 비어 있을 때만 새 상태를 넣는다 (spectators.py 참고).
+# 메시지 큐로 여러 워커를 돌릴 때는 다른 워커의 소켓에 직접 넣을 수 없으니, 방마다 관전 방(room:watch) 하나를
+# 관전자로 두고 큐로 한 번 내보낸다. 이때 느린 관전자 건너뛰기는 각 워커의 socket.io 큐에 맡긴다.
+# 빠른 길은 engine.io 의 비공개 속성(Server._send_eio_packet, eio.sockets[sid].queue)을 쓴다. python-engineio 가 바뀌어
+# 이것들이 없으면 메시지 큐 때처럼 공개된 socketio.emit 으로 관전자(socket.io sid)마다 보낸다.
+DIRECT_SPECTATORS = (not MESSAGE_QUEUE and callable(getattr(socketio.server, '_send_eio_packet', None))
+                     and isinstance(getattr(socketio.server.eio, 'sockets', None), dict))
+
+def encode_packets(event, payload):
+    encoded = socketio.server.packet_class(sio_packet.EVENT, namespace='/', data=[event, payload]).encode()
+    return [eio_packet.Packet(eio_packet.MESSAGE, p) for p in (encoded if isinstance(encoded, list) else [encoded])]
+
+def send_packets(eio_sid, packets):
+    for p in packets: socketio.server._send_eio_packet(eio_sid, p)
+
+def socket_backlog(eio_sid):
+    queue = getattr(socketio.server.eio.sockets.get(eio_sid), 'queue', None)
+    return queue.qsize() if queue is not None else 0
+
+def watch_room(room_id): return f"{room_id}:watch"
+
+if DIRECT_SPECTATORS:
+    spectators = SpectatorFeed(lambda room: encode_packets('spectate_state', room.spectator_view()), send_packets, socket_backlog, SPECTATOR_DELAY)
+else:
+    spectators = SpectatorFeed(lambda room: room.spectator_view(), lambda viewer, view: socketio.emit('spectate_state', view, to=viewer),
+                               lambda viewer: 0, SPECTATOR_DELAY)
+watchers = {} # 관전자 sid -> (room id, viewer)
+
+def spectator_loop():
+    while True:
+        socketio.sleep(SPECTATOR_INTERVAL)
+        if spectators.feeds: spectators.flush(time.monotonic())
+
+# 표본으로 남기는 턴 기록 (/metrics/traces)
+def turn_record(room, player_num, action, log_message):
+    game_state = room.game_state
+    return {'room': room.room_id, 'round': room.round_number, 'version': room.version, 'seat': player_num, 'action': action,
+            'log': log_message, 'next': game_state['current_player_index'], 'passed': list(game_state['players_who_passed_this_round']),
+            'hand_counts': [len(hand) for hand in game_state['player_hands']]}
+
+def handle_end_of_round(room, winner_index):
+    payments, is_game_over = room.settle_round(winner_index)
+    record(room, 'settle', winner=winner_index)
+    return payments, is_game_over
+
+def broadcast_game_state(room, is_start=False):
+    event_name = 'game_started' if is_start else 'game_snapshot'
+    arm_turn_clock(room)
+    for sid, seat in room.players.items():
+        emit('your_hand', room.private_hand(seat), to=sid)
+    emit(event_name, room.public_state(), to=room.room_id)
+    spectators.touch(room)
+    schedule_bot_turn(room)
+
+def broadcast_patch(room, **changes):
+    changes['timer'] = arm_turn_clock(room)
+    emit('game_update', room.next_patch(**changes), to=room.room_id)
+    spectators.touch(room)
+    schedule_bot_turn(room)
+
+# ===================================================================
+# 봇 차례 처리: 탐색은 eventlet 허브 밖의 OS 스레드(tpool)에서 돌린다
+# ===================================================================
+def schedule_bot_turn(room):
+    if room.is_game_over or not room.game_state: return
+    seat = room.game_state['current_player_index']
+    if seat in room.bots: socketio.start_background_task(run_bot_turn, room, seat, room.version)
+
+def run_bot_turn(room, seat, version):
+    socketio.sleep(BOT_MOVE_DELAY)
+    if room.version != version or rooms.get(room.room_id) is not room or seat not in room.bots: return
+    bot = room.bots[seat]
+    start = time.perf_counter()
+    move = tpool.execute(bot.choose, game_from_room(room), seat)
+    if metrics.enabled: metrics.bot_search_seconds.observe(bot.name, time.perf_counter() - start)
+    # 탐색하는 동안 상태가 바뀌었으면(리셋 등) 버린다
+    if room.version != version: return
+    if move is None: pass_turn(room, seat)
+    else: play_tiles(room, seat, mask_to_tiles(move.mask))
+
+# ===================================================================
+# 턴 시계: 모든 방의 차례 마감과 재접속 유예를 타이머 휠 하나로 돌린다
+# ===================================================================
+# 차례가 바뀔 때마다 방 id 로 다시 걸기 때문에 방마다 살아 있는 타이머는 하나뿐이다. 남은 초를 돌려준다.
+def arm_turn_clock(room):
+    if room.is_game_over or not room.game_state:
+        clock.cancel(room.room_id)
+        room.turn_deadline = None
+        return None
+    now = time.monotonic()
+    clock.arm(room.room_id, TURN_SECONDS, (handle_turn_timeout, room, room.game_state['current_player_index']), now)
+    room.turn_deadline = now + TURN_SECONDS
+    return TURN_SECONDS
+
+def clock_loop():
+    while True:
+        socketio.sleep(CLOCK_TICK)
+        for _, (callback, *args) in clock.advance(time.monotonic()):
+            try: callback(*args)
+            except Exception: app.logger.exception('turn clock callback failed')
+
+# 시간이 다 되면 사람이 누른 것과 같은 경로로 패스하고, 선두라서 패스할 수 없으면 가장 약한 싱글을 낸다
+def handle_turn_timeout(room, seat):
+    game_state = room.game_state
+    if rooms.get(room.room_id) is not room or room.is_game_over or not game_state or game_state['current_player_index'] != seat: return
+    if metrics.enabled: metrics.inc('lexio_turn_timeouts_total')
+    emit('turn_timeout', {'seat': seat}, to=room.room_id)
+    if game_state['last_played_hand_info'][0] is None: play_tiles(room, seat, [min(game_state['player_hands'][seat])])
+    else: pass_turn(room, seat)
+
+def deal_round(room, is_first_game):
+    room.start_new_game(is_first_game=is_first_game)
+    record(room, 'deal', hands=[tiles_to_mask(hand) for hand in room.game_state['player_hands']],
+                 start=room.game_state['current_player_index'], is_first=is_first_game)
+    if metrics.enabled: metrics.inc('lexio_rounds_started_total')
+    app.logger.debug('[%s] round %d started, P%d leads', room.room_id, room.round_number, room.game_state['current_player_index'] + 1)
+    broadcast_game_state(room, is_start=True)
+
+# 매치메이킹으로 예약된 자리는 모두 들어온 뒤에 시작한다
+def start_if_full(room):
+    if room.is_full() and not room.disconnected: deal_round(room, is_first_game=True)
+
+def reset_game(room):
+    replays.drop(room)
+    room.reset()
+    clock.cancel(room.room_id)
+    store.drop(room.room_id)
+    if metrics.enabled: metrics.inc('lexio_game_resets_total')
+    app.logger.info('[%s] game reset', room.room_id)
+    emit('show_lobby', to=room.room_id)
+    spectators.touch(room)
+
+# ===================================================================
+# 저장과 복구: 이벤트는 주기적으로 묶어서 tpool 에서 쓰고, 시작할 때 저장된 방을 되살린다
+# ===================================================================
+def persist_loop():
+    while True:
+        socketio.sleep(PERSIST_INTERVAL)
+        flush_store()
+
+def flush_store():
+    batch = store.take_pending()
+    if batch: tpool.execute(store.write, batch)
+    changed = ratings.take_pending()
+    if changed: tpool.execute(ratings.write, changed)
+    games = replays.take_pending()
+    if games: tpool.execute(replays.write, games)
+
+# 유예 시간 안에 같은 자리로 돌아오지 않으면 그 방의 게임을 끝낸다
+def arm_seat_expiry(room, seat, disconnected_at, grace=RECONNECT_GRACE):
+    now = time.monotonic()
+    clock.arm((room.room_id, seat), max(0, disconnected_at + grace - now), (expire_seat, room, seat, disconnected_at), now)
+
+def expire_seat(room, seat, disconnected_at):
+    if room.disconnected.get(seat) != disconnected_at or rooms.get(room.room_id) is not room: return
+    emit('player_left', {'player_num': seat + 1}, to=room.room_id)
+    reset_game(room)
+    rooms.drop_if_empty(room.room_id)
+
+def restore_rooms():
+    for room in store.load_rooms(lambda name: BOTS[name]()).values():
+        rooms.restore(room)
+        for seat, disconnected_at in room.disconnected.items(): arm_seat_expiry(room, seat, disconnected_at)
+        arm_turn_clock(room)
+        schedule_bot_turn(room)
+        app.logger.info('[%s] restored round %d (v%d), waiting for %d player(s)', room.room_id, room.round_number, room.version, len(room.disconnected))
+
+def seat_player(room, sid):
+    player_num = room.add_player(sid)
+    if sid in player_ids: room.identities[player_num] = player_ids[sid]
+    record(room, 'seat', seat=player_num, token=room.tokens[player_num])
+    emit('player_assigned', {'player_num': player_num, 'token': room.tokens[player_num]}, to=sid)
+    return player_num
+
+# ===================================================================
+# 매치메이킹: 대기열은 로비의 주인 워커 하나가 갖고, 잡힌 테이블도 그 워커가 맡는 방으로 연다
+# ===================================================================
+def match_loop():
+    while True:
+        socketio.sleep(MATCH_INTERVAL)
+        if not lobby: continue
+        now = time.monotonic()
+        for size, entries in lobby.match(now): open_match_room(size, entries, now)
+
+def new_match_room_id():
+    while True:
+        room_id = f"match-{secrets.token_hex(4)}"
+        if owner_of(room_id, WORKERS) == WORKER_ID and rooms.get(room_id) is None: return room_id
+
+# 자리마다 토큰을 예약해 알려 준다. 클라이언트는 그 방으로 다시 접속해 토큰으로 앉고, 모두 앉으면 게임이 시작된다.
+# 제시간에 들어오지 않는 자리가 있으면 재접속 유예가 끝난 것처럼 방을 닫는다.
+def open_match_room(size, entries, now):
+    room = rooms.open(new_match_room_id())
+    room.configure(size)
+    record(room, 'configure', num_players=size, bots=[])
+    for entry in entries:
+        seat = room.reserve_seat()
+        record(room, 'seat', seat=seat, token=room.tokens[seat])
+        arm_seat_expiry(room, seat, room.disconnected[seat], grace=MATCH_ACCEPT_SECONDS)
+        waited = now - entry.since
+        if metrics.enabled: metrics.queue_wait_seconds.observe(size, waited)
+        emit('match_found', {'room': room.room_id, 'token': room.tokens[seat], 'player_num': seat, 'waited': round(waited, 1)}, to=entry.player_id)
+
+# 방의 주인 워커가 이 워커면 바로 처리하고, 아니면 메시지 큐로 주인 워커에 넘긴다
+def route(event, sid, *args, room_id=None):
+    owner = owner_of(room_id or connection_rooms.get(sid, DEFAULT_ROOM), WORKERS)
+    if owner == WORKER_ID: dispatch(event, sid, *args)
+    else: socketio.server.manager.forward(owner, [event, sid, list(args)])
+
+def dispatch(event, sid, *args):
+    if metrics.enabled: metrics.call_handler(event, ACTIONS[event], sid, *args)
+    else: ACTIONS[event](sid, *args)
+
+restore_rooms()
+socketio.start_background_task(persist_loop)
+socketio.start_background_task(clock_loop)
+socketio.start_background_task(match_loop)
+socketio.start_background_task(spectator_loop)
 
 @app.route('/')
 def home(): return render_template('index.html')
 
-@socketio.on('request_start_game')
-def on_request_start_game(data):
-    global num_players, tiles_per_player
-    if num_players != 0: return
-    num_players = int(data.get('num_players', 3))
-    if num_players == 3: tiles_per_player = 12
-    elif num_players == 4: tiles_per_player = 13
-    else: tiles_per_player = 12
-    sid = request.sid
-    if sid not in players:
-        players[sid] = 0
-        emit('player_assigned', {'player_num': 0}, room=sid)
-    socketio.emit('waiting_for_players', {'current': len(players), 'needed': num_players})
+@app.route('/metrics')
+def metrics_endpoint(): return metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+@app.route('/metrics/traces')
+def traces_endpoint(): return jsonify(list(metrics.traces))
+
+# 대기열 통계는 로비의 주인 워커에만 있다
+@app.route('/lobby')
+def lobby_endpoint(): return jsonify({'worker': WORKER_ID, 'queues': {str(size): stats for size, stats in lobby.stats().items()}})
+
+# 레이팅 순위표도 로비의 주인 워커에만 있다
+@app.route('/leaderboard')
+def leaderboard_endpoint():
+    count = min(max(request.args.get('top', 100, type=int), 1), 1000)
+    return jsonify({'worker': WORKER_ID, 'players': len(ratings), 'top': [entry_dict(entry) for entry in ratings.board.top(count)]})
+
+@app.route('/leaderboard/<player>')
+def player_rating_endpoint(player):
+    profile = ratings.profile(player, radius=min(max(request.args.get('near', 5, type=int), 0), 50))
+    return (jsonify(profile), 200) if profile else (jsonify({'error': 'unknown player'}), 404)
+
+metrics.gauge('lexio_rules_version', '이 워커가 돌리는 규칙 코어 버전 (game_logic.RULES_VERSION)', lambda: RULES_VERSION)
+metrics.gauge('lexio_rooms', '이 워커가 가진 방 수', lambda: len(rooms))
+metrics.gauge('lexio_active_tables', '게임이 진행 중인 방 수', lambda: sum(1 for room in rooms.rooms.values() if room.game_state and not room.is_game_over))
+metrics.gauge('lexio_players', '자리에 앉아 접속 중인 플레이어 수', rooms.player_count)
+metrics.gauge('lexio_disconnected_seats', '재접속을 기다리는 자리 수', lambda: sum(len(room.disconnected) for room in rooms.rooms.values()))
+metrics.gauge('lexio_connections', '이 워커에 붙은 연결 수', lambda: len(connection_rooms))
+metrics.gauge('lexio_queue_waiting', '매치메이킹 대기열에 있는 플레이어 수', lambda: len(lobby))
+metrics.gauge('lexio_spectators', '이 워커가 상태를 보내는 관전자 수', lambda: len(spectators))
+metrics.gauge('lexio_rated_players', '이 워커의 레이팅 순위표에 있는 플레이어 수', lambda: len(ratings))
+metrics.gauge('lexio_guard_warned_connections', '요청 제한/검사에 한 번 이상 걸린 연결 수', lambda: len(guard.strikes))
+
+# ===================================================================
+# 소켓 이벤트: 핸들러는 route() 로 방의 주인 워커에 넘기고, 실제 처리는 sid 를 받는 함수들이 한다
+# ===================================================================
+def client_ip(): return request.access_route[-1] if TRUSTED_PROXY else request.remote_addr
+
+# 연결에서 오는 이벤트는 모두 guard 를 먼저 지난다. 걸리면 핸들러를 부르지 않고, 처음 한 번만 알리고, 계속되면 끊는다.
+def guarded(event):
+    def register(handler):
+        def checked(*args):
+            args, rejected = guard.check(request.sid, event, args)
+            if rejected is None: return handler(*args)
+            reject(request.sid, rejected)
+        return socketio.on(event)(checked)
+    return register
+
+def reject(sid, reason):
+    if metrics.enabled: metrics.inc(f"lexio_guard_{reason}_total")
+    if guard.should_disconnect(sid):
+        if metrics.enabled: metrics.inc('lexio_guard_disconnects_total')
+        return disconnect()
+    if guard.strikes[sid] == 1: emit('error_message', {'message': '요청이 너무 잦거나 올바르지 않습니다. 잠시 후 다시 시도하세요.'}, to=sid)
 
 @socketio.on('connect')
-def handle_connect():
+def handle_connect(auth=None):
     sid = request.sid
-    if num_players == 0 or len(players) >= num_players or sid in players: return
-    player_num = len(players)
-    players[sid] = player_num
-    emit('player_assigned', {'player_num': player_num}, room=sid)
-    socketio.emit('waiting_for_players', {'current': len(players), 'needed': num_players})
-    if len(players) == num_players:
-        start_new_game(is_first_game=True)
-        broadcast_game_state(is_start=True)
+    if not guard.connect(sid, client_ip()):
+        if metrics.enabled: metrics.inc('lexio_guard_refused_connections_total')
+        return False
+    checked = check_connect(auth, request.args)
+    # 거절한 연결은 disconnect 이벤트가 오지 않으므로 guard 상태도 여기서 지운다 (반복하면 connects 버킷에 걸린다)
+    if checked is None:
+        guard.disconnect(sid)
+        if metrics.enabled: metrics.inc('lexio_guard_invalid_total')
+        return False
+    room_id, token, compact, secret, watch = checked
+    room_id = room_id or DEFAULT_ROOM
+    connection_rooms[sid] = room_id
+    # 관전자는 플레이어 방에 들어가지 않는다 (패치를 매번 받지 않고 spectator_loop 가 보내는 상태만 받는다)
+    if watch:
+        if MESSAGE_QUEUE:
+            viewer = watch_room(room_id)
+            join_room(viewer)
+        elif DIRECT_SPECTATORS: viewer = socketio.server.manager.eio_sid_from_sid(sid, '/')
+        else: viewer = sid
+        return route('watch', sid, room_id, viewer)
+    player = connection_players[sid] = player_id(secret)
+    join_room(wire.compact_room(room_id) if compact else room_id)
+    route('connect', sid, room_id, token, compact, player)
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    if request.sid in players:
-        socketio.emit('player_left', {'player_num': players[request.sid] + 1})
-        reset_game()
-
-# app.py 파일에서 이 함수를 찾아 아래 내용으로 완전히 교체해주세요.
-
-@socketio.on('play_hand')
-def handle_play_hand(hand_data):
-    sid, player_num = request.sid, players.get(request.sid)
-    # --- 디버깅 메시지 ---
-    print(f"\n--- PLAY HAND by Player {player_num + 1} ---")
-    if game_state:
-        print(f"PASS LIST before play: {game_state.get('players_who_passed_this_round')}")
-    # --------------------
-
-    if player_num is None or not game_state: return
+    if request.sid in queued_connections:
+        queued_connections.discard(request.sid)
+        route('leave_queue', request.sid, room_id=LOBBY_ROOM)
+    route('disconnect', request.sid)
+    connection_rooms.pop(request.sid, None)
+    connection_players.pop(request.sid, None)
+    guard.disconnect(request.sid)
+
+@guarded('request_start_game')
+def handle_request_start_game(data): route('request_start_game', request.sid, data)
+
+@guarded('play_hand')
+def handle_play_hand(hand_data): route('play_hand', request.sid, hand_data)
+
+@guarded('pass_turn')
+def handle_pass_turn(): route('pass_turn', request.sid)
+
+@guarded('request_resync')
+def handle_request_resync(): route('request_resync', request.sid)
+
+@guarded('request_new_game')
+def handle_request_new_game(): route('request_new_game', request.sid)
+
+@guarded('join_queue')
+def handle_join_queue(data):
+    queued_connections.add(request.sid)
+    route('join_queue', request.sid, data, connection_players.get(request.sid), room_id=LOBBY_ROOM)
+
+@guarded('leave_queue')
+def handle_leave_queue():
+    queued_connections.discard(request.sid)
+    route('leave_queue', request.sid, room_id=LOBBY_ROOM)
+
+def on_request_start_game(sid, data):
+    room = rooms.room_of(sid)
+    if room is None or room.num_players != 0: return
+    # guard 를 끈 경우(LEXIO_GUARD=0)에도 인원수/봇 수는 여기서 다시 확인한다
+    checked = check_start_game((data,))
+    if checked is None: return emit('error_message', {'message': '3~5명, 봇은 인원수보다 적게 고를 수 있습니다.'}, to=sid)
+    data = checked[0]
+    room.configure(data['num_players'])
+    if sid not in room.players: seat_player(room, sid)
+    bot_class = BOTS.get(data['bot_level'], BOTS['heuristic'])
+    room.seat_bots([bot_class() for _ in range(data['bots'])])
+    record(room, 'configure', num_players=room.num_players, bots=[[seat, bot.name] for seat, bot in room.bots.items()])
+    emit('waiting_for_players', {'current': room.seated_count(), 'needed': room.num_players}, to=room.room_id)
+    start_if_full(room)
+
+def on_connect(sid, room_id, token, compact=False, player=None):
+    room = rooms.join(sid, room_id)
+    if compact:
+        compact_sids[sid] = room_id
+        compact_rooms[room_id] = compact_rooms.get(room_id, 0) + 1
+    if player: player_ids[sid] = player
+    if token and room.reconnect(sid, token) is not None:
+        if player: room.identities[room.players[sid]] = player
+        clock.cancel((room_id, room.players[sid]))
+        resume_player(room, sid, token)
+        if not room.game_state: start_if_full(room)
+        return
+    if room.is_full() and sid not in room.players: return emit('room_full', {'room': room_id}, to=sid)
+    if room.num_players == 0 or sid in room.players: return
+    seat_player(room, sid)
+    emit('waiting_for_players', {'current': room.seated_count(), 'needed': room.num_players}, to=room_id)
+    start_if_full(room)
+
+# 토큰으로 돌아온 플레이어에게 자리와 현재 상태를 다시 보낸다
+def resume_player(room, sid, token):
+    seat = room.players[sid]
+    emit('player_assigned', {'player_num': seat, 'token': token}, to=sid)
+    emit('player_returned', {'player_num': seat + 1}, to=room.room_id)
+    if not room.game_state:
+        emit('waiting_for_players', {'current': room.seated_count(), 'needed': room.num_players}, to=sid)
+        return
+    emit('your_hand', room.private_hand(seat), to=sid)
+    emit('game_started', room.public_state(), to=sid)
+    if room.is_game_over: emit('game_over', room.get_final_rankings(), to=sid)
+
+# 관전자도 방의 접속자로 남겨서, 관전 중인 방이 지워지지 않게 한다
+def on_watch(sid, room_id, viewer):
+    room = rooms.join(sid, room_id)
+    watchers[sid] = (room_id, viewer)
+    spectators.watch(room, viewer)
+
+def on_disconnect(sid):
+    watching = watchers.pop(sid, None)
+    if watching is not None:
+        room_id, viewer = watching
+        # 관전 방 하나를 같이 쓰는 경우에는 마지막 관전자가 나갈 때만 뺀다
+        if not MESSAGE_QUEUE or not any(v == viewer for _, v in watchers.values()): spectators.unwatch(room_id, viewer)
+        rooms.leave(sid)
+        return
+    player_ids.pop(sid, None)
+    compact_room_id = compact_sids.pop(sid, None)
+    if compact_room_id is not None:
+        compact_rooms[compact_room_id] -= 1
+        if not compact_rooms[compact_room_id]: del compact_rooms[compact_room_id]
+    room = rooms.room_of(sid)
+    seat = room.disconnect_player(sid) if room is not None else None
+    if seat is not None:
+        emit('player_disconnected', {'player_num': seat + 1, 'grace': RECONNECT_GRACE}, to=room.room_id)
+        arm_seat_expiry(room, seat, room.disconnected[seat])
+    rooms.leave(sid)
+
+def on_play_hand(sid, hand_data):
+    room = rooms.room_of(sid)
+    if room is None: return
+    player_num = room.players.get(sid)
+    if player_num is None or not room.game_state: return
+    # 압축 프로토콜 클라이언트는 타일 id 만 보낸다. guard 를 끈 경우(LEXIO_GUARD=0)에도 여기서 다시 id 로 맞춘다.
+    checked = check_play_hand((hand_data,))
+    if checked is None: return emit('error_message', {'message': '올바르지 않은 패입니다.'}, to=sid)
+    submitted_tiles = [TILES[t] for t in checked[0]]
+    error_message = play_tiles(room, player_num, submitted_tiles)
+    if not error_message: return
+    if metrics.enabled: metrics.inc('lexio_rejected_plays_total')
+    emit('error_message', {'message': error_message}, to=sid)
+
+# 사람(소켓 핸들러)과 봇이 함께 쓰는 패 내기. 낼 수 없으면 오류 메시지를 돌려준다.
+def play_tiles(room, player_num, submitted_tiles):
+    game_state = room.game_state
+    if room.is_game_over: return '게임이 이미 끝났습니다.'
     if player_num != game_state.get('current_player_index'):
-        return emit('error_message', {'message': '당신의 턴이 아닙니다.'})
+        return '당신의 턴이 아닙니다.'
     if player_num in game_state.get('players_who_passed_this_round', []):
-        return emit('error_message', {'message': '이미 패스했으므로 이번 라운드에 참여할 수 없습니다.'})
+        return '이미 패스했으므로 이번 라운드에 참여할 수 없습니다.'
+    submitted_mask = tiles_to_mask(submitted_tiles)
+    if submitted_mask & ~tiles_to_mask(game_state['player_hands'][player_num]) or submitted_mask.bit_count() != len(submitted_tiles):
+        return '손에 없는 패는 낼 수 없습니다.'
 
-    submitted_tiles = [Tile(t['suit'], t['rank']) for t in hand_data]
     combo_info = get_combination_info(submitted_tiles)
-    if not combo_info[0]: return emit('error_message', {'message': '유효한 조합이 아닙니다.'})
+    if not combo_info[0]: return '유효한 조합이 아닙니다.'
     if not is_stronger_combination(combo_info, game_state['last_played_hand_info']):
-        return emit('error_message', {'message': '더 약한 패는 낼 수 없습니다.'})
-    
-    combo_name, rep_info = combo_info
-    rep_rank = rep_info[0].rank if isinstance(rep_info, tuple) else rep_info.rank
-    log_message = f"P{player_num + 1}: {rep_rank} {combo_name}을(를) 냈습니다."
-    game_state['game_log'].append(log_message)
-    if len(game_state['game_log']) > 15: game_state['game_log'].pop(0)
-
-    # ✨ 수정된 부분: 패스 기록을 초기화하는 부분이 완전히 삭제되었습니다.
-    game_state.update({
-        'last_played_hand_info': combo_info,
-        'last_played_tiles': submitted_tiles,
-        'last_player_to_act_index': player_num
-    })
+        return '더 약한 패는 낼 수 없습니다.'
     
+    log_message = room.apply_play(player_num, submitted_tiles, combo_info)
+    record(room, 'play', seat=player_num, mask=submitted_mask)
     current_hand = game_state['player_hands'][player_num]
-    for tile in submitted_tiles:
-        if tile in current_hand: current_hand.remove(tile)
-    
-    # --- 디버깅 메시지 ---
-    print(f"PASS LIST after play: {game_state.get('players_who_passed_this_round')}")
-    # --------------------
-    
+    if metrics.enabled: metrics.trace_turn(lambda: turn_record(room, player_num, 'play', log_message))
+
+    play = {'seat': player_num, 'tiles': [tile.to_dict() for tile in submitted_tiles], 'combo': combo_info_to_dict(combo_info)}
     if not current_hand:
-        is_game_over = handle_end_of_round(winner_index=player_num)
+        payments, is_game_over = handle_end_of_round(room, winner_index=player_num)
+        room.is_game_over = is_game_over
+        broadcast_patch(room, turn=game_state['current_player_index'], log=log_message, play=play, money=room.player_money)
+        # 결과는 이긴 패를 담은 패치 뒤에 보낸다 (클라이언트가 마지막 패를 그린 다음 결과를 띄우게)
+        emit('round_result', {'winner': player_num + 1, 'payments': payments, 'money_status': room.player_money}, to=room.room_id)
         if is_game_over:
-            final_ranks = get_final_rankings()
-            socketio.emit('game_over', final_ranks)
+            final_ranks = room.get_final_rankings()
+            emit('game_over', final_ranks, to=room.room_id)
+            rate_game(room)
         else:
-            start_new_game(is_first_game=False)
-            broadcast_game_state(is_start=True)
+            deal_round(room, is_first_game=False)
     else:
-        advance_turn()
-        print(f"Next turn is now Player {game_state['current_player_index'] + 1}") # 디버깅 메시지
-        broadcast_game_state()
+        broadcast_patch(room, turn=game_state['current_player_index'], log=log_message, play=play)
 
 
-@socketio.on('pass_turn')
-def handle_pass_turn():
-    sid, player_num = request.sid, players.get(request.sid)
-    print(f"\n--- PASS TURN by Player {player_num + 1} ---") # 디버깅 메시지
-    print(f"PASS LIST before pass: {game_state.get('players_who_passed_this_round')}") # 디버깅 메시지
-    
-    if player_num is None or not game_state or player_num != game_state['current_player_index'] or game_state['last_played_hand_info'][0] is None or player_num in game_state['players_who_passed_this_round']:
+def on_pass_turn(sid):
+    room = rooms.room_of(sid)
+    if room is None: return
+    player_num = room.players.get(sid)
+    if player_num is None or not room.game_state: return
+    pass_turn(room, player_num)
+
+def pass_turn(room, player_num):
+    game_state = room.game_state
+    if room.is_game_over or player_num != game_state['current_player_index'] or game_state['last_played_hand_info'][0] is None or player_num in game_state['players_who_passed_this_round']:
         return
 
-    game_state['players_who_passed_this_round'].append(player_num)
-    game_state['game_log'].append(f"P{player_num + 1}: 패스했습니다.")
-    print(f"PASS LIST after pass: {game_state.get('players_who_passed_this_round')}") # 디버깅 메시지
+    log_message, cleared = room.apply_pass(player_num)
+    record(room, 'pass', seat=player_num)
+    if metrics.enabled: metrics.trace_turn(lambda: turn_record(room, player_num, 'pass', log_message))
 
-    if (num_players - len(game_state['players_who_passed_this_round'])) <= 1:
-        game_state.update({'last_played_hand_info': (None, None), 'last_played_tiles': [], 'players_who_passed_this_round': [], 'current_player_index': game_state['last_player_to_act_index']})
-        print("New round started by passes. PASS LIST cleared.") # 디버깅 메시지
-    else:
-        advance_turn()
-    
-    broadcast_game_state()
+    broadcast_patch(room, turn=game_state['current_player_index'], log=log_message, passed=player_num, clear=cleared)
+
+def on_request_resync(sid):
+    room = rooms.room_of(sid)
+    if room is None or not room.game_state or sid not in room.players: return
+    emit('your_hand', room.private_hand(room.players[sid]), to=sid)
+    emit('game_snapshot', room.public_state(), to=sid)
+
+# 자리에 앉은 플레이어만, 게임이 끝났거나 시작 전일 때만 방을 비울 수 있다
+def on_request_new_game(sid):
+    room = rooms.room_of(sid)
+    if room is not None and sid in room.players and (room.is_game_over or not room.game_state): reset_game(room)
+
+# 레이팅은 클라이언트가 보낸 값이 아니라 레이팅 저장소(메모리 순위표)에서 읽는다
+def on_join_queue(sid, data, player=None):
+    checked = check_join_queue((data,))
+    size = checked[0]['num_players'] if checked else None
+    if size not in QUEUE_SIZES: return emit('error_message', {'message': '3~5명 게임만 대기열에 들어갈 수 있습니다.'}, to=sid)
+    lobby.enqueue(sid, size, ratings.rating(player) if player else None)
+    emit('queue_joined', {'num_players': size, 'waiting': lobby.waiting[size]}, to=sid)
+
+# 끝난 게임의 최종 보유 금액을 레이팅 주인 워커로 넘긴다 (sid 자리는 비워 둔다)
+def rate_game(room):
+    results = [[seat, room.identities.get(seat), money] for seat, money in enumerate(room.player_money)]
+    if sum(1 for _, player, _ in results if player) >= 2: route('rate_game', None, room.room_id, results, room_id=LOBBY_ROOM)
+
+def on_rate_game(_, room_id, results):
+    changes = ratings.record([(player, money) for _, player, money in results])
+    if not changes: return
+    update = [{'player_num': seat + 1, 'rating': round(changes[player][0], 1), 'delta': round(changes[player][1], 1)} for seat, player, _ in results if player in changes]
+    # 방의 주인 워커가 아닐 수 있으므로 압축 프로토콜 방에도 직접 보낸다
+    socketio.emit('rating_update', {'ratings': update}, to=[room_id, wire.compact_room(room_id)])
+
+def on_leave_queue(sid):
+    if lobby.cancel(sid) is not None: emit('queue_left', to=sid)
 
-@socketio.on('request_new_game')
-def on_request_new_game():
-    if len(players) > 0: reset_game()
+ACTIONS = {
+    'connect': on_connect, 'disconnect': on_disconnect, 'request_start_game': on_request_start_game,
+    'play_hand': on_play_hand, 'pass_turn': on_pass_turn,
+    'request_resync': on_request_resync, 'request_new_game': on_request_new_game,
+    'join_queue': on_join_queue, 'leave_queue': on_leave_queue, 'watch': on_watch, 'rate_game': on_rate_game,
+}
 
 if __name__ == '__main__':
-    socketio.run(app, debug=True)
+    host, port = os.environ.get('HOST', '127.0.0.1'), int(os.environ.get('PORT', 5000))
+    if WORKERS == 1: socketio.run(app, host=host, port=port, debug=True)
+    else: socketio.run(app, host=host, port=port)
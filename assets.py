@@ -0,0 +1,131 @@
+# assets.py
+# 사용법: python assets.py [--webp]   (static/ 의 css/js/타일 이미지를 고친 뒤 배포 전에 돌린다. Pillow 필요)
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from io import BytesIO
+
+from flask import request, send_from_directory, url_for
+
+from game_logic import RANKS, SUITS
+
+# ===================================================================
+# 정적 파일 빌드: 타일 60장을 스프라이트 한 장으로 묶고, 파일 이름에 내용 해시를 붙여 static/dist 에 둔다
+# ===================================================================
+# static/dist/
+#   manifest.json           원래 이름 -> 해시 붙은 이름, 스프라이트 좌표
+#   tiles.<hash>.png        타일 스프라이트 (무늬 한 줄에 숫자 1~15, 256색 팔레트)
+#   tiles.<hash>.webp       --webp 로 만들었고 PNG 보다 작을 때만. 지원하는 브라우저가 골라 쓴다.
+#   tiles.<hash>.json       스프라이트 좌표 (manifest 의 atlas 와 같다)
+#   css/style.<hash>.css, js/main.<hash>.js  (+ .gz)
+# 내용이 바뀌면 이름이 바뀌므로 /assets/ 아래 파일은 1년 immutable 로 캐시하게 한다.
+# dist 가 없으면(개발 중) 예전처럼 /static/ 의 원본과 낱장 이미지를 쓴다.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC = os.path.join(ROOT, 'static')
+DIST = os.path.join(STATIC, 'dist')
+HASHED_FILES = ('css/style.css', 'js/main.js')
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg')
+TILE_CELL = (160, 240) # .card 80x120 의 두 배. 원본을 background-size: cover 처럼 가운데를 잘라 맞춘다.
+WEBP_QUALITY = 85
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+def tile_name(suit, rank): return f"{suit}_{rank}"
+
+def hashed_name(name, data):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+def write_hashed(name, data, files):
+    hashed = hashed_name(name, data)
+    path = os.path.join(DIST, hashed)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f: f.write(data)
+    if name.endswith(COMPRESSIBLE):
+        with open(path + '.gz', 'wb') as f: f.write(gzip.compress(data, 9, mtime=0))
+    files[name] = hashed
+    return hashed
+
+# Pillow 는 빌드할 때만 필요하다 (서버는 빌드 결과만 읽는다)
+def build_atlas(image_dir=os.path.join(STATIC, 'images')):
+    from PIL import Image, ImageOps
+    width, height = TILE_CELL
+    columns = sorted(RANKS)
+    atlas = Image.new('RGBA', (width * len(columns), height * len(SUITS)))
+    tiles = {}
+    for row, suit in enumerate(reversed(SUITS)):
+        for column, rank in enumerate(columns):
+            with Image.open(os.path.join(image_dir, f"{tile_name(suit, rank)}.png")) as image:
+                cell = ImageOps.fit(image.convert('RGBA'), TILE_CELL, method=Image.LANCZOS)
+            atlas.paste(cell, (column * width, row * height))
+            tiles[tile_name(suit, rank)] = [column * width, row * height]
+    return atlas, {'cell': list(TILE_CELL), 'size': list(atlas.size), 'tiles': tiles}
+
+def encode_image(image, fmt):
+    out = BytesIO()
+    if fmt == 'PNG': image.quantize(256, method=2, dither=0).save(out, 'PNG', optimize=True)
+    else: image.save(out, 'WEBP', quality=WEBP_QUALITY, method=6)
+    return out.getvalue()
+
+def build(webp=False):
+    if os.path.isdir(DIST): shutil.rmtree(DIST)
+    os.makedirs(DIST)
+    files = {}
+    atlas, coordinates = build_atlas()
+    png = encode_image(atlas, 'PNG')
+    coordinates['png'] = '/assets/' + write_hashed('tiles.png', png, files)
+    if webp:
+        # 단색 면이 대부분인 타일 그림은 팔레트 PNG 가 더 작으므로 그럴 때는 WebP 를 두지 않는다
+        data = encode_image(atlas, 'WEBP')
+        if len(data) < len(png): coordinates['webp'] = '/assets/' + write_hashed('tiles.webp', data, files)
+        else: print(f"tiles.webp: {len(data)} bytes >= PNG {len(png)} bytes, skipped")
+    write_hashed('tiles.json', json.dumps(coordinates, separators=(',', ':')).encode(), files)
+    for name in HASHED_FILES:
+        with open(os.path.join(STATIC, name), 'rb') as f: write_hashed(name, f.read(), files)
+    manifest = {'files': files, 'atlas': coordinates}
+    with open(os.path.join(DIST, 'manifest.json'), 'w') as f: json.dump(manifest, f, indent=1)
+    return manifest
+
+# ===================================================================
+# 서버 쪽: 해시 붙은 URL 을 템플릿에 넣고, /assets/ 를 캐시 헤더와 미리 압축한 파일로 내보낸다
+# ===================================================================
+class Assets:
+    def __init__(self, app, dist=DIST):
+        self.dist = dist
+        self.load()
+        app.add_url_rule('/assets/<path:filename>', 'assets', self.serve)
+        app.context_processor(lambda: {'asset_url': self.url, 'tile_atlas': self.atlas})
+
+    def load(self):
+        try:
+            with open(os.path.join(self.dist, 'manifest.json')) as f: manifest = json.load(f)
+        except (OSError, ValueError): manifest = {}
+        self.files, self.atlas = manifest.get('files', {}), manifest.get('atlas')
+
+    def url(self, name):
+        hashed = self.files.get(name)
+        return '/assets/' + hashed if hashed else url_for('static', filename=name)
+
+    def serve(self, filename):
+        accepts_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+        if accepts_gzip and filename.endswith(COMPRESSIBLE) and os.path.exists(os.path.join(self.dist, filename + '.gz')):
+            response = send_from_directory(self.dist, filename + '.gz', mimetype=mimetypes.guess_type(filename)[0], max_age=31536000)
+            response.headers['Content-Encoding'] = 'gzip'
+            del response.headers['Content-Disposition']
+        else:
+            response = send_from_directory(self.dist, filename, max_age=31536000)
+        response.headers['Cache-Control'] = IMMUTABLE
+        if filename.endswith(COMPRESSIBLE): response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='정적 파일 빌드 (스프라이트, 해시 이름, gzip)')
+    parser.add_argument('--webp', action='store_true', help='WebP 스프라이트도 만든다')
+    manifest = build(parser.parse_args().webp)
+    for name, hashed in manifest['files'].items():
+        path = os.path.join(DIST, hashed)
+        gz = f", gzip {os.path.getsize(path + '.gz')} bytes" if os.path.exists(path + '.gz') else ''
+        print(f"{name:>14} -> {hashed} ({os.path.getsize(path)} bytes{gz})")
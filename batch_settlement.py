@@ -0,0 +1,71 @@
+# batch_settlement.py
+import numpy as np
+
+# ===================================================================
+# NumPy 일괄 정산: game_logic.settle_round 를 (게임 수 x 인원수) 배열에 한 번에 적용한다
+# ===================================================================
+# payments[g, j, i] = 게임 g 에서 j 가 i 에게 낸 금액.
+# 남은 장 수 차이만큼 내고, 승자는 2를 쥔 상대에게 두 배를 받는다.
+def payment_matrices(final_card_counts, holds_two, winners, dtype=np.int16):
+    counts = np.asarray(final_card_counts, dtype=dtype)
+    holds_two = np.asarray(holds_two, dtype=bool)
+    winners = np.asarray(winners)
+    num_games, num_players = counts.shape
+    payments = counts[:, :, None] - counts[:, None, :]
+    np.maximum(payments, 0, out=payments)
+    doubled = holds_two[:, :, None] & (np.arange(num_players) == winners[:, None])[:, None, :]
+    payments <<= doubled
+    return payments
+
+# 행렬을 만들지 않는 닫힌 형태: 모든 쌍이 차이만큼 주고받으므로 k 의 순수익은 (장 수 합계 - 인원수 * c_k),
+# 여기에 승자가 2를 쥔 상대에게서 한 번 더 받는 금액을 더한다. payment_matrices(...) 의 행/열 합과 같다.
+def money_deltas(final_card_counts, holds_two, winners):
+    counts = np.asarray(final_card_counts, dtype=np.int32)
+    winners = np.asarray(winners)
+    num_games, num_players = counts.shape
+    rows = np.arange(num_games)
+    deltas = counts.sum(axis=1, keepdims=True) - num_players * counts
+    extra = np.maximum(counts - counts[rows, winners][:, None], 0)
+    extra *= np.asarray(holds_two, dtype=bool)
+    extra[rows, winners] = 0
+    deltas -= extra
+    deltas[rows, winners] += extra.sum(axis=1)
+    return deltas
+
+# 게임마다 라운드 하나씩 정산한 보유 금액과 게임 종료(파산) 여부
+def settle_rounds(player_money, final_card_counts, holds_two, winners):
+    money = np.array(player_money, dtype=np.int32)
+    money += money_deltas(final_card_counts, holds_two, winners)
+    return money, (money <= 0).any(axis=1)
+
+# ===================================================================
+# 여러 라운드에 걸친 통계
+# ===================================================================
+# deltas: (게임 수 x 라운드 수 x 인원수) 라운드별 금액 변화. 반환: 라운드별 보유 금액
+def money_history(starting_money, deltas):
+    return starting_money + np.cumsum(deltas, axis=1, dtype=np.int32)
+
+# 게임마다 처음으로 누군가 파산한 라운드(1부터). 끝까지 파산이 없으면 0
+def bankruptcy_rounds(history):
+    bankrupt = (history <= 0).any(axis=2)
+    first = bankrupt.argmax(axis=1) + 1
+    first[~bankrupt.any(axis=1)] = 0
+    return first
+
+def bankruptcy_round_distribution(history):
+    return np.bincount(bankruptcy_rounds(history))
+
+# 게임이 끝난(처음 파산이 나온) 라운드의 보유 금액. 파산이 없으면 마지막 라운드
+def final_money(history):
+    last = bankruptcy_rounds(history) - 1
+    last[last < 0] = history.shape[1] - 1
+    return history[np.arange(len(history)), last]
+
+# 각 행(게임)의 최종 금액 지니 계수. 정산은 제로섬이라 합계는 시작 금액 합계 그대로다.
+def gini(money):
+    money = np.sort(np.asarray(money, dtype=np.float64), axis=-1)
+    n = money.shape[-1]
+    totals = money.sum(axis=-1)
+    weighted = (money * np.arange(1, n + 1)).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals != 0, 2 * weighted / (n * totals) - (n + 1) / n, 0.0)
@@ -0,0 +1,84 @@
+# benchmarks/bench_assets.py
+# 사용법: python benchmarks/bench_assets.py [--hand 12] [--rebuild]
+import argparse
+import json
+import os
+import re
+import time
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+import app as server
+import assets
+from game_logic import TILES
+
+# 새 손님이 페이지를 처음 열 때와 다시 열 때 이 워커에 오는 정적 요청 수/바이트/처리 시간.
+# 브라우저 캐시를 흉내 낸다: max-age 가 있는 응답은 다시 요청하지 않고, 없으면 ETag 로 재검증(304)한다.
+# 외부 CDN(socket.io, Sortable)은 이 워커로 오지 않으므로 세지 않는다.
+LOCAL_URL = re.compile(r'(?:href|src)="(/[^"]+)"')
+ATLAS_JSON = re.compile(r'<script id="tile-atlas" type="application/json">(.*?)</script>', re.S)
+
+class Browser:
+    def __init__(self, client):
+        self.client, self.cache, self.loaded = client, {}, set()
+        self.requests = self.bytes = self.not_modified = 0
+        self.server_seconds = 0.0
+
+    def get(self, url):
+        if url in self.loaded: return # 같은 페이지 안에서는 이미 받은 그림을 다시 쓴다
+        self.loaded.add(url)
+        cached = self.cache.get(url)
+        if cached and 'max-age=0' not in cached[0] and 'max-age' in cached[0]: return
+        headers = {'Accept-Encoding': 'gzip, deflate, br'}
+        if cached and cached[1]: headers['If-None-Match'] = cached[1]
+        start = time.perf_counter()
+        response = self.client.get(url, headers=headers)
+        body = response.get_data()
+        self.server_seconds += time.perf_counter() - start
+        self.requests += 1
+        self.bytes += len(body) + sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+        if response.status_code == 304: self.not_modified += 1
+        else: self.cache[url] = (response.headers.get('Cache-Control', ''), response.headers.get('ETag'))
+        response.close()
+
+    # 페이지를 열고(load_page) 화면에 tiles 가 보일 때까지의 요청
+    def visit(self, tiles, load_page=True):
+        self.requests = self.bytes = self.not_modified = 0
+        self.server_seconds = 0.0
+        if load_page: self.page, self.loaded = self.client.get('/').get_data(as_text=True), set()
+        page = self.page
+        if load_page:
+            for url in LOCAL_URL.findall(page):
+                if not url.startswith('//'): self.get(url)
+        # 스프라이트가 있으면 그 한 장만, 없으면 main.js 가 화면에 나온 타일마다 그림을 받는다
+        atlas = json.loads(ATLAS_JSON.search(page).group(1))
+        if atlas: self.get(atlas['png'])
+        else:
+            for tile in tiles: self.get(f"/static/images/{tile.suit}_{tile.rank}.png")
+        return self.requests, self.bytes, self.not_modified, self.server_seconds
+
+def run(name, hand_tiles, report):
+    browser = Browser(server.app.test_client())
+    for visit, tiles, load_page in (('first load, own hand', hand_tiles, True), ('rest of the game, all 60', TILES, False), ('return visit', hand_tiles, True)):
+        requests, size, not_modified, seconds = browser.visit(tiles, load_page)
+        report(name, visit, requests, size, not_modified, seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description='정적 파일 첫 로딩 요청 수/바이트 측정')
+    parser.add_argument('--hand', type=int, default=12, help='처음 화면에 보이는 타일 수')
+    parser.add_argument('--rebuild', action='store_true', help='static/dist 를 다시 빌드한다 (Pillow 필요)')
+    args = parser.parse_args()
+    if args.rebuild or not os.path.exists(os.path.join(assets.DIST, 'manifest.json')): assets.build(webp=True)
+    server.assets.load()
+
+    print(f"{'mode':>8} {'visit':>28} {'requests':>9} {'KB':>8} {'304s':>5} {'server ms':>10}")
+    def report(name, visit, requests, size, not_modified, seconds):
+        print(f"{name:>8} {visit:>28} {requests:>9} {size / 1024:>8.1f} {not_modified:>5} {seconds * 1000:>10.1f}")
+    hand_tiles = TILES[::60 // args.hand][:args.hand]
+    server.assets.files, server.assets.atlas = {}, None
+    run('before', hand_tiles, report)
+    server.assets.load()
+    run('atlas', hand_tiles, report)
+
+if __name__ == '__main__':
+    main()
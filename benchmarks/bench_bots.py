@@ -0,0 +1,94 @@
+# benchmarks/bench_bots.py
+# 사용법: python benchmarks/bench_bots.py --positions 100 --budget 0.05 --rounds 200
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+from bots import HeuristicBot, MonteCarloBot
+from engine import Game, LowestPolicy
+from game_logic import combination_table
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+# 1) 실제 판에서 나오는 국면마다 탐색 시간과 롤아웃 속도
+def bench_search(positions, budget, seed):
+    rng = random.Random(seed)
+    bot = MonteCarloBot(time_budget=budget, rng=random.Random(seed))
+    latencies = []
+    while len(latencies) < positions:
+        game = Game(3, random.Random(rng.random()))
+        game.deal()
+        while len(latencies) < positions:
+            seat = game.current
+            t0 = time.perf_counter()
+            move = bot.choose(game, seat)
+            latencies.append(time.perf_counter() - t0)
+            if move is None: game.pass_turn()
+            elif game.play(move): break
+    print(f"search: {positions} positions, budget {budget * 1000:.0f} ms, "
+          f"p50 {percentile(latencies, 50) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms, "
+          f"{bot.rollouts_per_second():,.0f} rollouts/s")
+
+# 2) 같은 딜에서 자리별 평균 수익 (한 자리만 바꿔 끼운다)
+def bench_strength(rounds, budget, seed):
+    for name, make in (('lowest', LowestPolicy), ('heuristic', HeuristicBot), ('montecarlo', lambda: MonteCarloBot(budget, rng=random.Random(seed)))):
+        game = Game(3, random.Random(seed), starting_money=10 ** 6)
+        policies = [make(), HeuristicBot(), HeuristicBot()]
+        wins = 0
+        for _ in range(rounds): wins += game.play_round(policies) == 0
+        print(f"strength: P1={name:>10} vs 2x heuristic over {rounds} rounds: "
+              f"P1 wins {wins / rounds * 100:.1f}%, P1 money/round {(game.money[0] - 10 ** 6) / rounds:+.2f}")
+
+# 3) 봇이 탐색하는 동안 사람만 있는 다른 테이블의 응답 시간
+def bench_event_loop(budget, turns):
+    import app as server
+    server.BOT_MOVE_DELAY = 0
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        bot_table = []
+        for t in range(4):
+            host = SimClient(server.socketio, server.app, f"bots-{t}")
+            host.client.emit('request_start_game', {'num_players': 3, 'bots': 2, 'bot_level': 'montecarlo'})
+            bot_table.append(host)
+        host = SimClient(server.socketio, server.app, 'humans')
+        host.client.emit('request_start_game', {'num_players': 3})
+        humans = [host] + [SimClient(server.socketio, server.app, 'humans') for _ in range(2)]
+        latencies = []
+        for _ in range(turns):
+            server.socketio.sleep(0.005)
+            for client in bot_table + humans: client.drain()
+            for host in bot_table:
+                if host.is_my_turn() and not host.game_over: host.act()
+            actor = next((c for c in humans if c.is_my_turn()), None)
+            if actor is None or actor.game_over: continue
+            t0 = time.perf_counter()
+            actor.act()
+            latencies.append(time.perf_counter() - t0)
+        searched = sum(bot.stats['moves'] for room in server.rooms.rooms.values() for bot in room.bots.values() if hasattr(bot, 'stats'))
+        for client in bot_table + humans: client.disconnect()
+        # 끊긴 자리는 재접속 유예 동안 남아 있으므로 봇이 계속 두지 않게 방을 정리한다
+        for room in list(server.rooms.rooms.values()): server.reset_game(room)
+        server.socketio.sleep(budget * 2)
+    print(f"event loop: {searched} bot searches ran alongside {len(latencies)} human actions, "
+          f"human p50 {percentile(latencies, 50) * 1000:.2f} ms, p99 {percentile(latencies, 99) * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description='봇 탐색 속도/강도 벤치마크')
+    parser.add_argument('--positions', type=int, default=100)
+    parser.add_argument('--budget', type=float, default=0.05)
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--turns', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    combination_table()
+    bench_search(args.positions, args.budget, args.seed)
+    bench_strength(args.rounds, args.budget, args.seed)
+    bench_event_loop(args.budget, args.turns)
+
+if __name__ == '__main__':
+    main()
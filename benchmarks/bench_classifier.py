@@ -0,0 +1,162 @@
+# benchmarks/bench_classifier.py
+# 사용법: python benchmarks/bench_classifier.py [--sample 500000] [--skip-reference] [--skip-legacy]
+import argparse
+import random
+import time
+from collections import Counter
+from itertools import combinations, islice
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+import game_logic
+import lexio
+from bench_rules import LegacyTile
+from game_logic import TILES, Tile, classify_mask
+
+# 60장 덱의 5장 부분집합 전부(C(60,5) = 5,461,512)를 판정기마다 돌려서 같은 판정인지 확인하고,
+# 판정기마다 걸린 시간을 재서 성능 회귀 벤치마크로도 쓴다.
+#  web:       app.py 처럼 {'suit', 'rank'} 딕셔너리 -> Tile -> get_combination_info (기준)
+#  mask:      classify_mask (조합 테이블 조회, 엔진/봇 경로)
+#  reference: 규칙 그대로의 느린 판정 (_classify_reference). 테이블이 규칙과 같은지 확인한다.
+#  legacy:    통합 전 lexio.py 에 복사돼 있던 판정기. 통합으로 판정이 바뀐 조합을 (예전 -> 지금) 으로 세고,
+#             LEGACY_DRIFT 에 적힌 규칙 수정 말고 다른 차이가 나오면 실패한다.
+# lexio.py 는 이제 판정기를 따로 갖지 않으므로(game_logic 것을 그대로 가져다 쓴다) 같은 함수인지만 확인한다.
+CHUNK = 100000
+TILE_DICTS = [tile.to_dict() for tile in TILES]
+LEGACY_SUITS = {"sun": "해", "moon": "달", "star": "별", "cloud": "구름"}
+LEGACY_SUIT_POWER = {"해": 4, "달": 3, "별": 2, "구름": 1}
+
+# 통합 전 lexio.py 의 get_combination_info 그대로 (무늬 이름만 한국어, 조커 플러쉬는 나머지 네 장만 본다)
+class LegacyLexioTile(LegacyTile):
+    suit_power = LEGACY_SUIT_POWER
+
+def legacy_get_combination_info(tiles):
+    num_tiles, highest_tile = len(tiles), max(tiles)
+    if num_tiles == 1: return ("싱글", highest_tile)
+    if num_tiles == 2 and game_logic.all_ranks_are_same(tiles): return ("페어", highest_tile)
+    if num_tiles == 3 and game_logic.all_ranks_are_same(tiles): return ("트리플", highest_tile)
+    if num_tiles == 5:
+        ranks = [t.rank for t in tiles]
+        if 1 in ranks and len(set(ranks)) == 5:
+            other_four = [t for t in tiles if t.rank != 1]
+            strengths = sorted([Tile.rank_strength[t.rank] for t in other_four])
+            if len(strengths) == 4 and all(strengths[i] + 1 == strengths[i+1] for i in range(3)):
+                is_joker_flush = (len(set(t.suit for t in other_four)) == 1)
+                strength_to_rank = {v: k for k, v in Tile.rank_strength.items()}
+                virtual_rank = strength_to_rank.get(strengths[3] + 1)
+                if virtual_rank:
+                    virtual_rep_tile = LegacyLexioTile(max(tiles).suit, virtual_rank)
+                    return ("스트레이트 플러쉬" if is_joker_flush else "스트레이트", virtual_rep_tile)
+        rank_counts = Counter(ranks)
+        counts_values = sorted(rank_counts.values())
+        is_straight, is_flush = game_logic.ranks_are_sequential(tiles), game_logic.all_suits_are_same(tiles)
+        if is_straight and is_flush: return ("스트레이트 플러쉬", highest_tile)
+        if counts_values == [1, 4]:
+            quad_rank = [r for r, c in rank_counts.items() if c == 4][0]
+            return ("포카드", max(t for t in tiles if t.rank == quad_rank))
+        if counts_values == [2, 3]:
+            triple_rank = [r for r, c in rank_counts.items() if c == 3][0]
+            return ("풀하우스", max(t for t in tiles if t.rank == triple_rank))
+        if is_flush: return ("플러쉬", tuple(sorted(tiles, reverse=True)))
+        if is_straight: return ("스트레이트", highest_tile)
+    return (None, None)
+
+# 통합으로 일부러 바뀐 판정: (예전 이름, 지금 이름) -> (전수 검사에서의 부분집합 수, 이유)
+LEGACY_DRIFT = {
+    (None, "스트레이트"): (2040, "1-2-3-4-5, 2-3-4-5-6 은 웹 규칙대로 스트레이트 (무늬 4^5 - 4 가지 x 2)"),
+    ("스트레이트 플러쉬", "스트레이트"): (120, "조커(1) 스트레이트 플러쉬는 1 까지 다섯 장이 같은 무늬여야 한다"),
+    ("플러쉬", "스트레이트 플러쉬"): (8, "같은 무늬 1-2-3-4-5, 2-3-4-5-6 은 스트레이트 플러쉬 (4 무늬 x 2)"),
+}
+
+LEGACY_TILES = [LegacyLexioTile(LEGACY_SUITS[tile.suit], tile.rank) for tile in TILES]
+
+def tile_id(tile): return (Tile.rank_strength[tile.rank] - 1) * 4 + LEGACY_SUIT_POWER.get(tile.suit, Tile.suit_power.get(tile.suit)) - 1
+
+# 판정 결과를 (조합 이름, 대표 타일 id) 로 맞춰서 비교한다
+def signature(combo_info):
+    name, rep_info = combo_info[0], combo_info[1]
+    if name is None: return None
+    if isinstance(rep_info, tuple): return (name, tuple(tile_id(tile) for tile in rep_info))
+    return (name, tile_id(rep_info))
+
+def classify_web(chunk):
+    return [signature(game_logic.get_combination_info([Tile(d['suit'], d['rank']) for d in (TILE_DICTS[i] for i in ids)])) for ids in chunk]
+
+def classify_by_mask(chunk):
+    return [signature(classify_mask((1 << a) | (1 << b) | (1 << c) | (1 << d) | (1 << e))) for a, b, c, d, e in chunk]
+
+def classify_reference(chunk):
+    return [signature(game_logic._classify_reference([TILES[i] for i in ids])) for ids in chunk]
+
+def classify_legacy(chunk):
+    return [signature(legacy_get_combination_info([LEGACY_TILES[i] for i in ids])) for ids in chunk]
+
+def subsets(sample, seed):
+    everything = combinations(range(len(TILES)), 5)
+    if not sample: return everything, 5461512
+    rng = random.Random(seed)
+    return (tuple(sorted(rng.sample(range(len(TILES)), 5))) for _ in range(sample)), sample
+
+def main():
+    parser = argparse.ArgumentParser(description='5장 조합 판정 전수 검사 + 판정기 성능 회귀 벤치마크')
+    parser.add_argument('--sample', type=int, default=0, help='0 이면 5장 부분집합 전부, 아니면 이만큼 무작위로')
+    parser.add_argument('--skip-reference', action='store_true', help='느린 규칙 판정(_classify_reference)은 건너뛴다')
+    parser.add_argument('--skip-legacy', action='store_true', help='통합 전 lexio.py 판정기와 달라진 조합은 세지 않는다')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if lexio.get_combination_info is not game_logic.get_combination_info:
+        raise SystemExit("lexio.py has its own classifier again; compare it here")
+    start = time.perf_counter()
+    table = game_logic.combination_table()
+    print(f"rules v{game_logic.RULES_VERSION}; table build: {len(table)} combinations in {time.perf_counter() - start:.2f}s")
+
+    classifiers = [('web', classify_web), ('mask', classify_by_mask)]
+    if not args.skip_reference: classifiers.append(('reference', classify_reference))
+    if not args.skip_legacy: classifiers.append(('legacy', classify_legacy))
+    elapsed = dict.fromkeys([name for name, _ in classifiers], 0.0)
+    mismatches = dict.fromkeys([name for name, _ in classifiers[1:]], 0)
+    drift, examples, kinds = Counter(), [], Counter()
+
+    it, total = subsets(args.sample, args.seed)
+    done = 0
+    while True:
+        chunk = list(islice(it, CHUNK))
+        if not chunk: break
+        results = {}
+        for name, classify in classifiers:
+            start = time.perf_counter()
+            results[name] = classify(chunk)
+            elapsed[name] += time.perf_counter() - start
+        expected = results['web']
+        kinds.update(sig[0] if sig else None for sig in expected)
+        for name in mismatches:
+            for ids, got, want in zip(chunk, results[name], expected):
+                if got == want: continue
+                mismatches[name] += 1
+                if name == 'legacy': drift[(got and got[0], want and want[0])] += 1
+                elif len(examples) < 5: examples.append((name, [TILES[i] for i in ids], got, want))
+        done += len(chunk)
+        print(f"\r  {done}/{total}", end='', flush=True)
+    print()
+
+    print(f"{done} five-tile subsets: " + ", ".join(f"{kind or 'none'} {count}" for kind, count in kinds.most_common()))
+    print(f"{'classifier':>10} {'seconds':>8} {'subsets/s':>11} {'mismatches vs web':>18}")
+    for name, _ in classifiers:
+        print(f"{name:>10} {elapsed[name]:>8.2f} {done / elapsed[name]:>11,.0f} {mismatches.get(name, '-'):>18}")
+    for name, tiles, got, want in examples: print(f"  {name} differs on {tiles}: {got} != {want}")
+    unexpected = []
+    if 'legacy' in mismatches:
+        print("legacy lexio.py -> shared core (old -> new: subsets):")
+        for key in sorted(set(drift) | set(LEGACY_DRIFT), key=lambda key: -drift[key]):
+            expected_count, reason = LEGACY_DRIFT.get(key, (None, "unexpected"))
+            # 표본 검사에서는 종류만, 전수 검사에서는 개수까지 맞아야 한다
+            ok = expected_count is not None and (args.sample or drift[key] == expected_count)
+            print(f"  {key[0]} -> {key[1]}: {drift[key]}{'' if ok else ' (unexpected)'}  {reason}")
+            if not ok: unexpected.append(key)
+    if any(count for name, count in mismatches.items() if name != 'legacy'):
+        raise SystemExit("classifiers disagree")
+    if unexpected: raise SystemExit(f"legacy drift outside LEGACY_DRIFT: {unexpected}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_cluster.py
+# 사용법: python benchmarks/bench_cluster.py --workers 1 2 4 --tables 30 --turns 40 --placement spread
+# (socketio.Client 를 쓰므로 websocket-client 가 필요하다)
+import argparse
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from sim_client import NetworkClient, SimClient, play_tables, wait_for_state
+
+from cluster import owner_of, start_cluster
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(values, p):
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port)).close()
+            return
+        except OSError: time.sleep(0.1)
+    raise RuntimeError(f"port {port} did not open")
+
+# spread: 같은 테이블의 자리들을 서로 다른 워커에 붙여 거의 모든 액션이 전달을 거치게 한다 (스티키 라우팅이 없을 때의 최악)
+# sticky: 모든 자리를 방의 주인 워커에 붙인다 (room 해시 로드밸런서)
+def worker_for(room_id, seat, table, workers, placement):
+    if placement == 'sticky': return owner_of(room_id, workers)
+    return (table + seat) % workers
+
+# 부하 프로세스 하나: 테이블 몇 개를 맡아 차례가 오면 두고, 같은 테이블의 다른 자리가 패치를 받을 때까지의 시간을 잰다
+def run_load(task):
+    tables, num_players, turns, workers, base_port, placement, tag = task
+    seats_by_table = []
+    for t in tables:
+        room_id = f"cluster-{tag}-{t}"
+        url = lambda seat: f"http://127.0.0.1:{base_port + worker_for(room_id, seat, t, workers, placement)}"
+        host = SimClient(None, None, room_id, client=NetworkClient(url(0), room_id))
+        time.sleep(0.05)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        time.sleep(0.05)
+        seats_by_table.append([host] + [SimClient(None, None, room_id, client=NetworkClient(url(seat), room_id)) for seat in range(1, num_players)])
+    wait_for_state(seats_by_table)
+    latencies, elapsed = play_tables(seats_by_table, turns)
+    for seats in seats_by_table:
+        for client in seats: client.disconnect()
+    return len(latencies), elapsed, latencies
+
+def run(workers, args, base_port, tag):
+    devnull = open(os.devnull, 'w')
+    env = {'LEXIO_DB': '', 'LEXIO_REPLAYS': '', 'LEXIO_RATINGS': '', 'LEXIO_GUARD': '0'} # 부하 클라이언트는 모두 같은 IP
+    if workers == 1:
+        processes = [subprocess.Popen([sys.executable, os.path.join(ROOT, 'app.py')], env=dict(os.environ, PORT=str(base_port), **env), stdout=devnull, stderr=devnull)]
+    else:
+        processes = start_cluster(workers, base_port, base_port + 100, env=env, stdout=devnull)
+    try:
+        for i in range(workers): wait_for_port(base_port + i)
+        time.sleep(1.0)
+        chunks = [list(range(args.tables))[p::args.loaders] for p in range(args.loaders)]
+        tasks = [(chunk, args.players, args.turns, workers, base_port, args.placement, tag) for chunk in chunks if chunk]
+        with multiprocessing.Pool(len(tasks)) as pool: results = pool.map(run_load, tasks)
+    finally:
+        for process in processes: process.terminate()
+        for process in processes: process.wait()
+        devnull.close()
+    actions = sum(r[0] for r in results)
+    elapsed = max(r[1] for r in results)
+    latencies = [l for r in results for l in r[2]]
+    return actions, actions / elapsed if elapsed else 0.0, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='멀티 워커(메시지 큐) 처리량 벤치마크')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--tables', type=int, default=30)
+    parser.add_argument('--players', type=int, default=3)
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--loaders', type=int, default=2, help='부하 생성 프로세스 수')
+    parser.add_argument('--placement', choices=['spread', 'sticky'], default='spread')
+    parser.add_argument('--base-port', type=int, default=5800)
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}, tables: {args.tables}, placement: {args.placement} (1 worker = no message queue)")
+    print(f"{'workers':>8} {'actions':>8} {'actions/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for i, workers in enumerate(args.workers):
+        actions, rate, latencies = run(workers, args, args.base_port + i * 200, tag=f"{workers}-{int(time.time())}")
+        print(f"{workers:>8} {actions:>8} {rate:>10.0f} {percentile(latencies, 50) * 1000:>8.2f} {percentile(latencies, 99) * 1000:>8.2f}")
+
+if __name__ == '__main__':
+    main()
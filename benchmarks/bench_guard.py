@@ -0,0 +1,138 @@
+# benchmarks/bench_guard.py
+# 사용법: python benchmarks/bench_guard.py --tables 20 --attackers 5 --sockets 4 --rate 20 --ticks 200
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+import app as server
+from guard import Guard
+from metrics import metrics
+
+# 정상 테이블(사람 4명, 자리마다 다른 IP) 옆에서 공격자(IP 하나에 소켓 여러 개)가 이벤트를 쏟아 낼 때
+# 정상 테이블의 한 수가 서버 루프에서 기다리는 시간을 잰다.
+# 서버는 이벤트 루프 하나라서, 한 틱(가상 0.1초)에 도착한 이벤트를 무작위 순서로 하나씩 처리하는 큐로 본다.
+#  지연 = 앞 틱에서 밀린 일 + 이번 틱에서 앞서 처리된 이벤트 시간 + 자기 처리 시간
+# 공격자 이벤트는 재동기화 요청, 손에 없는/모양이 틀린 패, 봇 수를 부풀린 게임 시작, 새 게임 요청을 섞는다.
+# 끊긴 공격자는 다음 틱에 같은 IP 로 새로 접속한다. 요청 제한의 시계는 틱마다 0.1초씩 가는 가상 시간이다.
+TICK = 0.1
+
+class Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+def connect(room_id, ip):
+    return server.socketio.test_client(server.app, auth={'room': room_id}, headers={'X-Forwarded-For': ip})
+
+def attack_events(rng):
+    junk = [{'suit': rng.choice(('sun', 'moon', 'star', 'cloud')), 'rank': rng.randint(1, 15)} for _ in range(5)]
+    return rng.choice([
+        ('request_resync',), ('request_resync',), ('play_hand', junk), ('play_hand', {'suit': 'x'}),
+        ('play_hand', list(range(200))), ('request_start_game', {'num_players': 5, 'bots': 10000}), ('request_new_game',),
+    ])
+
+def percentile(values, q): return sorted(values)[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+def run(mode, args):
+    rng = random.Random(args.seed)
+    clock = Clock()
+    server.guard = Guard(enabled=mode != 'flood, guard off', clock=clock)
+    metrics.counters.clear()
+    tag, tables = mode.replace(', ', '-').replace(' ', '-'), [] # 방 이름에는 공백/쉼표를 못 쓴다 (guard.check_connect)
+    for t in range(args.tables):
+        room_id = f"{tag}-table-{t}"
+        host = SimClient(server.socketio, server.app, room_id, client=connect(room_id, f"10.{t}.0.0"))
+        host.client.emit('request_start_game', {'num_players': 4})
+        seats = [host] + [SimClient(server.socketio, server.app, room_id, client=connect(room_id, f"10.{t}.0.{seat}")) for seat in range(1, 4)]
+        for client in seats: client.drain()
+        tables.append(seats)
+    attackers = []
+    if mode != 'quiet':
+        for a in range(args.attackers):
+            room_id, ip = f"{tag}-flood-{a}", f"66.0.0.{a}"
+            sockets = [connect(room_id, ip) for _ in range(args.sockets)]
+            sockets[0].emit('request_start_game', {'num_players': 3, 'bots': 2})
+            attackers.append([room_id, ip, sockets])
+    good_sids = {c.client.eio_sid for seats in tables for c in seats}
+
+    latencies, service, flood = [], [], {'sent': 0, 'errors': 0, 'reconnects': 0, 'refused': 0}
+    backlog = 0.0
+    for _ in range(args.ticks):
+        clock.now += TICK
+        work = []
+        for seats in tables:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            work.append((actor, actor.choose_action()))
+        for attacker in attackers:
+            room_id, ip, sockets = attacker
+            for i, client in enumerate(sockets):
+                if not client.is_connected():
+                    work.append((None, ('reconnect', attacker, i)))
+                    continue
+                work += [(client, attack_events(rng)) for _ in range(args.rate)]
+        rng.shuffle(work)
+        start = time.perf_counter()
+        for actor, event in work:
+            began = time.perf_counter()
+            if isinstance(actor, SimClient):
+                if event[1] is None: actor.client.emit(event[0])
+                else: actor.client.emit(*event)
+                done = time.perf_counter()
+                latencies.append(backlog + done - start)
+                service.append(done - began)
+            elif actor is None:
+                _, attacker, i = event
+                attacker[2][i] = connect(attacker[0], attacker[1])
+                flood['reconnects'] += 1
+                flood['refused'] += not attacker[2][i].is_connected()
+            elif actor.is_connected():
+                flood['sent'] += 1
+                try: actor.emit(*event)
+                except Exception: flood['errors'] += 1 # 예전처럼 핸들러 안에서 터지는 경우 (실제 서버에서는 로그 한 줄과 함께 버려진다)
+        backlog = max(0.0, backlog + time.perf_counter() - start - TICK)
+        for seats in tables:
+            for client in seats: client.drain()
+        for _, _, sockets in attackers:
+            for client in sockets:
+                if client.is_connected(): client.get_received()
+    good_strikes = sum(server.guard.strikes.get(sid, 0) for sid in good_sids)
+    for seats in tables:
+        for client in seats: client.disconnect()
+    for _, _, sockets in attackers:
+        for client in sockets:
+            if client.is_connected(): client.disconnect()
+    counters = {name.replace('lexio_guard_', '').replace('_total', ''): value for name, value in metrics.counters.items() if name.startswith('lexio_guard_')}
+    return {'mode': mode, 'moves': len(latencies), 'p50': percentile(latencies, 0.5), 'p99': percentile(latencies, 0.99), 'max': max(latencies, default=0),
+            'service p99': percentile(service, 0.99), 'backlog': backlog, 'good strikes': good_strikes, 'flood': flood, 'guard': counters}
+
+def main():
+    parser = argparse.ArgumentParser(description='이벤트 폭주 속에서 정상 테이블의 한 수 지연 (요청 제한/검사 끔 vs 켬)')
+    parser.add_argument('--tables', type=int, default=20)
+    parser.add_argument('--attackers', type=int, default=5, help='공격자 수 (공격자마다 IP 하나)')
+    parser.add_argument('--sockets', type=int, default=4, help='공격자 한 명이 여는 소켓 수')
+    parser.add_argument('--rate', type=int, default=20, help='소켓 하나가 틱(0.1초)마다 보내는 이벤트 수')
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    server.TRUSTED_PROXY = True # 접속마다 X-Forwarded-For 로 IP 를 준다
+
+    results = []
+    for mode in ('quiet', 'flood, guard off', 'flood, guard on'):
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            results.append(run(mode, args))
+    flood_rate = args.attackers * args.sockets * args.rate / TICK
+    print(f"{args.tables} tables x 4 seats; {args.attackers} attackers x {args.sockets} sockets x {flood_rate / args.attackers / args.sockets:.0f} events/s = {flood_rate:,.0f} events/s")
+    print(f"{'mode':>17} {'moves':>6} {'p50 ms':>7} {'p99 ms':>8} {'max ms':>8} {'service p99 ms':>15} {'backlog s':>10} {'good strikes':>13}")
+    for r in results:
+        print(f"{r['mode']:>17} {r['moves']:>6} {r['p50'] * 1e3:>7.2f} {r['p99'] * 1e3:>8.2f} {r['max'] * 1e3:>8.2f} {r['service p99'] * 1e3:>15.3f} {r['backlog']:>10.2f} {r['good strikes']:>13}")
+    for r in results[1:]:
+        print(f"{r['mode']:>17} flood: {r['flood']}  guard: {r['guard']}")
+    if results[2]['good strikes']: raise SystemExit("well-behaved clients were rate limited")
+
+if __name__ == '__main__':
+    main()
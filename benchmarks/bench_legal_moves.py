@@ -0,0 +1,51 @@
+# benchmarks/bench_legal_moves.py
+# 사용법: python benchmarks/bench_legal_moves.py --hands 2000 --verify
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_logic import TILES, combination_table, get_combination_info, is_stronger_combination, legal_moves
+
+def brute_force(hand, board):
+    masks = set()
+    for size in (1, 2, 3, 5):
+        for chosen in combinations(hand, size):
+            info = get_combination_info(list(chosen))
+            if info[0] and is_stronger_combination(info, board): masks.add(info.mask)
+    return masks
+
+def main():
+    parser = argparse.ArgumentParser(description='legal_moves 열거 속도 (15장 손패)')
+    parser.add_argument('--hands', type=int, default=2000)
+    parser.add_argument('--hand-size', type=int, default=15)
+    parser.add_argument('--verify', action='store_true', help='모든 부분집합을 직접 판정한 결과와 비교')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    boards = [(None, None)] + list(combination_table().values())
+
+    cases = [(rng.sample(TILES, args.hand_size), rng.choice(boards) if i % 4 else (None, None)) for i in range(args.hands)]
+    timings, first_timings, move_counts, mismatches = [], [], 0, 0
+    for hand, board in cases:
+        t0 = time.perf_counter()
+        moves = list(legal_moves(hand, board))
+        t1 = time.perf_counter()
+        next(legal_moves(hand, board), None)
+        t2 = time.perf_counter()
+        timings.append(t1 - t0); first_timings.append(t2 - t1); move_counts += len(moves)
+        if args.verify and {info.mask for info in moves} != brute_force(hand, board): mismatches += 1
+
+    timings.sort(); first_timings.sort()
+    p = lambda values, q: values[min(len(values) - 1, int(len(values) * q))] * 1e6
+    print(f"hands: {args.hands} x {args.hand_size} tiles, avg legal moves: {move_counts / args.hands:.1f}")
+    print(f"all moves:  mean {sum(timings) / len(timings) * 1e6:.1f} us, p50 {p(timings, 0.5):.1f} us, p99 {p(timings, 0.99):.1f} us")
+    print(f"first move: mean {sum(first_timings) / len(first_timings) * 1e6:.1f} us, p99 {p(first_timings, 0.99):.1f} us")
+    if args.verify: print(f"brute-force mismatches: {mismatches}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_lobby.py
+# 사용법: python benchmarks/bench_lobby.py --rates 5 50 500 --duration 300 --burst 1000 10000 50000 --players 60
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+from lobby import QUEUE_SIZES, Lobby, simulate_arrivals
+
+def format_waits(stats):
+    return '  '.join(f"{size}p p50/p90/p99 {s['p50'] or 0:.1f}/{s['p90'] or 0:.1f}/{s['p99'] or 0:.1f}s ({s['tables']} tables)" for size, s in stats.items())
+
+# 가상 시간 도착: 도착률별 테이블이 잡히기까지 걸린 시간과 match() 한 번의 벽시계 비용
+def bench_arrivals(rates, duration, patience, seed):
+    print(f"arrivals over {duration:.0f}s simulated, sizes 3/4/5 = 5:3:2, ratings N(1500, 300), patience {patience}s")
+    for rate in rates:
+        for name, bucket_width in (('rated', 100), ('fifo', None)):
+            r = simulate_arrivals(Lobby(bucket_width=bucket_width), rate, duration, patience=patience, seed=seed)
+            print(f"{rate:>6}/s {name:>6}: {r['arrived']} arrived, {r['abandoned']} gave up, {r['still_waiting']} waiting, "
+                  f"match {r['match_ms_mean']:.3f} ms mean / {r['match_ms_max']:.3f} ms max")
+            print(f"{'':>15}{format_waits(r['stats'])}")
+
+# 한꺼번에 몰린 대기열: 넣기/빼기 비용과 한 번의 match() 로 몇 테이블을 얼마 만에 묶는지
+def bench_burst(sizes, seed):
+    print(f"{'queued':>8} {'enqueue ns':>11} {'cancel ns':>10} {'match ms':>9} {'tables':>7} {'left':>6}")
+    for count in sizes:
+        rng = random.Random(seed)
+        lobby = Lobby()
+        players = [(i, rng.choice(QUEUE_SIZES), rng.gauss(1500, 300)) for i in range(count)]
+        start = time.perf_counter()
+        for player_id, size, rating in players: lobby.enqueue(player_id, size, rating, 0.0)
+        enqueue_ns = (time.perf_counter() - start) / count * 1e9
+        start = time.perf_counter()
+        tables = lobby.match(30.0) # 30초 기다린 뒤라 window 는 ±3 구간
+        match_ms = (time.perf_counter() - start) * 1000
+        left = list(lobby.entries)
+        start = time.perf_counter()
+        for player_id in left: lobby.cancel(player_id)
+        cancel_ns = (time.perf_counter() - start) / max(1, len(left)) * 1e9
+        print(f"{count:>8} {enqueue_ns:>11.0f} {cancel_ns:>10.0f} {match_ms:>9.2f} {len(tables):>7} {len(left):>6}")
+
+# 실제 서버: 대기열 -> match_found -> 그 방으로 재접속 -> game_started 까지 걸린 시간
+def bench_server(num_players, size):
+    import app as server
+    server.MATCH_INTERVAL = 0.1
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        queued, joined_at = [], {}
+        for i in range(num_players):
+            client = server.socketio.test_client(server.app, auth={'room': f"queue-{i}"})
+            client.emit('join_queue', {'num_players': size})
+            joined_at[i] = time.perf_counter()
+            queued.append(client)
+        found, deadline = {}, time.perf_counter() + 10
+        while len(found) < num_players - num_players % size and time.perf_counter() < deadline:
+            server.socketio.sleep(0.05)
+            for i, client in enumerate(queued):
+                for message in client.get_received():
+                    if message['name'] == 'match_found': found[i] = (message['args'][0], time.perf_counter())
+        seats, started = [], []
+        for i, (match, found_at) in found.items():
+            seat = SimClient(server.socketio, server.app, match['room'], token=match['token'])
+            seats.append((i, seat))
+        for i, seat in seats:
+            seat.drain()
+            if seat.state is not None: started.append(time.perf_counter() - joined_at[i])
+        rooms = {seat.room_id for _, seat in seats}
+        for client in queued: client.disconnect()
+        for _, seat in seats: seat.disconnect()
+        for room in list(server.rooms.rooms.values()): server.reset_game(room)
+    to_match = sorted(found_at - joined_at[i] for i, (_, found_at) in found.items())
+    print(f"server: {num_players} players queued for {size}p -> {len(found)} matched into {len(rooms)} rooms, "
+          f"{len(started)} saw game_started; join->match p50 {to_match[len(to_match) // 2] * 1000:.0f} ms, "
+          f"max {to_match[-1] * 1000:.0f} ms (match interval {server.MATCH_INTERVAL * 1000:.0f} ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description='매치메이킹 대기열 벤치마크')
+    parser.add_argument('--rates', type=float, nargs='+', default=[5, 50, 500], help='초당 도착하는 플레이어 수')
+    parser.add_argument('--duration', type=float, default=300, help='시뮬레이션할 가상 시간(초)')
+    parser.add_argument('--patience', type=float, default=120, help='이만큼 기다리면 대기열을 떠난다(초)')
+    parser.add_argument('--burst', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--players', type=int, default=60, help='서버 통합 측정에 쓸 플레이어 수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    bench_arrivals(args.rates, args.duration, args.patience, args.seed)
+    bench_burst(args.burst, args.seed)
+    bench_server(args.players, 3)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_metrics.py
+# 사용법: python benchmarks/bench_metrics.py --tables 50 --turns 60 --repeat 3
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+import app as server
+from metrics import metrics
+
+def percentile(values, p):
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def run(num_tables, num_players, turns, tag):
+    tables = []
+    for t in range(num_tables):
+        room_id = f"metrics-{tag}-{t}"
+        host = SimClient(server.socketio, server.app, room_id)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        tables.append([host] + [SimClient(server.socketio, server.app, room_id) for _ in range(num_players - 1)])
+        for client in tables[-1]: client.drain()
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(turns):
+        for seats in tables:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            t0 = time.perf_counter()
+            actor.act()
+            latencies.append(time.perf_counter() - t0)
+            for client in seats: client.drain()
+    elapsed = time.perf_counter() - start
+    for seats in tables:
+        for client in seats: client.disconnect()
+    for room in list(server.rooms.rooms.values()): server.reset_game(room)
+    return len(latencies) / elapsed, latencies
+
+def main():
+    parser = argparse.ArgumentParser(description='계측 켜고/끄고 핸들러 오버헤드 비교')
+    parser.add_argument('--tables', type=int, default=50)
+    parser.add_argument('--players', type=int, default=3)
+    parser.add_argument('--turns', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    results = {False: [], True: []}
+    for i in range(args.repeat):
+        for enabled in (False, True):
+            random.seed(args.seed)
+            metrics.enabled = enabled
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                results[enabled].append(run(args.tables, args.players, args.turns, tag=f"{i}-{enabled}"))
+    print(f"{'metrics':>8} {'actions/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for enabled in (False, True):
+        rate = sorted(r[0] for r in results[enabled])[len(results[enabled]) // 2]
+        latencies = [l for r in results[enabled] for l in r[1]]
+        print(f"{'on' if enabled else 'off':>8} {rate:>10.0f} {percentile(latencies, 50) * 1000:>8.3f} {percentile(latencies, 99) * 1000:>8.3f}")
+
+    # 스크레이프 비용과 기록된 내용
+    with server.app.test_client() as http:
+        t0 = time.perf_counter()
+        body = http.get('/metrics').get_data(as_text=True)
+        scrape_ms = (time.perf_counter() - t0) * 1000
+        traces = http.get('/metrics/traces').get_json()
+    handled = sum(sum(counts) for counts in metrics.handler_seconds.counts.values())
+    print(f"/metrics: {len(body.splitlines())} lines, {len(body)} bytes, {scrape_ms:.2f} ms; "
+          f"{handled} handler calls timed, {metrics.turns} turns counted, {len(traces)} traces kept")
+
+if __name__ == '__main__':
+    main()
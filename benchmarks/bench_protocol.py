@@ -0,0 +1,92 @@
+# benchmarks/bench_protocol.py
+# 사용법: python benchmarks/bench_protocol.py --tables 20 --turns 60
+import argparse
+import contextlib
+import json
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+from app import app, socketio, rooms
+from game_room import combo_info_to_dict
+
+# 예전 broadcast_game_state: 모든 플레이어의 패를 담은 전체 상태를 모든 소켓에 보냈다
+def legacy_full_state(room):
+    game_state = room.game_state
+    state = game_state.copy()
+    state['player_hands'] = [[tile.to_dict() for tile in hand] for hand in game_state['player_hands']]
+    state['last_played_tiles'] = [tile.to_dict() for tile in game_state['last_played_tiles']]
+    state['player_money'] = room.player_money
+    state['last_played_hand_info'] = combo_info_to_dict(game_state['last_played_hand_info'])
+    return state
+
+def timed_encode(build):
+    t0 = time.perf_counter()
+    encoded = json.dumps(build())
+    return len(encoded.encode()), time.perf_counter() - t0
+
+def run(num_tables, num_players, turns):
+    totals = {name: [0, 0.0] for name in ('full', 'delta', 'snapshot_full', 'snapshot_views')}
+    samples, mismatches = 0, 0
+    tables = []
+    for t in range(num_tables):
+        room_id = f"proto-{t}"
+        host = SimClient(socketio, app, room_id)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        seats = [host] + [SimClient(socketio, app, room_id) for _ in range(num_players - 1)]
+        for client in seats: client.drain()
+        tables.append((rooms.get(room_id), seats))
+
+    def add(name, sockets, size, elapsed):
+        totals[name][0] += sockets * size; totals[name][1] += elapsed
+
+    for _ in range(turns):
+        for room, seats in tables:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            actor.act()
+            for client in seats: client.drain()
+            patch = seats[0].last_patch
+            if patch is None or patch['v'] != room.version: continue
+            samples += 1
+
+            # 액션 한 번: 예전엔 전체 상태를 N개 소켓에, 지금은 패치 하나를 N개 소켓에
+            size, elapsed = timed_encode(lambda: legacy_full_state(room)); add('full', num_players, size, elapsed)
+            size, elapsed = timed_encode(lambda: patch); add('delta', num_players, size, elapsed)
+            # 라운드 시작/재동기화: 예전 전체 상태 vs 공개 상태 한 번 + 자리별 패
+            size, elapsed = timed_encode(lambda: legacy_full_state(room)); add('snapshot_full', num_players, size, elapsed)
+            size, elapsed = timed_encode(room.public_state); add('snapshot_views', num_players, size, elapsed)
+            for seat in range(num_players):
+                size, elapsed = timed_encode(lambda: room.private_hand(seat)); add('snapshot_views', 1, size, elapsed)
+
+            public_view = json.loads(json.dumps(room.public_state()))
+            for client in seats:
+                if json.loads(json.dumps(client.state)) != public_view or client.hand != room.private_hand(client.player_num)['hand']:
+                    mismatches += 1
+
+    for room, seats in tables:
+        for client in seats: client.disconnect()
+    return samples, totals, mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description='전체 상태 vs 델타 패치 / 자리별 뷰 프로토콜 비교')
+    parser.add_argument('--tables', type=int, default=20)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--turns', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        samples, totals, mismatches = run(args.tables, args.players, args.turns)
+    if not samples: return print("no samples")
+    print(f"events: {samples}  client/server state mismatches: {mismatches}")
+    print(f"{'mode':>15} {'bytes/event':>12} {'encode us':>10}   (bytes summed over all {args.players} sockets)")
+    for name, (total_bytes, total_time) in totals.items():
+        print(f"{name:>15} {total_bytes / samples:>12.0f} {total_time / samples * 1e6:>10.1f}")
+    print(f"action ratio: {totals['full'][0] / totals['delta'][0]:.1f}x bytes, {totals['full'][1] / totals['delta'][1]:.1f}x encode time")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_ratings.py
+# 사용법: python benchmarks/bench_ratings.py --players 1000000 --games 20000 --queries 2000
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+from ratings import Leaderboard, Ratings
+
+# 플레이어 N명(레이팅 N(1500, 300))이 들어 있는 레이팅 저장소에서
+#  - 시작할 때 SQLite 에서 메모리 순위표를 채우는 시간
+#  - 게임 결과 반영(다인전 Elo + 순위표 갱신) 처리량과, 쌓인 갱신을 SQLite 에 쓰는 시간
+#  - 순위표 질의(내 순위, 상위 100명, 내 주변 ±10명)를 메모리 순위표와 SQLite rating 색인으로 각각 잰다
+# 메모리 순위표의 답이 SQL 과 같은지도 확인한다.
+def timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    return (time.perf_counter() - start) / len(items), results
+
+def main():
+    parser = argparse.ArgumentParser(description='레이팅 갱신/순위 질의 처리량 벤치마크')
+    parser.add_argument('--players', type=int, default=1000000)
+    parser.add_argument('--games', type=int, default=20000, help='반영할 게임 수 (3~5인 무작위)')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    path = os.path.join(tempfile.mkdtemp(prefix='lexio-ratings-'), 'ratings.db')
+    players = [f"{i:016x}" for i in range(args.players)]
+    seeded = Ratings(path)
+    start = time.perf_counter()
+    seeded.conn.execute('BEGIN')
+    seeded.conn.executemany('INSERT INTO ratings VALUES (?, ?, ?, 0)', ((p, rng.gauss(1500, 300), rng.randint(1, 200)) for p in players))
+    seeded.conn.execute('COMMIT')
+    seeded.close()
+    print(f"{args.players} players written to SQLite in {time.perf_counter() - start:.1f}s ({os.path.getsize(path) / 2 ** 20:.0f} MB)")
+
+    start = time.perf_counter()
+    ratings = Ratings(path)
+    print(f"startup: load + build in-memory leaderboard {time.perf_counter() - start:.2f}s")
+
+    games = [rng.sample(players, rng.choice((3, 4, 5))) for _ in range(args.games)]
+    start = time.perf_counter()
+    for table in games: ratings.record([(player, rng.randint(-10, 120)) for player in table])
+    update = time.perf_counter() - start
+    batch = ratings.take_pending()
+    start = time.perf_counter()
+    ratings.write(batch)
+    write = time.perf_counter() - start
+    print(f"updates: {args.games / update:,.0f} games/s in memory ({update / args.games * 1e6:.1f} us/game); "
+          f"SQLite write of {len(batch)} changed rows {write * 1000:.0f} ms ({write / args.games * 1e6:.1f} us/game)")
+
+    sample = rng.sample(players, args.queries)
+    print(f"{'query':>24} {'leaderboard us':>15} {'sqlite index us':>16} {'speedup':>8}")
+    fast, got = timed(ratings.board.rank, sample)
+    slow, expected = timed(ratings.rank_sql, sample[:max(1, args.queries // 10)])
+    assert got[:len(expected)] == expected, "rank differs from SQL"
+    print(f"{'my rank':>24} {fast * 1e6:>15.1f} {slow * 1e6:>16.1f} {slow / fast:>7.0f}x")
+    fast, got = timed(lambda _: ratings.board.top(100), range(200))
+    slow, expected = timed(lambda _: ratings.top_sql(100), range(200))
+    assert [(p, round(r, 9)) for _, p, r in got[0]] == [(p, round(r, 9)) for _, p, r in expected[0]], "top 100 differs from SQL"
+    print(f"{'top 100':>24} {fast * 1e6:>15.1f} {slow * 1e6:>16.1f} {slow / fast:>7.1f}x")
+    fast, _ = timed(lambda player: ratings.board.near(player, 10), sample)
+    print(f"{'players near me (+-10)':>24} {fast * 1e6:>15.1f} {'-':>16}")
+    fast, _ = timed(ratings.rating, sample)
+    print(f"{'matchmaking rating read':>24} {fast * 1e6:>15.2f} {'-':>16}")
+
+    # 순위표 크기에 따른 질의 비용 (O(log n) 확인)
+    print(f"{'players':>10} {'rank us':>8} {'top100 us':>10} {'near us':>8}")
+    for size in (10 ** 4, 10 ** 5, args.players):
+        board = Leaderboard()
+        for player in players[:size]: board.set(player, ratings.rating(player))
+        ids = rng.sample(players[:size], min(size, args.queries))
+        rank, _ = timed(board.rank, ids)
+        top, _ = timed(lambda _: board.top(100), range(100))
+        near, _ = timed(lambda player: board.near(player, 10), ids)
+        print(f"{size:>10} {rank * 1e6:>8.1f} {top * 1e6:>10.1f} {near * 1e6:>8.1f}")
+    ratings.close()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix): os.remove(path + suffix)
+    os.rmdir(os.path.dirname(path))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_render.py
+# 사용법: python benchmarks/bench_render.py --turns 300 [--players 4] [--atlas]   (node 필요)
+import argparse
+import contextlib
+import json
+import os
+import random
+import subprocess
+import tempfile
+
+from sim_client import SimClient
+
+import app as server
+
+# 실제 게임에서 한 자리(P1)가 받은 이벤트를 서버 액션 단위로 모아 두고, 브라우저 없이 node 에서 main.js 에 그대로 흘려
+# 업데이트 한 번마다 DOM 을 몇 번 고치는지 센다 (benchmarks/render_harness.js).
+#  before: 예전처럼 매번 innerHTML 을 비우고 손패/판/상태표/로그를 전부 새로 만든다
+#  after:  키 기반으로 바뀐 노드만 고치고 requestAnimationFrame 으로 한 프레임에 한 번 그린다
+# 마지막 화면(손패, 판, 상태표, 로그, 버튼)이 두 방식에서 같은지도 확인한다.
+HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'render_harness.js')
+
+class RecordingClient:
+    def __init__(self, client):
+        self.client, self.batches = client, []
+
+    def get_received(self):
+        messages = self.client.get_received()
+        # SimClient 가 받은 상태를 고쳐 쓰므로 받은 그대로 복사해 둔다
+        if messages: self.batches.append(json.loads(json.dumps([[m['name'], m['args'][0] if m['args'] else None] for m in messages])))
+        return messages
+
+    def __getattr__(self, name): return getattr(self.client, name)
+
+def record_game(num_players, turns):
+    room_id = 'render-bench'
+    watched = SimClient(server.socketio, server.app, room_id, client=RecordingClient(server.socketio.test_client(server.app, auth={'room': room_id})))
+    watched.client.emit('request_start_game', {'num_players': num_players})
+    seats = [watched] + [SimClient(server.socketio, server.app, room_id) for _ in range(num_players - 1)]
+    for client in seats: client.drain()
+    for _ in range(turns):
+        actor = next((c for c in seats if c.is_my_turn()), None)
+        if actor is None or any(c.game_over for c in seats): break
+        actor.act()
+        for client in seats: client.drain()
+    for client in seats: client.disconnect()
+    return watched.client.batches
+
+def run_harness(events_path, mode):
+    output = subprocess.run(['node', HARNESS, events_path, mode], check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description='main.js 렌더링: 전체 다시 그리기 vs 키 기반 부분 갱신 DOM 변경 수 비교')
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--turns', type=int, default=300)
+    parser.add_argument('--atlas', action='store_true', help='타일 스프라이트(static/dist)가 있는 경우로 잰다')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        batches = record_game(args.players, args.turns)
+    atlas = server.assets.atlas if args.atlas else None
+    with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+        json.dump({'batches': batches, 'atlas': atlas}, f)
+    try: results = [run_harness(f.name, mode) for mode in ('before', 'after')]
+    finally: os.remove(f.name)
+
+    print(f"{results[0]['events']} events, {results[0]['updates']} game_update frames seen by P1")
+    print(f"{'renderer':>9} {'mutations/update':>17} {'p50':>5} {'max':>5} {'nodes created/update':>21} {'total ms':>9}")
+    for r in results:
+        print(f"{r['mode']:>9} {r['mutations_per_update']:>17.1f} {r['p50']:>5} {r['max']:>5} {r['created_per_update']:>21.1f} {r['ms']:>9.1f}")
+    before, after = results
+    print(f"mutations {before['mutations'] / max(after['mutations'], 1):.1f}x fewer, nodes created {before['created'] / max(after['created'], 1):.1f}x fewer")
+    if before['screen'] != after['screen']:
+        for key in before['screen']:
+            if before['screen'][key] != after['screen'][key]: print(f"  {key}: {before['screen'][key]} != {after['screen'][key]}")
+        raise SystemExit("renderers disagree on the final screen")
+
+if __name__ == '__main__':
+    main()
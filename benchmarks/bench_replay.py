@@ -0,0 +1,100 @@
+# benchmarks/bench_replay.py
+# 사용법: python benchmarks/bench_replay.py --games 300 --scale 200000 --export 2000
+import argparse
+import json
+import os
+import resource
+import tempfile
+import time
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+import simulate
+from replay import MAGIC, ReplayReader, iter_round_rows, resimulate, to_dataframe, win_rate_by_twos
+
+def max_rss_mb(): return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+# 같은 게임을 persistence.py 의 JSON 이벤트로 쓰면 몇 바이트인지 (비교용)
+def json_bytes(game):
+    total = 0
+    for replay_round in game.rounds():
+        total += len(json.dumps({'hands': list(replay_round.hands), 'start': replay_round.start, 'is_first': False}))
+        for seat, mask in replay_round.actions():
+            total += len(json.dumps({'seat': seat, 'mask': mask} if mask else {'seat': seat}))
+        total += len(json.dumps({'winner': replay_round.winner}))
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description='리플레이 기록/읽기 벤치마크')
+    parser.add_argument('--games', type=int, default=300, help='엔진으로 실제로 돌려 기록할 게임 수')
+    parser.add_argument('--players', type=int, default=3)
+    parser.add_argument('--scale', type=int, default=200000, help='기록을 이어 붙여 이만큼의 게임으로 늘린 파일을 읽는다')
+    parser.add_argument('--export', type=int, default=2000, help='pandas 로 내보낼 게임 수')
+    parser.add_argument('--resimulate', type=int, default=300, help='엔진으로 다시 돌려 검증할 게임 수')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='lexio-replay-')
+    path = os.path.join(workdir, 'games.lxr')
+
+    # 기록 비용: 같은 시드로 기록 없이/기록하며 돌린다
+    start = time.perf_counter()
+    simulate.run(args.games, args.players, workers=1, seed=1)
+    plain = time.perf_counter() - start
+    start = time.perf_counter()
+    simulate.run(args.games, args.players, workers=1, seed=1, record=path)
+    recorded = time.perf_counter() - start
+    with ReplayReader(path) as reader:
+        games = list(reader)
+        rounds = sum(game.num_rounds for game in games)
+        actions = sum(1 for game in games for replay_round in game.rounds() for _ in replay_round.actions())
+        action_bytes = sum(r.actions_end - r.actions_offset for game in games for r in game.rounds())
+        size = len(reader.data)
+        json_size = sum(json_bytes(game) for game in games)
+    print(f"record: {args.games} games, {rounds} rounds, {actions} actions; engine {plain:.2f}s -> {recorded:.2f}s with recording "
+          f"({(recorded / plain - 1) * 100:+.1f}%)")
+    print(f"size: {size} bytes = {size / args.games:.0f} B/game, {size / rounds:.1f} B/round, {action_bytes / actions:.2f} B/action "
+          f"(JSON events: {json_size} bytes, {json_size / size:.1f}x larger)")
+
+    # 파일을 늘려서 읽기: 게임 레코드를 그대로 반복해 붙인다
+    with open(path, 'rb') as f: body = f.read()[len(MAGIC):]
+    big = os.path.join(workdir, 'big.lxr')
+    copies = max(1, args.scale // args.games)
+    with open(big, 'wb') as f:
+        f.write(MAGIC)
+        for _ in range(copies): f.write(body)
+    rss_before = max_rss_mb()
+    with ReplayReader(big) as reader:
+        start = time.perf_counter()
+        total_games = len(reader)
+        scan = time.perf_counter() - start
+        total_rounds = rounds * copies
+        start = time.perf_counter()
+        rates = win_rate_by_twos(reader)
+        analysis = time.perf_counter() - start
+        print(f"read: {total_games} games / {total_rounds} rounds, {os.path.getsize(big) / 2 ** 20:.0f} MB mmap'd; "
+              f"index scan {scan:.2f}s ({total_games / scan:.0f} games/s)")
+        print(f"win rate by twos dealt (streaming, hands + winner only): {analysis:.2f}s ({total_rounds / analysis:.0f} rounds/s), "
+              f"max RSS {rss_before:.0f} -> {max_rss_mb():.0f} MB")
+        print('  ' + ', '.join(f"{twos}: {rate * 100:.1f}% of {count}" for twos, (rate, count) in rates.items()))
+
+        sample = min(args.export, total_games)
+        start = time.perf_counter()
+        rows = sum(1 for _ in iter_round_rows(reader, sample))
+        decode = time.perf_counter() - start
+        start = time.perf_counter()
+        frame = to_dataframe(reader, sample)
+        export = time.perf_counter() - start
+        print(f"rows with action decode: {rows} rows in {decode:.2f}s ({rows / decode:.0f} rows/s); "
+              f"pandas export {export:.2f}s, {frame.memory_usage(deep=True).sum() / 2 ** 20:.1f} MB")
+
+        sample = min(args.resimulate, total_games)
+        start = time.perf_counter()
+        for i in range(sample): resimulate(reader.game(i))
+        check = time.perf_counter() - start
+        print(f"resimulate: {sample} games replayed through the engine with rule checks in {check:.2f}s ({sample / check:.0f} games/s), all matched")
+    os.remove(big)
+    os.remove(path)
+    os.rmdir(workdir)
+
+if __name__ == '__main__':
+    main()
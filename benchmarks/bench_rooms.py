@@ -0,0 +1,71 @@
+# benchmarks/bench_rooms.py
+# 사용법: python benchmarks/bench_rooms.py --tables 1 10 100 200 --turns 40
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+from app import app, socketio, rooms
+
+def percentile(values, p):
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+def open_tables(num_tables, num_players, tag):
+    tables = []
+    for t in range(num_tables):
+        room_id = f"bench-{tag}-{t}"
+        host = SimClient(socketio, app, room_id)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        seats = [host] + [SimClient(socketio, app, room_id) for _ in range(num_players - 1)]
+        for client in seats: client.drain()
+        tables.append(seats)
+    return tables
+
+def run(num_tables, num_players, turns, tag):
+    tables = open_tables(num_tables, num_players, tag)
+    latencies, handled = [], 0
+    start = time.perf_counter()
+    for _ in range(turns):
+        for seats in tables:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            t0 = time.perf_counter()
+            actor.act()
+            latencies.append(time.perf_counter() - t0)
+            handled += 1
+            for client in seats: client.drain()
+    elapsed = time.perf_counter() - start
+    delivered = sum(c.events for seats in tables for c in seats)
+    active_rooms = len(rooms)
+    for seats in tables:
+        for client in seats: client.disconnect()
+    return {
+        'tables': num_tables, 'active_rooms': active_rooms, 'handled': handled,
+        'events_per_sec': handled / elapsed if elapsed else 0.0,
+        'delivered_per_sec': delivered / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000, 'p99_ms': percentile(latencies, 99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='N개의 테이블을 동시에 돌리는 부하 벤치마크')
+    parser.add_argument('--tables', type=int, nargs='+', default=[1, 10, 50, 100, 200])
+    parser.add_argument('--players', type=int, default=3)
+    parser.add_argument('--turns', type=int, default=40)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    print(f"{'tables':>7} {'rooms':>6} {'actions':>8} {'actions/s':>10} {'emits/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in args.tables:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            result = run(n, args.players, args.turns, tag=n)
+        print(f"{result['tables']:>7} {result['active_rooms']:>6} {result['handled']:>8} {result['events_per_sec']:>10.0f} "
+              f"{result['delivered_per_sec']:>10.0f} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_rules.py
+# 사용법: python benchmarks/bench_rules.py --samples 200000
+import argparse
+import functools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_logic
+from game_logic import TILES, Tile, classify_mask, combination_ranking, get_combination_info, is_stronger_combination, tiles_to_mask
+
+# 비트마스크 도입 전의 Tile 비교와 is_stronger_combination (비교용)
+@functools.total_ordering
+class LegacyTile:
+    suit_power, rank_strength = Tile.suit_power, Tile.rank_strength
+    def __init__(self, suit, rank): self.suit, self.rank = suit, rank
+    def __eq__(self, other): return self.rank == other.rank and self.suit == other.suit
+    def __gt__(self, other):
+        if self.rank_strength[self.rank] != self.rank_strength[other.rank]: return self.rank_strength[self.rank] > self.rank_strength[other.rank]
+        return self.suit_power[self.suit] > self.suit_power[other.suit]
+
+def legacy_is_stronger_combination(new_combo_info, last_combo_info):
+    if last_combo_info[0] is None: return True
+    new_name, last_name = new_combo_info[0], last_combo_info[0]
+    new_tile, last_tile = new_combo_info[1], last_combo_info[1]
+    if new_name == '플러쉬' and last_name == '플러쉬':
+        for i in range(5):
+            new_card_strength = Tile.rank_strength[new_tile[i].rank]
+            last_card_strength = Tile.rank_strength[last_tile[i].rank]
+            if new_card_strength > last_card_strength: return True
+            if new_card_strength < last_card_strength: return False
+        return Tile.suit_power[new_tile[0].suit] > Tile.suit_power[last_tile[0].suit]
+    new_rank, last_rank = combination_ranking.get(new_name, 0), combination_ranking.get(last_name, 0)
+    if new_rank > last_rank: return True
+    if new_rank == last_rank and not isinstance(new_tile, tuple): return new_tile > last_tile
+    return False
+
+def rate(fn, items):
+    start = time.perf_counter()
+    for item in items: fn(item)
+    elapsed = time.perf_counter() - start
+    return len(items) / elapsed if elapsed else float('inf')
+
+def main():
+    parser = argparse.ArgumentParser(description='조합 판정/비교 마이크로벤치마크')
+    parser.add_argument('--samples', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    table = game_logic.combination_table()
+    print(f"table build: {len(table)} combinations in {time.perf_counter() - start:.2f}s")
+
+    # 실제 제출과 비슷하게 1/2/3/5장을 섞되, 절반은 유효한 조합으로 채운다
+    valid = list(table.values())
+    hands = []
+    for _ in range(args.samples):
+        if rng.random() < 0.5: hands.append(game_logic.mask_to_tiles(rng.choice(valid).mask))
+        else: hands.append(rng.sample(TILES, rng.choice((1, 2, 3, 5))))
+    masks = [tiles_to_mask(hand) for hand in hands]
+
+    print(f"{'benchmark':>34} {'ops/sec':>12}")
+    results = [
+        ('classify: reference (before)', rate(game_logic._classify_reference, hands)),
+        ('classify: get_combination_info', rate(get_combination_info, hands)),
+        ('classify: classify_mask', rate(classify_mask, masks)),
+    ]
+    # 두 구현 모두 같은 ComboInfo 객체 풀에서 비교한다 (한 테이블에 실제로 오가는 조합 수 정도)
+    pool = rng.sample(valid, 2000)
+    pairs = [(rng.choice(pool), rng.choice(pool)) for _ in range(args.samples)]
+    results += [
+        ('is_stronger: legacy (before)', rate(lambda p: legacy_is_stronger_combination(*p), pairs)),
+        ('is_stronger: key compare', rate(lambda p: is_stronger_combination(*p), pairs)),
+    ]
+    legacy_tiles = [(LegacyTile(a.suit, a.rank), LegacyTile(b.suit, b.rank)) for a, b in (rng.sample(TILES, 2) for _ in range(args.samples))]
+    new_tiles = [(TILES[rng.randrange(60)], TILES[rng.randrange(60)]) for _ in range(args.samples)]
+    results += [
+        ('Tile >: total_ordering (before)', rate(lambda p: p[0] > p[1], legacy_tiles)),
+        ('Tile >: id compare', rate(lambda p: p[0] > p[1], new_tiles)),
+    ]
+    for name, ops in results: print(f"{name:>34} {ops:>12,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_settlement.py
+# 사용법: python benchmarks/bench_settlement.py --rounds 1000000 --players 4
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_settlement import bankruptcy_round_distribution, final_money, gini, money_deltas, money_history, payment_matrices, settle_rounds
+from game_logic import settle_round
+
+def random_rounds(rng, num_rounds, num_players, tiles):
+    counts = rng.integers(1, tiles + 1, size=(num_rounds, num_players), dtype=np.int16)
+    winners = rng.integers(0, num_players, size=num_rounds)
+    counts[np.arange(num_rounds), winners] = 0
+    holds_two = (rng.random((num_rounds, num_players)) < 0.2) & (counts > 0)
+    return counts, holds_two, winners
+
+def scalar_deltas(counts, holds_two, winners):
+    deltas = np.zeros(counts.shape, dtype=np.int32)
+    for g in range(len(counts)):
+        for payer, payee, amount in settle_round(counts[g].tolist(), holds_two[g].tolist(), int(winners[g])):
+            deltas[g, payee] += amount
+            deltas[g, payer] -= amount
+    return deltas
+
+def main():
+    parser = argparse.ArgumentParser(description='NumPy 일괄 정산 vs 파이썬 정산')
+    parser.add_argument('--rounds', type=int, default=1000000)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--scalar-rounds', type=int, default=50000, help='파이썬 정산으로 잴 라운드 수 (외삽)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    counts, holds_two, winners = random_rounds(rng, args.rounds, args.players, 13)
+    money = np.full((args.rounds, args.players), 48, dtype=np.int32)
+
+    start = time.perf_counter()
+    settled, game_over = settle_rounds(money, counts, holds_two, winners)
+    vector_time = time.perf_counter() - start
+
+    n = min(args.scalar_rounds, args.rounds)
+    start = time.perf_counter()
+    expected = scalar_deltas(counts[:n], holds_two[:n], winners[:n])
+    scalar_time = (time.perf_counter() - start) * args.rounds / n
+    mismatches = int((settled[:n] - money[:n] != expected).any(axis=1).sum())
+    payments = payment_matrices(counts[:n], holds_two[:n], winners[:n])
+    mismatches += int((payments.sum(axis=1, dtype=np.int32) - payments.sum(axis=2, dtype=np.int32) != expected).any(axis=1).sum())
+
+    print(f"settle {args.rounds:,} rounds x {args.players} players")
+    print(f"  numpy:  {vector_time:.3f}s ({args.rounds / vector_time:,.0f} rounds/s)")
+    print(f"  python: {scalar_time:.3f}s (extrapolated from {n:,} rounds), mismatches: {mismatches}")
+
+    # 1만 게임 x 200 라운드 세션의 파산 라운드 분포와 지니 계수
+    games, rounds = 10000, 200
+    counts, holds_two, winners = random_rounds(rng, games * rounds, args.players, 13)
+    start = time.perf_counter()
+    deltas = money_deltas(counts, holds_two, winners).reshape(games, rounds, args.players)
+    history = money_history(48, deltas)
+    distribution = bankruptcy_round_distribution(history)
+    final_gini = gini(final_money(history))
+    stats_time = time.perf_counter() - start
+    observed = np.nonzero(distribution[1:])[0] + 1
+    print(f"session stats for {games:,} games x {rounds} rounds: {stats_time:.3f}s")
+    print(f"  bankrupt by round {rounds}: {distribution[1:].sum() / games * 100:.1f}%, "
+          f"median bankruptcy round {int(np.median(np.repeat(np.arange(len(distribution)), distribution)[distribution[0]:]))}, "
+          f"range {observed.min()}-{observed.max()}")
+    print(f"  mean gini of final money: {final_gini.mean():.3f}")
+
+if __name__ == '__main__':
+    main()
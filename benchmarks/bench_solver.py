@@ -0,0 +1,126 @@
+# benchmarks/bench_solver.py
+# 사용법: python benchmarks/bench_solver.py --positions 20 --remaining 8,12,16,20 --time-limit 1.0 --rounds 100
+import argparse
+import random
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+from bots import HeuristicBot, MonteCarloBot
+from engine import Game
+from game_logic import combination_table, legal_moves
+from solver import PASS, EndgameSolver, settlement
+
+# 3~5인 판을 HeuristicBot 끼리 남은 장 수 합이 remaining 이 될 때까지 둔 국면(손패는 모두 공개)에서
+#  1) 작은 국면은 전치표/가지치기 없는 완전 탐색과 값이 같은지, 정산이 engine.Game.settle 과 같은지 확인한다
+#  2) 남은 장 수별로 풀이 시간, 시간 제한 안에 끝까지 읽은 비율, 노드 수, 전치표 적중률
+#  3) 사후 분석: 지금 차례인 사람이 HeuristicBot 의 수 대신 최선 수를 뒀으면 이길 수 있었던(손익이 나아진) 국면의 비율
+#  4) MonteCarloBot 이 끝내기를 풀 때와 롤아웃만 할 때의 한 라운드 평균 수익
+def percentile(values, q): return sorted(values)[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+def position(num_players, remaining, rng):
+    game = Game(num_players, random.Random(rng.random()), starting_money=10 ** 6)
+    game.deal()
+    bot = HeuristicBot()
+    while sum(game.hand_counts()) > remaining:
+        move = bot.choose(game, game.current)
+        if move is None: game.pass_turn()
+        elif game.play(move): return None # 그 전에 라운드가 끝났다
+    return game
+
+def positions(count, remaining, rng, num_players=None):
+    result = []
+    while len(result) < count:
+        game = position(num_players or rng.choice((3, 4, 5)), remaining, rng)
+        if game is not None: result.append(game)
+    return result
+
+# engine.Game 으로 한 수씩 두는 완전 탐색 (root 는 최대, 나머지는 최소)
+def minimax(game, root):
+    seat = game.current
+    options = list(legal_moves(game.hands[seat], game.last_combo))
+    if game.last_combo[0] is not None: options.append(None)
+    values = []
+    for option in options:
+        sim = game.clone()
+        if option is None:
+            sim.pass_turn()
+            values.append(minimax(sim, root))
+        elif sim.play(option):
+            before = sim.money[root]
+            sim.settle(seat)
+            values.append(sim.money[root] - before)
+        else: values.append(minimax(sim, root))
+    return max(values) if seat == root else min(values)
+
+def check(count, rng):
+    checked = 0
+    while checked < count:
+        game = position(rng.choice((3, 4, 5)), rng.choice((6, 8, 10)), rng)
+        if game is None: continue
+        solution = EndgameSolver(game.num_players).solve(game, time_limit=60)
+        expected = minimax(game.clone(), game.current)
+        assert solution.exact and solution.value == expected, f"solver {solution} != minimax {expected}"
+        for winner in range(game.num_players):
+            sim = game.clone()
+            sim.hands[winner] = 0
+            before = list(sim.money)
+            sim.settle(winner)
+            assert all(settlement(sim.hands, seat, winner) == sim.money[seat] - before[seat] for seat in range(game.num_players)), "settlement differs from engine"
+        checked += 1
+    print(f"check: {checked} positions with 6-10 tiles left agree with exhaustive minimax and engine settlement")
+
+def bench_timing(remaining_list, count, time_limit, rng):
+    print(f"{'tiles':>5} {'players':>7} {'p50 ms':>8} {'p90 ms':>8} {'max ms':>8} {'exact':>6} {'nodes p50':>10} {'tt hits':>8} {'us/node':>8}")
+    for remaining in remaining_list:
+        for num_players in (3, 4, 5):
+            times, exact, nodes = [], 0, []
+            solver = EndgameSolver(num_players)
+            for game in positions(count, remaining, rng, num_players):
+                solver.table.clear()
+                solution = solver.solve(game, time_limit=time_limit)
+                times.append(solution.elapsed)
+                exact += solution.exact
+                nodes.append(solution.nodes)
+            stats = solver.stats
+            print(f"{remaining:>5} {num_players:>7} {percentile(times, 0.5) * 1e3:>8.1f} {percentile(times, 0.9) * 1e3:>8.1f} {max(times) * 1e3:>8.1f} "
+                  f"{exact:>3}/{count:<2} {percentile(nodes, 0.5):>10} {stats['tt_hits'] / max(1, stats['nodes']):>8.1%} {stats['time'] / max(1, stats['nodes']) * 1e6:>8.1f}")
+
+def bench_review(remaining, count, rng):
+    missed, solved, bot = 0, 0, HeuristicBot()
+    for game in positions(count, remaining, rng):
+        solution = EndgameSolver(game.num_players).solve(game, time_limit=10, all_moves=True)
+        if not solution.exact: continue
+        solved += 1
+        played = bot.choose(game, game.current)
+        if solution.values[PASS if played is None else played.mask] < solution.value: missed += 1
+    print(f"review: heuristic move was worse than the best move in {missed}/{solved} solved positions with {remaining} tiles left")
+
+def bench_strength(rounds, budget, endgame_tiles, seed):
+    for label, tiles in (('rollouts only', 0), (f"solve <= {endgame_tiles} tiles", endgame_tiles)):
+        game = Game(3, random.Random(seed), starting_money=10 ** 6)
+        bot = MonteCarloBot(budget, rng=random.Random(seed), endgame_tiles=tiles)
+        policies = [bot, HeuristicBot(), HeuristicBot()]
+        for _ in range(rounds): game.play_round(policies)
+        print(f"strength: P1 montecarlo ({label:>18}) vs 2x heuristic over {rounds} rounds: "
+              f"P1 money/round {(game.money[0] - 10 ** 6) / rounds:+.2f}, {bot.stats['endgames']} endgame moves")
+
+def main():
+    parser = argparse.ArgumentParser(description='끝내기 풀이 정확성/속도 벤치마크')
+    parser.add_argument('--positions', type=int, default=20, help='남은 장 수 x 인원수마다 풀 국면 수')
+    parser.add_argument('--remaining', default='8,12,16,20', help='모두의 남은 장 수 합 (쉼표로 구분)')
+    parser.add_argument('--time-limit', type=float, default=1.0, help='국면 하나의 시간 제한 (초)')
+    parser.add_argument('--checks', type=int, default=40)
+    parser.add_argument('--rounds', type=int, default=100, help='강도 비교 라운드 수 (0 이면 건너뛴다)')
+    parser.add_argument('--budget', type=float, default=0.05)
+    parser.add_argument('--endgame-tiles', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    combination_table()
+    rng = random.Random(args.seed)
+    check(args.checks, rng)
+    bench_timing([int(value) for value in args.remaining.split(',')], args.positions, args.time_limit, rng)
+    bench_review(12, args.positions * 3, rng)
+    if args.rounds: bench_strength(args.rounds, args.budget, args.endgame_tiles, args.seed)
+
+if __name__ == '__main__':
+    main()
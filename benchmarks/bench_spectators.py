@@ -0,0 +1,87 @@
+# benchmarks/bench_spectators.py
+# 사용법: python benchmarks/bench_spectators.py --viewers 0 100 1000 5000 --actions 300 --per-flush 4 --slow 0.1
+import argparse
+import contextlib
+import os
+import random
+import time
+
+from sim_client import SimClient
+
+import app as server
+
+# 관전자 한 테이블 측정.
+#  feed:  ?watch=1 로 붙어 spectator_loop 가 주기마다 보내는 최신 상태만 받는다 (여기서는 per_flush 액션마다 flush 를 직접 부른다)
+#  naive: 예전처럼 플레이어 방에 들어가 모든 이벤트를 받는다
+# 실제 소켓 대신 관전자 쪽 전송은 개수만 세는 가짜 전송으로 바꾸고, slow 비율의 관전자는 두 주기에 패킷 하나만 비우는 느린 소켓으로 흉내 낸다.
+def run(mode, num_viewers, actions, per_flush, slow_fraction, seed):
+    random.seed(seed)
+    room_id = f"watch-{mode}-{num_viewers}"
+    host = SimClient(server.socketio, server.app, room_id)
+    host.client.emit('request_start_game', {'num_players': 3})
+    players = [host] + [SimClient(server.socketio, server.app, room_id) for _ in range(2)]
+    viewers = [server.socketio.test_client(server.app, auth={'room': room_id, 'watch': mode == 'feed'}) for _ in range(num_viewers)]
+    for client in players: client.drain()
+    for client in viewers: client.get_received()
+
+    viewer_ids = {client.eio_sid for client in viewers}
+    slow = set(list(viewer_ids)[:int(num_viewers * slow_fraction)])
+    pending = dict.fromkeys(slow, 0)
+    sent = {'packets': 0, 'bytes': 0, 'max_backlog': 0}
+    deliver = server.socketio.server._send_eio_packet
+    def transport(eio_sid, pkt):
+        if eio_sid not in viewer_ids: return deliver(eio_sid, pkt)
+        sent['packets'] += 1
+        sent['bytes'] += len(pkt.data)
+        if eio_sid in pending:
+            pending[eio_sid] += 1
+            sent['max_backlog'] = max(sent['max_backlog'], pending[eio_sid])
+    server.socketio.server._send_eio_packet = transport
+    backlog = server.spectators.backlog
+    server.spectators.backlog = lambda viewer: pending.get(viewer, 0)
+
+    action_cpu = flush_cpu = 0.0
+    done = flushes = 0
+    while done < actions:
+        actor = next((c for c in players if c.is_my_turn()), None)
+        if actor is None or any(c.game_over for c in players): break
+        t0 = time.process_time()
+        actor.act()
+        action_cpu += time.process_time() - t0
+        for client in players: client.drain()
+        done += 1
+        if done % per_flush == 0:
+            flushes += 1
+            if flushes % 2 == 0:
+                for eio_sid in pending: pending[eio_sid] = max(0, pending[eio_sid] - 1)
+            t0 = time.process_time()
+            server.spectators.flush()
+            flush_cpu += time.process_time() - t0
+
+    server.socketio.server._send_eio_packet = deliver
+    server.spectators.backlog = backlog
+    for client in players + viewers: client.disconnect()
+    for room in list(server.rooms.rooms.values()): server.reset_game(room)
+    return done, action_cpu, flush_cpu, sent
+
+def main():
+    parser = argparse.ArgumentParser(description='관전자 fan-out 벤치마크')
+    parser.add_argument('--viewers', type=int, nargs='+', default=[0, 100, 1000, 5000])
+    parser.add_argument('--actions', type=int, default=300)
+    parser.add_argument('--per-flush', type=int, default=4, help='flush 한 번 사이의 게임 액션 수 (0.25초에 4 액션)')
+    parser.add_argument('--slow', type=float, default=0.1, help='느린 관전자 비율')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"one table, {args.per_flush} actions per flush, {args.slow:.0%} slow viewers (drain 1 packet per 2 flushes)")
+    print(f"{'mode':>6} {'viewers':>8} {'actions':>8} {'action us':>10} {'flush us':>10} {'cpu/event us':>13} {'pkts/viewer':>12} {'KB/viewer':>10} {'max backlog':>12}")
+    for mode in ('naive', 'feed'):
+        for num_viewers in args.viewers:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                done, action_cpu, flush_cpu, sent = run(mode, num_viewers, args.actions, args.per_flush, args.slow, args.seed)
+            per_viewer = max(1, num_viewers)
+            print(f"{mode:>6} {num_viewers:>8} {done:>8} {action_cpu / done * 1e6:>10.1f} {flush_cpu / max(1, done // args.per_flush) * 1e6:>10.1f} "
+                  f"{(action_cpu + flush_cpu) / done * 1e6:>13.1f} {sent['packets'] / per_viewer:>12.1f} {sent['bytes'] / per_viewer / 1024:>10.1f} {sent['max_backlog']:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_strength_index.py
+# 사용법: python benchmarks/bench_strength_index.py --queries 2000 --samples 2000
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import sim_client # noqa: F401 (저장소 루트를 import 경로에 넣는다)
+
+import strength_index
+from game_logic import FULL_DECK_MASK, combination_table, has_legal_move, legal_moves
+
+# 색인 없이 같은 질문에 답하는 방법 (비교용)
+def count_beating(table, board): return sum(1 for info in table.values() if info.key > board.key)
+
+def strongest_by_moves(hand, board): return max(legal_moves(hand, board), key=lambda info: info.key, default=None)
+
+def probability_by_moves(board, unseen_mask, k, samples, rng):
+    unseen = [i for i in range(60) if unseen_mask >> i & 1]
+    wins = sum(has_legal_move(sum(1 << i for i in rng.sample(unseen, k)), board) for _ in range(samples))
+    return wins / samples
+
+def timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(*item) for item in items]
+    return (time.perf_counter() - start) / len(items), results
+
+# 새 프로세스에서 import + 첫 질의까지 걸리는 시간 (조합 테이블을 만드는 경우 vs 색인 파일을 mmap 하는 경우)
+def cold_start(code, env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], check=True, env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description='조합 세기 색인 질의 벤치마크')
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--probability-queries', type=int, default=30)
+    parser.add_argument('--samples', type=int, default=2000, help='이길 확률 추정에 쓰는 가상 손패 수')
+    parser.add_argument('--hand-size', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    path = os.path.join(tempfile.mkdtemp(prefix='lexio-index-'), 'combinations.idx')
+    start = time.perf_counter()
+    strength_index.build(path)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    index = strength_index.StrengthIndex(path)
+    opened = time.perf_counter() - start
+    env = dict(os.environ, LEXIO_COMBO_INDEX=path)
+    table_start = cold_start("import game_logic; game_logic.combination_table()", env)
+    index_start = cold_start("import strength_index; strength_index.strength_index().beats_count((None, None))", env)
+    print(f"index: {len(index)} combinations, {os.path.getsize(path) / 1024:.0f} KB; build {build:.2f}s once, open {opened * 1e6:.0f} us")
+    print(f"cold process start to first answer: combination_table {table_start:.2f}s, mmap'd index {index_start:.2f}s")
+
+    table = combination_table()
+    combos = list(table.values())
+    boards = [rng.choice(combos) for _ in range(args.queries)]
+    hands = [(sum(1 << i for i in rng.sample(range(60), args.hand_size)), board if i % 4 else (None, None)) for i, board in enumerate(boards)]
+
+    print(f"{'query':>28} {'recompute us':>13} {'index us':>10} {'speedup':>8}")
+    naive, expected = timed(lambda board: count_beating(table, board), [(b,) for b in boards[:200]])
+    fast, got = timed(index.beats_count, [(b,) for b in boards[:200]])
+    assert got == expected
+    print(f"{'combinations beating X':>28} {naive * 1e6:>13.1f} {fast * 1e6:>10.1f} {naive / fast:>7.0f}x")
+
+    naive, expected = timed(strongest_by_moves, hands)
+    fast, got = timed(index.strongest_play, hands)
+    assert [e and e.key for e in expected] == [g and g.key for g in got]
+    print(f"{'strongest play in hand':>28} {naive * 1e6:>13.1f} {fast * 1e6:>10.1f} {naive / fast:>7.1f}x")
+
+    naive, expected = timed(index.ordinal, [(b,) for b in boards])
+    print(f"{'strength ordinal':>28} {'-':>13} {naive * 1e6:>10.1f}")
+
+    cases = []
+    for hand, board in hands[:args.probability_queries]:
+        if board[0] is None: board = rng.choice(combos)
+        cases.append((board, FULL_DECK_MASK & ~hand & ~board.mask, rng.choice((3, 6, 12))))
+    naive, expected = timed(lambda board, unseen, k: probability_by_moves(board, unseen, k, args.samples, rng), cases)
+    fast, got = timed(lambda board, unseen, k: index.beat_probability(board, unseen, k, args.samples, seed=args.seed), cases)
+    error = max(abs(a - b) for a, b in zip(expected, got))
+    print(f"{'P(opponent can beat board)':>28} {naive * 1e6:>13.1f} {fast * 1e6:>10.1f} {naive / fast:>7.1f}x   "
+          f"({args.samples} sampled hands each, max difference {error * 100:.1f} points)")
+    index.close()
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/bench_timers.py
+# 사용법: python benchmarks/bench_timers.py --tables 10000 50000 100000 --rounds 20
+import argparse
+import contextlib
+import heapq
+import os
+import random
+import time
+import tracemalloc
+
+from sim_client import SimClient
+
+import eventlet
+from turn_clock import TimerWheel
+
+# 비교 대상 1: 힙 + 지연 삭제 (다시 걸 때마다 힙에 새 항목이 쌓인다)
+class HeapTimers:
+    def __init__(self): self.heap, self.live = [], {}
+    def arm(self, key, delay, value, now):
+        entry = [now + delay, key, value, True]
+        old = self.live.get(key)
+        if old is not None: old[3] = False
+        self.live[key] = entry
+        heapq.heappush(self.heap, entry)
+    def cancel(self, key):
+        old = self.live.pop(key, None)
+        if old is not None: old[3] = False
+    def advance(self, now):
+        expired, heap = [], self.heap
+        while heap and heap[0][0] <= now:
+            deadline, key, value, alive = heapq.heappop(heap)
+            if alive:
+                del self.live[key]
+                expired.append((key, value))
+        return expired
+
+# 비교 대상 2: 테이블마다 잠자는 greenlet (eventlet.spawn_after / cancel)
+class GreenletTimers:
+    def __init__(self): self.threads = {}
+    def arm(self, key, delay, value, now):
+        old = self.threads.get(key)
+        if old is not None: old.cancel()
+        self.threads[key] = eventlet.spawn_after(delay, lambda: None)
+    def cancel(self, key):
+        old = self.threads.pop(key, None)
+        if old is not None: old.cancel()
+    def advance(self, now): return []
+
+# 시뮬레이션 시간으로 돌린다: 매 틱마다 일부 테이블의 차례가 바뀌어(다시 걸기) 마감이 밀린다
+# 메모리는 tracemalloc 이 시간을 크게 부풀려서 같은 시뮬레이션을 한 번 더 돌려 따로 잰다
+def bench_scheduler(make, num_tables, rounds, tick, turn_seconds, seed, trace_memory=False):
+    rng = random.Random(seed)
+    if trace_memory: tracemalloc.start()
+    timers, now = make(), 0.0
+    t0 = time.perf_counter()
+    for table in range(num_tables): timers.arm(table, turn_seconds, table, now)
+    arm_time = time.perf_counter() - t0
+    rearms, rearm_time, advance_time, expired = 0, 0.0, 0.0, 0
+    ticks = int(rounds * turn_seconds / tick)
+    per_tick = max(1, num_tables // int(turn_seconds / tick * 2)) # 평균 턴 길이 = 제한 시간의 절반
+    for _ in range(ticks):
+        now += tick
+        keys = [rng.randrange(num_tables) for _ in range(per_tick)]
+        t0 = time.perf_counter()
+        for key in keys: timers.arm(key, turn_seconds, key, now)
+        rearm_time += time.perf_counter() - t0
+        rearms += len(keys)
+        t0 = time.perf_counter()
+        fired = timers.advance(now)
+        advance_time += time.perf_counter() - t0
+        expired += len(fired)
+        for key, _ in fired: timers.arm(key, turn_seconds, key, now) # 시간 초과로 자동 진행 -> 다음 차례
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    t0 = time.perf_counter()
+    for table in range(num_tables): timers.cancel(table)
+    cancel_time = time.perf_counter() - t0
+    return {
+        'arm_ns': arm_time / num_tables * 1e9, 'rearm_ns': rearm_time / rearms * 1e9, 'cancel_ns': cancel_time / num_tables * 1e9,
+        'tick_us': advance_time / ticks * 1e6, 'expired': expired, 'peak_mb': peak / 2 ** 20,
+    }
+
+# 마감 정확도: 가짜 시계로 돌리면서 각 타이머가 마감 이후 첫 advance 에서 (그보다 이르지도 늦지도 않게) 꺼내지는지 본다.
+# 루프가 가끔 늦게 깨어나도(여러 tick 건너뜀) 밀린 타이머를 그 자리에서 모두 꺼내야 한다.
+def check_accuracy(num_timers, tick, seed):
+    rng = random.Random(seed)
+    wheel, deadlines = TimerWheel(tick=tick), {}
+    for key in range(num_timers):
+        delay = rng.uniform(0, 200) # 휠 한 바퀴(102.4초)보다 긴 마감도 섞는다
+        wheel.arm(key, delay, None, 0.0)
+        deadlines[key] = delay
+    early = missed = fired = 0
+    late, now = [], 0.0
+    while len(wheel):
+        previous = now
+        now += tick * rng.choice((1, 1, 1, 3, 17))
+        for key, _ in wheel.advance(now):
+            fired += 1
+            if deadlines[key] > now + 1e-9: early += 1
+            elif deadlines[key] <= previous - tick: missed += 1
+            if now - previous <= tick + 1e-9: late.append(now - deadlines[key])
+    return fired, early, missed, max(late)
+
+# 실제 서버: 아무도 두지 않는 테이블들이 시간 초과만으로 진행되는지와 마감 대비 지연
+def bench_server(num_tables, turn_seconds, duration):
+    import app as server
+    server.TURN_SECONDS, server.CLOCK_TICK = turn_seconds, 0.05
+    lateness = []
+    original = server.handle_turn_timeout
+    def timed_timeout(room, seat):
+        lateness.append(time.monotonic() - room.turn_deadline)
+        original(room, seat)
+    server.handle_turn_timeout = timed_timeout
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        clients = []
+        for t in range(num_tables):
+            host = SimClient(server.socketio, server.app, f"timer-{t}")
+            host.client.emit('request_start_game', {'num_players': 3})
+            clients += [host] + [SimClient(server.socketio, server.app, f"timer-{t}") for _ in range(2)]
+        server.socketio.sleep(duration)
+        for client in clients: client.drain()
+        resyncs = sum(client.resyncs for client in clients)
+        for client in clients: client.disconnect()
+        for room in list(server.rooms.rooms.values()): server.reset_game(room)
+    server.handle_turn_timeout = original
+    lateness.sort()
+    print(f"server: {num_tables} idle tables, {turn_seconds}s turns over {duration}s -> {len(lateness)} auto actions "
+          f"({len(lateness) / num_tables:.1f}/table), late p50 {lateness[len(lateness) // 2] * 1000:.0f} ms, "
+          f"max {lateness[-1] * 1000:.0f} ms, client resyncs {resyncs}")
+
+def main():
+    parser = argparse.ArgumentParser(description='턴 타이머 휠 벤치마크')
+    parser.add_argument('--tables', type=int, nargs='+', default=[10000, 50000, 100000])
+    parser.add_argument('--rounds', type=int, default=20, help='제한 시간의 몇 배만큼 시뮬레이션할지')
+    parser.add_argument('--turn-seconds', type=float, default=30)
+    parser.add_argument('--tick', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--skip-greenlets', action='store_true', help='greenlet 비교를 건너뛴다 (느림)')
+    args = parser.parse_args()
+
+    print(f"{'timers':>9} {'tables':>8} {'arm ns':>8} {'rearm ns':>9} {'cancel ns':>10} {'tick us':>9} {'expired':>8} {'peak MB':>8}")
+    kinds = [('wheel', lambda: TimerWheel(tick=args.tick)), ('heap', HeapTimers)]
+    if not args.skip_greenlets: kinds.append(('greenlet', GreenletTimers))
+    for num_tables in args.tables:
+        for name, make in kinds:
+            r = bench_scheduler(make, num_tables, args.rounds, args.tick, args.turn_seconds, args.seed)
+            r['peak_mb'] = bench_scheduler(make, num_tables, args.rounds, args.tick, args.turn_seconds, args.seed, trace_memory=True)['peak_mb']
+            print(f"{name:>9} {num_tables:>8} {r['arm_ns']:>8.0f} {r['rearm_ns']:>9.0f} {r['cancel_ns']:>10.0f} "
+                  f"{r['tick_us']:>9.1f} {r['expired']:>8} {r['peak_mb']:>8.1f}")
+    fired, early, missed, late = check_accuracy(100000, args.tick, args.seed)
+    print(f"accuracy: {fired} timers fired, {early} early, {missed} missed a wakeup; "
+          f"on-time wakeups fire at most {late * 1000:.1f} ms after the deadline (tick {args.tick * 1000:.0f} ms)")
+    bench_server(50, 0.3, 3.0)
+
+if __name__ == '__main__':
+    main()
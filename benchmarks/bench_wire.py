@@ -0,0 +1,125 @@
+# benchmarks/bench_wire.py
+# 사용법: python benchmarks/bench_wire.py --tables 20 --turns 80 [--compact-seats 2]
+import argparse
+import contextlib
+import copy
+import gc
+import json
+import os
+import random
+import time
+import zlib
+from collections import defaultdict
+
+from sim_client import SimClient
+
+import app as server
+import wire
+from socketio import packet as sio_packet
+
+# 실제 게임에서 서버가 방으로 내보낸 이벤트를 모아, 이벤트 종류마다 JSON 과 압축 프로토콜(wire.py)의
+# 전송 크기(socket.io 패킷 그대로)와 인코딩/디코딩 시간을 비교한다.
+# 비교용으로 JSON 을 deflate 한 크기도 보여 준다 (웹소켓 permessage-deflate 를 켰을 때의 대략적인 크기).
+# 열 턴마다 마지막 자리가 재동기화를 요청해 게임 중간 스냅샷(game_snapshot)도 잰다.
+# 압축 프로토콜로 접속한 자리(--compact-seats)의 상태가 서버 공개 상태와 같은지도 확인한다.
+def socketio_packets(event, payload):
+    encoded = server.socketio.server.packet_class(sio_packet.EVENT, namespace='/', data=[event, payload]).encode()
+    return encoded if isinstance(encoded, list) else [encoded]
+
+def packet_size(packets): return sum(len(p.encode()) + 1 if isinstance(p, str) else len(p) + 1 for p in packets) # +1: engine.io 패킷 종류
+
+def deflated_size(text):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return len(compressor.compress(text.encode()) + compressor.flush())
+
+def capture():
+    events = []
+    original = server.socketio.emit
+    def emit(event, *args, to=None, **kwargs):
+        if event in wire.EVENT_CODES: events.append((event, copy.deepcopy(args[0]))) # 공개 상태는 방의 목록을 그대로 담고 있다
+        return original(event, *args, to=to, **kwargs)
+    server.socketio.emit = emit
+    return events
+
+def play(num_tables, num_players, turns, compact_seats):
+    mismatches = 0
+    tables = []
+    for t in range(num_tables):
+        room_id = f"wire-{t}"
+        host = SimClient(server.socketio, server.app, room_id, compact=compact_seats > 0)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        seats = [host] + [SimClient(server.socketio, server.app, room_id, compact=seat < compact_seats) for seat in range(1, num_players)]
+        for client in seats: client.drain()
+        tables.append((server.rooms.get(room_id), seats))
+    for turn in range(turns):
+        for room, seats in tables:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            actor.act()
+            if turn % 10 == 9: seats[-1].client.emit('request_resync') # 재접속/재동기화 때 보내는 게임 중간 스냅샷
+            for client in seats: client.drain()
+            public_view = json.loads(json.dumps(room.public_state()))
+            for client in seats:
+                state = dict(client.state, turn_seconds_left=None)
+                if json.loads(json.dumps(state)) != dict(public_view, turn_seconds_left=None): mismatches += 1
+    for room, seats in tables:
+        for client in seats: client.disconnect()
+    return mismatches
+
+def measure(events, repeat):
+    stats = defaultdict(lambda: defaultdict(float))
+    for event, payload in events:
+        frame = wire.encode(event, payload)
+        expected = json.loads(json.dumps(payload))
+        name, decoded = wire.decode(frame)
+        row = stats[event]
+        row['count'] += 1
+        row['mismatches'] += name != event or json.loads(json.dumps(decoded)) != expected
+        row['deflated frames'] += frame[0] >= wire.DEFLATED
+        text_packets = socketio_packets(event, payload)
+        row['json bytes'] += packet_size(text_packets)
+        row['json+deflate bytes'] += deflated_size(text_packets[0]) + 1
+        row['wire bytes'] += packet_size(socketio_packets(wire.EVENT, frame))
+        text = json.dumps(payload, separators=(',', ':'))
+        for label, fn in (('json encode', lambda: json.dumps(payload, separators=(',', ':'))), ('wire encode', lambda: wire.encode(event, payload)),
+                          ('json decode', lambda: json.loads(text)), ('wire decode', lambda: wire.decode(frame))):
+            start = time.perf_counter()
+            for _ in range(repeat): fn()
+            row[label] += (time.perf_counter() - start) / repeat
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='게임 이벤트 JSON vs 압축 프로토콜(wire.py) 크기/속도 비교')
+    parser.add_argument('--tables', type=int, default=20)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--turns', type=int, default=80)
+    parser.add_argument('--compact-seats', type=int, default=2, help='테이블마다 압축 프로토콜로 접속하는 자리 수')
+    parser.add_argument('--repeat', type=int, default=20, help='시간을 잴 때 이벤트 하나를 반복하는 횟수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    events = capture()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        mismatches = play(args.tables, args.players, args.turns, args.compact_seats)
+    # 저장소에서 되살린 방의 스냅샷: 로그가 메시지 번호가 아닌 문장이라 deflate 경로를 탄다
+    restored = [(event, dict(payload, game_log=[str(line) for line in payload['game_log']]))
+                for event, payload in events if event == 'game_snapshot' or event == 'game_started']
+    gc.disable() # timeit 처럼 시간을 잴 때는 GC 를 끈다 (테스트 클라이언트가 쌓은 객체 때문에 흔들린다)
+    stats = measure(events, args.repeat)
+    stats.update({f"{event} (restored log)": row for event, row in measure(restored[:200], args.repeat).items()})
+
+    gc.enable()
+    print(f"{len(events)} events from {args.tables} tables; compact-seat state mismatches vs server: {mismatches}")
+    print(f"{'event':>30} {'count':>6} {'json B':>7} {'json+defl B':>11} {'wire B':>7} {'ratio':>6} {'deflated':>8} "
+          f"{'json enc us':>11} {'wire enc us':>11} {'json dec us':>11} {'wire dec us':>11} {'bad':>4}")
+    for event, row in stats.items():
+        n = row['count']
+        print(f"{event:>30} {n:>6.0f} {row['json bytes'] / n:>7.0f} {row['json+deflate bytes'] / n:>11.0f} {row['wire bytes'] / n:>7.0f} "
+              f"{row['json bytes'] / row['wire bytes']:>5.1f}x {row['deflated frames']:>8.0f} "
+              f"{row['json encode'] / n * 1e6:>11.1f} {row['wire encode'] / n * 1e6:>11.1f} "
+              f"{row['json decode'] / n * 1e6:>11.1f} {row['wire decode'] / n * 1e6:>11.1f} {row['mismatches']:>4.0f}")
+    if mismatches or any(row['mismatches'] for row in stats.values()): raise SystemExit("compact frames do not round-trip")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+// benchmarks/render_harness.js
+// 사용법: node benchmarks/render_harness.js <events.json> <before|after>   (bench_render.py 가 부른다)
+// 브라우저 없이 static/js/main.js 를 vm 에서 돌리고, 가짜 DOM 에서 문서에 붙은 노드의 변경 수(document 에 건
+// MutationObserver 가 받을 노드 추가/삭제, 속성, 글자 변경)와 새로 만든 노드 수를 센다.
+//  before: 예전 redrawGame (매번 innerHTML = '' 후 전부 새로 만들기). 아래 LEGACY_RENDERER 에 그대로 얼려 두었다.
+//  after:  지금 main.js 의 키 기반 renderGame + requestAnimationFrame 묶음
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+const counts = { mutations: 0, created: 0 };
+
+class FakeClassList {
+    constructor(element) { this.element = element; this.names = new Set(); }
+    contains(name) { return this.names.has(name); }
+    add(name) { if (!this.names.has(name)) { this.names.add(name); this.element.mutated(); } }
+    remove(name) { if (this.names.delete(name)) this.element.mutated(); }
+    toggle(name, force) {
+        const on = force === undefined ? !this.names.has(name) : force;
+        if (on) this.add(name); else this.remove(name);
+        return on;
+    }
+}
+
+class FakeElement {
+    constructor(tagName, id) {
+        this.tagName = tagName;
+        this.id = id;
+        this.root = id !== undefined; // getElementById 로 얻은 노드는 문서에 붙어 있다
+        this.children = [];
+        this.parentNode = null;
+        this.classList = new FakeClassList(this);
+        this.dataset = new Proxy({}, { set: (target, key, value) => { target[key] = String(value); this.mutated(); return true; } });
+        this.style = new Proxy({}, { set: (target, key, value) => { target[key] = value; this.mutated(); return true; } });
+        this._text = '';
+        this._disabled = false;
+        this.scrollTop = 0;
+        this.scrollHeight = 0;
+        this.currentTime = 0;
+    }
+    get connected() { return this.root || (this.parentNode !== null && this.parentNode.connected); }
+    mutated(n = 1) { if (this.connected) counts.mutations += n; }
+    get className() { return [...this.classList.names].join(' '); }
+    set className(value) { this.classList.names = new Set(value.split(' ').filter(Boolean)); this.mutated(); }
+    get disabled() { return this._disabled; }
+    set disabled(value) { this._disabled = value; this.mutated(); }
+    get firstChild() { return this.children[0] || null; }
+    get nextSibling() {
+        if (!this.parentNode) return null;
+        const siblings = this.parentNode.children;
+        return siblings[siblings.indexOf(this) + 1] || null;
+    }
+    get textContent() { return this.children.length ? this.children.map(child => child.textContent).join('') : this._text; }
+    set textContent(value) { this.clear(); this._text = String(value); this.mutated(); }
+    get innerText() { return this.textContent; }
+    set innerText(value) { this.textContent = value; }
+    get innerHTML() { return this.children.length ? this.children.map(child => child.textContent).join('') : this._text; }
+    set innerHTML(value) { this.clear(); this._text = String(value); if (value) this.mutated(); }
+    clear() {
+        this.mutated(this.children.length);
+        this.children.forEach(child => { child.parentNode = null; });
+        this.children = [];
+        this._text = '';
+    }
+    detach() {
+        if (!this.parentNode) return;
+        this.parentNode.mutated();
+        const siblings = this.parentNode.children;
+        siblings.splice(siblings.indexOf(this), 1);
+        this.parentNode = null;
+    }
+    appendChild(child) { return this.insertBefore(child, null); }
+    insertBefore(child, before) {
+        child.detach();
+        const index = before ? this.children.indexOf(before) : this.children.length;
+        this.children.splice(index, 0, child);
+        child.parentNode = this;
+        this.mutated();
+        return child;
+    }
+    remove() { this.detach(); }
+    addEventListener() {}
+    play() { return Promise.resolve(); }
+    toDataURL() { return ''; }
+}
+
+function makeDocument(atlas) {
+    const elements = new Map();
+    return {
+        elements,
+        getElementById(id) {
+            if (!elements.has(id)) {
+                const element = new FakeElement('div', id);
+                if (id === 'tile-atlas') element._text = JSON.stringify(atlas);
+                elements.set(id, element);
+            }
+            return elements.get(id);
+        },
+        querySelectorAll() { return []; },
+        createElement(tagName) { counts.created++; return new FakeElement(tagName); },
+        head: new FakeElement('head'),
+        body: new FakeElement('body'),
+    };
+}
+
+function makeSocket() {
+    const handlers = new Map();
+    return {
+        auth: {},
+        on(event, handler) { if (!handlers.has(event)) handlers.set(event, []); handlers.get(event).push(handler); },
+        listeners(event) { return handlers.get(event) || []; },
+        emit() {},
+        deliver(event, payload) { this.listeners(event).forEach(handler => handler(payload)); },
+    };
+}
+
+// 통합 전 main.js 의 redrawGame / createCard 그대로 (이벤트마다 바로 그린다)
+const LEGACY_RENDERER = `
+function redrawGame() { legacyRedrawGame(gameState); }
+function legacyRedrawGame(gameState) {
+    if (!gameState || !gameState.hand_counts || (myPlayerNum === -1 && !watching)) return;
+    const myStatus = {
+        isMyTurn: gameState.current_player_index === myPlayerNum,
+        hasPassed: gameState.players_who_passed_this_round.includes(myPlayerNum),
+        isLeader: gameState.last_played_hand_info[0] === null
+    };
+    playButton.disabled = !myStatus.isMyTurn || myStatus.hasPassed;
+    passButton.disabled = !myStatus.isMyTurn || myStatus.isLeader;
+    myHandDiv.innerHTML = '';
+    myHand.forEach(tile => legacyCreateCard(tile, myHandDiv, true));
+    boardHandDiv.innerHTML = '';
+    const lastPlayedTiles = gameState.last_played_tiles;
+    if (lastPlayedTiles && lastPlayedTiles.length > 0) {
+        lastPlayedTiles.forEach(tile => legacyCreateCard(tile, boardHandDiv, false));
+    }
+    if (gameState.current_player_index === myPlayerNum) {
+        gameInfoDiv.innerHTML = '<span class="turn-indicator">당신의 턴입니다!</span>';
+    } else {
+        gameInfoDiv.innerHTML = \`플레이어 \${gameState.current_player_index + 1}의 턴입니다.\`;
+    }
+    statusTbody.innerHTML = '';
+    const numPlayers = gameState.hand_counts.length;
+    for (let i = 0; i < numPlayers; i++) {
+        const row = document.createElement('tr');
+        let status = '';
+        row.classList.remove('my-turn-indicator');
+        if (i === gameState.current_player_index) {
+            status = '진행 중';
+            if (i === myPlayerNum) { row.classList.add('my-turn-indicator'); }
+            else { row.classList.add('turn-row'); }
+        } else if (gameState.players_who_passed_this_round.includes(i)) {
+            status = 'Pass';
+        }
+        let playerName = \`P\${i + 1}\`;
+        if (i === myPlayerNum) {
+            playerName += ' (당신)';
+            row.classList.add('my-row');
+        }
+        const cells = [playerName, \`\${gameState.hand_counts[i]}개\`, \`\${gameState.player_money[i]}원\`, status];
+        row.innerHTML = cells.map(cell => \`<td>\${cell}</td>\`).join('');
+        // innerHTML 이 만드는 <td> 네 개 (가짜 DOM 은 HTML 을 해석하지 않으므로 직접 붙인다)
+        row.children = cells.map(cell => { const td = document.createElement('td'); td._text = cell; td.parentNode = row; return td; });
+        statusTbody.appendChild(row);
+    }
+    logList.innerHTML = '';
+    if (gameState.game_log) {
+        gameState.game_log.forEach(message => {
+            const li = document.createElement('li');
+            li.textContent = message;
+            logList.appendChild(li);
+        });
+        logList.scrollTop = logList.scrollHeight;
+    }
+}
+function legacyCreateCard(tile, container, isClickable) {
+    const cardDiv = document.createElement('div');
+    cardDiv.className = 'card';
+    cardDiv.dataset.suit = tile.suit;
+    cardDiv.dataset.rank = tile.rank;
+    setTileImage(cardDiv, tile);
+    container.appendChild(cardDiv);
+}
+`;
+
+function load(mode, atlas) {
+    const document = makeDocument(atlas);
+    const socket = makeSocket();
+    const frames = [];
+    const context = {
+        document, console, Promise, JSON, Math, Date, Map, Set, Array, Object, String, Number, Proxy, Uint8Array, DataView,
+        window: { location: { search: '?room=bench' } },
+        URLSearchParams, crypto: require('crypto').webcrypto,
+        localStorage: { getItem: () => null, setItem() {}, removeItem() {} },
+        io: () => socket,
+        Sortable: function Sortable() {},
+        requestAnimationFrame: (callback) => frames.push(callback),
+        setInterval: () => 0, setTimeout: () => 0, alert() {},
+    };
+    let source = fs.readFileSync(path.join(__dirname, '..', 'static', 'js', 'main.js'), 'utf8');
+    if (mode === 'before') source += LEGACY_RENDERER;
+    vm.runInNewContext(source, context);
+    const flush = () => { while (frames.length) frames.shift()(); };
+    return { document, socket, flush };
+}
+
+// 화면에 보이는 내용 요약 (두 방식이 같은 화면을 그리는지 비교한다)
+function screen(document) {
+    const element = (id) => document.getElementById(id);
+    return {
+        hand: element('player-hand').children.map(card => `${card.dataset.suit}_${card.dataset.rank}`).sort(),
+        board: element('board-hand').children.map(card => `${card.dataset.suit}_${card.dataset.rank}`),
+        info: element('game-info').innerHTML,
+        status: element('player-status-tbody').children.map(row => row.children.map(cell => cell.textContent)),
+        log: element('game-log-list').children.map(li => li.textContent),
+        play: element('play-button').disabled, pass: element('pass-button').disabled,
+    };
+}
+
+function main() {
+    const [eventsPath, mode] = process.argv.slice(2);
+    const { batches, atlas } = JSON.parse(fs.readFileSync(eventsPath, 'utf8'));
+    const { document, socket, flush } = load(mode, atlas);
+    const perUpdate = [];
+    let updates = 0;
+    const start = process.hrtime.bigint();
+    for (const batch of batches) {
+        // 한 배치 = 서버 액션 하나에 딸려 같은 프레임에 도착한 이벤트들
+        const before = { ...counts };
+        for (const [event, payload] of batch) socket.deliver(event, payload);
+        flush();
+        if (batch.some(([event]) => event === 'game_update')) {
+            updates++;
+            perUpdate.push({ mutations: counts.mutations - before.mutations, created: counts.created - before.created });
+        }
+    }
+    const elapsed = Number(process.hrtime.bigint() - start) / 1e6;
+    const sorted = perUpdate.map(u => u.mutations).sort((a, b) => a - b);
+    console.log(JSON.stringify({
+        mode, updates, events: batches.reduce((n, batch) => n + batch.length, 0),
+        mutations: counts.mutations, created: counts.created, ms: elapsed,
+        mutations_per_update: perUpdate.reduce((n, u) => n + u.mutations, 0) / updates,
+        created_per_update: perUpdate.reduce((n, u) => n + u.created, 0) / updates,
+        p50: sorted[Math.floor(sorted.length / 2)], max: sorted[sorted.length - 1],
+        screen: screen(document),
+    }));
+}
+
+main();
@@ -0,0 +1,151 @@
+# benchmarks/sim_client.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('LEXIO_DB', '') # 벤치마크는 따로 지정하지 않으면 저장소 없이 돈다
+os.environ.setdefault('LEXIO_REPLAYS', '') # 리플레이 기록도 마찬가지
+os.environ.setdefault('LEXIO_RATINGS', '') # 레이팅은 메모리에만
+os.environ.setdefault('LEXIO_GUARD', '0') # 테스트 클라이언트는 모두 같은 IP 라서 요청 제한은 끈다 (bench_guard 가 따로 켠다)
+
+import wire
+from game_logic import Tile
+
+# ===================================================================
+# 시뮬레이션 클라이언트: 받은 이벤트로 상태를 추적하고 단순한 수를 고른다
+# ===================================================================
+class SimClient:
+    # compact=True 면 압축 프로토콜(wire.py)로 접속해서 받은 프레임을 풀어 쓴다
+    def __init__(self, socketio, app, room_id, token=None, client=None, compact=False):
+        auth = {'room': room_id, 'token': token, 'wire': wire.WIRE_NAME} if compact else {'room': room_id, 'token': token}
+        self.client = client or socketio.test_client(app, auth=auth)
+        self.room_id = room_id
+        self.player_num = -1
+        self.token = token
+        self.state = None
+        self.hand = []
+        self.events = 0
+        self.game_over = False
+        self.resyncs = 0
+        self.last_patch = None
+
+    def drain(self):
+        for message in self.client.get_received():
+            self.events += 1
+            name, args = message['name'], message['args']
+            if name == wire.EVENT:
+                name, payload = wire.decode(args[0])
+                args = [payload]
+            if name == 'player_assigned': self.player_num, self.token = args[0]['player_num'], args[0].get('token')
+            elif name == 'your_hand': self.hand = args[0]['hand']
+            elif name in ('game_started', 'game_snapshot'): self.state = args[0]
+            elif name == 'game_update':
+                self.last_patch = args[0]
+                self.apply_patch(args[0])
+            elif name == 'game_over': self.game_over = True
+
+    # static/js/main.js 의 applyPatch 와 같은 규칙
+    def apply_patch(self, patch):
+        state = self.state
+        if state is None or patch['v'] != state['version'] + 1:
+            if state is None or patch['v'] > state['version']:
+                self.resyncs += 1
+                self.client.emit('request_resync')
+            return
+        play = patch.get('play')
+        if play:
+            state['hand_counts'][play['seat']] -= len(play['tiles'])
+            if play['seat'] == self.player_num:
+                for tile in play['tiles']:
+                    if tile in self.hand: self.hand.remove(tile)
+            state.update({'last_played_tiles': play['tiles'], 'last_played_hand_info': play['combo'], 'last_player_to_act_index': play['seat']})
+        if patch.get('passed') is not None: state['players_who_passed_this_round'].append(patch['passed'])
+        if patch.get('clear'): state.update({'last_played_tiles': [], 'last_played_hand_info': [None, None], 'players_who_passed_this_round': []})
+        if patch.get('money'): state['player_money'] = patch['money']
+        if patch.get('log'):
+            state['game_log'].append(patch['log'])
+            if len(state['game_log']) > 15: state['game_log'].pop(0)
+        state['current_player_index'] = patch['turn']
+        state['version'] = patch['v']
+
+    def is_my_turn(self):
+        return self.state is not None and self.state['current_player_index'] == self.player_num
+
+    def choose_action(self):
+        # 선두면 가장 약한 싱글, 아니면 싱글 위에 더 센 싱글, 못 내면 패스
+        hand = [Tile(t['suit'], t['rank']) for t in self.hand]
+        combo_name, rep_info = self.state['last_played_hand_info']
+        if combo_name is None: return ('play_hand', [min(hand).to_dict()])
+        if combo_name == '싱글':
+            board_tile = Tile(rep_info['suit'], rep_info['rank'])
+            stronger = [tile for tile in hand if tile > board_tile]
+            if stronger: return ('play_hand', [min(stronger).to_dict()])
+        return ('pass_turn', None)
+
+    def act(self):
+        event, payload = self.choose_action()
+        if payload is None: self.client.emit(event)
+        else: self.client.emit(event, payload)
+
+    def disconnect(self): self.client.disconnect()
+
+# 실제 서버에 붙는 클라이언트를 test_client 와 같은 모양(get_received/emit/disconnect)으로 감싼다.
+# SimClient(None, None, room_id, client=NetworkClient(url, room_id)) 처럼 쓴다.
+# 요청 제한(guard.py)을 켠 서버에 한 컴퓨터에서 여럿이 붙을 때는 서버를 LEXIO_TRUSTED_PROXY=1 로 띄우고
+# 자리마다 다른 ip(X-Forwarded-For)를 준다.
+class NetworkClient:
+    def __init__(self, url, room_id, token=None, ip=None):
+        import socketio
+        self.received = []
+        self.sio = socketio.Client()
+        self.sio.on('*', lambda event, *args: self.received.append({'name': event, 'args': list(args)}))
+        headers = {'X-Forwarded-For': ip} if ip else {}
+        self.sio.connect(f"{url}?room={room_id}", auth={'room': room_id, 'token': token}, headers=headers, transports=['websocket'])
+
+    def get_received(self):
+        received, self.received = self.received, []
+        return received
+
+    def emit(self, event, *args): self.sio.emit(event, *args)
+
+    def disconnect(self): self.sio.disconnect()
+
+# ===================================================================
+# 여러 테이블을 한 루프에서 두기 (NetworkClient 로 붙은 부하 생성기들이 같이 쓴다)
+# ===================================================================
+def wait_for_state(tables, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline and not all(c.state for seats in tables for c in seats):
+        for seats in tables:
+            for client in seats: client.drain()
+        time.sleep(0.01)
+
+# 테이블마다 turns 수를 둔다. 한 수의 지연은 둔 뒤 같은 테이블의 모든 자리가 그보다 새 패치를 받을 때까지의 시간.
+# think 는 한 수가 끝나고 그 테이블의 다음 수까지 기다릴 시간(초)을 돌려주는 함수 (None 이면 바로 둔다).
+# 돌려주는 값: (지연 목록, 걸린 시간)
+def play_tables(tables, turns, timeout=60, think=None):
+    latencies, pending, acted, ready = [], {}, [0] * len(tables), [0.0] * len(tables)
+    start = time.perf_counter()
+    deadline = start + timeout
+    while time.perf_counter() < deadline and (pending or any(n < turns for n in acted)):
+        now = time.perf_counter()
+        for i, seats in enumerate(tables):
+            for client in seats: client.drain()
+            if any(c.game_over for c in seats): acted[i] = turns
+            if i in pending:
+                # 액션 전의 버전보다 새 패치를 다른 자리가 받으면 한 바퀴가 끝난 것
+                version, t0 = pending[i]
+                if all(c.state and c.state['version'] > version for c in seats):
+                    latencies.append(now - t0)
+                    del pending[i]
+                    if think: ready[i] = now + think()
+                continue
+            if acted[i] >= turns or ready[i] > now: continue
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None: continue
+            pending[i] = (actor.state['version'], time.perf_counter())
+            actor.act()
+            acted[i] += 1
+        time.sleep(0.0005)
+    return latencies, time.perf_counter() - start
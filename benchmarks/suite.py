@@ -0,0 +1,363 @@
+# benchmarks/suite.py
+# 사용법: python benchmarks/suite.py run [--quick] [--layers rules,serialization,flows] [--out results.json]
+#         python benchmarks/suite.py compare baseline.json results.json [--threshold 0.1]
+#         python benchmarks/suite.py load --url http://127.0.0.1:5000 --tables 50 --turns 40 [--out load.json]
+import argparse
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from sim_client import NetworkClient, SimClient, play_tables, wait_for_state
+
+from game_logic import TILES, classify_mask, combination_table, get_combination_info, is_stronger_combination, legal_moves, mask_to_tiles, tiles_to_mask
+
+# ===================================================================
+# 회귀 확인용 벤치마크 모음: 같은 씨앗으로 같은 일을 반복해서 재고, 결과를 환경 정보와 함께 JSON 으로 남긴다
+# ===================================================================
+# run:     세 층을 잰다. 항목마다 한 번 데우고 repeat 번 재서 가장 좋은 값(value, timeit 처럼 다른 일에 방해받지 않은 쪽)과
+#          흩어짐(spread = 중앙값 절대 편차 / 중앙값, 튀는 한 번에 흔들리지 않게)을 남긴다.
+#   rules          Tile 비교, get_combination_info, is_stronger_combination, classify_mask, legal_moves (ns/op, us/op)
+#   serialization  broadcast_game_state 가 만드는 페이로드(자리별 손패 + 공개 상태)의 생성 + JSON 인코딩, 패치, 압축 프로토콜
+#   flows          Flask-SocketIO 테스트 클라이언트로 connect -> request_start_game -> 정해진 수순의 play_hand/pass_turn
+# compare: 기준 파일과 비교해 한도보다 더 나빠진 항목을 표시하고, 하나라도 있으면 0 이 아닌 코드로 끝난다.
+#          한도는 threshold 와 NOISE_SPREADS x 두 결과 중 큰 spread 중 큰 쪽이되, spread 몫은 SPREAD_CAP 을 넘지 않는다
+#          (시끄러운 항목을 회귀로 잡지 않되, 시끄럽다고 회귀가 통째로 가려지지도 않게).
+# load:    띄워 둔 서버에 NetworkClient 테이블 여러 개로 붙어 처리량과 한 수 지연 백분위를 잰다 (결과 형식은 run 과 같다).
+# 기능별로 자세히 보는 스크립트(bench_rules.py, bench_wire.py, bench_cluster.py 등)는 그대로 두고, 여기서는 회귀를 잡는
+# 대표 항목만 짧게 잰다.
+THRESHOLD = 0.10
+NOISE_SPREADS = 3  # 중앙값 절대 편차의 3배면 정규 분포로 2 표준편차 정도
+SPREAD_CAP = 0.25
+LAYERS = ('rules', 'serialization', 'flows')
+
+def percentile(values, q): return sorted(values)[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+def spread(values):
+    middle = statistics.median(values)
+    return statistics.median(abs(value - middle) for value in values) / middle if middle else 0.0
+
+# ===================================================================
+# 환경 정보와 결과 파일
+# ===================================================================
+def cpu_model():
+    with contextlib.suppress(OSError):
+        with open('/proc/cpuinfo') as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'): return line.split(':', 1)[1].strip()
+    return platform.processor() or platform.machine()
+
+def git_commit():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root, capture_output=True, text=True, timeout=10).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root, capture_output=True, text=True, timeout=10).stdout.strip())
+        return commit or None, dirty
+    except (OSError, subprocess.SubprocessError): return None, None
+
+def package_versions():
+    from importlib import metadata
+    versions = {}
+    for name in ('Flask', 'Flask-SocketIO', 'python-socketio', 'python-engineio', 'eventlet', 'numpy'):
+        with contextlib.suppress(metadata.PackageNotFoundError): versions[name] = metadata.version(name)
+    return versions
+
+def environment(args):
+    commit, dirty = git_commit()
+    return {
+        'time': datetime.now(timezone.utc).isoformat(timespec='seconds'), 'commit': commit, 'dirty': dirty,
+        'python': platform.python_version(), 'implementation': platform.python_implementation(),
+        'platform': platform.platform(), 'machine': platform.machine(), 'cpu': cpu_model(), 'cpus': os.cpu_count(),
+        'packages': package_versions(), 'args': {key: value for key, value in vars(args).items() if key != 'func'},
+    }
+
+class Results:
+    def __init__(self): self.entries = {}
+
+    # values: 반복마다 잰 값. better 는 'lower'(시간, 크기) 또는 'higher'(처리량)
+    def add(self, name, values, unit, better='lower'):
+        value, noise = min(values) if better == 'lower' else max(values), spread(values)
+        self.entries[name] = {'value': value, 'unit': unit, 'better': better, 'spread': round(noise, 4), 'runs': values}
+        print(f"{name:>40} {value:>14,.2f} {unit:<10} spread {noise:>6.1%}", flush=True)
+
+    def write(self, path, args):
+        with open(path, 'w') as out: json.dump({'environment': environment(args), 'results': self.entries}, out, indent=2, ensure_ascii=False)
+        print(f"wrote {len(self.entries)} results to {path}")
+
+# fn 을 items 마다 한 번씩 부르는 것을 repeat 번 재서 한 번당 시간 목록 (scale: 1e9 = ns, 1e6 = us).
+# 앞부분으로 한 번 데우고, 재는 동안은 timeit 처럼 gc 를 끈다.
+def measure(fn, items, repeat, scale):
+    for item in items[:max(1, len(items) // 10)]: fn(item)
+    runs, enabled = [], gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for item in items: fn(item)
+            runs.append((time.perf_counter() - start) / len(items) * scale)
+    finally:
+        if enabled: gc.enable()
+    return runs
+
+# ===================================================================
+# 1) 규칙
+# ===================================================================
+def bench_rules(results, args):
+    rng = random.Random(args.seed)
+    table = combination_table()
+    valid = list(table.values())
+    # 실제 제출과 비슷하게 1/2/3/5장을 섞되, 절반은 유효한 조합으로 채운다
+    hands = [mask_to_tiles(rng.choice(valid).mask) if rng.random() < 0.5 else rng.sample(TILES, rng.choice((1, 2, 3, 5))) for _ in range(args.samples)]
+    masks = [tiles_to_mask(hand) for hand in hands]
+    tile_pairs = [(rng.choice(TILES), rng.choice(TILES)) for _ in range(args.samples)]
+    pool = rng.sample(valid, 2000)
+    combo_pairs = [(rng.choice(pool), rng.choice(pool)) for _ in range(args.samples)]
+    # 12장 손패에서 선두일 때와 바닥에 싱글/페어가 있을 때
+    boards = [(None, None)] + [info for info in pool if info.mask.bit_count() <= 2][:20]
+    positions = [(sum(1 << tile.id for tile in rng.sample(TILES, 12)), rng.choice(boards)) for _ in range(max(1, args.samples // 20))]
+
+    results.add('rules.tile_compare', measure(lambda pair: pair[0] > pair[1], tile_pairs, args.repeat, 1e9), 'ns/op')
+    results.add('rules.get_combination_info', measure(get_combination_info, hands, args.repeat, 1e9), 'ns/op')
+    results.add('rules.is_stronger_combination', measure(lambda pair: is_stronger_combination(*pair), combo_pairs, args.repeat, 1e9), 'ns/op')
+    results.add('rules.classify_mask', measure(classify_mask, masks, args.repeat, 1e9), 'ns/op')
+    results.add('rules.legal_moves', measure(lambda position: list(legal_moves(*position)), positions, args.repeat, 1e6), 'us/op')
+
+# ===================================================================
+# 2) 직렬화: 진행 중인 방에서 서버가 보내는 페이로드를 만들어 JSON(또는 압축 프로토콜)으로 바꾸는 비용
+# ===================================================================
+# 방마다 가장 약한 싱글을 내거나 패스하면서 몇 수 진행해 로그와 바닥 패가 찬 상태를 만든다
+def mid_game_rooms(count, turns, seed):
+    from game_room import GameRoom
+    random.seed(seed)
+    rooms = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for i in range(count):
+            room = GameRoom(f"bench-{i}")
+            room.configure(3 + i % 3)
+            for seat in range(room.num_players): room.add_player(f"sid-{i}-{seat}")
+            room.start_new_game()
+            for _ in range(turns):
+                game_state = room.game_state
+                seat, last = game_state['current_player_index'], game_state['last_played_hand_info']
+                hand = game_state['player_hands'][seat]
+                singles = [tile for tile in hand if is_stronger_combination(get_combination_info([tile]), last)]
+                if singles and len(hand) > 1: room.apply_play(seat, [min(singles)])
+                elif last[0] is not None: room.apply_pass(seat)
+            rooms.append(room)
+    return rooms
+
+def bench_serialization(results, args):
+    import wire
+    from game_room import combo_info_to_dict
+    rooms = mid_game_rooms(args.rooms, 8, args.seed)
+
+    # broadcast_game_state 가 방 하나에 만드는 것: 자리마다 your_hand, 방 전체에 공개 상태 하나
+    def broadcast(room):
+        for seat in room.players.values(): json.dumps(room.private_hand(seat))
+        json.dumps(room.public_state())
+
+    # play_tiles 가 broadcast_patch 로 보내는 패치 (버전은 올리지 않는다)
+    def patch(room):
+        game_state = room.game_state
+        tiles = game_state['last_played_tiles'] or [game_state['player_hands'][0][0]]
+        play = {'seat': game_state['last_player_to_act_index'], 'tiles': [tile.to_dict() for tile in tiles], 'combo': combo_info_to_dict(game_state['last_played_hand_info'])}
+        json.dumps({'turn': game_state['current_player_index'], 'log': game_state['game_log'][-1], 'play': play, 'timer': 30.0, 'v': room.version + 1})
+
+    states = [room.public_state() for room in rooms]
+    results.add('serialization.broadcast_game_state', measure(broadcast, rooms, args.repeat, 1e6), 'us/op')
+    results.add('serialization.patch', measure(patch, rooms, args.repeat, 1e6), 'us/op')
+    results.add('serialization.snapshot_wire', measure(lambda state: wire.encode('game_snapshot', state), states, args.repeat, 1e6), 'us/op')
+    results.add('serialization.snapshot_json_bytes', [statistics.mean(len(json.dumps(state).encode()) for state in states)], 'bytes')
+    results.add('serialization.snapshot_wire_bytes', [statistics.mean(len(wire.encode('game_snapshot', state)) for state in states)], 'bytes')
+
+# ===================================================================
+# 3) 핸들러 흐름: 테스트 클라이언트로 접속부터 게임 진행까지 (서버 핸들러는 emit 안에서 바로 돈다)
+# ===================================================================
+def scripted_tables(server, tag, tables, num_players):
+    seats_by_table, start = [], time.perf_counter()
+    for t in range(tables):
+        room_id = f"suite-{tag}-{t}"
+        host = SimClient(server.socketio, server.app, room_id)
+        host.client.emit('request_start_game', {'num_players': num_players})
+        seats_by_table.append([host] + [SimClient(server.socketio, server.app, room_id) for _ in range(num_players - 1)])
+    for seats in seats_by_table:
+        for client in seats: client.drain()
+    return seats_by_table, (time.perf_counter() - start) / tables
+
+def close_tables(server, seats_by_table):
+    for seats in seats_by_table:
+        for client in seats: client.disconnect()
+    # 끊긴 자리는 재접속 유예 동안 남아 있으므로 방을 정리해 다음 반복에 타이머가 남지 않게 한다
+    for room in list(server.rooms.rooms.values()): server.reset_game(room)
+
+# 한 번 돌린 결과: (접속 us/conn, 시작 us/table, 한 수 p50 us, p99 us, 초당 수)
+def flow_run(server, args, r):
+    random.seed(args.seed) # 딜도 같은 씨앗으로 (클라이언트의 수는 손패로 정해진다)
+    start = time.perf_counter()
+    clients = [server.socketio.test_client(server.app, auth={'room': f"suite-idle-{r}"}) for _ in range(args.tables)]
+    connect = (time.perf_counter() - start) / len(clients) * 1e6
+    for client in clients: client.disconnect()
+
+    seats_by_table, per_table = scripted_tables(server, r, args.tables, 3)
+    latencies, start = [], time.perf_counter()
+    for _ in range(args.turns):
+        for seats in seats_by_table:
+            actor = next((c for c in seats if c.is_my_turn()), None)
+            if actor is None or any(c.game_over for c in seats): continue
+            t0 = time.perf_counter()
+            actor.act()
+            latencies.append(time.perf_counter() - t0)
+            for client in seats: client.drain()
+    elapsed = time.perf_counter() - start
+    close_tables(server, seats_by_table)
+    return connect, per_table * 1e6, percentile(latencies, 0.5) * 1e6, percentile(latencies, 0.99) * 1e6, len(latencies) / elapsed
+
+# measure() 처럼 한 번 데우고(첫 접속/첫 딜의 import, 조합 테이블, 캐시) gc 를 끈 채로 잰다. 쓰레기는 반복 사이에만 모은다.
+def bench_flows(results, args):
+    import app as server
+    runs = {'connect': [], 'start': [], 'p50': [], 'p99': [], 'rate': []}
+    enabled = gc.isenabled()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        flow_run(server, args, 'warmup')
+        gc.disable()
+        try:
+            for r in range(args.repeat):
+                gc.collect()
+                for key, value in zip(runs, flow_run(server, args, r)): runs[key].append(value)
+        finally:
+            if enabled: gc.enable()
+    results.add('flows.connect', runs['connect'], 'us/conn')
+    results.add('flows.start_game', runs['start'], 'us/table')
+    results.add('flows.action_p50', runs['p50'], 'us')
+    results.add('flows.action_p99', runs['p99'], 'us')
+    results.add('flows.actions_per_second', runs['rate'], 'actions/s', better='higher')
+
+def run(args):
+    if args.quick: args.samples, args.repeat, args.rooms, args.tables, args.turns = args.samples // 5, 3, args.rooms // 2, args.tables // 2, args.turns // 2
+    layers = args.layers.split(',')
+    unknown = set(layers) - set(LAYERS)
+    if unknown: raise SystemExit(f"unknown layers: {', '.join(sorted(unknown))}")
+    results = Results()
+    print(f"python {platform.python_version()} on {cpu_model()} ({os.cpu_count()} cpus), repeat {args.repeat}")
+    if 'rules' in layers: bench_rules(results, args)
+    if 'serialization' in layers: bench_serialization(results, args)
+    if 'flows' in layers: bench_flows(results, args)
+    if args.out: results.write(args.out, args)
+
+# ===================================================================
+# compare: 기준과 비교
+# ===================================================================
+def compare(args):
+    with open(args.baseline) as f: baseline = json.load(f)
+    with open(args.current) as f: current = json.load(f)
+    for key in ('python', 'implementation', 'cpu', 'machine'):
+        before, after = baseline['environment'].get(key), current['environment'].get(key)
+        if before != after: print(f"warning: {key} differs ({before} -> {after}); numbers may not be comparable")
+    regressions = []
+    print(f"{'benchmark':>40} {'baseline':>12} {'current':>12} {'unit':<10} {'change':>8} {'limit':>6}")
+    for name in sorted(set(baseline['results']) | set(current['results'])):
+        before, after = baseline['results'].get(name), current['results'].get(name)
+        if before is None or after is None:
+            print(f"{name:>40} {'-' if before is None else format(before['value'], ',.2f'):>12} {'-' if after is None else format(after['value'], ',.2f'):>12}")
+            continue
+        change = (after['value'] - before['value']) / before['value'] if before['value'] else 0.0
+        worse = -change if after['better'] == 'higher' else change
+        # spread 는 runs 에서 다시 계산한다 (예전 결과 파일은 (최대 - 최소) / value 를 적어 두었다)
+        noise = max(spread(entry['runs']) if entry.get('runs') else entry['spread'] for entry in (before, after))
+        limit = max(args.threshold, min(SPREAD_CAP, NOISE_SPREADS * noise))
+        flag = 'REGRESSION' if worse > limit else 'better' if worse < -limit else ''
+        if flag == 'REGRESSION': regressions.append(name)
+        print(f"{name:>40} {before['value']:>12,.2f} {after['value']:>12,.2f} {after['unit']:<10} {change:>+8.1%} {limit:>6.0%} {flag}")
+    if regressions: raise SystemExit(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+    print(f"no regressions beyond {args.threshold:.0%} (or {NOISE_SPREADS}x the measured spread, at most {SPREAD_CAP:.0%})")
+
+# ===================================================================
+# load: 띄워 둔 서버에 붙는 부하 생성기
+# ===================================================================
+# 부하 프로세스 하나가 테이블 몇 개를 맡는다. 씨앗은 방 이름, 각 테이블의 생각 시간, (서버가 허용하면) 자리별 IP 를 정한다.
+# 서버를 LEXIO_GUARD=0 으로 띄우거나, LEXIO_TRUSTED_PROXY=1 로 띄우고 --forwarded-for 로 자리마다 다른 IP 를 준다.
+def run_loader(task):
+    tables, args, tag, index = task
+    rng = random.Random(args.seed * 1000 + index)
+    seats_by_table, failed = [], 0
+    for t in tables:
+        room_id = f"load-{tag}-{t}"
+        ip = lambda seat: f"10.{t // 256 % 256}.{t % 256}.{seat + 1}" if args.forwarded_for else None
+        try:
+            host = SimClient(None, None, room_id, client=NetworkClient(args.url, room_id, ip=ip(0)))
+            time.sleep(0.05)
+            host.client.emit('request_start_game', {'num_players': args.players})
+            time.sleep(0.05)
+            seats_by_table.append([host] + [SimClient(None, None, room_id, client=NetworkClient(args.url, room_id, ip=ip(seat))) for seat in range(1, args.players)])
+        except Exception: failed += 1 # 서버가 접속을 거절했다 (요청 제한이나 연결 수)
+    wait_for_state(seats_by_table)
+    think = (lambda: rng.expovariate(1000 / args.think)) if args.think else None
+    latencies, elapsed = play_tables(seats_by_table, args.turns, timeout=args.timeout, think=think)
+    for seats in seats_by_table:
+        for client in seats: client.disconnect()
+    return latencies, elapsed, failed
+
+def load(args):
+    tag = f"{args.seed}-{int(time.time())}"
+    chunks = [list(range(args.tables))[i::args.loaders] for i in range(args.loaders)]
+    tasks = [(chunk, args, tag, i) for i, chunk in enumerate(chunks) if chunk]
+    with multiprocessing.Pool(len(tasks)) as pool: outcomes = pool.map(run_loader, tasks)
+    latencies = [latency for outcome in outcomes for latency in outcome[0]]
+    elapsed = max(outcome[1] for outcome in outcomes)
+    failed = sum(outcome[2] for outcome in outcomes)
+    print(f"{args.url}: {args.tables} tables x {args.players} seats over {len(tasks)} loader processes, {len(latencies)} actions in {elapsed:.1f}s"
+          + (f", {failed} tables could not connect" if failed else ''))
+    results = Results()
+    results.add('load.actions_per_second', [len(latencies) / elapsed if elapsed else 0.0], 'actions/s', better='higher')
+    for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99)): results.add(f"load.latency_{name}", [percentile(latencies, q) * 1e3], 'ms')
+    results.add('load.latency_max', [max(latencies, default=0.0) * 1e3], 'ms')
+    if args.out: results.write(args.out, args)
+    if failed: raise SystemExit(f"{failed} tables could not connect (is the server running with LEXIO_GUARD=0 or LEXIO_TRUSTED_PROXY=1 + --forwarded-for?)")
+
+def main():
+    parser = argparse.ArgumentParser(description='렉시오 서버 벤치마크 모음 (규칙/직렬화/핸들러 흐름, 기준 비교, 부하 생성)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='규칙/직렬화/핸들러 흐름을 재서 JSON 으로 남긴다')
+    run_parser.add_argument('--layers', default=','.join(LAYERS))
+    run_parser.add_argument('--out', help='결과 JSON 경로')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--samples', type=int, default=50000, help='규칙 항목마다 입력 수')
+    run_parser.add_argument('--rooms', type=int, default=200, help='직렬화에 쓰는 진행 중인 방 수')
+    run_parser.add_argument('--tables', type=int, default=20, help='핸들러 흐름의 테이블 수 (3인)')
+    run_parser.add_argument('--turns', type=int, default=60, help='핸들러 흐름에서 테이블마다 둘 수')
+    run_parser.add_argument('--quick', action='store_true', help='입력과 반복을 줄여 빠르게')
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help='기준 결과와 비교해 회귀를 표시한다')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=THRESHOLD, help='이보다 나빠지면 회귀 (0.1 = 10%%)')
+    compare_parser.set_defaults(func=compare)
+
+    load_parser = commands.add_parser('load', help='띄워 둔 서버에 여러 클라이언트로 붙어 처리량/지연을 잰다')
+    load_parser.add_argument('--url', default='http://127.0.0.1:5000')
+    load_parser.add_argument('--tables', type=int, default=50)
+    load_parser.add_argument('--players', type=int, default=3)
+    load_parser.add_argument('--turns', type=int, default=40)
+    load_parser.add_argument('--loaders', type=int, default=2, help='부하 생성 프로세스 수')
+    load_parser.add_argument('--think', type=float, default=0, help='한 수 뒤 다음 수까지 평균 생각 시간 (ms, 지수 분포)')
+    load_parser.add_argument('--forwarded-for', action='store_true', help='자리마다 다른 X-Forwarded-For (서버가 LEXIO_TRUSTED_PROXY=1 일 때)')
+    load_parser.add_argument('--timeout', type=float, default=120)
+    load_parser.add_argument('--out', help='결과 JSON 경로')
+    load_parser.add_argument('--seed', type=int, default=1)
+    load_parser.set_defaults(func=load)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+# bots.py
+import random
+import time
+
+from engine import NO_PLAY, Game
+from game_logic import TWO_MASK, classify_mask, tiles_to_mask
+from solver import PASS, EndgameSolver, expected_values
+
+# ===================================================================
+# 봇 플레이어: engine 정책과 같은 choose(game, seat) 인터페이스
+# ===================================================================
+# 봇은 자기 손패, 낸 타일(played_mask), 각자 남은 장 수 같은 공개 정보만 본다.
+class HeuristicBot:
+    name = 'heuristic'
+
+    def choose(self, game, seat):
+        moves = list(game.legal_moves(seat))
+        if not moves: return None
+        # 선두: 한 번에 가장 많이 털 수 있는 조합 중 가장 약한 것
+        if game.last_combo[0] is None: return max(moves, key=lambda info: (info.mask.bit_count(), -info.key))
+        # 따라갈 때: 가장 약한 수를 내되 2는 아껴 둔다. 상대가 곧 끝날 것 같으면 아끼지 않는다.
+        counts = game.hand_counts()
+        danger = min(count for i, count in enumerate(counts) if i != seat) <= 3
+        for info in moves:
+            if danger or not info.mask & TWO_MASK: return info
+        return None
+
+class MonteCarloBot:
+    name = 'montecarlo'
+
+    # 모두의 남은 장 수 합이 endgame_tiles 이하면 롤아웃 대신 끝내기 풀이(solver.py)로 고른다. 0 이면 쓰지 않는다.
+    def __init__(self, time_budget=0.05, max_candidates=6, rng=None, endgame_tiles=12):
+        self.time_budget, self.max_candidates, self.endgame_tiles = time_budget, max_candidates, endgame_tiles
+        self.rng = rng or random.Random()
+        self.rollout_policy = HeuristicBot()
+        self.solvers = {} # 인원수 -> EndgameSolver (전치표를 수마다 다시 쓴다)
+        self.stats = {'moves': 0, 'rollouts': 0, 'search_time': 0.0, 'endgames': 0, 'endgame_time': 0.0}
+
+    def candidates(self, game, seat):
+        moves = list(game.legal_moves(seat))
+        if len(moves) > self.max_candidates:
+            # 약한 수 위주로 추리고, 휴리스틱이 고른 수와 가장 센 수는 항상 포함한다
+            picked = moves[:self.max_candidates - 2] + [self.rollout_policy.choose(game, seat), moves[-1]]
+            moves = list({info.mask: info for info in picked if info is not None}.values())
+        if moves and game.last_combo[0] is not None: moves.append(None)
+        return moves
+
+    def determinize(self, game, seat): return game.determinize(seat, self.rng)
+
+    def rollout(self, world, seat, option):
+        sim = world.clone()
+        before = sim.money[seat]
+        if option is None: sim.pass_turn()
+        elif sim.play(option):
+            sim.settle(seat)
+            return sim.money[seat] - before
+        sim.finish_round([self.rollout_policy] * sim.num_players)
+        return sim.money[seat] - before
+
+    # 시간 예산 안에서 가상의 판을 계속 만들어 모든 후보를 같은 판에서 끝까지 두어 보고 평균 수익이 가장 큰 수를 고른다.
+    # 예산은 롤아웃마다 확인하고, 한 번도 두어 보지 못한 후보는 고르지 않는다.
+    def choose(self, game, seat):
+        if sum(game.hand_counts()) <= self.endgame_tiles: return self.choose_endgame(game, seat)
+        options = self.candidates(game, seat)
+        if len(options) <= 1: return options[0] if options else None
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        totals, counts = [0] * len(options), [0] * len(options)
+        out_of_time = False
+        while not out_of_time:
+            world = self.determinize(game, seat)
+            for i, option in enumerate(options):
+                totals[i] += self.rollout(world, seat, option)
+                counts[i] += 1
+                if time.perf_counter() >= deadline:
+                    out_of_time = True
+                    break
+        self.stats['moves'] += 1
+        self.stats['rollouts'] += sum(counts)
+        self.stats['search_time'] += time.perf_counter() - start
+        sampled = [i for i in range(len(options)) if counts[i]]
+        return options[max(sampled, key=lambda i: totals[i] / counts[i])]
+
+    # 가상의 판들을 끝까지 풀어 평균 정산 손익이 가장 큰 첫 수
+    def choose_endgame(self, game, seat):
+        start = time.perf_counter()
+        solver = self.solvers.get(game.num_players)
+        if solver is None: solver = self.solvers[game.num_players] = EndgameSolver(game.num_players)
+        values = expected_values(game, seat, self.rng, time_limit=self.time_budget, solver=solver)
+        self.stats['endgames'] += 1
+        self.stats['endgame_time'] += time.perf_counter() - start
+        if not values: return None
+        best = max(values, key=values.get)
+        return None if best == PASS else classify_mask(best)
+
+    def rollouts_per_second(self):
+        return self.stats['rollouts'] / self.stats['search_time'] if self.stats['search_time'] else 0.0
+
+BOTS = {'heuristic': HeuristicBot, 'montecarlo': MonteCarloBot}
+
+# ===================================================================
+# 서버 연결: GameRoom 상태를 engine.Game 복사본으로 바꿔 봇에게 넘긴다
+# ===================================================================
+def game_from_room(room):
+    game_state = room.game_state
+    game = Game(room.num_players, tiles_per_player_count=room.tiles_per_player)
+    game.money, game.round_number = list(room.player_money), room.round_number
+    game.hands = [tiles_to_mask(hand) for hand in game_state['player_hands']]
+    game.current = game_state['current_player_index']
+    game.last_combo = game_state['last_played_hand_info'] if game_state['last_played_hand_info'][0] is not None else NO_PLAY
+    game.last_actor = game_state['last_player_to_act_index']
+    game.passed = list(game_state['players_who_passed_this_round'])
+    game.played_mask = game_state['played_mask']
+    return game
@@ -0,0 +1,148 @@
+# cluster.py
+# 사용법: python cluster.py --workers 4 --base-port 5000           (로컬 브로커 + 워커 4개)
+#         python cluster.py broker --port 5600                       (브로커만)
+import argparse
+import os
+import pickle
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+import socketio
+
+# ===================================================================
+# 여러 워커 프로세스로 나눠 돌리기
+# ===================================================================
+# - 테이블(room id)마다 주인 워커가 정해져 있고(owner_of), 그 방의 상태는 주인 워커에만 있다.
+# - 연결은 아무 워커나 받을 수 있다. 받은 워커는 방에 join_room 만 하고, 액션은 주인 워커로 전달(forward)한다.
+# - 주인 워커가 보내는 emit 은 메시지 큐를 통해 모든 워커에 퍼지고, 각 워커가 자기 연결에만 전달한다.
+# 로드밸런서가 ?room= 값으로 해시하면(nginx: hash $arg_room consistent) 대부분의 연결이 주인 워커에 바로 붙어 전달이 필요 없다.
+def owner_of(room_id, workers):
+    return zlib.crc32(room_id.encode()) % workers if workers > 1 else 0
+
+def decode_message(message):
+    if isinstance(message, dict): return message
+    try: return pickle.loads(message)
+    except Exception: return None
+
+# 액션 전달은 Socket.IO 가 쓰는 채널에 'forward' 메시지로 함께 싣는다.
+# 주인 워커만 처리하고, 나머지 메시지는 그대로 PubSubManager 에 넘긴다.
+class ForwardingMixin:
+    worker_id = 0
+    on_forward = None
+
+    def forward(self, worker_id, action):
+        self._publish({'method': 'forward', 'worker': worker_id, 'action': action, 'host_id': self.host_id})
+
+    def _listen(self):
+        for message in super()._listen():
+            data = decode_message(message)
+            if data is not None and data.get('method') == 'forward':
+                if data['worker'] == self.worker_id: self.on_forward(*data['action'])
+                continue
+            yield message
+
+class RedisForwardingManager(ForwardingMixin, socketio.RedisManager): pass
+
+class KombuForwardingManager(ForwardingMixin, socketio.KombuManager): pass
+
+# 로컬 테스트용 브로커에 붙는 매니저 (lexio://host:port). 보내는 연결과 받는 연결을 따로 쓴다.
+class LocalBrokerManager(socketio.PubSubManager):
+    name = 'lexio-broker'
+
+    def __init__(self, url, channel='flask-socketio', write_only=False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        parsed = urlparse(url)
+        self.address = (parsed.hostname or '127.0.0.1', parsed.port or 5600)
+        self.sock = None
+        self.lock = threading.Lock()
+
+    # 워커가 브로커보다 먼저 뜰 수 있으므로 붙을 때까지 기다린다
+    def _connect(self):
+        while True:
+            try: return socket.create_connection(self.address)
+            except OSError: time.sleep(0.1)
+
+    def _publish(self, data):
+        payload = pickle.dumps(data)
+        with self.lock:
+            if self.sock is None: self.sock = self._connect()
+            self.sock.sendall(struct.pack('>I', len(payload)) + payload)
+
+    def _listen(self):
+        reader = self._connect().makefile('rb')
+        while True:
+            header = reader.read(4)
+            if len(header) < 4: return
+            yield reader.read(struct.unpack('>I', header)[0])
+
+class BrokerManager(ForwardingMixin, LocalBrokerManager): pass
+
+def make_client_manager(url, worker_id, on_forward):
+    if url.startswith('lexio://'): manager_class = BrokerManager
+    elif url.startswith(('redis://', 'rediss://')): manager_class = RedisForwardingManager
+    else: manager_class = KombuForwardingManager
+    manager = manager_class(url, channel='flask-socketio')
+    manager.worker_id, manager.on_forward = worker_id, on_forward
+    return manager
+
+# ===================================================================
+# 로컬 브로커: 받은 프레임(4바이트 길이 + 본문)을 보낸 연결을 뺀 모든 연결에 그대로 뿌린다
+# ===================================================================
+def run_broker(host='127.0.0.1', port=5600):
+    server = socket.create_server((host, port))
+    clients, lock = [], threading.Lock()
+
+    def relay(conn):
+        reader = conn.makefile('rb')
+        try:
+            while True:
+                header = reader.read(4)
+                if len(header) < 4: break
+                frame = header + reader.read(struct.unpack('>I', header)[0])
+                with lock: targets = [c for c in clients if c is not conn]
+                for target in targets:
+                    try: target.sendall(frame)
+                    except OSError: pass
+        finally:
+            with lock: clients.remove(conn)
+            conn.close()
+
+    while True:
+        conn, _ = server.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with lock: clients.append(conn)
+        threading.Thread(target=relay, args=(conn,), daemon=True).start()
+
+# 브로커와 워커 N개를 띄운다. 워커 i 는 base_port + i 에서 듣는다.
+def start_cluster(workers, base_port=5000, broker_port=5600, host='127.0.0.1', env=None, stdout=None):
+    root = os.path.dirname(os.path.abspath(__file__))
+    processes = [subprocess.Popen([sys.executable, os.path.join(root, 'cluster.py'), 'broker', '--port', str(broker_port)], stdout=stdout)]
+    for worker_id in range(workers):
+        worker_env = dict(os.environ, **(env or {}))
+        worker_env.update({'LEXIO_WORKERS': str(workers), 'LEXIO_WORKER_ID': str(worker_id), 'HOST': host,
+                           'PORT': str(base_port + worker_id), 'LEXIO_MESSAGE_QUEUE': f"lexio://127.0.0.1:{broker_port}"})
+        processes.append(subprocess.Popen([sys.executable, os.path.join(root, 'app.py')], env=worker_env, stdout=stdout, stderr=stdout))
+    return processes
+
+def main():
+    parser = argparse.ArgumentParser(description='렉시오 멀티 워커 실행')
+    parser.add_argument('mode', nargs='?', default='cluster', choices=['cluster', 'broker'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--base-port', type=int, default=5000)
+    parser.add_argument('--port', type=int, default=5600, help='브로커 포트')
+    args = parser.parse_args()
+    if args.mode == 'broker': return run_broker(port=args.port)
+    processes = start_cluster(args.workers, args.base_port, args.port)
+    try:
+        for process in processes: process.wait()
+    except KeyboardInterrupt:
+        for process in processes: process.terminate()
+
+if __name__ == '__main__':
+    main()
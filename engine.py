@@ -0,0 +1,153 @@
+# engine.py
+import random
+
+from game_logic import FULL_DECK_MASK, TILES, TWO_MASK, Tile, is_stronger_combination, legal_moves, lowest_move, settle_round, tiles_per_player
+
+# ===================================================================
+# 헤드리스 게임 엔진: 입출력 없이 app.py 와 같은 규칙으로 한 게임을 끝까지 진행한다
+# ===================================================================
+# 손패는 타일 id 비트마스크. 정책(policy)은 choose(game, seat) 에서 낼 ComboInfo 를 돌려주고,
+# 패스하려면 None 을 돌려준다. 정책은 자기 손패와 공개 정보(played_mask, hand_counts 등)만 봐야 한다.
+NO_PLAY = (None, None)
+STARTING_TILE_ID = Tile("cloud", 3).id
+
+class Game:
+    def __init__(self, num_players, rng=None, starting_money=48, tiles_per_player_count=None):
+        self.num_players = num_players
+        self.rng = rng or random.Random()
+        self.tiles_per_player = tiles_per_player_count or tiles_per_player(num_players)
+        self.money = [starting_money] * num_players
+        self.round_number = 0
+        self.hands = []
+
+    def deal(self):
+        deck = list(range(len(TILES)))
+        self.rng.shuffle(deck)
+        hands = [0] * self.num_players
+        for _ in range(self.tiles_per_player):
+            for i in range(self.num_players): hands[i] |= 1 << deck.pop()
+        start = self.rng.randint(0, self.num_players - 1)
+        for i, hand in enumerate(hands):
+            if hand >> STARTING_TILE_ID & 1:
+                start = i
+                break
+        self.start_round(hands, start)
+
+    # 나눠 준 손패로 라운드를 시작한다. 기록된 리플레이를 다시 돌릴 때도 쓴다.
+    def start_round(self, hands, start):
+        self.round_number += 1
+        self.hands, self.current = list(hands), start
+        self.last_combo, self.last_actor, self.passed = NO_PLAY, start, []
+        self.played_mask = 0
+
+    def hand_counts(self): return [hand.bit_count() for hand in self.hands]
+
+    # seat 가 볼 수 없는 타일: 다른 플레이어의 손패 + 배분되지 않은 타일
+    def unseen_mask(self, seat): return FULL_DECK_MASK & ~self.hands[seat] & ~self.played_mask
+
+    def legal_moves(self, seat=None):
+        return legal_moves(self.hands[self.current if seat is None else seat], self.last_combo)
+
+    def _advance(self):
+        next_player = (self.current + 1) % self.num_players
+        for _ in range(self.num_players):
+            if next_player not in self.passed:
+                self.current = next_player
+                return
+            next_player = (next_player + 1) % self.num_players
+
+    # 라운드가 끝나면(손패를 다 내면) True
+    def play(self, combo_info):
+        seat, mask = self.current, combo_info.mask
+        if seat in self.passed or mask & ~self.hands[seat] or not is_stronger_combination(combo_info, self.last_combo):
+            raise ValueError(f"P{seat + 1}: 낼 수 없는 패입니다 {combo_info}")
+        self.hands[seat] &= ~mask
+        self.played_mask |= mask
+        self.last_combo, self.last_actor = combo_info, seat
+        if not self.hands[seat]: return True
+        self._advance()
+        return False
+
+    def pass_turn(self):
+        if self.last_combo[0] is None: raise ValueError("라운드의 선두는 패스할 수 없습니다.")
+        self.passed.append(self.current)
+        if self.num_players - len(self.passed) <= 1:
+            self.last_combo, self.passed, self.current = NO_PLAY, [], self.last_actor
+        else:
+            self._advance()
+
+    def settle(self, winner_index):
+        payments = settle_round(self.hand_counts(), [bool(hand & TWO_MASK) for hand in self.hands], winner_index)
+        for payer, payee, amount in payments:
+            self.money[payee] += amount
+            self.money[payer] -= amount
+        return payments
+
+    def is_over(self): return any(money <= 0 for money in self.money)
+
+    # seat 가 볼 수 없는 타일을 다른 플레이어들의 남은 장 수에 맞게 무작위로 나눠 준 가상의 판 (봇 탐색용)
+    def determinize(self, seat, rng):
+        world = self.clone(rng)
+        unseen, mask = [], self.unseen_mask(seat)
+        while mask:
+            low = mask & -mask
+            unseen.append(low)
+            mask ^= low
+        rng.shuffle(unseen)
+        position = 0
+        for other, hand in enumerate(self.hands):
+            if other == seat: continue
+            count = hand.bit_count()
+            world.hands[other] = sum(unseen[position:position + count])
+            position += count
+        return world
+
+    # 봇 탐색용 복사본: 손패/패스 목록만 새로 만들고 나머지는 그대로 공유한다
+    def clone(self, rng=None):
+        game = Game.__new__(Game)
+        game.__dict__.update(self.__dict__)
+        game.hands, game.passed, game.money = list(self.hands), list(self.passed), list(self.money)
+        if rng is not None: game.rng = rng
+        return game
+
+    def play_round(self, policies):
+        self.deal()
+        return self.finish_round(policies)
+
+    # 진행 중인 라운드를 끝까지 두고 승자 자리를 돌려준다
+    def finish_round(self, policies):
+        while True:
+            seat = self.current
+            move = policies[seat].choose(self, seat)
+            if move is None: self.pass_turn()
+            elif self.play(move):
+                self.settle(seat)
+                return seat
+
+    def play_game(self, policies, max_rounds=1000):
+        while not self.is_over() and self.round_number < max_rounds: self.play_round(policies)
+        return GameResult(self)
+
+class GameResult:
+    __slots__ = ('rounds', 'money', 'winner', 'bankrupt')
+    def __init__(self, game):
+        self.rounds, self.money = game.round_number, list(game.money)
+        self.winner = max(range(game.num_players), key=lambda i: self.money[i])
+        self.bankrupt = [i for i, money in enumerate(self.money) if money <= 0]
+
+# ===================================================================
+# 기본 정책
+# ===================================================================
+class LowestPolicy:
+    # 낼 수 있는 가장 약한 조합을 내고, 없으면 패스 (legal_moves 의 첫 수와 같다)
+    def choose(self, game, seat): return lowest_move(game.hands[seat], game.last_combo)
+
+class RandomPolicy:
+    def __init__(self, pass_probability=0.1): self.pass_probability = pass_probability
+    def choose(self, game, seat):
+        moves = list(game.legal_moves(seat))
+        if not moves: return None
+        if game.last_combo[0] is not None and game.rng.random() < self.pass_probability: return None
+        return game.rng.choice(moves)
+
+POLICIES = {'lowest': LowestPolicy, 'random': RandomPolicy}
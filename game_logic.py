@@ -1,21 +1,57 @@
 # game_logic.py
-import functools
+from bisect import bisect_right
 from collections import Counter
+from itertools import combinations, product
 
 # ===================================================================
 # 게임 엔진: Tile 클래스 및 헬퍼 함수
 # ===================================================================
-@functools.total_ordering
+# app.py(웹)와 lexio.py(터미널)가 함께 쓰는 규칙 코어. 판정/정산 결과가 바뀌는 수정을 하면 버전을 올린다.
+RULES_VERSION = 2
+
+# 타일 번호(id)는 렉시오 서열 순서의 0~59 정수: id = (숫자 서열 - 1) * 4 + (무늬 서열 - 1)
+# 손패는 id 비트를 모은 정수 마스크로 표현한다 (60비트)
 class Tile:
     suit_power = {"sun": 4, "moon": 3, "star": 2, "cloud": 1}
     rank_strength = {3: 1, 4: 2, 5: 3, 6: 4, 7: 5, 8: 6, 9: 7, 10: 8, 11: 9, 12: 10, 13: 11, 14: 12, 15: 13, 1: 14, 2: 15}
-    def __init__(self, suit, rank): self.suit, self.rank = suit, rank
+    __slots__ = ('suit', 'rank', 'id')
+    def __init__(self, suit, rank):
+        self.suit, self.rank = suit, rank
+        self.id = (self.rank_strength[rank] - 1) * 4 + self.suit_power[suit] - 1
     def __repr__(self): return f"({self.suit}, {self.rank})"
     def to_dict(self): return {'suit': self.suit, 'rank': self.rank}
-    def __eq__(self, other): return self.rank == other.rank and self.suit == other.suit
-    def __gt__(self, other):
-        if self.rank_strength[self.rank] != self.rank_strength[other.rank]: return self.rank_strength[self.rank] > self.rank_strength[other.rank]
-        return self.suit_power[self.suit] > self.suit_power[other.suit]
+    def __hash__(self): return self.id
+    def __eq__(self, other): return self.id == other.id
+    def __ne__(self, other): return self.id != other.id
+    def __gt__(self, other): return self.id > other.id
+    def __ge__(self, other): return self.id >= other.id
+    def __lt__(self, other): return self.id < other.id
+    def __le__(self, other): return self.id <= other.id
+
+SUITS = sorted(Tile.suit_power, key=Tile.suit_power.get)
+RANKS = sorted(Tile.rank_strength, key=Tile.rank_strength.get)
+TILES = [Tile(suit, rank) for rank in RANKS for suit in SUITS]
+FULL_DECK_MASK = (1 << len(TILES)) - 1
+
+# 무늬 표시 이름. 규칙과 통신은 영문 무늬 키만 쓰고, 사람에게 보여 줄 때만 이 표를 거친다.
+SUIT_NAMES = {'ko': {"sun": "해", "moon": "달", "star": "별", "cloud": "구름"}}
+def tile_label(tile, lang='ko'): return f"({SUIT_NAMES[lang][tile.suit]}, {tile.rank})"
+
+def rank_mask(rank): return 0b1111 << ((Tile.rank_strength[rank] - 1) * 4)
+TWO_MASK = rank_mask(2)
+
+def tiles_to_mask(tiles):
+    mask = 0
+    for tile in tiles: mask |= 1 << tile.id
+    return mask
+
+def mask_to_tiles(mask):
+    tiles = []
+    while mask:
+        low = mask & -mask
+        tiles.append(TILES[low.bit_length() - 1])
+        mask ^= low
+    return tiles
 
 def all_ranks_are_same(tiles): return len(set(tile.rank for tile in tiles)) == 1
 def ranks_are_sequential(tiles):
@@ -35,7 +71,8 @@ def is_four_of_a_kind(tiles):
 
 combination_ranking = {"싱글": 1, "페어": 2, "트리플": 3, "스트레이트": 4, "플러쉬": 5, "풀하우스": 6, "포카드": 7, "스트레이트 플러쉬": 8}
 
-def get_combination_info(tiles):
+# 규칙 그대로의 느린 판정. 아래 조합 테이블을 만들 때만 쓴다.
+def _classify_reference(tiles):
     if not tiles: return (None, None)
     num_tiles, highest_tile = len(tiles), max(tiles)
     if num_tiles == 1: return ("싱글", highest_tile)
@@ -56,11 +93,10 @@ def get_combination_info(tiles):
                     virtual_rep_tile = Tile(max(tiles).suit, virtual_rank)
                     if is_joker_flush: return ("스트레이트 플러쉬", virtual_rep_tile)
                     else: return ("스트레이트", virtual_rep_tile)
-        if sorted_ranks = [1,2,3,4,5] or [2,3,4,5,6]:
-            return ('스트레이트',highest_tiles)
         rank_counts = Counter(rank for rank in ranks)
         counts_values = sorted(rank_counts.values())
         is_straight, is_flush = ranks_are_sequential(tiles), all_suits_are_same(tiles)
+        if sorted_ranks in ([1, 2, 3, 4, 5], [2, 3, 4, 5, 6]): is_straight = True
         if is_straight and is_flush: return ("스트레이트 플러쉬", highest_tile)
         if counts_values == [1, 4]:
             quad_rank = [r for r, c in rank_counts.items() if c == 4][0]
@@ -76,20 +112,230 @@ def get_combination_info(tiles):
         if is_straight: return ("스트레이트", highest_tile)
     return (None, None)
 
+# ===================================================================
+# 조합 테이블: 마스크 -> (조합 이름, 대표 타일, 비교 키)
+# ===================================================================
+# 비교 키 = 조합 서열 << 24 | 조합 안의 세기. 플러쉬는 다섯 장의 숫자 서열(4비트씩) + 최고 타일 무늬,
+# 나머지는 대표 타일 id. 키가 크면 더 센 패이므로 is_stronger_combination 은 정수 비교 한 번이다.
+class ComboInfo(tuple):
+    def __new__(cls, name, rep_info, key, mask):
+        info = super().__new__(cls, (name, rep_info))
+        info.key, info.mask = key, mask
+        return info
+
+def _combination_key(name, rep_info):
+    if name == "플러쉬":
+        inner = 0
+        for tile in rep_info: inner = (inner << 4) | Tile.rank_strength[tile.rank]
+        inner = (inner << 2) | (Tile.suit_power[rep_info[0].suit] - 1)
+    else:
+        inner = rep_info.id
+    return (combination_ranking[name] << 24) | inner
+
+def combination_key(combo_info):
+    key = getattr(combo_info, 'key', None)
+    if key is not None or combo_info[0] is None: return key
+    return _combination_key(*combo_info)
+
+def _candidate_masks():
+    rank_tiles = [[rank_index * 4 + suit_index for suit_index in range(4)] for rank_index in range(len(RANKS))]
+    for tile_id in range(len(TILES)): yield 1 << tile_id
+    for ids in rank_tiles:
+        for size in (2, 3):
+            for chosen in combinations(ids, size): yield sum(1 << i for i in chosen)
+    # 5장: 서로 다른 숫자 다섯 개(스트레이트/플러쉬), 풀하우스, 포카드
+    for rank_set in combinations(range(len(RANKS)), 5):
+        mixed = [TILES[rank_set[0] * 4]] + [TILES[r * 4 + 1] for r in rank_set[1:]]
+        suit_choices = product(range(4), repeat=5) if _classify_reference(mixed)[0] else ((s,) * 5 for s in range(4))
+        for suits in suit_choices: yield sum(1 << (r * 4 + s) for r, s in zip(rank_set, suits))
+    for major, minor in product(range(len(RANKS)), repeat=2):
+        if major == minor: continue
+        for triple in combinations(rank_tiles[major], 3):
+            for pair in combinations(rank_tiles[minor], 2): yield sum(1 << i for i in triple + pair)
+        for single in rank_tiles[minor]: yield sum(1 << i for i in rank_tiles[major]) | (1 << single)
+
+_combination_table = None
+_straight_rank_sets = None
+
+def combination_table():
+    global _combination_table, _straight_rank_sets
+    if _combination_table is None:
+        table, rank_sets = {}, set()
+        for mask in _candidate_masks():
+            tiles = mask_to_tiles(mask)
+            name, rep_info = _classify_reference(tiles)
+            if name is None: continue
+            if isinstance(rep_info, tuple): rep_info = tuple(TILES[tile.id] for tile in rep_info)
+            else: rep_info = TILES[rep_info.id]
+            table[mask] = ComboInfo(name, rep_info, _combination_key(name, rep_info), mask)
+            if name in ("스트레이트", "스트레이트 플러쉬"): rank_sets.add(tuple(tile.id >> 2 for tile in tiles))
+        _combination_table, _straight_rank_sets = table, sorted(rank_sets)
+    return _combination_table
+
+# 스트레이트가 되는 숫자 서열 조합들 (숫자 서열 번호 0~14의 오름차순 튜플)
+def straight_rank_sets():
+    if _straight_rank_sets is None: combination_table()
+    return _straight_rank_sets
+
+# (숫자 서열 튜플, 그 숫자들의 비트) — 손패에 없는 숫자가 있는 서열을 비트 연산 한 번으로 건너뛴다
+_straight_rank_bits = None
+
+def _build_straight_rank_bits():
+    global _straight_rank_bits
+    _straight_rank_bits = [(rank_set, sum(1 << r for r in rank_set)) for rank_set in straight_rank_sets()]
+    return _straight_rank_bits
+
+_NO_COMBINATION = ComboInfo(None, None, None, 0)
+
+def classify_mask(mask):
+    return (_combination_table or combination_table()).get(mask, _NO_COMBINATION)
+
+def get_combination_info(tiles):
+    if not tiles: return (None, None)
+    mask = 0
+    for tile in tiles: mask |= 1 << tile.id
+    # 같은 타일을 두 번 낸 경우는 조합이 아니다
+    if mask.bit_count() != len(tiles): return _NO_COMBINATION
+    return (_combination_table or combination_table()).get(mask, _NO_COMBINATION)
+
 def is_stronger_combination(new_combo_info, last_combo_info):
     if last_combo_info[0] is None: return True
-    new_name, last_name = new_combo_info[0], last_combo_info[0]
-    new_tile, last_tile = new_combo_info[1], last_combo_info[1]
-    if new_name == '플러쉬' and last_name == '플러쉬':
-        for i in range(5):
-            new_card_strength = Tile.rank_strength[new_tile[i].rank]
-            last_card_strength = Tile.rank_strength[last_tile[i].rank]
-            if new_card_strength > last_card_strength: return True
-            if new_card_strength < last_card_strength: return False
-        new_suit_power = Tile.suit_power[new_tile[0].suit]
-        last_suit_power = Tile.suit_power[last_tile[0].suit]
-        return new_suit_power > last_suit_power
-    new_rank, last_rank = combination_ranking.get(new_name, 0), combination_ranking.get(last_name, 0)
-    if new_rank > last_rank: return True
-    if new_rank == last_rank and not isinstance(new_tile, tuple): return new_tile > last_tile
-    return False
+    try: new_key, last_key = new_combo_info.key, last_combo_info.key
+    except AttributeError: new_key, last_key = combination_key(new_combo_info), combination_key(last_combo_info)
+    return new_key is not None and new_key > last_key
+
+# ===================================================================
+# 합법 수 생성: 손패로 바닥 패를 이길 수 있는 조합을 약한 것부터 차례로 만든다
+# ===================================================================
+def _five_tile_masks(by_rank, by_suit):
+    masks = set()
+    present = 0 # 손패에 있는 숫자 서열 비트
+    for r, bits in enumerate(by_rank):
+        if bits: present |= 1 << r
+    for rank_set, rank_bits in _straight_rank_bits or _build_straight_rank_bits():
+        if rank_bits & ~present: continue
+        for chosen in product(*[by_rank[r] for r in rank_set]): masks.add(sum(chosen))
+    for suited in by_suit:
+        if len(suited) >= 5:
+            for chosen in combinations(suited, 5): masks.add(sum(chosen))
+    triples = [sum(c) for bits in by_rank if len(bits) >= 3 for c in combinations(bits, 3)]
+    if triples:
+        for r, bits in enumerate(by_rank):
+            if len(bits) < 2: continue
+            for pair in combinations(bits, 2):
+                pair_mask = sum(pair)
+                for triple_mask in triples:
+                    if not triple_mask & (0b1111 << (r * 4)): masks.add(triple_mask | pair_mask)
+    for r, bits in enumerate(by_rank):
+        if len(bits) == 4:
+            quad_mask = sum(bits)
+            for other in by_rank[:r] + by_rank[r + 1:]:
+                for bit in other: masks.add(quad_mask | bit)
+    return masks
+
+def legal_moves(hand, last_combo_info=(None, None)):
+    hand_mask = hand if isinstance(hand, int) else tiles_to_mask(hand)
+    table = _combination_table or combination_table()
+    last_key = combination_key(last_combo_info) if last_combo_info[0] is not None else -1
+    min_class = last_key >> 24 if last_key >= 0 else 0
+
+    by_rank = [[] for _ in RANKS]
+    by_suit = [[] for _ in SUITS]
+    mask = hand_mask
+    while mask:
+        low = mask & -mask
+        tile_id = low.bit_length() - 1
+        by_rank[tile_id >> 2].append(low); by_suit[tile_id & 3].append(low)
+        mask ^= low
+
+    # 싱글/페어/트리플: 숫자 서열 순으로 만들면 키 순서와 거의 같으므로 조합 종류별로 정렬만 한다
+    for size in (1, 2, 3):
+        if size < min_class: continue
+        moves = [table[sum(c)] for bits in by_rank if len(bits) >= size for c in combinations(bits, size)]
+        moves.sort(key=lambda info: info.key)
+        for info in moves:
+            if info.key > last_key: yield info
+
+    # 5장 조합은 처음 필요할 때 만들어 손패마다 캐시에 둔다
+    keys, moves = _five_tile_moves(hand_mask, by_rank, by_suit)
+    for i in range(bisect_right(keys, last_key), len(moves)): yield moves[i]
+
+# 손패 마스크 -> (키 목록, 키 순으로 정렬한 5장 조합). 손패는 자기 차례에 낼 때만 바뀌므로 같은 손패를 여러 번 묻는다.
+_five_tile_cache = {}
+FIVE_TILE_CACHE_SIZE = 1 << 14
+_NO_FIVE_TILE_MOVES = ([], [])
+
+def _five_tile_moves(hand_mask, by_rank=None, by_suit=None):
+    cached = _five_tile_cache.get(hand_mask)
+    if cached is not None: return cached
+    if hand_mask.bit_count() < 5: return _NO_FIVE_TILE_MOVES
+    if by_rank is None:
+        by_rank, by_suit = [[] for _ in RANKS], [[] for _ in SUITS]
+        mask = hand_mask
+        while mask:
+            low = mask & -mask
+            tile_id = low.bit_length() - 1
+            by_rank[tile_id >> 2].append(low); by_suit[tile_id & 3].append(low)
+            mask ^= low
+    table = _combination_table or combination_table()
+    moves = sorted((table[m] for m in _five_tile_masks(by_rank, by_suit)), key=lambda info: info.key)
+    if len(_five_tile_cache) >= FIVE_TILE_CACHE_SIZE: _five_tile_cache.clear()
+    cached = _five_tile_cache[hand_mask] = ([info.key for info in moves], moves)
+    return cached
+
+# legal_moves 의 첫 수(바닥을 이기는 가장 약한 조합)를 조합을 다 만들지 않고 바로 찾는다. 없으면 None.
+# 싱글/페어/트리플의 키는 대표 타일(가장 센 타일) id 라서, 숫자 서열 순으로 그 숫자의 타일 비트만 보면 된다:
+# size 장 조합 중 대표 타일이 가장 약한 것은 아래 size - 1 장 + 조건을 넘는 가장 약한 타일이다.
+def lowest_move(hand, last_combo_info=(None, None)):
+    hand_mask = hand if isinstance(hand, int) else tiles_to_mask(hand)
+    if not hand_mask: return None
+    table = _combination_table or combination_table()
+    last_key = combination_key(last_combo_info) if last_combo_info[0] is not None else -1
+    min_class = last_key >> 24 if last_key >= 0 else 0
+    if min_class <= 1:
+        above = last_key & 0xFFFFFF if min_class == 1 else -1
+        higher = hand_mask >> (above + 1) << (above + 1)
+        if higher: return table[higher & -higher]
+    for size in (2, 3):
+        if size < min_class: continue
+        above = last_key & 0xFFFFFF if size == min_class else -1 # 같은 종류면 대표 타일 id 가 이보다 커야 한다
+        for r in range(max(0, above >> 2), len(RANKS)):
+            nibble = hand_mask >> (r * 4) & 15
+            if nibble.bit_count() < size: continue
+            low, bits = 0, nibble
+            for _ in range(size - 1):
+                bit = bits & -bits
+                low |= bit
+                bits ^= bit
+            while bits:
+                bit = bits & -bits
+                if r * 4 + bit.bit_length() - 1 > above: return table[(low | bit) << (r * 4)]
+                bits ^= bit
+    keys, moves = _five_tile_moves(hand_mask)
+    i = bisect_right(keys, last_key)
+    return moves[i] if i < len(moves) else None
+
+def has_legal_move(hand, last_combo_info=(None, None)):
+    return lowest_move(hand, last_combo_info) is not None
+
+# ===================================================================
+# 규칙 설정과 라운드 정산
+# ===================================================================
+def tiles_per_player(num_players):
+    if num_players == 3: return 12
+    elif num_players == 4: return 13
+    else: return 12
+
+# 남은 장 수가 적은 플레이어가 많은 플레이어에게서 차이만큼 받는다. 승자는 2를 쥔 상대에게 두 배를 받는다.
+# 반환값: (낸 사람, 받은 사람, 금액) 목록
+def settle_round(final_card_counts, holds_two, winner_index):
+    num_players = len(final_card_counts)
+    payments = []
+    for i in range(num_players):
+        for j in range(num_players):
+            if i == j: continue
+            if final_card_counts[j] > final_card_counts[i]:
+                payment_amount = final_card_counts[j] - final_card_counts[i]
+                if i == winner_index and holds_two[j]: payment_amount *= 2
+                payments.append((j, i, payment_amount))
+    return payments
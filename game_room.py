@@ -0,0 +1,332 @@
+# game_room.py
+import random
+import secrets
+import time
+
+from game_logic import TILES, Tile, combination_ranking, get_combination_info, mask_to_tiles, settle_round, tiles_per_player, tiles_to_mask
+
+# ===================================================================
+# 게임 로그: JSON 으로는 지금까지와 같은 한국어 문장이고, 압축 프로토콜(wire.py)은 메시지 번호와 인자만 보낸다
+# ===================================================================
+# 번호와 인자는 main.js 의 LOG_FORMATS 와 맞춘다. 저장했다가 되살린 로그는 평범한 문자열이라 문장 그대로 보낸다.
+LOG_ROUND_START, LOG_PLAY, LOG_PASS = 0, 1, 2
+COMBINATION_NAMES = {rank: name for name, rank in combination_ranking.items()}
+LOG_FORMATS = {
+    LOG_ROUND_START: lambda round_number: f"라운드 {round_number} 시작!",
+    LOG_PLAY: lambda seat, rank, combo: f"P{seat + 1}: {rank} {COMBINATION_NAMES[combo]}을(를) 냈습니다.",
+    LOG_PASS: lambda seat: f"P{seat + 1}: 패스했습니다.",
+}
+
+class LogLine(str):
+    def __new__(cls, code, *params):
+        line = super().__new__(cls, LOG_FORMATS[code](*params))
+        line.code, line.params = code, params
+        return line
+
+    def __reduce__(self): return (LogLine, (self.code, *self.params)) # 메시지 큐(cluster.py)로 보낼 때 pickle 된다
+
+# ===================================================================
+# 게임 방(테이블): 테이블마다 독립된 게임 상태를 가진다
+# ===================================================================
+class GameRoom:
+    starting_money = 48
+
+    def __init__(self, room_id):
+        self.room_id = room_id
+        self.players = {}
+        self.game_state = {}
+        self.player_money = []
+        self.round_number = 1
+        self.num_players = 0
+        self.tiles_per_player = 0
+        self.version = 0
+        self.bots = {}
+        self.is_game_over = False
+        self.tokens = {}       # seat -> 재접속 토큰
+        self.disconnected = {} # seat -> 접속이 끊긴 시각 (유예 시간 안에 토큰으로 돌아올 수 있다)
+        self.turn_deadline = None # 지금 차례의 마감 시각 (time.monotonic 기준)
+        self.identities = {}   # seat -> 레이팅을 매기는 플레이어 id (ratings.py). 저장하지 않고 재접속할 때 다시 받는다
+
+    def configure(self, num_players):
+        self.num_players = num_players
+        self.tiles_per_player = tiles_per_player(num_players)
+
+    def seated_count(self): return len(self.tokens) + len(self.bots)
+
+    def is_full(self): return self.num_players != 0 and self.seated_count() >= self.num_players
+
+    # 봇은 뒷자리부터 앉히고, 사람은 add_player 로 앞자리부터 채운다
+    def seat_bots(self, bots):
+        for bot in bots[:self.num_players - len(self.tokens)]:
+            self.bots[self.num_players - 1 - len(self.bots)] = bot
+
+    def free_seat(self):
+        player_num = 0
+        while player_num in self.tokens or player_num in self.bots: player_num += 1
+        return player_num
+
+    def add_player(self, sid):
+        player_num = self.free_seat()
+        self.players[sid] = player_num
+        self.tokens[player_num] = secrets.token_urlsafe(16)
+        return player_num
+
+    # 매치메이킹으로 잡힌 자리: 토큰만 만들어 두고, 플레이어가 그 토큰으로 접속하면 reconnect 로 앉는다
+    def reserve_seat(self):
+        player_num = self.free_seat()
+        self.tokens[player_num] = secrets.token_urlsafe(16)
+        self.disconnected[player_num] = time.monotonic()
+        return player_num
+
+    # 접속이 끊겨도 자리는 비우지 않고 토큰으로 다시 앉을 수 있게 남겨 둔다
+    def disconnect_player(self, sid):
+        seat = self.players.pop(sid, None)
+        if seat is not None: self.disconnected[seat] = time.monotonic()
+        return seat
+
+    def reconnect(self, sid, token):
+        seat = next((seat for seat, seat_token in self.tokens.items() if seat_token == token), None)
+        if seat is None or seat not in self.disconnected: return None
+        del self.disconnected[seat]
+        self.players[sid] = seat
+        return seat
+
+    def start_new_game(self, is_first_game=True):
+        suits, ranks = ["cloud", "star", "moon", "sun"], list(range(1, 16))
+        deck = [Tile(suit, rank) for suit in suits for rank in ranks]
+        random.shuffle(deck)
+        player_hands = [[] for _ in range(self.num_players)]
+        for _ in range(self.tiles_per_player):
+            for i in range(self.num_players): player_hands[i].append(deck.pop())
+        for hand in player_hands: hand.sort()
+
+        start_player_index = random.randint(0, self.num_players - 1)
+        starting_tile = Tile("cloud", 3)
+        for i, hand in enumerate(player_hands):
+            if starting_tile in hand:
+                start_player_index = i
+                break
+        self.deal(player_hands, start_player_index, is_first_game)
+
+    # 나눠 준 패로 라운드를 시작한다. 저장된 이벤트를 다시 재생할 때도 이 함수를 쓴다.
+    def deal(self, player_hands, start_player_index, is_first_game):
+        if is_first_game:
+            self.player_money = [self.starting_money] * self.num_players
+            self.round_number = 1
+            self.is_game_over = False
+        else:
+            self.round_number += 1
+        self.version += 1
+
+        self.game_state = {
+            "player_hands": player_hands, "current_player_index": start_player_index,
+            "last_played_hand_info": (None, None), "last_played_tiles": [],
+            "players_who_passed_this_round": [], "last_player_to_act_index": start_player_index,
+            "game_log": [LogLine(LOG_ROUND_START, self.round_number)], "played_mask": 0
+        }
+
+    def add_log(self, log_message):
+        game_log = self.game_state['game_log']
+        game_log.append(log_message)
+        if len(game_log) > 15: game_log.pop(0)
+
+    # 검증이 끝난 패를 상태에 반영한다. 손패가 남아 있으면 다음 차례로 넘긴다.
+    def apply_play(self, player_num, tiles, combo_info=None):
+        game_state = self.game_state
+        combo_info = combo_info or get_combination_info(tiles)
+        combo_name, rep_info = combo_info
+        rep_rank = rep_info[0].rank if isinstance(rep_info, tuple) else rep_info.rank
+        log_message = LogLine(LOG_PLAY, player_num, rep_rank, combination_ranking[combo_name])
+        self.add_log(log_message)
+        game_state.update({
+            'last_played_hand_info': combo_info,
+            'last_played_tiles': tiles,
+            'last_player_to_act_index': player_num
+        })
+        game_state['played_mask'] |= tiles_to_mask(tiles)
+        current_hand = game_state['player_hands'][player_num]
+        for tile in tiles:
+            if tile in current_hand: current_hand.remove(tile)
+        if current_hand: self.advance_turn()
+        return log_message
+
+    # 패스를 반영하고, 한 명만 남으면 판을 비운다. (로그, 판을 비웠는지) 를 돌려준다.
+    def apply_pass(self, player_num):
+        game_state = self.game_state
+        game_state['players_who_passed_this_round'].append(player_num)
+        log_message = LogLine(LOG_PASS, player_num)
+        self.add_log(log_message)
+        cleared = (self.num_players - len(game_state['players_who_passed_this_round'])) <= 1
+        if cleared:
+            game_state.update({'last_played_hand_info': (None, None), 'last_played_tiles': [], 'players_who_passed_this_round': [], 'current_player_index': game_state['last_player_to_act_index']})
+        else:
+            self.advance_turn()
+        return log_message, cleared
+
+    def settle_round(self, winner_index):
+        player_hands, player_money = self.game_state['player_hands'], self.player_money
+        final_card_counts = [len(hand) for hand in player_hands]
+        holds_two = [any(tile.rank == 2 for tile in hand) for hand in player_hands]
+        payments = []
+        for payer, payee, payment_amount in settle_round(final_card_counts, holds_two, winner_index):
+            player_money[payee] += payment_amount
+            player_money[payer] -= payment_amount
+            payments.append(f"P{payer + 1} → P{payee + 1}에게 {payment_amount}원 지불")
+        return payments, any(money <= 0 for money in player_money)
+
+    def get_final_rankings(self):
+        player_money = self.player_money
+        survivors = sorted([(money, i + 1) for i, money in enumerate(player_money) if money > 0], reverse=True)
+        bankrupt_players = [i + 1 for i, money in enumerate(player_money) if money <= 0]
+        ranking_text = [f"{rank + 1}등: P{p_num} ({money}원)" for rank, (money, p_num) in enumerate(survivors)]
+        return {'rankings': ranking_text, 'bankrupt': [str(p) for p in bankrupt_players]}
+
+    def advance_turn(self):
+        game_state = self.game_state
+        if not game_state: return
+        next_player = (game_state['current_player_index'] + 1) % self.num_players
+        for _ in range(self.num_players):
+            if next_player not in game_state['players_who_passed_this_round']:
+                game_state['current_player_index'] = next_player
+                return
+            next_player = (next_player + 1) % self.num_players
+
+    def reset(self):
+        self.players.clear(); self.game_state.clear(); self.num_players = 0
+        self.bots.clear(); self.is_game_over = False; self.version += 1
+        self.tokens.clear(); self.disconnected.clear(); self.turn_deadline = None
+        self.identities.clear()
+
+    # 저장용 스냅샷: JSON 으로 바로 쓸 수 있게 타일은 마스크로, dict 키는 [seat, 값] 목록으로 바꾼다
+    def to_snapshot(self):
+        game_state = self.game_state
+        snapshot = {
+            'num_players': self.num_players, 'tiles_per_player': self.tiles_per_player,
+            'player_money': self.player_money, 'round_number': self.round_number,
+            'version': self.version, 'is_game_over': self.is_game_over,
+            'bots': [[seat, bot.name] for seat, bot in self.bots.items()],
+            'tokens': [[seat, token] for seat, token in self.tokens.items()],
+            'game_state': None,
+        }
+        if game_state:
+            snapshot['game_state'] = {
+                'player_hands': [tiles_to_mask(hand) for hand in game_state['player_hands']],
+                'current_player_index': game_state['current_player_index'],
+                'last_player_to_act_index': game_state['last_player_to_act_index'],
+                'players_who_passed_this_round': game_state['players_who_passed_this_round'],
+                'last_played_tiles': [tile.id for tile in game_state['last_played_tiles']],
+                'game_log': game_state['game_log'], 'played_mask': game_state['played_mask'],
+            }
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, room_id, snapshot, make_bot):
+        room = cls(room_id)
+        room.num_players, room.tiles_per_player = snapshot['num_players'], snapshot['tiles_per_player']
+        room.player_money, room.round_number = list(snapshot['player_money']), snapshot['round_number']
+        room.version, room.is_game_over = snapshot['version'], snapshot['is_game_over']
+        room.bots = {seat: make_bot(name) for seat, name in snapshot['bots']}
+        room.tokens = {seat: token for seat, token in snapshot['tokens']}
+        game_state = snapshot['game_state']
+        if game_state:
+            last_played_tiles = [TILES[tile_id] for tile_id in game_state['last_played_tiles']]
+            room.game_state = {
+                'player_hands': [mask_to_tiles(mask) for mask in game_state['player_hands']],
+                'current_player_index': game_state['current_player_index'],
+                'last_player_to_act_index': game_state['last_player_to_act_index'],
+                'players_who_passed_this_round': list(game_state['players_who_passed_this_round']),
+                'last_played_hand_info': get_combination_info(last_played_tiles) if last_played_tiles else (None, None),
+                'last_played_tiles': last_played_tiles,
+                'game_log': list(game_state['game_log']), 'played_mask': game_state['played_mask'],
+            }
+        return room
+
+    # 모든 플레이어에게 공통인 공개 상태: 다른 사람의 패는 장 수만 보낸다
+    def public_state(self):
+        game_state = self.game_state
+        return {
+            'version': self.version,
+            'hand_counts': [len(hand) for hand in game_state['player_hands']],
+            'current_player_index': game_state['current_player_index'],
+            'last_player_to_act_index': game_state['last_player_to_act_index'],
+            'players_who_passed_this_round': game_state['players_who_passed_this_round'],
+            'last_played_tiles': [tile.to_dict() for tile in game_state['last_played_tiles']],
+            'last_played_hand_info': combo_info_to_dict(game_state['last_played_hand_info']),
+            'game_log': game_state['game_log'],
+            'player_money': self.player_money,
+            'turn_seconds_left': None if self.turn_deadline is None else max(0.0, round(self.turn_deadline - time.monotonic(), 1)),
+        }
+
+    # 관전자용: 게임이 없을 때도 보낼 수 있게 방 정보를 더한다 (손패는 public_state 처럼 장 수만)
+    def spectator_view(self):
+        view = self.public_state() if self.game_state else {'version': self.version}
+        view.update({'room': self.room_id, 'num_players': self.num_players, 'round_number': self.round_number, 'is_game_over': self.is_game_over})
+        return view
+
+    # 자기 자리의 패는 그 플레이어의 sid 로만 보낸다
+    def private_hand(self, seat):
+        return {'v': self.version, 'seat': seat, 'hand': [tile.to_dict() for tile in self.game_state['player_hands'][seat]]}
+
+    def next_patch(self, **changes):
+        self.version += 1
+        changes['v'] = self.version
+        return changes
+
+def combo_info_to_dict(combo_info):
+    combo_name, rep_info = combo_info
+    if isinstance(rep_info, tuple): rep_info_dict = [tile.to_dict() for tile in rep_info]
+    elif isinstance(rep_info, Tile): rep_info_dict = rep_info.to_dict()
+    else: rep_info_dict = None
+    return (combo_name, rep_info_dict)
+
+# ===================================================================
+# 방 관리자: room id -> GameRoom, sid -> room id
+# ===================================================================
+class RoomManager:
+    def __init__(self):
+        self.rooms = {}
+        self.sid_to_room = {}
+        self.members = {}
+
+    def __len__(self): return len(self.rooms)
+
+    def get(self, room_id): return self.rooms.get(room_id)
+
+    # 접속자 없이 방을 만든다 (매치메이킹으로 잡힌 테이블)
+    def open(self, room_id):
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = GameRoom(room_id)
+            self.members[room_id] = set()
+        return room
+
+    def join(self, sid, room_id):
+        room = self.open(room_id)
+        self.sid_to_room[sid] = room_id
+        self.members[room_id].add(sid)
+        return room
+
+    def room_of(self, sid):
+        room_id = self.sid_to_room.get(sid)
+        return self.rooms.get(room_id) if room_id is not None else None
+
+    def leave(self, sid):
+        room_id = self.sid_to_room.pop(sid, None)
+        if room_id is None: return None
+        members = self.members.get(room_id)
+        if members is not None: members.discard(sid)
+        return self.drop_if_empty(room_id) or self.rooms.get(room_id)
+
+    # 남은 접속자도 없고 돌아올 플레이어도 없는 방만 지운다. 지운 방을 돌려준다.
+    def drop_if_empty(self, room_id):
+        room = self.rooms.get(room_id)
+        if room is None or self.members.get(room_id) or room.disconnected: return None
+        self.members.pop(room_id, None)
+        return self.rooms.pop(room_id)
+
+    # 저장소에서 복구한 방을 등록한다 (접속자는 아직 없다)
+    def restore(self, room):
+        self.rooms[room.room_id] = room
+        self.members.setdefault(room.room_id, set())
+
+    def player_count(self): return sum(len(room.players) for room in self.rooms.values())
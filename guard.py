@@ -0,0 +1,164 @@
+# guard.py
+import re
+import time
+
+from bots import BOTS
+from game_logic import TILES
+import wire
+
+# ===================================================================
+# 소켓 이벤트 앞단: 연결(sid)·IP 별 토큰 버킷과 페이로드 모양 검사
+# ===================================================================
+# app.py 의 핸들러는 방의 주인 워커로 넘기기(route) 전에 check() 를 지난다. 규칙 코드는 건드리지 않고
+# 정해진 횟수의 dict/타입 확인만 하므로 페이로드 크기와 상관없이 비용이 일정하다.
+#  - 이벤트마다 비용(EVENT_COSTS)을 sid 버킷과 IP 버킷에서 같이 뺀다. 모자라면 그 이벤트를 버린다(mute).
+#  - 모양/범위가 틀린 페이로드도 버린다. 버릴 때마다 경고(strike)를 하나 쌓고, STRIKE_LIMIT 에 닿으면 app.py 가 끊는다.
+#  - play_hand 의 타일은 중복 없는 타일 id 목록으로, request_start_game 의 값은 정수로 바꿔서 넘긴다.
+#  - 연결할 때의 auth/query 는 check_connect() 가 본다. 이건 guard 를 꺼도(LEXIO_GUARD=0) 늘 검사한다.
+# 같은 IP 에서 새 연결을 여는 것도 따로 버킷(connects)으로 막는다 (끊겨도 바로 새 sid 로 돌아오지 못하게).
+SID_RATE, SID_BURST = 5, 20         # 연결 하나: 초당 5, 한 번에 20 까지
+IP_RATE, IP_BURST = 20, 60          # 같은 IP 의 연결 전체 (탭 여러 개, 같은 공유기)
+CONNECT_RATE, CONNECT_BURST = 1, 10 # 같은 IP 의 새 연결
+STRIKE_LIMIT = 30
+PRUNE_EVERY = 1024 # 새 연결이 이만큼 들어올 때마다 가득 찬(오래 조용한) 버킷을 지운다
+MAX_PLAY_TILES = 5
+EVENT_COSTS = {
+    'play_hand': 1, 'pass_turn': 1, 'request_resync': 2, 'request_start_game': 3,
+    'request_new_game': 5, 'join_queue': 2, 'leave_queue': 1,
+}
+NAME_PATTERN = re.compile(r'[A-Za-z0-9_.-]{1,64}') # 방 이름, 재접속 토큰 (secrets.token_urlsafe)
+CONNECT_KEYS = {'room', 'token', 'player', 'wire', 'watch'}
+WIRES = {wire.WIRE_NAME}
+MAX_PLAYER_SECRET = 128 # ratings.player_id 와 같다
+TILE_IDS = {(tile.suit, tile.rank): tile.id for tile in TILES}
+
+class TokenBuckets:
+    def __init__(self, rate, burst):
+        self.rate, self.burst = rate, burst
+        self.buckets = {} # key -> [남은 토큰, 마지막으로 채운 시각]
+
+    def __len__(self): return len(self.buckets)
+
+    def take(self, key, cost, now):
+        bucket = self.buckets.get(key)
+        if bucket is None: bucket = self.buckets[key] = [self.burst, now]
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < cost:
+            bucket[0] = tokens
+            return False
+        bucket[0] = tokens - cost
+        return True
+
+    def discard(self, key): self.buckets.pop(key, None)
+
+    # 지금쯤 가득 찼을 버킷은 지워도 같다 (다시 만들면 가득 찬 채로 시작한다)
+    def prune(self, now):
+        full = [key for key, (tokens, stamp) in self.buckets.items() if tokens + (now - stamp) * self.rate >= self.burst]
+        for key in full: del self.buckets[key]
+
+# ===================================================================
+# 페이로드 검사: 정규화한 인자 튜플, 틀리면 None
+# ===================================================================
+# 브라우저의 <select> 값은 문자열로 오므로 짧은 숫자 문자열도 정수로 받는다
+def small_int(value, low, high):
+    if isinstance(value, str) and 0 < len(value) <= 2 and value.isascii() and value.isdigit(): value = int(value)
+    if type(value) is not int or not low <= value <= high: return None
+    return value
+
+def no_payload(args): return () if not args else None
+
+# 타일은 id(압축 프로토콜 클라이언트) 또는 {'suit', 'rank'}
+def check_play_hand(args):
+    if len(args) != 1 or type(args[0]) is not list or not 0 < len(args[0]) <= MAX_PLAY_TILES: return None
+    ids, mask = [], 0
+    for tile in args[0]:
+        if type(tile) is int: tile_id = tile if 0 <= tile < len(TILES) else None
+        elif type(tile) is dict and len(tile) == 2 and type(tile.get('suit')) is str and type(tile.get('rank')) is int:
+            tile_id = TILE_IDS.get((tile['suit'], tile['rank']))
+        else: return None
+        if tile_id is None or mask >> tile_id & 1: return None
+        mask |= 1 << tile_id
+        ids.append(tile_id)
+    return (ids,)
+
+def check_start_game(args):
+    if len(args) != 1 or type(args[0]) is not dict or len(args[0]) > 3: return None
+    data = args[0]
+    num_players = small_int(data.get('num_players', 3), 3, 5)
+    if num_players is None: return None
+    bots = small_int(data.get('bots', 0), 0, num_players - 1)
+    bot_level = data.get('bot_level')
+    if bots is None or (bot_level is not None and (type(bot_level) is not str or bot_level not in BOTS)): return None
+    return ({'num_players': num_players, 'bots': bots, 'bot_level': bot_level},)
+
+# 인원수 범위(QUEUE_SIZES)는 핸들러가 안내 메시지와 함께 확인한다
+def check_join_queue(args):
+    if len(args) != 1 or type(args[0]) is not dict or len(args[0]) > 1: return None
+    size = small_int(args[0].get('num_players', 3), 0, 99)
+    return None if size is None else ({'num_players': size},)
+
+def name_or_none(value): return value if value is None or (type(value) is str and NAME_PATTERN.fullmatch(value)) else False
+
+# 연결: (방 이름 또는 None, 토큰, 압축 프로토콜 여부, 플레이어 비밀 값, 관전 여부). auth 는 dict 또는 None, args 는 query.
+def check_connect(auth, args):
+    if auth is None: auth = {}
+    if type(auth) is not dict or not CONNECT_KEYS.issuperset(auth): return None
+    room, token = name_or_none(auth.get('room') or args.get('room') or None), name_or_none(auth.get('token'))
+    player, wire_name, watch = auth.get('player'), auth.get('wire'), auth.get('watch', False)
+    if room is False or token is False or type(watch) is not bool: return None
+    if player is not None and (type(player) is not str or not 0 < len(player) <= MAX_PLAYER_SECRET): return None
+    if wire_name is not None and (type(wire_name) is not str or wire_name not in WIRES): return None
+    return (room, token, wire_name is not None, player, watch or args.get('watch') == '1')
+
+VALIDATORS = {
+    'play_hand': check_play_hand, 'pass_turn': no_payload, 'request_resync': no_payload,
+    'request_start_game': check_start_game, 'request_new_game': no_payload,
+    'join_queue': check_join_queue, 'leave_queue': no_payload,
+}
+
+# ===================================================================
+# 연결별 상태
+# ===================================================================
+class Guard:
+    # clock 은 벤치마크가 가상 시간으로 바꿔 끼울 수 있게 둔다
+    def __init__(self, enabled=True, clock=time.monotonic):
+        self.enabled, self.clock = enabled, clock
+        self.sids = TokenBuckets(SID_RATE, SID_BURST)
+        self.ips = TokenBuckets(IP_RATE, IP_BURST)
+        self.connects = TokenBuckets(CONNECT_RATE, CONNECT_BURST)
+        self.addresses = {} # sid -> ip
+        self.strikes = {}   # sid -> 경고 수
+        self.connections = 0
+
+    # 새 연결을 받을지
+    def connect(self, sid, ip):
+        if not self.enabled: return True
+        now = self.clock()
+        self.connections += 1
+        if self.connections % PRUNE_EVERY == 0:
+            for buckets in (self.ips, self.connects): buckets.prune(now)
+        if not self.connects.take(ip, 1, now): return False
+        self.addresses[sid] = ip
+        return True
+
+    def disconnect(self, sid):
+        self.addresses.pop(sid, None)
+        self.strikes.pop(sid, None)
+        self.sids.discard(sid)
+
+    # (정규화한 인자, 거절 이유) 를 돌려준다. 이유가 None 이 아니면 핸들러를 부르지 않는다.
+    def check(self, sid, event, args):
+        if not self.enabled: return args, None
+        now, cost = self.clock(), EVENT_COSTS[event]
+        if not self.sids.take(sid, cost, now) or not self.ips.take(self.addresses.get(sid), cost, now):
+            return None, self.strike(sid, 'rate_limited')
+        args = VALIDATORS[event](args)
+        if args is None: return None, self.strike(sid, 'invalid')
+        return args, None
+
+    def strike(self, sid, reason):
+        self.strikes[sid] = self.strikes.get(sid, 0) + 1
+        return reason
+
+    def should_disconnect(self, sid): return self.strikes.get(sid, 0) >= STRIKE_LIMIT
@@ -0,0 +1,142 @@
+# lobby.py
+import random
+import time
+from collections import OrderedDict, deque
+
+# ===================================================================
+# 매치메이킹 로비: 인원수별 대기열을 일정 주기마다 한꺼번에 테이블로 묶는다
+# ===================================================================
+# 대기열은 인원수(3/4/5) -> 레이팅 구간(bucket) -> 들어온 순서의 OrderedDict 이다.
+# match() 는 가장 오래 기다린 사람이 맨 앞에 있는 구간부터, 그 사람의 구간 ±window 안에서 size 명을 모은다.
+# window 는 기다린 시간에 따라 넓어져서 레이팅이 드문 사람도 결국 테이블을 얻는다.
+# 한 번의 match() 비용은 (만들어진 테이블 수 + 구간 수) 에 비례하고 대기 인원 수와는 관계없다.
+QUEUE_SIZES = (3, 4, 5)
+DEFAULT_RATING = 1500
+
+class QueueEntry:
+    __slots__ = ('player_id', 'size', 'rating', 'bucket', 'since')
+
+    def __init__(self, player_id, size, rating, bucket, since):
+        self.player_id, self.size, self.rating, self.bucket, self.since = player_id, size, rating, bucket, since
+
+class Lobby:
+    # bucket_width=None 이면 레이팅을 보지 않고 들어온 순서대로만 묶는다
+    def __init__(self, bucket_width=100, widen_every=10.0, max_window=10, sample_capacity=4096):
+        self.bucket_width, self.widen_every, self.max_window = bucket_width, widen_every, max_window
+        self.queues = {size: {} for size in QUEUE_SIZES} # size -> bucket -> OrderedDict(player_id -> QueueEntry)
+        self.entries = {}                                 # player_id -> QueueEntry
+        self.waiting = dict.fromkeys(QUEUE_SIZES, 0)
+        self.tables = dict.fromkeys(QUEUE_SIZES, 0)
+        self.waits = {size: deque(maxlen=sample_capacity) for size in QUEUE_SIZES} # 최근 테이블이 잡히기까지 걸린 시간
+
+    def __len__(self): return len(self.entries)
+
+    def __contains__(self, player_id): return player_id in self.entries
+
+    def bucket_of(self, rating):
+        if self.bucket_width is None: return 0
+        return int((DEFAULT_RATING if rating is None else rating) // self.bucket_width)
+
+    # 기다린 시간에 따라 양옆으로 몇 구간까지 볼지
+    def window(self, waited): return min(self.max_window, int(waited / self.widen_every))
+
+    # 이미 줄을 서 있으면 새 조건으로 다시 선다 (기다린 시간은 처음부터)
+    def enqueue(self, player_id, size, rating=None, now=None):
+        if size not in self.queues: raise ValueError(f"unsupported table size: {size}")
+        self.cancel(player_id)
+        now = time.monotonic() if now is None else now
+        entry = QueueEntry(player_id, size, rating, self.bucket_of(rating), now)
+        self.queues[size].setdefault(entry.bucket, OrderedDict())[player_id] = entry
+        self.entries[player_id] = entry
+        self.waiting[size] += 1
+        return entry
+
+    def cancel(self, player_id):
+        entry = self.entries.pop(player_id, None)
+        if entry is None: return None
+        buckets = self.queues[entry.size]
+        queue = buckets[entry.bucket]
+        del queue[player_id]
+        if not queue: del buckets[entry.bucket]
+        self.waiting[entry.size] -= 1
+        return entry
+
+    # 묶인 테이블 목록 [(size, [QueueEntry])] 을 돌려준다. 묶인 사람은 대기열에서 빠진다.
+    def match(self, now=None):
+        now = time.monotonic() if now is None else now
+        tables = []
+        for size, buckets in self.queues.items():
+            if self.waiting[size] < size: continue
+            for bucket in sorted(buckets, key=lambda b: next(iter(buckets[b].values())).since):
+                while bucket in buckets:
+                    anchor = next(iter(buckets[bucket].values()))
+                    picked = self.gather(buckets, bucket, self.window(now - anchor.since), size)
+                    if picked is None: break
+                    tables.append((size, self.seat(size, picked, now)))
+        return tables
+
+    # 가까운 구간부터 들어온 순서대로 size 명을 꺼낸다. 모자라면 아무것도 꺼내지 않는다.
+    def gather(self, buckets, center, window, size):
+        near = [center] + [b for d in range(1, window + 1) for b in (center - d, center + d) if b in buckets]
+        if sum(len(buckets[b]) for b in near) < size: return None
+        picked = []
+        for b in near:
+            queue = buckets[b]
+            while queue and len(picked) < size: picked.append(queue.popitem(last=False)[1])
+            if not queue: del buckets[b]
+            if len(picked) == size: break
+        return picked
+
+    def seat(self, size, picked, now):
+        waits = self.waits[size]
+        for entry in picked:
+            del self.entries[entry.player_id]
+            waits.append(now - entry.since)
+        self.waiting[size] -= size
+        self.tables[size] += 1
+        return picked
+
+    def stats(self, now=None):
+        now = time.monotonic() if now is None else now
+        result = {}
+        for size, buckets in self.queues.items():
+            waits = sorted(self.waits[size])
+            oldest = min((next(iter(queue.values())).since for queue in buckets.values()), default=now)
+            result[size] = {
+                'waiting': self.waiting[size], 'tables': self.tables[size], 'oldest_wait': round(now - oldest, 3),
+                'p50': percentile(waits, 50), 'p90': percentile(waits, 90), 'p99': percentile(waits, 99),
+            }
+        return result
+
+def percentile(ordered, p):
+    if not ordered: return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 3)
+
+# ===================================================================
+# 도착 시뮬레이터: 가상 시간으로 플레이어를 도착시키고 주기마다 match() 를 돌린다
+# ===================================================================
+# 도착은 초당 rate 명의 포아송 과정, 인원수는 size_weights 비율, 레이팅은 정규분포를 따른다.
+# 기다리다 지친 사람(patience 초 이상)은 줄에서 나간다. 벽시계로 잰 match() 비용도 함께 돌려준다.
+def simulate_arrivals(lobby, rate, duration, interval=0.5, size_weights=(5, 3, 2), rating_mean=DEFAULT_RATING,
+                      rating_spread=300, patience=None, seed=1):
+    rng = random.Random(seed)
+    sizes = list(lobby.queues)
+    now, next_arrival, next_player = 0.0, rng.expovariate(rate), 0
+    match_seconds, passes, abandoned = [], 0, 0
+    leave_at = deque()
+    while now < duration:
+        now += interval
+        while next_arrival <= now:
+            size = rng.choices(sizes, size_weights)[0]
+            lobby.enqueue(next_player, size, rng.gauss(rating_mean, rating_spread), next_arrival)
+            if patience is not None: leave_at.append((next_arrival + patience, next_player))
+            next_player += 1
+            next_arrival += rng.expovariate(rate)
+        while leave_at and leave_at[0][0] <= now:
+            if lobby.cancel(leave_at.popleft()[1]) is not None: abandoned += 1
+        start = time.perf_counter()
+        lobby.match(now)
+        match_seconds.append(time.perf_counter() - start)
+        passes += 1
+    return {'arrived': next_player, 'abandoned': abandoned, 'still_waiting': len(lobby), 'stats': lobby.stats(now),
+            'match_ms_mean': sum(match_seconds) / passes * 1000, 'match_ms_max': max(match_seconds) * 1000}
@@ -0,0 +1,91 @@
+# metrics.py
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import deque
+
+# ===================================================================
+# 계측: 핸들러 지연 히스토그램, emit 크기, 게이지, 표본 턴 기록
+# ===================================================================
+# 호출하는 쪽은 `if metrics.enabled:` 한 번만 확인하고 나머지는 여기서 한다. 꺼져 있으면 그 분기 하나가 비용의 전부다.
+# /metrics 는 Prometheus 텍스트 형식으로 내보낸다. 게이지는 긁어 갈 때(scrape)만 계산한다.
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 65536)
+WAIT_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+
+class Histogram:
+    def __init__(self, name, help_text, label, buckets):
+        self.name, self.help_text, self.label, self.buckets = name, help_text, label, buckets
+        self.counts, self.sums = {}, {}
+
+    def observe(self, label_value, value):
+        counts = self.counts.get(label_value)
+        if counts is None:
+            counts = self.counts[label_value] = [0] * (len(self.buckets) + 1)
+            self.sums[label_value] = 0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[label_value] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_value, counts in sorted(self.counts.items()):
+            label, cumulative = f'{self.label}="{label_value}"', 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{label}}} {self.sums[label_value]}")
+            lines.append(f"{self.name}_count{{{label}}} {cumulative}")
+        return lines
+
+class Metrics:
+    def __init__(self, enabled=True, trace_every=50, trace_capacity=256, emit_sample_every=8):
+        self.enabled = enabled
+        self.trace_every, self.emit_sample_every = trace_every, emit_sample_every
+        self.emits = 0
+        self.handler_seconds = Histogram('lexio_handler_seconds', '소켓 이벤트 처리 시간', 'event', LATENCY_BUCKETS)
+        self.emit_bytes = Histogram('lexio_emit_bytes', 'emit 한 번의 JSON 페이로드 크기 (표본)', 'event', SIZE_BUCKETS)
+        self.bot_search_seconds = Histogram('lexio_bot_search_seconds', '봇 한 수의 탐색 시간', 'bot', LATENCY_BUCKETS)
+        self.queue_wait_seconds = Histogram('lexio_queue_wait_seconds', '대기열에 들어와서 테이블이 잡히기까지 걸린 시간', 'size', WAIT_BUCKETS)
+        self.counters = {}
+        self.gauges = []
+        self.traces = deque(maxlen=trace_capacity)
+        self.turns = 0
+
+    def inc(self, name, amount=1): self.counters[name] = self.counters.get(name, 0) + amount
+
+    # fn 은 /metrics 를 요청할 때만 불린다
+    def gauge(self, name, help_text, fn): self.gauges.append((name, help_text, fn))
+
+    def call_handler(self, event, handler, *args):
+        start = time.perf_counter()
+        try: return handler(*args)
+        finally: self.handler_seconds.observe(event, time.perf_counter() - start)
+
+    # socket.io 가 보내는 것과 같은 방식(구분자 없는 JSON)으로 크기를 잰다.
+    # 직렬화를 한 번 더 하는 셈이라 emit_sample_every 번에 한 번만 잰다 (히스토그램은 표본 분포).
+    def observe_emit(self, event, args):
+        self.emits += 1
+        if self.emits % self.emit_sample_every: return
+        self.emit_bytes.observe(event, len(json.dumps(args[0], separators=(',', ':'))) if args else 0)
+
+    # 턴마다 세기만 하고 trace_every 번째 턴만 기록을 남긴다. make_record 는 그때만 불린다.
+    def trace_turn(self, make_record):
+        self.turns += 1
+        if self.turns % self.trace_every: return
+        record = make_record()
+        record['time'] = time.time()
+        self.traces.append(record)
+
+    def render(self):
+        lines = []
+        for histogram in (self.handler_seconds, self.emit_bytes, self.bot_search_seconds, self.queue_wait_seconds): lines += histogram.render()
+        for name, value in sorted(self.counters.items()):
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+        lines += ["# TYPE lexio_turns_total counter", f"lexio_turns_total {self.turns}"]
+        lines += ["# TYPE lexio_emits_total counter", f"lexio_emits_total {self.emits}"]
+        for name, help_text, fn in self.gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {fn()}"]
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics(enabled=os.environ.get('LEXIO_METRICS', '1') != '0')
@@ -0,0 +1,136 @@
+# persistence.py
+import json
+import sqlite3
+import time
+
+from game_logic import mask_to_tiles
+from game_room import GameRoom
+
+# ===================================================================
+# 게임 상태 저장소: 이벤트 로그(append-only) + 주기적인 스냅샷
+# ===================================================================
+# record() 는 메모리 목록에 쌓기만 한다. 쌓인 묶음은 take_pending() 으로 꺼내 write() 로 한 트랜잭션에 쓴다.
+# app.py 는 write() 를 eventlet tpool(OS 스레드)에서 호출하므로 턴 처리 중에는 디스크를 기다리지 않는다.
+#
+# 이벤트 종류 (data 는 JSON):
+#   configure {num_players, bots: [[seat, 봇 이름]]}   seat {seat, token}
+#   deal {hands: [마스크], start, is_first}             play {seat, mask}
+#   pass {seat}                                          settle {winner}
+class NullStore:
+    def record(self, room, kind, **data): pass
+    def snapshot(self, room): pass
+    def drop(self, room_id): pass
+    def take_pending(self): return []
+    def write(self, batch): pass
+    def flush(self): pass
+    def load_rooms(self, make_bot): return {}
+    def close(self): pass
+
+class SqliteStore:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY, room_id TEXT NOT NULL, version INTEGER NOT NULL, kind TEXT NOT NULL, data TEXT NOT NULL);
+        CREATE INDEX IF NOT EXISTS events_room ON events (room_id, id);
+        CREATE TABLE IF NOT EXISTS snapshots (room_id TEXT PRIMARY KEY, event_id INTEGER NOT NULL, data TEXT NOT NULL);
+    """
+
+    def __init__(self, path, snapshot_every=64):
+        self.path, self.snapshot_every = path, snapshot_every
+        # write() 는 tpool 의 아무 스레드에서나 불리지만 한 번에 하나씩만 불린다
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        # WAL + synchronous=NORMAL: 커밋마다 fsync 하지 않는다. 프로세스가 죽어도 커밋된 묶음은 남는다.
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self.seq = self.conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+        self.pending = []
+        self.since_snapshot = {}
+        self.stats = {'events': 0, 'snapshots': 0, 'batches': 0, 'write_time': 0.0}
+
+    def record(self, room, kind, **data):
+        self.seq += 1
+        self.pending.append(('event', self.seq, room.room_id, room.version, kind, json.dumps(data)))
+        count = self.since_snapshot.get(room.room_id, 0) + 1
+        if kind == 'deal' or count >= self.snapshot_every: self.snapshot(room)
+        else: self.since_snapshot[room.room_id] = count
+
+    # 스냅샷 이전의 이벤트는 더 필요 없으므로 쓸 때 함께 지운다
+    def snapshot(self, room):
+        self.since_snapshot[room.room_id] = 0
+        self.pending.append(('snapshot', self.seq, room.room_id, json.dumps(room.to_snapshot())))
+
+    def drop(self, room_id):
+        self.since_snapshot.pop(room_id, None)
+        self.pending.append(('drop', room_id))
+
+    def take_pending(self):
+        batch, self.pending = self.pending, []
+        return batch
+
+    def write(self, batch):
+        if not batch: return
+        start = time.perf_counter()
+        conn = self.conn
+        conn.execute('BEGIN')
+        try:
+            events = []
+            for item in batch:
+                if item[0] == 'event':
+                    events.append(item[1:])
+                    continue
+                # 스냅샷/삭제 앞의 이벤트를 먼저 써서 순서를 지킨다
+                if events: conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?)', events)
+                events = []
+                if item[0] == 'snapshot':
+                    _, event_id, room_id, data = item
+                    conn.execute('INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?)', (room_id, event_id, data))
+                    conn.execute('DELETE FROM events WHERE room_id = ? AND id <= ?', (room_id, event_id))
+                    self.stats['snapshots'] += 1
+                else:
+                    conn.execute('DELETE FROM snapshots WHERE room_id = ?', (item[1],))
+                    conn.execute('DELETE FROM events WHERE room_id = ?', (item[1],))
+            if events: conn.executemany('INSERT INTO events VALUES (?, ?, ?, ?, ?)', events)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self.stats['events'] += sum(1 for item in batch if item[0] == 'event')
+        self.stats['batches'] += 1
+        self.stats['write_time'] += time.perf_counter() - start
+
+    def flush(self): self.write(self.take_pending())
+
+    # 방마다 마지막 스냅샷에서 시작해 그 뒤의 이벤트를 순서대로 다시 적용한다
+    def load_rooms(self, make_bot):
+        rooms, after = {}, {}
+        for room_id, event_id, data in self.conn.execute('SELECT room_id, event_id, data FROM snapshots'):
+            rooms[room_id] = GameRoom.from_snapshot(room_id, json.loads(data), make_bot)
+            after[room_id] = event_id
+        for room_id, event_id, version, kind, data in self.conn.execute('SELECT room_id, id, version, kind, data FROM events ORDER BY id'):
+            if event_id <= after.get(room_id, 0): continue
+            room = rooms.get(room_id)
+            if room is None: room = rooms[room_id] = GameRoom(room_id)
+            apply_event(room, kind, json.loads(data), make_bot)
+            room.version = version
+        # 재시작 전에 앉아 있던 사람은 모두 접속이 끊긴 것으로 보고 재접속을 기다린다
+        now = time.monotonic()
+        for room in rooms.values():
+            for seat in room.tokens: room.disconnected[seat] = now
+        return rooms
+
+    def close(self):
+        self.flush()
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.conn.close()
+
+def apply_event(room, kind, data, make_bot):
+    if kind == 'configure':
+        room.configure(data['num_players'])
+        room.bots = {seat: make_bot(name) for seat, name in data['bots']}
+    elif kind == 'seat': room.tokens[data['seat']] = data['token']
+    elif kind == 'deal': room.deal([mask_to_tiles(mask) for mask in data['hands']], data['start'], data['is_first'])
+    elif kind == 'play': room.apply_play(data['seat'], mask_to_tiles(data['mask']))
+    elif kind == 'pass': room.apply_pass(data['seat'])
+    elif kind == 'settle': room.is_game_over = room.settle_round(data['winner'])[1]
+
+def open_store(path):
+    return SqliteStore(path) if path else NullStore()
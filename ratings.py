@@ -0,0 +1,244 @@
+# ratings.py
+import hashlib
+from bisect import bisect_left, insort
+import sqlite3
+import time
+
+from lobby import DEFAULT_RATING
+
+# ===================================================================
+# 레이팅: 게임이 끝날 때마다 최종 보유 금액 순위로 다인전 Elo 를 갱신한다
+# ===================================================================
+# 플레이어는 브라우저가 localStorage 에 만들어 두는 비밀 값(auth 의 player)으로 구분한다. 서버는 그 해시 앞부분만
+# 공개 id 로 쓰고 저장한다. 봇과 id 가 없는 자리는 레이팅에 넣지 않고, 사람이 두 명 이상인 게임만 반영한다.
+# 다인전 Elo: 한 게임을 모든 두 사람 사이의 승부로 나눠 (실제 점수 - 기대 점수) 합에 K / (N - 1) 을 곱한다.
+# 보유 금액이 같으면 무승부로 본다.
+#
+# 순위 질의는 메모리의 Leaderboard(레이팅 구간별 Fenwick 트리)가 O(log n) 으로 답하고, SQLite 는
+# 원본 저장(+ rating 색인으로 SQL 질의)에 쓴다. 갱신은 record() 로 쌓았다가 write() 로 한 트랜잭션에 쓴다
+# (persistence.SqliteStore 처럼 app.py 가 tpool 에서 부른다).
+K_FACTOR = 32
+ID_LENGTH = 16
+
+def player_id(secret):
+    if not isinstance(secret, str) or not secret or len(secret) > 128: return None
+    return hashlib.sha256(secret.encode()).hexdigest()[:ID_LENGTH]
+
+def elo_deltas(ratings, scores, k=K_FACTOR):
+    n = len(ratings)
+    deltas = []
+    for i in range(n):
+        total = 0.0
+        for j in range(n):
+            if i == j: continue
+            expected = 1 / (1 + 10 ** ((ratings[j] - ratings[i]) / 400))
+            actual = 1.0 if scores[i] > scores[j] else 0.5 if scores[i] == scores[j] else 0.0
+            total += actual - expected
+        deltas.append(k * total / (n - 1))
+    return deltas
+
+# ===================================================================
+# 순위표: 레이팅을 resolution 단위 구간으로 나눠 구간별 인원을 Fenwick 트리에 둔다
+# ===================================================================
+# 순위/상위 k명/내 주변은 트리에서 O(log 구간 수) 로 구간을 찾고, 그 구간 안(보통 수십~백여 명)만 정렬해서 본다.
+# 여러 구간에 걸쳐 내려갈 때는 사람이 있는 구간의 정렬된 목록(nonempty)을 따라간다 (상위권은 구간마다 한두 명뿐이다).
+# 레이팅은 [low, high) 로 잘라서 구간을 정한다 (정렬 순서에만 쓰고 실제 값은 그대로 둔다).
+class Leaderboard:
+    def __init__(self, low=0, high=4000, resolution=10):
+        self.low, self.resolution = low, resolution
+        self.size = (high - low) * resolution
+        self.tree = [0] * (self.size + 1)
+        self.buckets = {}  # 구간 -> {player: rating}
+        self.ratings = {}  # player -> rating
+        self.nonempty = [] # 사람이 있는 구간 (오름차순)
+        self.top_step = 1 << (self.size.bit_length() - 1)
+
+    def __len__(self): return len(self.ratings)
+
+    def __contains__(self, player): return player in self.ratings
+
+    def bucket_of(self, rating): return min(self.size - 1, max(0, int((rating - self.low) * self.resolution)))
+
+    def _add(self, bucket, delta):
+        i, tree, size = bucket + 1, self.tree, self.size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    # bucket 보다 낮은 구간에 있는 인원
+    def _count_below(self, bucket):
+        i, total, tree = bucket, 0, self.tree
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    # 낮은 쪽부터 index 번째(0부터) 사람이 든 구간과 그 구간 안에서의 순서
+    def _select(self, index):
+        position, step, tree, size = 0, self.top_step, self.tree, self.size
+        while step:
+            if position + step <= size and tree[position + step] <= index:
+                position += step
+                index -= tree[position]
+            step >>= 1
+        return position, index
+
+    # 처음 채울 때: 구간별 인원을 센 뒤 트리를 O(구간 수) 로 한 번에 만든다
+    def load(self, items):
+        for player, rating in items:
+            self.ratings[player] = rating
+            self.buckets.setdefault(self.bucket_of(rating), {})[player] = rating
+        tree, size = [0] * (self.size + 1), self.size
+        for bucket, members in self.buckets.items(): tree[bucket + 1] = len(members)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size: tree[parent] += tree[i]
+        self.tree, self.nonempty = tree, sorted(self.buckets)
+
+    def set(self, player, rating):
+        if player in self.ratings: self.remove(player)
+        bucket = self.bucket_of(rating)
+        members = self.buckets.get(bucket)
+        if members is None:
+            members = self.buckets[bucket] = {}
+            insort(self.nonempty, bucket)
+        members[player] = rating
+        self._add(bucket, 1)
+        self.ratings[player] = rating
+
+    def remove(self, player):
+        rating = self.ratings.pop(player, None)
+        if rating is None: return
+        bucket = self.bucket_of(rating)
+        members = self.buckets[bucket]
+        del members[player]
+        if not members:
+            del self.buckets[bucket]
+            del self.nonempty[bisect_left(self.nonempty, bucket)]
+        self._add(bucket, -1)
+
+    # 1등부터 센 순위 (자기보다 레이팅이 높은 사람 수 + 1). 없는 플레이어는 None
+    def rank(self, player):
+        rating = self.ratings.get(player)
+        if rating is None: return None
+        bucket = self.bucket_of(rating)
+        above = len(self.ratings) - self._count_below(bucket + 1)
+        return above + sum(1 for other in self.buckets[bucket].values() if other > rating) + 1
+
+    # 위에서 start 번째(0부터)부터 count 명: [(순위, player, rating)]. 같은 레이팅은 id 순서로 자른다.
+    def entries(self, start, count):
+        total, result, position = len(self.ratings), [], max(0, start)
+        if position >= total or count <= 0: return result
+        bucket, offset = self._select(total - 1 - position)
+        index = bisect_left(self.nonempty, bucket)
+        while True:
+            members = sorted(self.buckets[self.nonempty[index]].items(), key=lambda item: (item[1], item[0]))
+            for player, rating in reversed(members[:offset + 1]):
+                result.append((position + 1, player, rating))
+                position += 1
+                if len(result) == count: return result
+            index -= 1
+            if index < 0: return result
+            offset = len(self.buckets[self.nonempty[index]]) - 1
+
+    def top(self, count): return self.entries(0, count)
+
+    # 내 순위 앞뒤로 radius 명씩
+    def near(self, player, radius):
+        rank = self.rank(player)
+        if rank is None: return []
+        start = max(0, rank - 1 - radius)
+        return self.entries(start, rank - 1 - start + radius + 1)
+
+# ===================================================================
+# 저장소
+# ===================================================================
+class Ratings:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS ratings (player TEXT PRIMARY KEY, rating REAL NOT NULL, games INTEGER NOT NULL, updated REAL NOT NULL);
+        CREATE INDEX IF NOT EXISTS ratings_by_rating ON ratings (rating);
+    """
+
+    # path=None 이면 메모리에만 둔다 (벤치마크/저장소 없이 돌릴 때)
+    def __init__(self, path=None, k=K_FACTOR, board=None):
+        self.k = k
+        self.board = board or Leaderboard()
+        self.games = {}
+        self.pending = {}
+        self.stats = {'games': 0, 'batches': 0, 'write_time': 0.0}
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(self.SCHEMA)
+            rows = self.conn.execute('SELECT player, rating, games FROM ratings').fetchall()
+            self.board.load((player, rating) for player, rating, _ in rows)
+            self.games = {player: games for player, _, games in rows}
+
+    def __len__(self): return len(self.board)
+
+    def rating(self, player): return self.board.ratings.get(player, DEFAULT_RATING)
+
+    def profile(self, player, radius=0):
+        if player not in self.board: return None
+        profile = {'player': player, 'rating': round(self.rating(player), 1), 'games': self.games.get(player, 0), 'rank': self.board.rank(player), 'players': len(self.board)}
+        if radius: profile['near'] = [entry_dict(entry) for entry in self.board.near(player, radius)]
+        return profile
+
+    # results: [(player, 최종 보유 금액)] -> {player: (새 레이팅, 변화량)}
+    def record(self, results, now=None):
+        results = [(player, money) for player, money in results if player]
+        if len({player for player, _ in results}) != len(results) or len(results) < 2: return {}
+        now = time.time() if now is None else now
+        before = [self.rating(player) for player, _ in results]
+        deltas = elo_deltas(before, [money for _, money in results], self.k)
+        changes = {}
+        for (player, _), rating, delta in zip(results, before, deltas):
+            self.board.set(player, rating + delta)
+            games = self.games[player] = self.games.get(player, 0) + 1
+            self.pending[player] = (player, rating + delta, games, now)
+            changes[player] = (rating + delta, delta)
+        self.stats['games'] += 1
+        return changes
+
+    def take_pending(self):
+        batch, self.pending = list(self.pending.values()), {}
+        return batch
+
+    def write(self, batch):
+        if not batch or self.conn is None: return
+        start = time.perf_counter()
+        conn = self.conn
+        conn.execute('BEGIN')
+        try:
+            conn.executemany('INSERT OR REPLACE INTO ratings VALUES (?, ?, ?, ?)', batch)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        self.stats['batches'] += 1
+        self.stats['write_time'] += time.perf_counter() - start
+
+    def flush(self): self.write(self.take_pending())
+
+    # 같은 질문을 SQLite 의 rating 색인으로 (메모리 순위표와 비교하거나 다른 도구에서 볼 때)
+    def top_sql(self, count):
+        rows = self.conn.execute('SELECT player, rating FROM ratings ORDER BY rating DESC, player DESC LIMIT ?', (count,))
+        return [(position + 1, player, rating) for position, (player, rating) in enumerate(rows)]
+
+    def rank_sql(self, player):
+        row = self.conn.execute('SELECT rating FROM ratings WHERE player = ?', (player,)).fetchone()
+        if row is None: return None
+        return self.conn.execute('SELECT COUNT(*) FROM ratings WHERE rating > ?', row).fetchone()[0] + 1
+
+    def close(self):
+        if self.conn is None: return
+        self.flush()
+        self.conn.close()
+
+def entry_dict(entry):
+    rank, player, rating = entry
+    return {'rank': rank, 'player': player, 'rating': round(rating, 1)}
+
+def open_ratings(path): return Ratings(path or None)
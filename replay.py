@@ -0,0 +1,333 @@
+# replay.py
+# 사용법: python replay.py games.lxr [--csv rounds.csv] [--limit 100000]
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from engine import Game
+from game_logic import TWO_MASK, classify_mask
+
+# ===================================================================
+# 리플레이 기록: 게임마다 한 레코드를 이진 형식으로 한 파일에 이어 붙인다
+# ===================================================================
+# 파일 = MAGIC + 게임 레코드들 (모두 little endian)
+#   게임:   length u32 (이 필드 다음부터 레코드 끝까지), num_players u8, flags u8, starting_money u16, rounds u16
+#           라운드 × rounds, 최종 금액 i16 × num_players
+#   라운드: start u8, 손패 마스크 u64 × num_players, action_bytes u16, 액션들, winner u8
+#   액션:   (seat << 3 | 낸 타일 수) 1바이트 + 타일 id 1바이트씩. 타일 수 0 은 패스.
+# 나눠 준 손패와 액션 마스크만 있으면 게임을 그대로 다시 돌릴 수 있다. 한 수는 패스 1바이트, 싱글 2바이트, 5장 6바이트.
+# 레코드와 라운드 모두 길이를 앞에 두어서 필요 없는 부분은 읽지 않고 건너뛴다.
+MAGIC = b'LXRP\x01'
+GAME_HEADER = struct.Struct('<IBBHH')
+ACTION_LENGTH = struct.Struct('<H')
+FINISHED = 1 # flags: 누군가 파산해서 끝난 게임 (0 이면 중간에 그만둔 게임의 끝난 라운드까지만)
+HANDS_FORMATS = {n: struct.Struct(f"<B{n}Q") for n in range(1, 8)} # 인원수 -> (start, 손패 마스크들)
+
+def mask_to_ids(mask):
+    ids = bytearray()
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
+# 한 게임을 메모리에서 쌓아 finish() 에서 레코드 바이트로 돌려준다
+class GameRecorder:
+    def __init__(self, num_players, starting_money):
+        self.num_players, self.starting_money = num_players, starting_money
+        self.hands_format = HANDS_FORMATS[num_players]
+        self.buffer = bytearray()
+        self.rounds = 0
+        self.money = [starting_money] * num_players # 마지막으로 끝난 라운드 뒤의 금액
+        self.round_start = None # 진행 중인 라운드가 시작된 위치
+        self.actions_start = 0
+
+    def deal(self, hands, start):
+        self.round_start = len(self.buffer)
+        self.buffer += self.hands_format.pack(start, *hands)
+        self.buffer += b'\0\0' # action_bytes 자리
+        self.actions_start = len(self.buffer)
+
+    def play(self, seat, mask):
+        ids = mask_to_ids(mask)
+        self.buffer.append(seat << 3 | len(ids))
+        self.buffer += ids
+
+    def pass_turn(self, seat): self.buffer.append(seat << 3)
+
+    def end_round(self, winner, money):
+        ACTION_LENGTH.pack_into(self.buffer, self.actions_start - 2, len(self.buffer) - self.actions_start)
+        self.buffer.append(winner)
+        self.rounds += 1
+        self.money = list(money)
+        self.round_start = None
+
+    # 끝나지 않은 라운드는 버린다
+    def finish(self, finished=True):
+        if self.round_start is not None: del self.buffer[self.round_start:]
+        body = self.buffer + struct.pack(f"<{self.num_players}h", *self.money)
+        header = GAME_HEADER.pack(GAME_HEADER.size - 4 + len(body), self.num_players, FINISHED if finished else 0, self.starting_money, self.rounds)
+        return header + body
+
+# 헤드리스 엔진 게임을 그대로 기록한다. 봇 탐색용 clone() 은 Game 으로 만들어지므로 기록되지 않는다.
+class RecordingGame(Game):
+    def __init__(self, num_players, rng=None, starting_money=48, tiles_per_player_count=None):
+        super().__init__(num_players, rng, starting_money, tiles_per_player_count)
+        self.recorder = GameRecorder(num_players, starting_money)
+
+    def start_round(self, hands, start):
+        super().start_round(hands, start)
+        self.recorder.deal(hands, start)
+
+    def play(self, combo_info):
+        seat = self.current
+        finished = super().play(combo_info)
+        self.recorder.play(seat, combo_info.mask)
+        return finished
+
+    def pass_turn(self):
+        self.recorder.pass_turn(self.current)
+        super().pass_turn()
+
+    def settle(self, winner_index):
+        payments = super().settle(winner_index)
+        self.recorder.end_round(winner_index, self.money)
+        return payments
+
+    def record(self): return self.recorder.finish(finished=self.is_over())
+
+# ===================================================================
+# 파일 쓰기: app.py 의 저장소처럼 끝난 게임을 쌓아 두었다가 tpool 에서 한꺼번에 쓴다
+# ===================================================================
+class NullReplays:
+    def record(self, room, kind, **data): pass
+    def drop(self, room): pass
+    def take_pending(self): return []
+    def write(self, batch): pass
+    def close(self): pass
+
+class ReplayWriter:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0: self.file.write(MAGIC)
+        self.recorders = {} # room id -> 진행 중인 GameRecorder
+        self.pending = []
+        self.games = 0
+
+    # persistence 와 같은 이벤트(deal/play/pass/settle)를 받는다
+    def record(self, room, kind, **data):
+        if kind == 'deal':
+            if data['is_first']:
+                self.drop(room)
+                self.recorders[room.room_id] = GameRecorder(room.num_players, room.starting_money)
+            recorder = self.recorders.get(room.room_id)
+            if recorder is not None: recorder.deal(data['hands'], data['start'])
+            return
+        recorder = self.recorders.get(room.room_id)
+        if recorder is None: return # 재시작 전에 시작된 게임
+        if kind == 'play': recorder.play(data['seat'], data['mask'])
+        elif kind == 'pass': recorder.pass_turn(data['seat'])
+        elif kind == 'settle':
+            recorder.end_round(data['winner'], room.player_money)
+            if any(money <= 0 for money in room.player_money):
+                self.pending.append(recorder.finish())
+                del self.recorders[room.room_id]
+
+    # 게임을 중간에 그만두면 끝난 라운드까지만 남긴다
+    def drop(self, room):
+        recorder = self.recorders.pop(room.room_id, None)
+        if recorder is not None and recorder.rounds: self.pending.append(recorder.finish(finished=False))
+
+    def take_pending(self):
+        pending, self.pending = self.pending, []
+        return pending
+
+    def write(self, batch):
+        self.file.write(b''.join(batch))
+        self.file.flush()
+        self.games += len(batch)
+
+    def close(self):
+        self.write(self.take_pending())
+        self.file.close()
+
+def open_replays(path):
+    return ReplayWriter(path) if path else NullReplays()
+
+# ===================================================================
+# 읽기: 파일을 mmap 으로 열고 게임/라운드를 필요한 만큼만 풀어 본다
+# ===================================================================
+# 전체를 메모리에 올리지 않으므로 수백만 게임짜리 파일도 한 게임씩 흘려 보며 통계를 낼 수 있다.
+# 처음부터 훑을 때는 지나간 부분의 페이지를 RELEASE_BYTES 마다 돌려줘서 상주 메모리도 일정하게 둔다.
+RELEASE_BYTES = 32 * 2 ** 20
+class ReplayRound:
+    __slots__ = ('data', 'start', 'hands', 'actions_offset', 'actions_end', 'winner')
+
+    def actions(self):
+        data, i, end = self.data, self.actions_offset, self.actions_end
+        while i < end:
+            head = data[i]
+            count, mask = head & 7, 0
+            for tile_id in data[i + 1:i + 1 + count]: mask |= 1 << tile_id
+            yield head >> 3, mask
+            i += 1 + count
+
+    # 라운드가 끝났을 때 각자 남은 손패
+    def final_hands(self):
+        hands = list(self.hands)
+        for seat, mask in self.actions(): hands[seat] &= ~mask
+        return hands
+
+class ReplayGame:
+    __slots__ = ('data', 'offset', 'end', 'num_players', 'finished', 'starting_money', 'num_rounds', 'hands_format')
+
+    def __init__(self, data, offset):
+        length, self.num_players, flags, self.starting_money, self.num_rounds = GAME_HEADER.unpack_from(data, offset)
+        self.data, self.offset, self.end = data, offset, offset + 4 + length
+        self.finished = bool(flags & FINISHED)
+        self.hands_format = HANDS_FORMATS[self.num_players]
+
+    def money(self): return struct.unpack_from(f"<{self.num_players}h", self.data, self.end - 2 * self.num_players)
+
+    def rounds(self):
+        data, hands_format = self.data, self.hands_format
+        position = self.offset + GAME_HEADER.size
+        for _ in range(self.num_rounds):
+            start, *hands = hands_format.unpack_from(data, position)
+            position += hands_format.size
+            action_bytes = ACTION_LENGTH.unpack_from(data, position)[0]
+            position += 2
+            replay_round = ReplayRound()
+            replay_round.data, replay_round.start, replay_round.hands = data, start, hands
+            replay_round.actions_offset, replay_round.actions_end = position, position + action_bytes
+            position += action_bytes
+            replay_round.winner = data[position]
+            position += 1
+            yield replay_round
+
+class ReplayReader:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b''
+        if self.data[:len(MAGIC)] != MAGIC: raise ValueError(f"{path}: 렉시오 리플레이 파일이 아닙니다.")
+        self.offsets = None
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap): self.data.close()
+        self.file.close()
+
+    # 레코드 길이만 보고 건너뛰며 게임 시작 위치를 모은다 (마지막에 잘린 레코드는 무시한다)
+    def index(self):
+        if self.offsets is None:
+            offsets, data, position, size = [], self.data, len(MAGIC), len(self.data)
+            released = 0
+            while position + GAME_HEADER.size <= size:
+                end = position + 4 + GAME_HEADER.unpack_from(data, position)[0]
+                if end > size: break
+                offsets.append(position)
+                position = end
+                if position - released >= RELEASE_BYTES: released = self.release(released, position)
+            self.offsets = offsets
+        return self.offsets
+
+    def __len__(self): return len(self.index())
+
+    def game(self, i): return ReplayGame(self.data, self.index()[i])
+
+    def __iter__(self):
+        data, position, size = self.data, len(MAGIC), len(self.data)
+        released = 0
+        while position + GAME_HEADER.size <= size:
+            game = ReplayGame(data, position)
+            if game.end > size: return
+            yield game
+            position = game.end
+            if position - released >= RELEASE_BYTES: released = self.release(released, position)
+
+    # [start, end) 중 페이지 경계까지 읽은 부분을 버린다 (다시 읽으면 파일에서 다시 올라온다)
+    def release(self, start, end):
+        end -= end % mmap.PAGESIZE
+        if isinstance(self.data, mmap.mmap) and hasattr(mmap, 'MADV_DONTNEED'): self.data.madvise(mmap.MADV_DONTNEED, start, end - start)
+        return end
+
+# 기록을 엔진으로 다시 돌리며 모든 수가 규칙에 맞는지 확인하고, 끝난 Game 을 돌려준다
+def resimulate(replay_game):
+    game = Game(replay_game.num_players, starting_money=replay_game.starting_money)
+    for replay_round in replay_game.rounds():
+        game.start_round(replay_round.hands, replay_round.start)
+        for seat, mask in replay_round.actions():
+            if seat != game.current: raise ValueError(f"라운드 {game.round_number}: P{seat + 1} 의 차례가 아닙니다.")
+            if mask: game.play(classify_mask(mask))
+            else: game.pass_turn()
+        if game.hands[replay_round.winner]: raise ValueError(f"라운드 {game.round_number}: 승자 P{replay_round.winner + 1} 의 손패가 남아 있습니다.")
+        game.settle(replay_round.winner)
+    if tuple(game.money) != replay_game.money(): raise ValueError(f"최종 금액이 다릅니다: {game.money} != {list(replay_game.money())}")
+    return game
+
+# ===================================================================
+# 분석: 라운드 × 자리 단위 행으로 흘려 보내고, pandas 로 내보낸다
+# ===================================================================
+ROUND_COLUMNS = ['game', 'round', 'num_players', 'seat', 'start', 'won', 'hand', 'tiles', 'twos', 'tiles_left', 'twos_left', 'actions']
+
+def iter_round_rows(reader, limit=None):
+    for game_index, game in enumerate(reader):
+        if limit is not None and game_index >= limit: return
+        for round_index, replay_round in enumerate(game.rounds()):
+            final_hands = replay_round.final_hands()
+            actions = replay_round.actions_end - replay_round.actions_offset
+            for seat, hand in enumerate(replay_round.hands):
+                left = final_hands[seat]
+                yield (game_index, round_index, game.num_players, seat, seat == replay_round.start, seat == replay_round.winner,
+                       hand, hand.bit_count(), (hand & TWO_MASK).bit_count(), left.bit_count(), (left & TWO_MASK).bit_count(), actions)
+
+def to_dataframe(reader, limit=None):
+    import pandas as pd
+    frame = pd.DataFrame.from_records(iter_round_rows(reader, limit), columns=ROUND_COLUMNS)
+    return frame.astype({'game': 'int32', 'round': 'int16', 'num_players': 'int8', 'seat': 'int8', 'hand': 'int64', 'tiles': 'int8',
+                         'twos': 'int8', 'tiles_left': 'int8', 'twos_left': 'int8', 'actions': 'int16'})
+
+# 나눠 받은 2 의 개수별 라운드 승률. 손패 마스크와 승자만 보면 되므로 액션은 풀지 않는다.
+def win_rate_by_twos(reader, limit=None):
+    dealt, won = {}, {}
+    for game_index, game in enumerate(reader):
+        if limit is not None and game_index >= limit: break
+        for replay_round in game.rounds():
+            for seat, hand in enumerate(replay_round.hands):
+                twos = (hand & TWO_MASK).bit_count()
+                dealt[twos] = dealt.get(twos, 0) + 1
+                if seat == replay_round.winner: won[twos] = won.get(twos, 0) + 1
+    return {twos: (won.get(twos, 0) / count, count) for twos, count in sorted(dealt.items())}
+
+def main():
+    parser = argparse.ArgumentParser(description='렉시오 리플레이 파일 요약')
+    parser.add_argument('path')
+    parser.add_argument('--limit', type=int, default=None, help='앞에서부터 이만큼의 게임만 본다')
+    parser.add_argument('--csv', default=None, help='라운드 × 자리 행을 CSV 로 내보낸다 (pandas)')
+    args = parser.parse_args()
+
+    with ReplayReader(args.path) as reader:
+        start = time.perf_counter()
+        games = rounds = finished = 0
+        for game in reader:
+            if args.limit is not None and games >= args.limit: break
+            games += 1
+            rounds += game.num_rounds
+            finished += game.finished
+        print(f"{games} games ({finished} finished), {rounds} rounds, {len(reader.data)} bytes, scanned in {time.perf_counter() - start:.2f}s")
+        print(f"{'twos dealt':>10} {'rounds':>10} {'win %':>7}")
+        for twos, (rate, count) in win_rate_by_twos(reader, args.limit).items():
+            print(f"{twos:>10} {count:>10} {rate * 100:>7.1f}")
+        if args.csv:
+            to_dataframe(reader, args.limit).to_csv(args.csv, index=False)
+            print(f"wrote {args.csv}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+# simulate.py
+# 사용법: python simulate.py --games 20000 --players 3 --money 48 --policies lowest,random,random [--record games.lxr]
+import argparse
+import multiprocessing
+import random
+import time
+from collections import Counter
+
+import engine
+from bots import BOTS
+from engine import Game
+from game_logic import combination_table
+from replay import RecordingGame, ReplayWriter
+
+POLICIES = {**engine.POLICIES, **BOTS}
+
+# ===================================================================
+# 대량 시뮬레이션: 게임 묶음(chunk)을 프로세스 풀에 나눠 돌리고 통계를 합친다
+# ===================================================================
+# 묶음마다 (기본 시드, 묶음 번호)로 RNG 를 만들기 때문에 워커 수나 실행 순서와 관계없이 결과가 재현된다.
+# 처리량: lowest 정책 기준 코어 하나에 라운드 약 3,000~6,000개/초. 시작 금액 48 이면 게임 하나가 12~55 라운드라
+# 게임으로는 코어당 100~250개/초다. 한 수가 순수 파이썬으로 몇 마이크로초라 목표였던 초당 수만 게임에는 닿지 않는다.
+# 수백만 게임은 코어 수만큼 나눠 시간 단위로 돌린다. 시작 금액과 상관없는 통계(라운드당 정산)는 라운드 수로 보면 된다.
+class Stats:
+    def __init__(self, num_players):
+        self.games = 0
+        self.wins = [0] * num_players
+        self.money_sum = [0] * num_players
+        self.money_sq_sum = [0] * num_players
+        self.money_min = [None] * num_players
+        self.money_max = [None] * num_players
+        self.rounds = Counter()
+        self.bankruptcies = [0] * num_players
+
+    def add(self, result):
+        self.games += 1
+        self.wins[result.winner] += 1
+        self.rounds[result.rounds] += 1
+        for i, money in enumerate(result.money):
+            self.money_sum[i] += money
+            self.money_sq_sum[i] += money * money
+            if self.money_min[i] is None or money < self.money_min[i]: self.money_min[i] = money
+            if self.money_max[i] is None or money > self.money_max[i]: self.money_max[i] = money
+        for i in result.bankrupt: self.bankruptcies[i] += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.rounds.update(other.rounds)
+        for i in range(len(self.wins)):
+            self.wins[i] += other.wins[i]
+            self.money_sum[i] += other.money_sum[i]
+            self.money_sq_sum[i] += other.money_sq_sum[i]
+            self.bankruptcies[i] += other.bankruptcies[i]
+            if other.money_min[i] is not None and (self.money_min[i] is None or other.money_min[i] < self.money_min[i]): self.money_min[i] = other.money_min[i]
+            if other.money_max[i] is not None and (self.money_max[i] is None or other.money_max[i] > self.money_max[i]): self.money_max[i] = other.money_max[i]
+        return self
+
+# record 면 묶음의 게임 기록(replay.py 형식)을 이어 붙인 바이트도 함께 돌려준다
+def run_chunk(task):
+    seed, chunk_index, games, num_players, starting_money, tiles, policy_names, record = task
+    rng = random.Random(seed * 1000003 + chunk_index)
+    policies = [POLICIES[name]() for name in policy_names]
+    stats = Stats(num_players)
+    game_class, records = RecordingGame if record else Game, []
+    for _ in range(games):
+        game = game_class(num_players, rng, starting_money, tiles)
+        stats.add(game.play_game(policies))
+        if record: records.append(game.record())
+    return stats, b''.join(records)
+
+def run(games, num_players=3, starting_money=48, tiles=None, policy_names=None, workers=None, seed=0, chunk_size=50, record=None):
+    policy_names = policy_names or ['lowest'] * num_players
+    combination_table() # fork 전에 만들어 두면 워커들이 그대로 공유한다
+    tasks, chunk_index = [], 0
+    for start in range(0, games, chunk_size):
+        tasks.append((seed, chunk_index, min(chunk_size, games - start), num_players, starting_money, tiles, policy_names, record is not None))
+        chunk_index += 1
+    total = Stats(num_players)
+    writer = ReplayWriter(record) if record else None
+    def collect(stats, records):
+        total.merge(stats)
+        if writer is not None: writer.write([records])
+    if workers == 1:
+        for task in tasks: collect(*run_chunk(task))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for result in pool.imap_unordered(run_chunk, tasks): collect(*result)
+    if writer is not None: writer.close()
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description='렉시오 대량 시뮬레이션')
+    parser.add_argument('--games', type=int, default=2000)
+    parser.add_argument('--players', type=int, default=3)
+    parser.add_argument('--money', type=int, default=48, help='시작 금액 (app.py 48, lexio.py 27)')
+    parser.add_argument('--tiles', type=int, default=None, help='1인당 타일 수 (기본: 인원수 규칙)')
+    parser.add_argument('--policies', default=None, help='자리별 정책, 쉼표로 구분 (lowest, random, heuristic, montecarlo)')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', default=None, help='게임 기록을 이 리플레이 파일에 이어 붙인다 (replay.py 로 읽는다)')
+    args = parser.parse_args()
+
+    policy_names = args.policies.split(',') if args.policies else None
+    if policy_names and len(policy_names) != args.players: parser.error('--policies 는 인원수만큼 지정해야 합니다.')
+    start = time.perf_counter()
+    stats = run(args.games, args.players, args.money, args.tiles, policy_names, args.workers, args.seed, record=args.record)
+    elapsed = time.perf_counter() - start
+
+    total_rounds = sum(rounds * count for rounds, count in stats.rounds.items())
+    print(f"{stats.games} games, {total_rounds} rounds in {elapsed:.2f}s "
+          f"({stats.games / elapsed:.0f} games/s, {total_rounds / elapsed:.0f} rounds/s)")
+    print(f"rounds per game: mean {total_rounds / stats.games:.1f}, max {max(stats.rounds)}")
+    print(f"{'seat':>5} {'win %':>7} {'bankrupt %':>11} {'money mean':>11} {'std':>7} {'min':>6} {'max':>6}")
+    for i in range(args.players):
+        mean = stats.money_sum[i] / stats.games
+        std = max(stats.money_sq_sum[i] / stats.games - mean * mean, 0) ** 0.5
+        print(f"{'P' + str(i + 1):>5} {stats.wins[i] / stats.games * 100:>7.1f} {stats.bankruptcies[i] / stats.games * 100:>11.1f} "
+              f"{mean:>11.1f} {std:>7.1f} {stats.money_min[i]:>6} {stats.money_max[i]:>6}")
+
+if __name__ == '__main__':
+    main()
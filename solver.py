@@ -0,0 +1,276 @@
+# solver.py
+import random
+import time
+
+from engine import NO_PLAY
+from game_logic import TILES, TWO_MASK, classify_mask, legal_moves
+
+# ===================================================================
+# 끝내기 풀이: 남은 패가 적을 때 라운드 끝까지 읽어 정산 손익이 가장 좋은 수를 찾는다
+# ===================================================================
+# 손패를 모두 아는 판(engine.Game)에서, 지금 둘 차례인 자리(root)의 라운드 정산 손익을 값으로 하는 최소최대 탐색이다.
+# 다인전이라 상대들은 모두 root 의 손익을 줄이는 쪽으로 둔다고 본다 (paranoid). 그래서 값은 상대가 어떻게 두든
+# root 가 받을 수 있는 하한이고, "이길 수 있었던 판" 은 이 값으로 판정한다.
+#  - 알파베타 + 전치표(TT). 판의 키는 Zobrist 해시(자리별 타일, 바닥 패, 차례, 마지막으로 낸 사람, 패스한 자리).
+#    TT 항목은 (남은 깊이, 값, 경계 종류, 최선 수의 마스크). 끝까지 읽은 항목은 깊이를 SOLVED 로 두고 계속 쓴다.
+#  - 수 정렬: TT 의 최선 수, 그다음 많이 털어 내는 수(장 수가 많은 순, 같으면 약한 순), 패스는 마지막.
+#  - 가지치기: root 가 지금 다 털고 이기는 값(ceiling)이 그 판에서 받을 수 있는 최대다. 상대 장 수와 2를 쥔 상대는
+#    줄기만 하기 때문이다. ceiling 이 alpha 이하면 더 읽지 않고, root 가 ceiling 을 얻으면 다른 수를 보지 않는다.
+#  - 반복 심화: 깊이를 두 배씩 늘려 time_limit 안에서 지평선에 닿은 잎 없이 끝나면 정확한 값이다.
+#    깊이 제한에 걸린 잎은 남은 장 수가 가장 적은 사람이 이긴다고 보고 정산한다.
+# 손패를 모르는 실제 판에서는 expected_values() 가 보이지 않는 타일을 무작위로 나눈 판 여러 개를 풀어 평균을 낸다.
+PASS = 0          # 수를 마스크로 적을 때 패스
+SOLVED = 1 << 30  # 지평선 없이 끝까지 읽은 TT 항목의 깊이
+EXACT, LOWER, UPPER = 0, 1, 2
+INFINITY = 1 << 20
+CHECK_EVERY = 1024 # 이만큼의 노드마다 시간을 본다
+MAX_ENTRIES = 1 << 20
+TILE_BITS = len(TILES)
+
+class OutOfTime(Exception): pass
+
+class Solution:
+    __slots__ = ('move', 'value', 'exact', 'depth', 'nodes', 'elapsed', 'values', 'line')
+    def __init__(self, move, value, exact, depth, nodes, elapsed, values, line):
+        self.move, self.value, self.exact, self.depth = move, value, exact, depth
+        self.nodes, self.elapsed, self.values, self.line = nodes, elapsed, values, line
+    def __repr__(self): return f"Solution(move={self.move}, value={self.value}, exact={self.exact}, depth={self.depth}, nodes={self.nodes})"
+
+# seat 의 라운드 정산 손익 (game_logic.settle_round 와 같은 규칙: 장 수 차이만큼, 승자는 2를 쥔 상대에게 두 배)
+def settlement(hands, seat, winner):
+    mine, total = hands[seat].bit_count(), 0
+    for other, hand in enumerate(hands):
+        if other == seat: continue
+        diff = hand.bit_count() - mine
+        if diff > 0: total += diff * 2 if seat == winner and hand & TWO_MASK else diff
+        elif diff < 0: total += diff * 2 if other == winner and hands[seat] & TWO_MASK else diff
+    return total
+
+# root 가 이기면 이 손패의 상대에게서 받는 돈
+def weight(hand): return hand.bit_count() * 2 if hand & TWO_MASK else hand.bit_count()
+
+class EndgameSolver:
+    def __init__(self, num_players, seed=0, max_entries=MAX_ENTRIES):
+        rng = random.Random(seed)
+        self.num_players, self.max_entries = num_players, max_entries
+        self.tile_keys = [[rng.getrandbits(64) for _ in TILES] for _ in range(num_players + 1)] # 마지막 줄은 바닥 패
+        self.turn_keys = [rng.getrandbits(64) for _ in range(num_players)]
+        self.actor_keys = [rng.getrandbits(64) for _ in range(num_players)]
+        self.passed_keys = [rng.getrandbits(64) for _ in range(1 << num_players)]
+        self.root_keys = [rng.getrandbits(64) for _ in range(num_players)] # 값은 root 의 손익이라 root 가 다르면 다른 항목
+        self.mask_keys = [{} for _ in range(num_players + 1)] # 자리(마지막은 바닥) -> 마스크 -> 타일 키들의 xor
+        self.move_lists = {} # 손패 << TILE_BITS | 바닥 패 마스크 -> 정렬한 합법 수
+        self.table = {}
+        self.stats = {'solves': 0, 'nodes': 0, 'tt_hits': 0, 'time': 0.0}
+
+    # xor 이라 손패에서 수를 빼고 더할 때는 그 수의 키만 xor 하면 된다
+    def mask_key(self, seat, mask):
+        key = self.mask_keys[seat].get(mask)
+        if key is None:
+            keys, key, rest = self.tile_keys[seat], 0, mask
+            while rest:
+                low = rest & -rest
+                key ^= keys[low.bit_length() - 1]
+                rest ^= low
+            self.mask_keys[seat][mask] = key
+        return key
+
+    def moves(self, hand):
+        moves = self.move_lists.get(hand << TILE_BITS | self.last_mask)
+        if moves is None:
+            moves = sorted(legal_moves(hand, self.last), key=lambda info: (-info.mask.bit_count(), info.key))
+            self.move_lists[hand << TILE_BITS | self.last_mask] = moves
+        return moves
+
+    def load(self, game):
+        self.hands, self.current, self.last = list(game.hands), game.current, game.last_combo
+        self.last_mask = self.last.mask if self.last[0] is not None else 0
+        self.last_actor, self.passed = game.last_actor, 0
+        for seat in game.passed: self.passed |= 1 << seat
+        self.hand_key = 0
+        for seat in range(self.num_players): self.hand_key ^= self.mask_key(seat, self.hands[seat])
+        self.ceiling = sum(weight(hand) for seat, hand in enumerate(self.hands) if seat != self.root)
+
+    # game 은 손패를 모두 아는 판. 지금 차례인 자리의 최선 수(ComboInfo, 패스면 None)와 그 자리의 정산 손익.
+    # all_moves=True 면 첫 수마다 창을 열어 두고 각각의 값(values: 마스크 -> 값)을 구한다.
+    def solve(self, game, time_limit=0.05, max_depth=200, all_moves=False):
+        start = time.perf_counter()
+        self.root = game.current
+        self.root_key = self.root_keys[self.root]
+        self.load(game)
+        if len(self.table) > self.max_entries: self.table.clear()
+        self.nodes, self.tt_hits, self.deadline = 0, 0, float('inf')
+        best, depth = None, 1
+        while True:
+            self.horizon = 0
+            try: result = self.search_root(depth, all_moves)
+            except OutOfTime:
+                self.load(game) # 탐색 중간에 빠져나왔으므로 판을 처음으로 되돌린다
+                break
+            best = (result, depth, not self.horizon)
+            if not self.horizon or depth >= max_depth: break
+            self.deadline = start + time_limit # 첫 깊이는 시간과 상관없이 끝낸다
+            depth = min(depth * 2, max_depth) # 패스도 한 수라 끝까지 수십 수다. 깊이를 두 배씩 늘려 다시 읽는 비용을 줄인다.
+        (move, value, values), depth, exact = best
+        elapsed = time.perf_counter() - start
+        self.stats['solves'] += 1
+        self.stats['nodes'] += self.nodes
+        self.stats['tt_hits'] += self.tt_hits
+        self.stats['time'] += elapsed
+        return Solution(move, value, exact, depth, self.nodes, elapsed, values, self.principal_line(depth))
+
+    def search_root(self, depth, all_moves):
+        alpha, beta = -INFINITY, INFINITY
+        best_move, best_value, values = None, -INFINITY, {}
+        key = self.key()
+        for option in self.options(self.table.get(key)):
+            value = self.try_option(option, depth, -INFINITY if all_moves else alpha, beta)
+            values[PASS if option is None else option.mask] = value
+            if value > best_value: best_move, best_value = option, value
+            alpha = max(alpha, value)
+        self.table[key] = (depth if self.horizon else SOLVED, best_value, EXACT, PASS if best_move is None else best_move.mask)
+        return best_move, best_value, values
+
+    def key(self):
+        board = self.mask_keys[-1].get(self.last_mask)
+        if board is None: board = self.mask_key(-1, self.last_mask)
+        return self.hand_key ^ self.root_key ^ board ^ self.turn_keys[self.current] ^ self.actor_keys[self.last_actor] ^ self.passed_keys[self.passed]
+
+    # 둘 수 있는 수 (None = 패스). TT 에 최선 수가 있으면 그 수를 맨 앞으로.
+    def options(self, entry):
+        moves = self.moves(self.hands[self.current])
+        options = moves + [None] if self.last_mask else moves
+        if entry is None: return options
+        best = entry[3]
+        if best == PASS: return [None] + moves if self.last_mask else options
+        if options[0].mask == best: return options
+        for i, option in enumerate(options):
+            if option is not None and option.mask == best: return [option] + options[:i] + options[i + 1:]
+        return options
+
+    def advance(self):
+        seat, n, passed = self.current, self.num_players, self.passed
+        for _ in range(n):
+            seat = seat + 1 if seat + 1 < n else 0
+            if not passed >> seat & 1: break
+        self.current = seat
+
+    def apply_pass(self):
+        self.passed |= 1 << self.current
+        if self.num_players - self.passed.bit_count() <= 1:
+            self.last, self.last_mask, self.passed, self.current = NO_PLAY, 0, 0, self.last_actor
+        else: self.advance()
+
+    # 수 하나를 두고 그 뒤의 값을 구한 다음 되돌린다 (engine.Game.play / pass_turn 과 같은 규칙)
+    def try_option(self, option, depth, alpha, beta):
+        seat = self.current
+        saved = (seat, self.last, self.last_mask, self.last_actor, self.passed)
+        if option is None:
+            self.apply_pass()
+            value = self.search(depth - 1, alpha, beta)
+            self.current, self.last, self.last_mask, self.last_actor, self.passed = saved
+            return value
+        mask, hands = option.mask, self.hands
+        hand = hands[seat]
+        if hand == mask:
+            hands[seat] = 0
+            value = settlement(hands, self.root, seat)
+            hands[seat] = hand
+            return value
+        move_key = self.mask_key(seat, mask)
+        change = 0 if seat == self.root else weight(hand & ~mask) - weight(hand)
+        hands[seat] = hand & ~mask
+        self.hand_key ^= move_key
+        self.ceiling += change
+        self.last, self.last_mask, self.last_actor = option, mask, seat
+        self.advance()
+        value = self.search(depth - 1, alpha, beta)
+        hands[seat] = hand
+        self.hand_key ^= move_key
+        self.ceiling -= change
+        self.current, self.last, self.last_mask, self.last_actor, self.passed = saved
+        return value
+
+    def search(self, depth, alpha, beta):
+        self.nodes += 1
+        if not self.nodes % CHECK_EVERY and time.perf_counter() > self.deadline: raise OutOfTime
+        key = self.key()
+        entry = self.table.get(key)
+        if entry is not None and entry[0] >= depth:
+            entry_depth, value, bound, _ = entry
+            if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+                self.tt_hits += 1
+                if entry_depth < SOLVED: self.horizon += 1
+                return value
+        ceiling = self.ceiling
+        if ceiling <= alpha: return ceiling
+        if depth <= 0:
+            self.horizon += 1
+            return self.estimate()
+        horizon, original_alpha, original_beta = self.horizon, alpha, beta
+        if self.current == self.root:
+            best_value, best_move = -INFINITY, PASS
+            for option in self.options(entry):
+                value = self.try_option(option, depth, alpha, beta)
+                if value > best_value:
+                    best_value, best_move = value, PASS if option is None else option.mask
+                    if value > alpha: alpha = value
+                    if alpha >= beta or value >= ceiling: break
+        else:
+            best_value, best_move = INFINITY, PASS
+            for option in self.options(entry):
+                value = self.try_option(option, depth, alpha, beta)
+                if value < best_value:
+                    best_value, best_move = value, PASS if option is None else option.mask
+                    if value < beta: beta = value
+                    if alpha >= beta: break
+        bound = UPPER if best_value <= original_alpha else LOWER if best_value >= original_beta else EXACT
+        self.table[key] = (depth if self.horizon > horizon else SOLVED, best_value, bound, best_move)
+        return best_value
+
+    # 지평선의 판: 남은 장 수가 가장 적은 사람(같으면 먼저 둘 사람)이 이긴다고 보고 정산한다
+    def estimate(self):
+        n, seat, hands = self.num_players, self.current, self.hands
+        winner = seat
+        for step in range(1, n):
+            other = (seat + step) % n
+            if hands[other].bit_count() < hands[winner].bit_count(): winner = other
+        return settlement(hands, self.root, winner)
+
+    # 방금 푼 판에서 TT 의 최선 수를 따라간 수순: [(자리, ComboInfo 또는 None)]
+    def principal_line(self, limit):
+        line, hands = [], self.hands
+        for _ in range(limit):
+            entry = self.table.get(self.key())
+            if entry is None: break
+            seat, best = self.current, entry[3]
+            if best == PASS:
+                if not self.last_mask: break
+                line.append((seat, None))
+                self.apply_pass()
+                continue
+            option = classify_mask(best)
+            line.append((seat, option))
+            if hands[seat] == best: break
+            hands[seat] &= ~best
+            self.hand_key ^= self.mask_key(seat, best)
+            self.last, self.last_mask, self.last_actor = option, best, seat
+            self.advance()
+        return line
+
+# ===================================================================
+# 손패를 모르는 판: 보이지 않는 타일을 나눈 판들의 평균
+# ===================================================================
+# 실제 판의 seat 입장에서 worlds 개(또는 time_limit 안에서 풀 수 있는 만큼)의 가상의 판을 풀어
+# 첫 수(마스크, 패스는 PASS)마다 평균 정산 손익을 돌려준다. 수가 정해지는 건 seat 의 손패뿐이라 모든 판에서 후보가 같다.
+def expected_values(game, seat, rng, worlds=8, time_limit=0.05, solver=None):
+    solver = solver or EndgameSolver(game.num_players)
+    deadline = time.perf_counter() + time_limit
+    totals, solved = {}, 0
+    for i in range(worlds):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0 and solved: break
+        solution = solver.solve(game.determinize(seat, rng), time_limit=max(remaining, 0) / (worlds - i), all_moves=True)
+        for move, value in solution.values.items(): totals[move] = totals.get(move, 0) + value
+        solved += 1
+    return {move: total / solved for move, total in totals.items()}
@@ -0,0 +1,93 @@
+# spectators.py
+import time
+from collections import deque
+
+# ===================================================================
+# 관전: 공개 상태만, 원하면 지연을 두고, 방마다 한 번만 인코딩해서 관전자들에게 나눠 준다
+# ===================================================================
+# 게임 쪽은 상태가 바뀔 때마다 touch(room) 만 부른다. 관전자가 몇 명이든 비용은 같다.
+# 실제 전송은 flush() 가 주기마다 한다.
+#  - 그 사이에 여러 번 바뀌었어도 마지막 상태 하나만 보낸다 (패치가 아니라 전체 상태라 중간 것을 건너뛰어도 된다)
+#  - delay 가 있으면 touch 때 인코딩해 두었다가 delay 초가 지난 것 중 가장 새것을 보낸다
+#  - 앞서 보낸 패킷이 아직 소켓 큐에 남아 있는 느린 관전자는 건너뛴다. 큐가 비면 그때의 최신 상태를 받으므로
+#    관전자마다 쌓이는 것은 많아야 패킷 하나다.
+# encode(room) -> 패킷, send(viewer, 패킷), backlog(viewer) -> 큐에 남은 패킷 수 는 app.py 가 넘겨준다.
+class RoomFeed:
+    __slots__ = ('viewers', 'version', 'packet', 'history', 'lagging')
+
+    def __init__(self):
+        self.viewers = {}   # viewer -> 마지막으로 보낸 버전
+        self.version = 0    # 관전용 버전 (보낼 패킷이 바뀔 때마다 1씩)
+        self.packet = None
+        self.history = deque() # delay 용 (인코딩한 시각, 패킷)
+        self.lagging = False   # 최신 패킷을 아직 못 받은 관전자가 있는지
+
+class SpectatorFeed:
+    def __init__(self, encode, send, backlog, delay=0.0):
+        self.encode, self.send, self.backlog, self.delay = encode, send, backlog, delay
+        self.feeds = {} # room id -> RoomFeed
+        self.dirty = {} # room id -> room (지연이 없을 때는 flush 에서 한 번만 인코딩한다)
+        self.encoded = self.sent = self.skipped = 0
+
+    def __len__(self): return sum(len(feed.viewers) for feed in self.feeds.values())
+
+    def watch(self, room, viewer):
+        feed = self.feeds.get(room.room_id)
+        if feed is None:
+            feed = self.feeds[room.room_id] = RoomFeed()
+            self.touch(room)
+        feed.viewers[viewer] = 0
+        feed.lagging = feed.packet is not None
+
+    def unwatch(self, room_id, viewer):
+        feed = self.feeds.get(room_id)
+        if feed is None: return
+        feed.viewers.pop(viewer, None)
+        if not feed.viewers: self.drop(room_id)
+
+    def drop(self, room_id):
+        self.feeds.pop(room_id, None)
+        self.dirty.pop(room_id, None)
+
+    def touch(self, room):
+        feed = self.feeds.get(room.room_id)
+        if feed is None: return
+        if self.delay:
+            feed.history.append((time.monotonic(), self.encode(room)))
+            self.encoded += 1
+        else: self.dirty[room.room_id] = room
+
+    def flush(self, now=None):
+        now = time.monotonic() if now is None else now
+        dirty, self.dirty = self.dirty, {}
+        for room_id, room in dirty.items():
+            feed = self.feeds.get(room_id)
+            if feed is None: continue
+            self.publish(feed, self.encode(room))
+            self.encoded += 1
+        if self.delay:
+            for feed in self.feeds.values():
+                packet, history = None, feed.history
+                while history and history[0][0] <= now - self.delay: packet = history.popleft()[1]
+                if packet is not None: self.publish(feed, packet)
+        for feed in self.feeds.values():
+            if feed.lagging: self.deliver(feed)
+
+    def publish(self, feed, packet):
+        feed.version += 1
+        feed.packet = packet
+        feed.lagging = True
+
+    def deliver(self, feed):
+        lagging, version, packet = False, feed.version, feed.packet
+        viewers = feed.viewers
+        for viewer, seen in viewers.items():
+            if seen == version: continue
+            if self.backlog(viewer):
+                lagging = True
+                self.skipped += 1
+                continue
+            self.send(viewer, packet)
+            viewers[viewer] = version
+            self.sent += 1
+        feed.lagging = lagging
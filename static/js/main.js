@@ -1,5 +1,26 @@
-const socket = io();
+const params = new URLSearchParams(window.location.search);
+const roomId = params.get('room') || 'main';
+// ?watch=1 이면 관전자: 자리에 앉지 않고 서버가 주기적으로 보내는 공개 상태만 그린다
+const watching = params.get('watch') === '1';
+// 새로고침이나 일시적인 끊김 뒤에도 같은 자리로 돌아올 수 있게 방마다 토큰을 보관한다
+const tokenKey = `lexio-token-${roomId}`;
+// query 의 room 은 로드밸런서가 같은 방의 연결을 같은 워커로 보내는 데 쓴다 (cluster.py 참고)
+// 레이팅을 매길 때 쓰는 이 브라우저의 플레이어 비밀 값 (서버는 해시만 저장한다, ratings.py)
+let playerSecret = localStorage.getItem('lexio-player');
+if (!playerSecret) {
+    playerSecret = Array.from(crypto.getRandomValues(new Uint8Array(16)), b => b.toString(16).padStart(2, '0')).join('');
+    localStorage.setItem('lexio-player', playerSecret);
+}
+// ?wire=bin 이면 게임 이벤트를 압축 프로토콜(wire.py)로 받는다. 관전자는 늘 JSON 이다.
+const compactWire = params.get('wire') === 'bin' && !watching;
+const socket = watching
+    ? io({ auth: { room: roomId, watch: true }, query: { room: roomId, watch: '1' } })
+    : io({ auth: { room: roomId, token: localStorage.getItem(tokenKey), player: playerSecret, wire: compactWire ? 'bin1' : undefined }, query: { room: roomId } });
+if (watching) document.body.classList.add('spectating');
 let myPlayerNum = -1;
+let gameState = null;
+let myHand = [];
+let turnDeadline = null;
 
 const allScreens = document.querySelectorAll('.screen');
 const startScreen = document.getElementById('start-screen');
@@ -10,6 +31,7 @@ const gameOverScreen = document.getElementById('game-over-screen');
 
 const waitingStatus = document.getElementById('waiting-status');
 const gameInfoDiv = document.getElementById('game-info');
+const turnTimerDiv = document.getElementById('turn-timer');
 const myHandDiv = document.getElementById('player-hand');
 const boardHandDiv = document.getElementById('board-hand');
 const statusTbody = document.getElementById('player-status-tbody');
@@ -17,9 +39,25 @@ const logList = document.getElementById('game-log-list');
 const playButton = document.getElementById('play-button');
 const passButton = document.getElementById('pass-button');
 const startGameButton = document.getElementById('start-game-button');
+const queueButton = document.getElementById('queue-button');
+const leaveQueueButton = document.getElementById('leave-queue-button');
+const lobbyStatus = document.getElementById('lobby-status');
 const numPlayersSelect = document.getElementById('num-players-select');
+const numBotsSelect = document.getElementById('num-bots-select');
+const botLevelSelect = document.getElementById('bot-level-select');
 const playAgainButton = document.getElementById('play-again-button');
 const playSound = document.getElementById('play-sound');
+// 빌드된 타일 스프라이트(assets.py)가 있으면 카드마다 그림을 따로 받지 않고 한 장에서 잘라 쓴다
+const tileAtlas = JSON.parse(document.getElementById('tile-atlas').textContent);
+if (tileAtlas) {
+    const useWebp = tileAtlas.webp && document.createElement('canvas').toDataURL('image/webp').startsWith('data:image/webp');
+    const [cellWidth, cellHeight] = tileAtlas.cell;
+    const [atlasWidth, atlasHeight] = tileAtlas.size;
+    const atlasStyle = document.createElement('style');
+    atlasStyle.textContent = `.card.atlas { background-image: url('${useWebp ? tileAtlas.webp : tileAtlas.png}'); `
+        + `background-size: ${atlasWidth / cellWidth * 100}% ${atlasHeight / cellHeight * 100}%; }`;
+    document.head.appendChild(atlasStyle);
+}
 
 new Sortable(myHandDiv, { animation: 150, ghostClass: 'sortable-ghost' });
 
@@ -35,23 +73,179 @@ function showScreen(screenId) {
 
 startGameButton.addEventListener('click', () => {
     const numPlayers = numPlayersSelect.value;
-    socket.emit('request_start_game', { 'num_players': numPlayers });
+    const numBots = Math.min(parseInt(numBotsSelect.value), parseInt(numPlayers) - 1);
+    socket.emit('request_start_game', { 'num_players': numPlayers, 'bots': numBots, 'bot_level': botLevelSelect.value });
+});
+
+// 빠른 대전: 같은 인원수를 고른 사람들과 서버가 테이블을 잡아 준다
+queueButton.addEventListener('click', () => {
+    socket.emit('join_queue', { 'num_players': numPlayersSelect.value });
+});
+
+leaveQueueButton.addEventListener('click', () => {
+    socket.emit('leave_queue');
 });
 
 playAgainButton.addEventListener('click', () => {
     socket.emit('request_new_game');
 });
 
+// ===== 압축 프로토콜: wire.py 와 같은 형식. 풀어서 JSON 이벤트와 같은 모양으로 같은 핸들러에 넘긴다 =====
+const WIRE_EVENTS = ['game_update', 'game_started', 'game_snapshot', 'your_hand', 'turn_timeout'];
+const TILE_SUITS = ['cloud', 'star', 'moon', 'sun'];
+const TILE_RANKS = [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 1, 2];
+const COMBO_NAMES = [null, '싱글', '페어', '트리플', '스트레이트', '플러쉬', '풀하우스', '포카드', '스트레이트 플러쉬'];
+// 로그 메시지 번호 -> 문장 (game_room.LOG_FORMATS 와 같은 순서)
+const LOG_FORMATS = [
+    (round) => `라운드 ${round} 시작!`,
+    (seat, rank, combo) => `P${seat + 1}: ${rank} ${COMBO_NAMES[combo]}을(를) 냈습니다.`,
+    (seat) => `P${seat + 1}: 패스했습니다.`,
+];
+const tileFromId = (id) => ({ suit: TILE_SUITS[id % 4], rank: TILE_RANKS[id >> 2] });
+const tileId = (tile) => TILE_RANKS.indexOf(tile.rank) * 4 + TILE_SUITS.indexOf(tile.suit);
+
+class WireReader {
+    constructor(buffer) { this.view = new DataView(buffer); this.offset = 0; }
+    u8() { return this.view.getUint8(this.offset++); }
+    u16() { const value = this.view.getUint16(this.offset, true); this.offset += 2; return value; }
+    u32() { const value = this.view.getUint32(this.offset, true); this.offset += 4; return value; }
+    i16() { const value = this.view.getInt16(this.offset, true); this.offset += 2; return value; }
+    list(read) { return Array.from({ length: this.u8() }, () => read()); }
+    tiles() { return this.list(() => tileFromId(this.u8())); }
+    combo(tiles) {
+        const code = this.u8(), rep = this.u8();
+        if (!code) return [null, null];
+        return [COMBO_NAMES[code], rep === 0xFF ? [...tiles].sort((a, b) => tileId(b) - tileId(a)) : tileFromId(rep)];
+    }
+    log() {
+        const code = this.u8();
+        if (code === 0xFF) {
+            const length = this.u16();
+            this.offset += length;
+            return new TextDecoder().decode(new Uint8Array(this.view.buffer, this.offset - length, length));
+        }
+        const format = LOG_FORMATS[code];
+        return format(...Array.from({ length: format.length }, () => this.u16()));
+    }
+    time() { const value = this.u16(); return value === 0xFFFF ? null : value / 10; }
+}
+
+function decodeState(reader) {
+    const state = { version: reader.u32(), hand_counts: reader.list(() => reader.u8()) };
+    state.current_player_index = reader.u8();
+    state.last_player_to_act_index = reader.u8();
+    state.players_who_passed_this_round = reader.list(() => reader.u8());
+    state.last_played_tiles = reader.tiles();
+    state.last_played_hand_info = reader.combo(state.last_played_tiles);
+    state.game_log = reader.list(() => reader.log());
+    state.player_money = reader.list(() => reader.i16());
+    state.turn_seconds_left = reader.time();
+    return state;
+}
+
+const WIRE_DECODERS = [
+    (reader) => {
+        const patch = { v: reader.u32() };
+        const fields = reader.u8();
+        if (fields & 1) patch.turn = reader.u8();
+        if (fields & 2) patch.log = reader.log();
+        if (fields & 4) {
+            const seat = reader.u8(), tiles = reader.tiles();
+            patch.play = { seat, tiles, combo: reader.combo(tiles) };
+        }
+        if (fields & 8) patch.passed = reader.u8();
+        if (fields & 16) patch.clear = (fields & 128) !== 0;
+        if (fields & 32) patch.money = reader.list(() => reader.i16());
+        if (fields & 64) patch.timer = reader.time();
+        return patch;
+    },
+    decodeState,
+    decodeState,
+    (reader) => ({ v: reader.u32(), seat: reader.u8(), hand: reader.tiles() }),
+    (reader) => ({ seat: reader.u8() }),
+];
+
+async function decodeFrame(data) {
+    const bytes = new Uint8Array(data instanceof Blob ? await data.arrayBuffer() : data);
+    let body = bytes.slice(1).buffer;
+    if (bytes[0] & 0x80) {
+        body = await new Response(new Blob([body]).stream().pipeThrough(new DecompressionStream('deflate-raw'))).arrayBuffer();
+    }
+    const code = bytes[0] & 0x7F;
+    return [WIRE_EVENTS[code], WIRE_DECODERS[code](new WireReader(body))];
+}
+
+// deflate 된 프레임을 푸는 동안 뒤에 온 프레임이 먼저 처리되지 않도록 차례로 푼다
+let wireQueue = Promise.resolve();
+socket.on('b', (data) => {
+    wireQueue = wireQueue
+        .then(() => decodeFrame(data))
+        .then(([event, payload]) => socket.listeners(event).forEach(listener => listener(payload)))
+        .catch(e => console.error('압축 프레임 오류:', e));
+});
+
 socket.on('connect', () => console.log('✅ Connected!'));
-socket.on('player_assigned', (data) => { myPlayerNum = data.player_num; });
+socket.on('player_assigned', (data) => {
+    myPlayerNum = data.player_num;
+    if (data.token) {
+        localStorage.setItem(tokenKey, data.token);
+        socket.auth.token = data.token;
+    }
+});
 socket.on('waiting_for_players', (data) => {
     showScreen('waiting-screen');
+    leaveQueueButton.style.display = 'none';
     waitingStatus.innerText = `(${data.current} / ${data.needed} 명)`;
 });
-socket.on('game_update', redrawGame);
-socket.on('game_started', (gameState) => {
+socket.on('queue_joined', (data) => {
+    showScreen('waiting-screen');
+    waitingStatus.innerText = `${data.num_players}인 대기열에서 상대를 찾는 중... (${data.waiting}명 대기)`;
+    leaveQueueButton.style.display = '';
+});
+socket.on('queue_left', () => {
+    leaveQueueButton.style.display = 'none';
+    showScreen('start-screen');
+});
+// 잡힌 방의 자리 토큰을 저장하고 그 방으로 다시 접속한다
+socket.on('match_found', (data) => {
+    localStorage.setItem(`lexio-token-${data.room}`, data.token);
+    window.location.search = `?room=${encodeURIComponent(data.room)}`;
+});
+socket.on('room_full', () => {
+    lobbyStatus.innerText = '이 방은 이미 가득 찼습니다. 빠른 대전으로 다른 테이블을 찾아보세요.';
+    showScreen('start-screen');
+});
+// 관전 상태는 매번 전체 상태라서 버전을 맞출 필요 없이 그대로 바꿔 그린다
+socket.on('spectate_state', (view) => {
+    if (!view.hand_counts) {
+        showScreen('waiting-screen');
+        waitingStatus.innerText = `관전 대기 중: ${view.room}`;
+        return;
+    }
+    showScreen('game-screen');
+    gameState = view;
+    setTurnTimer(view.turn_seconds_left);
+    redrawGame();
+});
+// 새 손패(새 라운드, 재동기화)가 오면 이전 손패에서 골라 둔 선택은 지운다. 남는 카드 노드는 그대로 다시 쓰기 때문이다.
+socket.on('your_hand', (data) => {
+    myHand = data.hand;
+    myHandDiv.querySelectorAll('.card.selected').forEach(card => card.classList.remove('selected'));
+});
+socket.on('game_update', applyPatch);
+socket.on('game_snapshot', (snapshot) => {
+    gameState = snapshot;
+    setTurnTimer(snapshot.turn_seconds_left);
+    redrawGame();
+});
+socket.on('game_started', (snapshot) => {
     showScreen('game-screen');
-    redrawGame(gameState);
+    gameState = snapshot;
+    setTurnTimer(snapshot.turn_seconds_left);
+    redrawGame();
+});
+socket.on('turn_timeout', (data) => {
+    gameInfoDiv.innerText = data.seat === myPlayerNum ? '시간 초과! 자동으로 진행합니다.' : `플레이어 ${data.seat + 1} 시간 초과`;
 });
 socket.on('error_message', (data) => alert(`오류: ${data.message}`));
 socket.on('round_result', (data) => {
@@ -67,6 +261,7 @@ socket.on('round_result', (data) => {
 });
 socket.on('game_over', (data) => {
     document.getElementById('final-rankings-text').innerHTML = '<strong>최종 순위:</strong>\n' + data.rankings.join('\n');
+    document.getElementById('rating-changes-text').innerHTML = '';
     const bankruptText = document.getElementById('bankrupt-players-text');
     if(data.bankrupt && data.bankrupt.length > 0) {
         bankruptText.innerText = "파산: 플레이어 " + data.bankrupt.join(', ');
@@ -75,25 +270,110 @@ socket.on('game_over', (data) => {
     }
     showScreen('game-over-screen');
 });
+socket.on('rating_update', (data) => {
+    const lines = data.ratings.map(r => `플레이어 ${r.player_num}: ${r.rating} (${r.delta >= 0 ? '+' : ''}${r.delta})`);
+    document.getElementById('rating-changes-text').innerHTML = '<strong>레이팅:</strong>\n' + lines.join('\n');
+});
 socket.on('show_lobby', () => {
     showScreen('start-screen');
 });
+socket.on('player_disconnected', (data) => {
+    gameInfoDiv.innerText = `플레이어 ${data.player_num}의 접속이 끊어졌습니다. ${data.grace}초 동안 재접속을 기다립니다.`;
+});
+socket.on('player_returned', (data) => {
+    gameInfoDiv.innerText = `플레이어 ${data.player_num}이(가) 다시 접속했습니다.`;
+});
 socket.on('player_left', (data) => {
     alert(`플레이어 ${data.player_num}의 접속이 끊어져 게임이 종료되었습니다. 로비로 돌아갑니다.`);
+    localStorage.removeItem(tokenKey);
     window.location.reload();
 });
 
 playButton.addEventListener('click', () => {
     const selectedCards = document.querySelectorAll('#player-hand .card.selected');
     const hand_to_play = Array.from(selectedCards).map(card => ({ suit: card.dataset.suit, rank: parseInt(card.dataset.rank) }));
-    if (hand_to_play.length > 0) { socket.emit('play_hand', hand_to_play); } 
+    if (hand_to_play.length > 0) { socket.emit('play_hand', compactWire ? hand_to_play.map(tileId) : hand_to_play); } 
     else { alert('카드를 선택해주세요!'); }
 });
 
 passButton.addEventListener('click', () => { socket.emit('pass_turn'); });
 
-function redrawGame(gameState) {
-    if (!gameState || !gameState.player_hands || myPlayerNum === -1) return;
+// 서버는 매 액션마다 버전이 붙은 패치만 보낸다. 버전이 비면 전체 스냅샷을 다시 요청한다.
+function applyPatch(patch) {
+    if (!gameState || patch.v !== gameState.version + 1) {
+        if (!gameState || patch.v > gameState.version) socket.emit('request_resync');
+        return;
+    }
+    if (patch.play) {
+        gameState.hand_counts[patch.play.seat] -= patch.play.tiles.length;
+        if (patch.play.seat === myPlayerNum) {
+            patch.play.tiles.forEach(tile => {
+                const index = myHand.findIndex(t => t.suit === tile.suit && t.rank === tile.rank);
+                if (index !== -1) myHand.splice(index, 1);
+            });
+        }
+        gameState.last_played_tiles = patch.play.tiles;
+        gameState.last_played_hand_info = patch.play.combo;
+        gameState.last_player_to_act_index = patch.play.seat;
+    }
+    if (patch.passed !== undefined) {
+        gameState.players_who_passed_this_round.push(patch.passed);
+    }
+    if (patch.clear) {
+        gameState.last_played_tiles = [];
+        gameState.last_played_hand_info = [null, null];
+        gameState.players_who_passed_this_round = [];
+    }
+    if (patch.money) gameState.player_money = patch.money;
+    if (patch.log) {
+        gameState.game_log.push(patch.log);
+        if (gameState.game_log.length > 15) gameState.game_log.shift();
+    }
+    gameState.current_player_index = patch.turn;
+    gameState.version = patch.v;
+    if (patch.timer !== undefined) setTurnTimer(patch.timer);
+    redrawGame();
+}
+
+// 서버는 남은 초만 보낸다. 받은 시각부터 세기 때문에 시계가 달라도 상관없다.
+function setTurnTimer(seconds) {
+    turnDeadline = (seconds === null || seconds === undefined) ? null : Date.now() + seconds * 1000;
+    updateTurnTimer();
+}
+
+function updateTurnTimer() {
+    if (turnDeadline === null || !gameState) {
+        setText(turnTimerDiv, '');
+        return;
+    }
+    const left = Math.max(0, Math.ceil((turnDeadline - Date.now()) / 1000));
+    setText(turnTimerDiv, `남은 시간: ${left}초`);
+    turnTimerDiv.classList.toggle('urgent', left <= 5 && gameState.current_player_index === myPlayerNum);
+}
+setInterval(updateTurnTimer, 250);
+
+// ===== 화면 그리기: 다시 만들지 않고 바뀐 부분만 고친다 =====
+// 카드는 타일(suit_rank), 상태 줄은 자리 번호로 키를 잡아 있던 노드를 다시 쓰고, 로그는 새 줄만 붙인다.
+// 한 프레임 안에 이벤트가 여러 개 와도 requestAnimationFrame 에서 한 번만 그린다.
+let renderQueued = false;
+let renderedLog = [];
+const statusRows = [];
+
+function redrawGame() {
+    if (renderQueued) return;
+    renderQueued = true;
+    requestAnimationFrame(() => {
+        renderQueued = false;
+        renderGame(gameState);
+    });
+}
+
+function setText(element, text) { if (element.textContent !== text) element.textContent = text; }
+function setHtml(element, html) { if (element.innerHTML !== html) element.innerHTML = html; }
+function setDisabled(button, disabled) { if (button.disabled !== disabled) button.disabled = disabled; }
+
+function renderGame(gameState) {
+    if (!gameState || !gameState.hand_counts || (myPlayerNum === -1 && !watching)) return;
 
     const myStatus = {
         isMyTurn: gameState.current_player_index === myPlayerNum,
@@ -101,74 +381,111 @@ function redrawGame(gameState) {
         isLeader: gameState.last_played_hand_info[0] === null
     };
 
-    playButton.disabled = !myStatus.isMyTurn || myStatus.hasPassed;
-   // main.js 의 redrawGame 함수 내부
-    passButton.disabled = !myStatus.isMyTurn || myStatus.isLeader;
+    setDisabled(playButton, !myStatus.isMyTurn || myStatus.hasPassed);
+    setDisabled(passButton, !myStatus.isMyTurn || myStatus.isLeader);
 
-    myHandDiv.innerHTML = '';
-    const myHand = gameState.player_hands[myPlayerNum];
-    myHand.forEach(tile => createCard(tile, myHandDiv, true));
-
-    boardHandDiv.innerHTML = '';
-    const lastPlayedTiles = gameState.last_played_tiles;
-    if (lastPlayedTiles && lastPlayedTiles.length > 0) {
-        lastPlayedTiles.forEach(tile => createCard(tile, boardHandDiv, false));
-    }
+    // 내 패는 Sortable 로 바꾼 순서를 지키도록 남은 카드는 움직이지 않는다
+    reconcileCards(myHandDiv, myHand, true);
+    reconcileCards(boardHandDiv, gameState.last_played_tiles || [], false);
 
     if (gameState.current_player_index === myPlayerNum) {
-        gameInfoDiv.innerHTML = `<span class="turn-indicator">당신의 턴입니다!</span>`;
+        setHtml(gameInfoDiv, `<span class="turn-indicator">당신의 턴입니다!</span>`);
     } else {
-        gameInfoDiv.innerHTML = `플레이어 ${gameState.current_player_index + 1}의 턴입니다.`;
+        setHtml(gameInfoDiv, `플레이어 ${gameState.current_player_index + 1}의 턴입니다.`);
+    }
+
+    renderStatusRows(gameState);
+    if (gameState.game_log) renderLog(gameState.game_log);
+}
+
+function tileKey(tile) { return `${tile.suit}_${tile.rank}`; }
+
+// 키가 같은 카드는 그대로 두고, 없어진 카드만 빼고 새 카드만 만든다.
+// keepOrder 면 남은 카드의 순서는 건드리지 않고 새 카드를 끝에 붙인다.
+function reconcileCards(container, tiles, keepOrder) {
+    const wanted = new Map(tiles.map(tile => [tileKey(tile), tile]));
+    const existing = new Map();
+    Array.from(container.children).forEach(card => {
+        if (wanted.has(card.dataset.key)) existing.set(card.dataset.key, card);
+        else card.remove();
+    });
+    if (keepOrder) {
+        wanted.forEach((tile, key) => { if (!existing.has(key)) container.appendChild(createCard(tile, true)); });
+        return;
     }
+    let cursor = container.firstChild;
+    wanted.forEach((tile, key) => {
+        const card = existing.get(key) || createCard(tile, false);
+        if (card === cursor) cursor = cursor.nextSibling;
+        else container.insertBefore(card, cursor);
+    });
+}
 
-    statusTbody.innerHTML = '';
-    const numPlayers = gameState.player_hands.length;
-    for (let i = 0; i < numPlayers; i++) {
+function renderStatusRows(gameState) {
+    const numPlayers = gameState.hand_counts.length;
+    while (statusRows.length > numPlayers) statusRows.pop().row.remove();
+    while (statusRows.length < numPlayers) {
         const row = document.createElement('tr');
-        let status = '';
-        row.classList.remove('my-turn-indicator');
-        if (i === gameState.current_player_index) {
-            status = '진행 중';
-            if (i === myPlayerNum) { row.classList.add('my-turn-indicator'); }
-            else { row.classList.add('turn-row'); }
-        } else if (gameState.players_who_passed_this_round.includes(i)) {
-            status = 'Pass';
-        }
-        let playerName = `P${i + 1}`;
-        if (i === myPlayerNum) {
-            playerName += ' (당신)';
-            row.classList.add('my-row');
-        }
-        const cardCount = gameState.player_hands[i].length;
-        const money = gameState.player_money[i];
-        row.innerHTML = `<td>${playerName}</td><td>${cardCount}개</td><td>${money}원</td><td>${status}</td>`;
+        const cells = [0, 1, 2, 3].map(() => row.appendChild(document.createElement('td')));
         statusTbody.appendChild(row);
+        statusRows.push({ row, cells });
     }
-    
-    logList.innerHTML = '';
-    if (gameState.game_log) {
-        const lastMessage = gameState.game_log[gameState.game_log.length - 1];
-        if (lastMessage && lastMessage.includes('냈습니다')) {
-            playSound.currentTime = 0;
-            playSound.play().catch(e => console.error("소리 재생 오류:", e));
-        }
-        gameState.game_log.forEach(message => {
-            const li = document.createElement('li');
-            li.textContent = message;
-            logList.appendChild(li);
-        });
-        logList.scrollTop = logList.scrollHeight;
+    statusRows.forEach(({ row, cells }, i) => {
+        const isCurrent = i === gameState.current_player_index;
+        let status = '';
+        if (isCurrent) status = '진행 중';
+        else if (gameState.players_who_passed_this_round.includes(i)) status = 'Pass';
+        setText(cells[0], i === myPlayerNum ? `P${i + 1} (당신)` : `P${i + 1}`);
+        setText(cells[1], `${gameState.hand_counts[i]}개`);
+        setText(cells[2], `${gameState.player_money[i]}원`);
+        setText(cells[3], status);
+        if (row.classList.contains('my-turn-indicator') !== (isCurrent && i === myPlayerNum)) row.classList.toggle('my-turn-indicator');
+        if (row.classList.contains('turn-row') !== (isCurrent && i !== myPlayerNum)) row.classList.toggle('turn-row');
+        if (row.classList.contains('my-row') !== (i === myPlayerNum)) row.classList.toggle('my-row');
+    });
+}
+
+// 로그는 최근 15줄만 온다. 앞에서 밀려난 줄은 빼고 새 줄만 붙인다. 새 라운드처럼 이어지지 않으면 다시 채운다.
+function renderLog(log) {
+    let drop = 0;
+    while (drop < renderedLog.length && !renderedLog.slice(drop).every((message, i) => message === log[i])) drop++;
+    for (let i = 0; i < drop; i++) logList.firstChild.remove();
+    const added = log.slice(renderedLog.length - drop);
+    added.forEach(message => {
+        const li = document.createElement('li');
+        li.textContent = message;
+        logList.appendChild(li);
+    });
+    renderedLog = log.slice();
+    if (!added.length) return;
+    if (added.some(message => message.includes('냈습니다'))) {
+        playSound.currentTime = 0;
+        playSound.play().catch(e => console.error("소리 재생 오류:", e));
     }
+    logList.scrollTop = logList.scrollHeight;
 }
-        
-function createCard(tile, container, isClickable) {
+
+function setTileImage(cardDiv, tile) {
+    if (!tileAtlas) {
+        cardDiv.style.backgroundImage = `url('/static/images/${tile.suit}_${tile.rank}.png')`;
+        return;
+    }
+    const [x, y] = tileAtlas.tiles[`${tile.suit}_${tile.rank}`];
+    const [cellWidth, cellHeight] = tileAtlas.cell;
+    const [atlasWidth, atlasHeight] = tileAtlas.size;
+    cardDiv.classList.add('atlas');
+    cardDiv.style.backgroundPosition = `${x / (atlasWidth - cellWidth) * 100}% ${y / (atlasHeight - cellHeight) * 100}%`;
+}
+
+function createCard(tile, isClickable) {
     const cardDiv = document.createElement('div');
     cardDiv.className = 'card';
+    cardDiv.dataset.key = tileKey(tile);
     cardDiv.dataset.suit = tile.suit;
     cardDiv.dataset.rank = tile.rank;
-    cardDiv.style.backgroundImage = `url('/static/images/${tile.suit}_${tile.rank}.png')`;
+    setTileImage(cardDiv, tile);
     if (isClickable) {
         cardDiv.addEventListener('click', () => cardDiv.classList.toggle('selected'));
     }
-    container.appendChild(cardDiv);
+    return cardDiv;
 }
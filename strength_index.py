@@ -0,0 +1,201 @@
+# strength_index.py
+# 사용법: python strength_index.py [--path combinations.idx] [--rebuild] [--hand 0 4 8 ...] [--board 12 13] [--unseen-count 12]
+import argparse
+import bisect
+import mmap
+import os
+import struct
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+from game_logic import FULL_DECK_MASK, RULES_VERSION, TILES, ComboInfo, combination_key, combination_ranking, combination_table, mask_to_tiles, tile_label
+
+# ===================================================================
+# 조합 세기 색인: 60장 덱에서 나올 수 있는 모든 조합을 세기 순으로 정렬해 파일로 두고 mmap 으로 읽는다
+# ===================================================================
+# 파일 = 헤더 + 배열들 (모두 little endian, 배열은 세기(key) 오름차순, 같은 key 는 마스크 순)
+#   헤더:     MAGIC 4바이트, 형식 버전 u16, RULES_VERSION u16, 조합 수 u32, 예약 u32
+#   masks:    u64 × n   조합의 타일 마스크
+#   keys:     u32 × n   game_logic 의 비교 키 (조합 서열 << 24 | 조합 안의 세기). 클수록 세다.
+#   by_mask:  u32 × n   masks 를 마스크 값 순으로 정렬하는 위치 (마스크 -> 위치 를 이분 탐색으로 찾는다)
+#   ordinals: u16 × n   세기 서열 번호 (같은 key 는 같은 번호, 가장 약한 것이 0)
+# 규칙 버전이 다르거나 파일이 없으면 한 번 만들어 쓴다. 만든 뒤에는 계산 없이 이분 탐색/배열 연산으로만 답한다.
+MAGIC = b'LXCI'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+DEFAULT_PATH = os.environ.get('LEXIO_COMBO_INDEX') or os.path.join(os.path.dirname(os.path.abspath(__file__)), f"combinations-v{RULES_VERSION}.idx")
+COMBINATION_NAMES = {rank: name for name, rank in combination_ranking.items()}
+CHUNK = 4096 # beat_probability 에서 한 번에 비교할 후보 조합 수
+TOP_CHUNK = 512 # strongest_play 가 센 쪽부터 처음 훑어볼 조합 수 (못 찾으면 네 배씩 늘린다)
+ENUMERATE_COST = 200 # 손패 부분집합 하나를 색인에서 찾는 비용 / 후보 조합 하나와 비교하는 비용
+
+def build(path):
+    table = combination_table()
+    infos = sorted(table.values(), key=lambda info: (info.key, info.mask))
+    masks = np.array([info.mask for info in infos], dtype='<u8')
+    keys = np.array([info.key for info in infos], dtype='<u4')
+    by_mask = np.argsort(masks, kind='stable').astype('<u4')
+    ordinals = np.concatenate(([0], np.cumsum(keys[1:] != keys[:-1]))).astype('<u2')
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RULES_VERSION, len(infos), 0))
+        for array in (masks, keys, by_mask, ordinals): f.write(array.tobytes())
+    os.replace(tmp, path)
+
+class StrengthIndex:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        with open(path, 'rb') as f: self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rules, n, _ = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != FORMAT_VERSION or rules != RULES_VERSION:
+            self.data.close()
+            raise ValueError(f"{path}: 다른 형식/규칙 버전의 색인입니다 (형식 {version}, 규칙 {rules})")
+        offset = HEADER.size
+        arrays = []
+        for dtype in ('<u8', '<u4', '<u4', '<u2'):
+            arrays.append(np.frombuffer(self.data, dtype=dtype, count=n, offset=offset))
+            offset += n * np.dtype(dtype).itemsize
+        self.masks, self.keys, self.by_mask, self.ordinals = arrays
+        # 키 하나를 찾을 때는 numpy 호출보다 파이썬 정수를 돌려주는 memoryview 위의 bisect 가 빠르다
+        key_offset = HEADER.size + n * 8
+        self.key_view = memoryview(self.data)[key_offset:key_offset + n * 4].cast('I')
+        self.mask_view = memoryview(self.masks[self.by_mask]) # 마스크 값 순 (position() 용, 320KB)
+        classes = self.keys >> 24
+        self.sizes = np.where(classes <= 3, classes, 5).astype(np.uint8) # 싱글/페어/트리플은 서열 = 장 수, 나머지는 5장
+
+    def __len__(self): return len(self.keys)
+
+    def close(self):
+        self.key_view.release()
+        self.masks = self.keys = self.by_mask = self.ordinals = self.sizes = self.key_view = self.mask_view = None
+        self.data.close()
+
+    # 색인 위치 -> ComboInfo. 조합 테이블 없이 키에서 바로 만든다 (대표 타일 = 키 하위 비트의 타일 id).
+    def combo(self, position):
+        key, mask = int(self.keys[position]), int(self.masks[position])
+        name = COMBINATION_NAMES[key >> 24]
+        rep_info = tuple(sorted(mask_to_tiles(mask), reverse=True)) if name == "플러쉬" else TILES[key & 0xffffff]
+        return ComboInfo(name, rep_info, key, mask)
+
+    # 마스크 -> 색인 위치. 조합이 아니면 -1.
+    def position(self, mask):
+        i = bisect.bisect_left(self.mask_view, mask)
+        if i < len(self.mask_view) and self.mask_view[i] == mask: return int(self.by_mask[i])
+        return -1
+
+    # 세기 서열 번호 (0 = 가장 약한 조합). 조합이 아니면 None.
+    def ordinal(self, combo_info):
+        position = self.position(combo_info if isinstance(combo_info, int) else combo_info.mask)
+        return int(self.ordinals[position]) if position >= 0 else None
+
+    # 바닥 패(combo_info)보다 센 첫 위치. 바닥이 비었으면 0.
+    def first_beating(self, combo_info):
+        key = combination_key(combo_info) if combo_info[0] is not None else None
+        return 0 if key is None else bisect.bisect_right(self.key_view, key)
+
+    def beats_count(self, combo_info): return len(self.keys) - self.first_beating(combo_info)
+
+    # 바닥 패를 이기는 조합 가운데 within 안의 타일로만 만들 수 있는 것들의 마스크
+    def beating(self, combo_info, within=FULL_DECK_MASK):
+        start = self.first_beating(combo_info)
+        masks = self.masks[start:]
+        if within != FULL_DECK_MASK: masks = masks[(masks & np.uint64(FULL_DECK_MASK & ~within)) == 0]
+        return masks
+
+    # 손패로 낼 수 있는 (바닥을 이기는) 조합의 색인 위치들. 세기 오름차순.
+    def playable(self, hand, combo_info=(None, None)):
+        start = self.first_beating(combo_info)
+        return start + np.flatnonzero((self.masks[start:] & np.uint64(FULL_DECK_MASK & ~hand)) == 0)
+
+    # 센 쪽 끝에서부터 조금씩 넓혀 가며 찾는다. 대개 처음 몇백 개 안에서 끝난다.
+    def strongest_play(self, hand, combo_info=(None, None)):
+        start, end, width = self.first_beating(combo_info), len(self.keys), TOP_CHUNK
+        missing = np.uint64(FULL_DECK_MASK & ~hand)
+        while end > start:
+            lo = max(start, end - width)
+            found = np.flatnonzero((self.masks[lo:end] & missing) == 0)
+            if len(found): return self.combo(lo + int(found[-1]))
+            end, width = lo, width * 4
+        return None
+
+    def weakest_play(self, hand, combo_info=(None, None)):
+        positions = self.playable(hand, combo_info)
+        return self.combo(int(positions[0])) if len(positions) else None
+
+    # 보이지 않는 타일(unseen_mask) 가운데 무작위 k장을 쥔 상대가 바닥 패를 이길 수 있을 확률 (표본 추정).
+    # 장 수별로, 후보 조합이 적으면 표본 손패마다 후보 전부와 비교하고, 손패의 부분집합이 더 적으면(끝판의 짧은 손패)
+    # 부분집합을 색인에서 찾는다. 이미 이길 수 있는 표본은 다음 장 수에서 빼고 본다.
+    def beat_probability(self, combo_info, unseen_mask, k, samples=2000, seed=None):
+        start = self.first_beating(combo_info)
+        ids = np.array([i for i in range(FULL_DECK_MASK.bit_length()) if unseen_mask >> i & 1], dtype=np.uint64)
+        k = min(k, len(ids))
+        if k <= 0 or start == len(self.keys): return 0.0
+        masks, sizes = self.masks[start:], self.sizes[start:]
+        fits = (masks & np.uint64(FULL_DECK_MASK & ~unseen_mask)) == 0
+        fits &= sizes <= k
+        if not fits.any(): return 0.0
+        rng = np.random.default_rng(seed)
+        held = ids[np.argpartition(rng.random((samples, len(ids))), k - 1, axis=1)[:, :k]]
+        missing = ~np.bitwise_or.reduce(np.left_shift(np.uint64(1), held), axis=1)
+        open_rows = np.ones(samples, dtype=bool)
+        for size in (1, 2, 3, 5):
+            group = masks[fits & (sizes == size)]
+            if not len(group): continue
+            rows = np.flatnonzero(open_rows)
+            if comb(k, size) * ENUMERATE_COST < len(group):
+                subsets = np.bitwise_or.reduce(np.left_shift(np.uint64(1), held[rows][:, list(combinations(range(k), size))]), axis=2)
+                found = self.by_mask[np.minimum(np.searchsorted(self.masks, subsets, sorter=self.by_mask), len(self.keys) - 1)]
+                hit = ((self.masks[found] == subsets) & (found >= start)).any(axis=1)
+                open_rows[rows[hit]] = False
+                continue
+            for lo in range(0, len(group), CHUNK):
+                if not len(rows): return 1.0
+                hit = ((group[None, lo:lo + CHUNK] & missing[rows, None]) == 0).any(axis=1)
+                open_rows[rows[hit]] = False
+                rows = rows[~hit]
+        return 1.0 - open_rows.mean()
+
+_index = None
+
+# 프로세스에서 한 번만 연다. 파일이 없거나 규칙 버전이 다르면 새로 만든다.
+def open_index(path=DEFAULT_PATH, rebuild=False):
+    if not rebuild:
+        try: return StrengthIndex(path)
+        except (OSError, ValueError, struct.error): pass
+    build(path)
+    return StrengthIndex(path)
+
+def strength_index():
+    global _index
+    if _index is None: _index = open_index()
+    return _index
+
+def main():
+    parser = argparse.ArgumentParser(description='조합 세기 색인 만들기/조회')
+    parser.add_argument('--path', default=DEFAULT_PATH)
+    parser.add_argument('--rebuild', action='store_true')
+    parser.add_argument('--hand', type=int, nargs='*', help='손패 타일 id (0~59)')
+    parser.add_argument('--board', type=int, nargs='*', default=[], help='바닥 패 타일 id')
+    parser.add_argument('--unseen-count', type=int, default=12, help='상대가 쥔 보이지 않는 타일 수')
+    args = parser.parse_args()
+
+    index = open_index(args.path, args.rebuild)
+    print(f"{args.path}: {len(index)} combinations, {int(index.ordinals[-1]) + 1} strength levels, {os.path.getsize(args.path)} bytes")
+    board_mask = sum(1 << i for i in args.board)
+    board = (None, None)
+    if board_mask:
+        if index.position(board_mask) < 0: raise SystemExit("바닥 패가 조합이 아닙니다")
+        board = index.combo(index.position(board_mask))
+        print(f"board {board[0]} {[tile_label(t) for t in mask_to_tiles(board_mask)]}: ordinal {index.ordinal(board)}, {index.beats_count(board)} combinations beat it")
+    if args.hand:
+        hand = sum(1 << i for i in args.hand)
+        strongest = index.strongest_play(hand, board)
+        print(f"hand {[tile_label(t) for t in mask_to_tiles(hand)]}: {len(index.playable(hand, board))} plays, "
+              f"strongest {strongest[0] + ' ' + str([tile_label(t) for t in mask_to_tiles(strongest.mask)]) if strongest else '-'}")
+        unseen = FULL_DECK_MASK & ~hand & ~board_mask
+        print(f"opponent with {args.unseen_count} unseen tiles beats the board: {index.beat_probability(board, unseen, args.unseen_count, seed=1) * 100:.1f}%")
+
+if __name__ == '__main__':
+    main()
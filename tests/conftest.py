@@ -0,0 +1,8 @@
+# tests/conftest.py
+import os
+import sys
+
+# 저장소 루트의 모듈(game_logic, app ...)을 그대로 import 한다. 테스트는 DB/리플레이 파일을 만들지 않는다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for name in ('LEXIO_DB', 'LEXIO_REPLAYS', 'LEXIO_RATINGS'): os.environ.setdefault(name, '')
+os.environ.setdefault('LEXIO_GUARD', '0') # 테스트 클라이언트는 모두 같은 IP 라서 요청 제한은 끈다 (test_guard 는 Guard 를 직접 만든다)
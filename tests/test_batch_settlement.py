@@ -0,0 +1,39 @@
+# tests/test_batch_settlement.py
+import numpy as np
+
+from batch_settlement import money_deltas, payment_matrices, settle_rounds
+from game_logic import settle_round
+
+# game_logic.settle_round 의 (낸 사람, 받은 사람, 금액) 목록을 자리별 금액 변화로
+def brute_force(counts, holds_two, winner):
+    deltas = [0] * len(counts)
+    for payer, payee, amount in settle_round(counts, holds_two, winner):
+        deltas[payer] -= amount
+        deltas[payee] += amount
+    return deltas
+
+def random_rounds(rng, num_games, num_players):
+    counts = rng.integers(0, 14, size=(num_games, num_players))
+    winners = rng.integers(0, num_players, size=num_games)
+    counts[np.arange(num_games), winners] = 0
+    holds_two = rng.random((num_games, num_players)) < 0.3
+    holds_two[np.arange(num_games), winners] = False
+    return counts, holds_two, winners
+
+def test_money_deltas_match_settle_round():
+    rng = np.random.default_rng(1)
+    for num_players in (3, 4, 5):
+        counts, holds_two, winners = random_rounds(rng, 2000, num_players)
+        # 같은 장 수, 모두 0장 같은 끝 경우도 섞는다
+        counts[:50] = counts[:50, :1]
+        deltas = money_deltas(counts, holds_two, winners)
+        expected = [brute_force(list(c), list(h), int(w)) for c, h, w in zip(counts, holds_two, winners)]
+        assert deltas.tolist() == expected
+        assert not deltas.sum(axis=1).any() # 제로섬
+        payments = payment_matrices(counts, holds_two, winners)
+        assert (payments.sum(axis=1) - payments.sum(axis=2)).tolist() == expected
+
+# 2를 쥔 P3 은 승자에게 두 배(16), P2 에게는 차이만큼(5) 낸다
+def test_settle_rounds_flags_bankruptcy():
+    money, over = settle_rounds([[5, 5, 5], [60, 60, 60]], [[0, 3, 8], [0, 3, 8]], [[False, False, True]] * 2, [0, 0])
+    assert money.tolist() == [[24, 7, -16], [79, 62, 39]] and over.tolist() == [True, False]
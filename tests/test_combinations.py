@@ -0,0 +1,56 @@
+# tests/test_combinations.py
+import random
+
+from game_logic import TILES, Tile, _classify_reference, classify_mask, combination_ranking, combination_table, get_combination_info, is_stronger_combination, mask_to_tiles
+
+# 조합 키 도입 전(baseline)의 is_stronger_combination 그대로: 키 순서가 이 비교와 같아야 한다
+def reference_stronger(new_combo_info, last_combo_info):
+    if last_combo_info[0] is None: return True
+    new_name, last_name = new_combo_info[0], last_combo_info[0]
+    new_tile, last_tile = new_combo_info[1], last_combo_info[1]
+    if new_name == '플러쉬' and last_name == '플러쉬':
+        for i in range(5):
+            new_card_strength = Tile.rank_strength[new_tile[i].rank]
+            last_card_strength = Tile.rank_strength[last_tile[i].rank]
+            if new_card_strength > last_card_strength: return True
+            if new_card_strength < last_card_strength: return False
+        return Tile.suit_power[new_tile[0].suit] > Tile.suit_power[last_tile[0].suit]
+    new_rank, last_rank = combination_ranking.get(new_name, 0), combination_ranking.get(last_name, 0)
+    if new_rank > last_rank: return True
+    if new_rank == last_rank and not isinstance(new_tile, tuple): return new_tile > last_tile
+    return False
+
+def test_tile_ids_follow_rank_then_suit():
+    assert [tile.id for tile in TILES] == list(range(60))
+    assert all(a < b for a, b in zip(TILES, TILES[1:]))
+
+def test_table_matches_reference_classifier():
+    for mask, info in combination_table().items():
+        name, rep_info = _classify_reference(mask_to_tiles(mask))
+        assert (info[0], info[1]) == (name, rep_info) and info.mask == mask
+
+# 키 순으로 줄 세우면 바로 앞의 조합을 예전 비교로도 이겨야 한다.
+# 키가 같은 조합(대표 타일이 같은 페어/트리플 등)은 예전 비교로도 서로 이기지 못한다.
+def test_key_order_matches_reference_strength():
+    ordered = sorted(combination_table().values(), key=lambda info: info.key)
+    for weaker, stronger in zip(ordered, ordered[1:]):
+        if weaker.key == stronger.key: assert not reference_stronger(stronger, weaker) and not reference_stronger(weaker, stronger), (weaker, stronger)
+        else: assert reference_stronger(stronger, weaker) and not reference_stronger(weaker, stronger), (weaker, stronger)
+
+def test_is_stronger_combination_matches_reference_on_random_pairs():
+    rng = random.Random(1)
+    combos = list(combination_table().values())
+    for _ in range(20000):
+        a, b = rng.choice(combos), rng.choice(combos)
+        assert is_stronger_combination(a, b) == reference_stronger(a, b) == (a.key > b.key)
+        # 키가 없는 (이름, 대표 타일) 튜플로 불러도 같다 (클라이언트 상태를 복원할 때)
+        assert is_stronger_combination((a[0], a[1]), (b[0], b[1])) == reference_stronger(a, b)
+
+def test_anything_beats_an_empty_table():
+    assert is_stronger_combination(classify_mask(1), (None, None))
+
+def test_invalid_and_duplicate_tiles_are_not_combinations():
+    assert get_combination_info([]) == (None, None)
+    assert get_combination_info([TILES[0], TILES[0]])[0] is None
+    assert get_combination_info([TILES[0], TILES[5]])[0] is None
+    assert not is_stronger_combination(get_combination_info([TILES[0], TILES[5]]), classify_mask(1))
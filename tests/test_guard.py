@@ -0,0 +1,96 @@
+# tests/test_guard.py
+import pytest
+
+from game_logic import TILES
+from guard import CONNECT_BURST, SID_BURST, SID_RATE, STRIKE_LIMIT, Guard, check_connect, check_join_queue, check_play_hand, check_start_game, no_payload
+import wire
+
+@pytest.mark.parametrize('tiles, expected', [
+    ([0], [0]), ([59, 3], [59, 3]), ([{'suit': 'sun', 'rank': 2}], [TILES[-1].id]),
+    ([{'suit': 'cloud', 'rank': 3}, 5], [0, 5]), (list(range(5)), list(range(5))),
+])
+def test_play_hand_normalizes_to_tile_ids(tiles, expected):
+    assert check_play_hand((tiles,)) == (expected,)
+
+@pytest.mark.parametrize('args', [
+    (), ([0], [1]), ('0',), ({'0': 0},), ([],), (list(range(6)),),
+    ([True],), ([-1],), ([60],), ([1.0],), ([0, 0],), ([0, {'suit': 'cloud', 'rank': 3}],),
+    ([{'suit': 'cloud'}],), ([{'suit': 'cloud', 'rank': '3'}],), ([{'suit': 'comet', 'rank': 3}],),
+    ([{'suit': 'cloud', 'rank': 3, 'x': 1}],), ([[0]],), ([None],),
+])
+def test_play_hand_rejects_malformed_tiles(args):
+    assert check_play_hand(args) is None
+
+def test_start_game_accepts_select_strings_and_fills_defaults():
+    assert check_start_game(({'num_players': '4', 'bots': '2', 'bot_level': 'heuristic'},)) == ({'num_players': 4, 'bots': 2, 'bot_level': 'heuristic'},)
+    assert check_start_game(({},)) == ({'num_players': 3, 'bots': 0, 'bot_level': None},)
+
+@pytest.mark.parametrize('data', [
+    {'num_players': 2}, {'num_players': 6}, {'num_players': True}, {'num_players': '003'}, {'num_players': 3, 'bots': 3},
+    {'num_players': 3, 'bot_level': 'grandmaster'}, {'num_players': 3, 'bot_level': 1}, {'a': 1, 'b': 2, 'c': 3, 'd': 4},
+])
+def test_start_game_rejects_out_of_range_values(data):
+    assert check_start_game((data,)) is None
+
+def test_queue_and_empty_payloads():
+    assert check_join_queue(({'num_players': '5'},)) == ({'num_players': 5},)
+    assert check_join_queue(({'num_players': 3, 'x': 1},)) is None
+    assert no_payload(()) == () and no_payload(({},)) is None
+
+@pytest.mark.parametrize('auth, args, expected', [
+    (None, {}, (None, None, False, None, False)),
+    ({'room': 'main', 'token': 'aZ_-09', 'player': 'ab' * 16, 'wire': wire.WIRE_NAME}, {}, ('main', 'aZ_-09', True, 'ab' * 16, False)),
+    ({'room': 'load-1.5-3', 'token': None, 'wire': None}, {}, ('load-1.5-3', None, False, None, False)),
+    ({'room': 'x', 'watch': True}, {}, ('x', None, False, None, True)),
+    (None, {'room': 'from-query', 'watch': '1'}, ('from-query', None, False, None, True)),
+    ({'room': ''}, {'room': 'q'}, ('q', None, False, None, False)),
+])
+def test_connect_normalizes_auth(auth, args, expected):
+    assert check_connect(auth, args) == expected
+
+@pytest.mark.parametrize('auth, args', [
+    (['x'], {}), ('str', {}), (1, {}), ({'room': 'x' * 65}, {}), ({'room': 'x' * 100000}, {}), ({'room': {'a': 1}}, {}),
+    ({'room': 'a b'}, {}), ({'room': 'x:watch'}, {}), ({'room': '방'}, {}), (None, {'room': 'bad room'}),
+    ({'token': 5}, {}), ({'token': 'a/b'}, {}), ({'wire': 'bin2'}, {}), ({'wire': ['bin1']}, {}),
+    ({'watch': 'yes'}, {}), ({'watch': 1}, {}), ({'player': 'p' * 129}, {}), ({'player': ''}, {}), ({'player': 7}, {}),
+    ({'room': 'x', 'extra': 1}, {}),
+])
+def test_connect_rejects_malformed_auth(auth, args):
+    assert check_connect(auth, args) is None
+
+class Clock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+def test_sid_bucket_mutes_bursts_and_refills():
+    clock = Clock()
+    guard = Guard(clock=clock)
+    assert guard.connect('a', '1.1.1.1')
+    for _ in range(SID_BURST): assert guard.check('a', 'pass_turn', ()) == ((), None)
+    assert guard.check('a', 'pass_turn', ()) == (None, 'rate_limited')
+    clock.now += 1
+    for _ in range(SID_RATE): assert guard.check('a', 'pass_turn', ())[1] is None
+    assert guard.check('a', 'pass_turn', ())[1] == 'rate_limited'
+    assert guard.strikes['a'] == 2
+
+def test_invalid_payloads_strike_until_disconnect():
+    clock = Clock()
+    guard = Guard(clock=clock)
+    guard.connect('a', '1.1.1.1')
+    for _ in range(STRIKE_LIMIT):
+        clock.now += 1
+        assert not guard.should_disconnect('a')
+        assert guard.check('a', 'play_hand', ([True],)) == (None, 'invalid')
+    assert guard.should_disconnect('a')
+    guard.disconnect('a')
+    assert not guard.should_disconnect('a') and 'a' not in guard.addresses
+
+def test_new_connections_from_one_ip_are_limited():
+    guard = Guard(clock=Clock())
+    assert all(guard.connect(f"s{i}", '2.2.2.2') for i in range(CONNECT_BURST))
+    assert not guard.connect('late', '2.2.2.2') and guard.connect('other', '3.3.3.3')
+
+def test_disabled_guard_passes_payloads_through():
+    guard = Guard(enabled=False)
+    assert guard.connect('a', '1.1.1.1')
+    assert guard.check('a', 'play_hand', ([True],)) == (([True],), None)
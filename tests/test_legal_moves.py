@@ -0,0 +1,49 @@
+# tests/test_legal_moves.py
+import random
+from itertools import combinations
+
+from game_logic import TILES, _classify_reference, combination_key, combination_table, legal_moves, lowest_move
+
+# 손패의 1/2/3/5장 부분집합을 전부 규칙 그대로 판정해서, 바닥 패를 이기는 것만 모은다
+def brute_force(hand_mask, last_combo_info):
+    ids = [tile_id for tile_id in range(len(TILES)) if hand_mask >> tile_id & 1]
+    last_key = combination_key(last_combo_info) if last_combo_info[0] is not None else -1
+    moves = {}
+    for size in (1, 2, 3, 5):
+        for chosen in combinations(ids, size):
+            info = _classify_reference([TILES[i] for i in chosen])
+            if info[0] is None: continue
+            key = combination_key(info)
+            if key > last_key: moves[sum(1 << i for i in chosen)] = key
+    return moves
+
+def positions(count, seed):
+    rng = random.Random(seed)
+    boards = [(None, None)] + list(combination_table().values())
+    for _ in range(count):
+        hand = sum(1 << tile_id for tile_id in rng.sample(range(len(TILES)), rng.choice((3, 7, 12, 16))))
+        yield hand, rng.choice(boards)
+
+def test_legal_moves_matches_brute_force():
+    for hand, board in positions(300, 1):
+        moves = list(legal_moves(hand, board))
+        expected = brute_force(hand, board)
+        assert {info.mask for info in moves} == set(expected) and len(moves) == len(expected), (hand, board)
+        # 약한 것부터 (같은 키끼리는 순서를 따지지 않는다)
+        assert [info.key for info in moves] == sorted(expected.values())
+
+def test_legal_moves_accepts_tile_lists():
+    hand, board = next(positions(1, 2))
+    tiles = [TILES[tile_id] for tile_id in range(len(TILES)) if hand >> tile_id & 1]
+    assert [info.mask for info in legal_moves(tiles, board)] == [info.mask for info in legal_moves(hand, board)]
+
+# lowest_move 는 legal_moves 의 첫 수와 같은 세기여야 한다 (엔진의 LowestPolicy, has_legal_move)
+def test_lowest_move_is_the_weakest_legal_move():
+    for hand, board in positions(2000, 3):
+        first = next(legal_moves(hand, board), None)
+        lowest = lowest_move(hand, board)
+        if first is None: assert lowest is None, (hand, board)
+        else: assert lowest is not None and lowest.key == first.key and lowest.mask & ~hand == 0, (hand, board)
+
+def test_empty_hand_has_no_moves():
+    assert list(legal_moves(0)) == [] and lowest_move(0) is None
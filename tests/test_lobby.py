@@ -0,0 +1,49 @@
+# tests/test_lobby.py
+from lobby import Lobby
+
+def ids(tables): return [(size, [entry.player_id for entry in picked]) for size, picked in tables]
+
+def test_tables_form_in_arrival_order_within_a_bucket():
+    lobby = Lobby(bucket_width=100)
+    for i in range(7): lobby.enqueue(i, 3, 1510, now=i)
+    assert ids(lobby.match(now=10)) == [(3, [0, 1, 2]), (3, [3, 4, 5])]
+    assert len(lobby) == 1 and 6 in lobby and lobby.waiting[3] == 1
+
+def test_window_widens_one_bucket_per_interval():
+    lobby = Lobby(bucket_width=100, widen_every=10.0, max_window=10)
+    lobby.enqueue('a', 3, 1500, now=0)   # 구간 15
+    lobby.enqueue('b', 3, 1650, now=0)   # 구간 16
+    lobby.enqueue('c', 3, 1320, now=0)   # 구간 13
+    assert lobby.match(now=9.9) == []    # window 0: 자기 구간만
+    assert lobby.match(now=10) == []     # window 1: 14~16, c 는 아직 밖
+    assert ids(lobby.match(now=20)) == [(3, ['a', 'b', 'c'])] # window 2: 13~17
+    assert len(lobby) == 0
+
+def test_nearer_buckets_are_taken_before_farther_ones():
+    lobby = Lobby(bucket_width=100, widen_every=10.0)
+    lobby.enqueue('anchor', 3, 1500, now=0)
+    lobby.enqueue('far', 3, 1290, now=1)   # 구간 12 (거리 3)
+    lobby.enqueue('below', 3, 1410, now=2) # 구간 14 (거리 1)
+    lobby.enqueue('above', 3, 1720, now=3) # 구간 17 (거리 2)
+    # window 3 이면 넷 다 닿지만 가까운 구간부터: 15, 14, 16, 13, 17, 12
+    assert ids(lobby.match(now=30)) == [(3, ['anchor', 'below', 'above'])]
+    assert 'far' in lobby
+
+def test_longest_waiting_bucket_goes_first_and_window_is_capped():
+    lobby = Lobby(bucket_width=100, widen_every=1.0, max_window=2)
+    lobby.enqueue('old', 3, 900, now=0)   # 구간 9
+    lobby.enqueue('x', 3, 1200, now=5)    # 구간 12
+    lobby.enqueue('y', 3, 1200, now=6)
+    lobby.enqueue('z', 3, 1300, now=7)    # 구간 13
+    # 가장 오래 기다린 old 의 구간부터 보지만 window 가 2 에서 멈춰서 구간 12 에 닿지 않고, 다음 구간(12)에서 묶인다
+    assert lobby.window(100) == 2
+    assert ids(lobby.match(now=100)) == [(3, ['x', 'y', 'z'])]
+    assert 'old' in lobby and lobby.tables[3] == 1
+
+def test_enqueue_again_and_cancel():
+    lobby = Lobby(bucket_width=None)
+    lobby.enqueue('a', 3, now=0)
+    lobby.enqueue('a', 4, now=1) # 다시 서면 예전 줄에서 빠진다
+    assert lobby.waiting == {3: 0, 4: 1, 5: 0}
+    assert lobby.cancel('a').size == 4 and lobby.cancel('a') is None
+    assert len(lobby) == 0 and lobby.queues[4] == {}
@@ -0,0 +1,131 @@
+# tests/test_patches.py
+import copy
+import random
+
+import pytest
+
+import app as server
+from game_logic import Tile, get_combination_info, is_stronger_combination
+
+# main.js 의 applyPatch 그대로: 버전이 하나씩 이어질 때만 적용하고, 비면 False (클라이언트는 request_resync 를 보낸다)
+def apply_patch(state, patch, seat, hand):
+    if state is None or patch['v'] != state['version'] + 1: return False
+    play = patch.get('play')
+    if play:
+        state['hand_counts'][play['seat']] -= len(play['tiles'])
+        if play['seat'] == seat:
+            for tile in play['tiles']:
+                if tile in hand: hand.remove(tile)
+        state['last_played_tiles'] = play['tiles']
+        state['last_played_hand_info'] = play['combo']
+        state['last_player_to_act_index'] = play['seat']
+    if 'passed' in patch: state['players_who_passed_this_round'].append(patch['passed'])
+    if patch.get('clear'):
+        state['last_played_tiles'], state['last_played_hand_info'], state['players_who_passed_this_round'] = [], [None, None], []
+    if patch.get('money'): state['player_money'] = patch['money']
+    if patch.get('log'):
+        state['game_log'].append(patch['log'])
+        if len(state['game_log']) > 15: state['game_log'].pop(0)
+    state['current_player_index'] = patch['turn']
+    state['version'] = patch['v']
+    return True
+
+# 브라우저 하나: 받은 이벤트로 화면 상태를 만든다. drop 이 참이면 다음 패치 하나를 잃어버린 것처럼 건너뛴다.
+class Player:
+    def __init__(self, room_id):
+        self.client = server.socketio.test_client(server.app, auth={'room': room_id})
+        self.seat, self.hand, self.state = None, [], None
+        self.versions, self.room_payloads, self.hands_seen = [], [], []
+        self.drop = self.gap = False
+        self.deals = 0
+
+    def receive(self):
+        for message in self.client.get_received():
+            name, args = message['name'], message['args']
+            payload = args[0] if args else None
+            if name == 'player_assigned': self.seat = payload['player_num']
+            elif name == 'your_hand':
+                self.hand = list(payload['hand'])
+                self.hands_seen.append(payload)
+            elif name in ('game_started', 'game_snapshot'):
+                self.deals += name == 'game_started'
+                self.state = copy.deepcopy(payload)
+                self.room_payloads.append(payload)
+            elif name == 'game_update':
+                self.room_payloads.append(payload)
+                self.versions.append(payload['v'])
+                if self.drop: self.drop = False
+                elif not apply_patch(self.state, payload, self.seat, self.hand): self.gap = True
+
+    # 선두면 가장 약한 싱글, 아니면 바닥의 싱글을 이기는 가장 약한 싱글을 내고, 없으면 패스
+    def act(self):
+        last = self.state['last_played_hand_info']
+        last_info = (None, None) if last[0] is None else get_combination_info([Tile(tile['suit'], tile['rank']) for tile in self.state['last_played_tiles']])
+        for tile in sorted(self.hand, key=lambda tile: Tile(tile['suit'], tile['rank'])):
+            if is_stronger_combination(get_combination_info([Tile(tile['suit'], tile['rank'])]), last_info):
+                return self.client.emit('play_hand', [tile])
+        self.client.emit('pass_turn')
+
+def receive_all(players):
+    for player in players: player.receive()
+
+def table(room_id):
+    players = [Player(room_id)]
+    players[0].client.emit('request_start_game', {'num_players': 3})
+    players += [Player(room_id), Player(room_id)]
+    receive_all(players)
+    assert all(player.state for player in players)
+    return players
+
+def play(players, actions):
+    for _ in range(actions):
+        turn = players[0].state['current_player_index']
+        next(player for player in players if player.seat == turn).act()
+        receive_all(players)
+
+def public(state): return {key: value for key, value in state.items() if key != 'turn_seconds_left'}
+
+@pytest.fixture
+def players(request):
+    random.seed(1) # 딜 (GameRoom.start_new_game)
+    players = table(request.node.name)
+    yield players
+    for player in players: player.client.disconnect()
+    room = server.rooms.get(request.node.name) # 다 나가면 방이 없어진다
+    if room is not None: server.reset_game(room)
+
+def test_patch_versions_increase_by_one_and_rebuild_the_snapshot(players):
+    play(players, 120)
+    assert players[0].deals >= 2 # 새 라운드의 딜을 건넜다
+    for player in players:
+        assert not player.gap
+        # 라운드 안에서는 하나씩, 새 라운드의 딜(game_started)을 건너서도 줄지 않는다
+        assert player.versions and all(b > a for a, b in zip(player.versions, player.versions[1:]))
+        state, hand = copy.deepcopy(player.state), player.hand
+        player.client.emit('request_resync')
+        player.receive()
+        assert public(state) == public(player.state)
+        assert sorted(hand, key=str) == sorted(player.hand, key=str)
+
+def test_a_skipped_version_is_detected_and_resync_restores_the_state(players):
+    play(players, 5)
+    late = players[1]
+    late.drop = True
+    play(players, 2)
+    assert late.gap # 건너뛴 다음 패치의 버전이 이어지지 않는다
+    late.client.emit('request_resync')
+    late.receive()
+    assert late.state['version'] == players[0].state['version']
+    assert public(late.state) == public(players[0].state)
+    late.gap = False
+    play(players, 10)
+    assert not late.gap and late.state['version'] == players[0].state['version']
+
+def test_hands_go_only_to_their_own_seat(players):
+    play(players, 60)
+    for player in players:
+        assert player.hands_seen and all(payload['seat'] == player.seat for payload in player.hands_seen)
+        for payload in player.room_payloads:
+            assert 'player_hands' not in payload and 'hand' not in payload
+            # 방 전체에 가는 상태에는 장 수만 있다
+            if 'hand_counts' in payload: assert all(type(count) is int for count in payload['hand_counts'])
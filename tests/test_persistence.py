@@ -0,0 +1,87 @@
+# tests/test_persistence.py
+import json
+import random
+
+from bots import BOTS
+from game_logic import lowest_move, mask_to_tiles, tiles_to_mask
+from game_room import GameRoom
+from persistence import SqliteStore
+
+def make_bot(name): return BOTS[name]()
+
+# app.py 처럼 방을 진행하면서 같은 이벤트를 저장소에 남긴다 (사람 자리도 가장 약한 수를 낸다)
+def play(room, store, actions):
+    store.record(room, 'configure', num_players=room.num_players, bots=[[seat, bot.name] for seat, bot in room.bots.items()])
+    for seat in range(room.num_players - len(room.bots)):
+        room.add_player(f"sid-{seat}")
+        store.record(room, 'seat', seat=seat, token=room.tokens[seat])
+    is_first = needs_deal = True
+    for _ in range(actions):
+        if needs_deal:
+            room.start_new_game(is_first_game=is_first)
+            store.record(room, 'deal', hands=[tiles_to_mask(hand) for hand in room.game_state['player_hands']],
+                         start=room.game_state['current_player_index'], is_first=is_first)
+            is_first = needs_deal = False
+        state = room.game_state
+        seat = state['current_player_index']
+        move = lowest_move(tiles_to_mask(state['player_hands'][seat]), state['last_played_hand_info'])
+        if move is None or (state['last_played_hand_info'][0] is not None and random.random() < 0.2):
+            room.apply_pass(seat)
+            store.record(room, 'pass', seat=seat)
+            continue
+        room.apply_play(seat, mask_to_tiles(move.mask))
+        store.record(room, 'play', seat=seat, mask=move.mask)
+        if not state['player_hands'][seat]:
+            room.is_game_over = room.settle_round(seat)[1]
+            store.record(room, 'settle', winner=seat)
+            if room.is_game_over: break
+            needs_deal = True
+
+def snapshot(room):
+    data = json.loads(json.dumps(room.to_snapshot()))
+    data.pop('version') # 패치 번호라 복구할 때 이벤트의 버전을 따른다
+    return data
+
+def test_snapshot_round_trips_through_json():
+    random.seed(1)
+    room = GameRoom('round-trip')
+    room.configure(4)
+    room.seat_bots([make_bot('heuristic')])
+    play(room, SqliteStore(':memory:'), 150)
+    data = json.loads(json.dumps(room.to_snapshot()))
+    restored = GameRoom.from_snapshot('round-trip', data, make_bot)
+    assert json.loads(json.dumps(restored.to_snapshot())) == data
+    assert restored.game_state['last_played_hand_info'][:2] == tuple(room.game_state['last_played_hand_info'][:2])
+    assert restored.public_state() == room.public_state()
+
+# 마지막 스냅샷 + 그 뒤 이벤트만으로 다시 만든 방이 살아 있는 방과 같아야 한다 (스냅샷 주기를 바꿔 가며)
+def test_store_recovers_rooms_from_snapshot_and_events(tmp_path):
+    for snapshot_every in (1, 7, 1000):
+        random.seed(snapshot_every)
+        path = str(tmp_path / f"store-{snapshot_every}.db")
+        store = SqliteStore(path, snapshot_every=snapshot_every)
+        rooms = []
+        for r, (num_players, actions) in enumerate([(3, 40), (4, 200), (5, 333)]):
+            room = GameRoom(f"room-{r}")
+            room.configure(num_players)
+            play(room, store, actions)
+            rooms.append(room)
+            store.flush()
+        store.close()
+        recovered = SqliteStore(path).load_rooms(make_bot)
+        assert sorted(recovered) == [room.room_id for room in rooms]
+        for room in rooms:
+            restored = recovered[room.room_id]
+            assert snapshot(restored) == snapshot(room), (snapshot_every, room.room_id)
+            # 재시작 전의 사람 자리는 모두 재접속을 기다린다
+            assert set(restored.disconnected) == set(room.tokens)
+
+def test_dropped_rooms_are_not_recovered(tmp_path):
+    path = str(tmp_path / 'drop.db')
+    store = SqliteStore(path)
+    room = GameRoom('gone')
+    room.configure(3)
+    play(room, store, 10)
+    store.drop('gone')
+    store.close()
+    assert SqliteStore(path).load_rooms(make_bot) == {}
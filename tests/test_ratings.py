@@ -0,0 +1,95 @@
+# tests/test_ratings.py
+import random
+
+import pytest
+
+from ratings import Leaderboard, Ratings, elo_deltas, player_id
+
+# 순위표를 정렬된 목록으로 그대로 센다: 레이팅 높은 순, 같으면 id 큰 순 (Ratings.top_sql 과 같은 순서)
+def brute_force_order(ratings): return sorted(ratings.items(), key=lambda item: (item[1], item[0]), reverse=True)
+
+def brute_force_rank(ratings, player): return sum(1 for other in ratings.values() if other > ratings[player]) + 1
+
+def check(board, ratings):
+    assert len(board) == len(ratings)
+    order = brute_force_order(ratings)
+    assert board.top(len(ratings) + 5) == [(i + 1, player, rating) for i, (player, rating) in enumerate(order)]
+    for player in ratings: assert board.rank(player) == brute_force_rank(ratings, player)
+    for start in (0, 1, len(ratings) // 2, len(ratings) - 1):
+        assert board.entries(start, 7) == [(i + 1, player, rating) for i, (player, rating) in enumerate(order)][start:start + 7]
+
+def test_leaderboard_matches_brute_force():
+    rng = random.Random(5)
+    board, ratings = Leaderboard(), {}
+    # 처음 채우기(load) 뒤에 넣기/바꾸기/빼기를 섞는다. 같은 구간, 같은 레이팅도 자주 나오게 좁은 범위에서 뽑는다.
+    initial = {f"p{i}": round(rng.uniform(1400, 1600), rng.choice((0, 1, 3))) for i in range(300)}
+    board.load(initial.items())
+    ratings.update(initial)
+    check(board, ratings)
+    for step in range(3000):
+        player = f"p{rng.randrange(400)}"
+        if rng.random() < 0.2:
+            board.remove(player)
+            ratings.pop(player, None)
+        else:
+            rating = round(rng.uniform(1400, 1600), rng.choice((0, 1, 3)))
+            board.set(player, rating)
+            ratings[player] = rating
+        if step % 250 == 0: check(board, ratings)
+    check(board, ratings)
+    assert board.rank('nobody') is None and board.near('nobody', 3) == []
+
+def test_near_is_centred_on_the_player():
+    board = Leaderboard()
+    board.load((f"p{i}", 1000 + i) for i in range(20))
+    assert [player for _, player, _ in board.near('p10', 2)] == ['p12', 'p11', 'p10', 'p9', 'p8']
+    assert [rank for rank, _, _ in board.near('p19', 2)] == [1, 2, 3]
+
+# 다인전 Elo 를 두 사람씩의 고전 Elo 로 직접 계산한 값과 비교한다
+def brute_force_elo(ratings, scores, k):
+    n, deltas = len(ratings), [0.0] * len(ratings)
+    for i in range(n):
+        for j in range(i + 1, n):
+            expected = 1 / (1 + 10 ** ((ratings[j] - ratings[i]) / 400))
+            actual = (scores[i] > scores[j]) + 0.5 * (scores[i] == scores[j])
+            deltas[i] += k / (n - 1) * (actual - expected)
+            deltas[j] -= k / (n - 1) * (actual - expected)
+    return deltas
+
+def test_elo_deltas_match_pairwise_elo():
+    rng = random.Random(7)
+    for _ in range(500):
+        n = rng.randint(2, 5)
+        ratings = [rng.uniform(800, 2200) for _ in range(n)]
+        scores = [rng.choice((-20, 0, 10, 10, 48, 90)) for _ in range(n)]
+        deltas = elo_deltas(ratings, scores)
+        assert deltas == pytest.approx(brute_force_elo(ratings, scores, 32))
+        assert sum(deltas) == pytest.approx(0, abs=1e-9)
+    assert elo_deltas([1500, 1500], [10, 0]) == [16, -16]
+    assert elo_deltas([1500, 1500, 1500], [5, 5, 5]) == [0, 0, 0]
+
+def test_record_updates_ratings_and_ranks():
+    ratings = Ratings()
+    alice, bob, carol = player_id('alice'), player_id('bob'), player_id('carol')
+    changes = ratings.record([(alice, 90), (bob, 40), (carol, 10), (None, 60)], now=0)
+    assert set(changes) == {alice, bob, carol} # 봇/id 없는 자리는 빠진다
+    assert changes[alice][0] == pytest.approx(1516) and changes[carol][0] == pytest.approx(1484) and changes[bob][1] == pytest.approx(0)
+    assert [ratings.profile(player)['rank'] for player in (alice, bob, carol)] == [1, 2, 3]
+    before = [ratings.rating(player) for player in (carol, alice)]
+    changes = ratings.record([(carol, 50), (alice, 20)], now=1)
+    assert [changes[carol][1], changes[alice][1]] == pytest.approx(elo_deltas(before, [50, 20]))
+    assert ratings.record([(alice, 1), (alice, 2)]) == {} and ratings.record([(bob, 1)]) == {}
+    assert ratings.profile(alice)['games'] == 2 and ratings.profile('nobody') is None
+
+def test_sql_queries_agree_with_the_leaderboard(tmp_path):
+    ratings = Ratings(str(tmp_path / 'ratings.db'))
+    rng = random.Random(9)
+    players = [player_id(f"secret{i}") for i in range(12)]
+    for _ in range(40): ratings.record([(player, rng.randrange(100)) for player in rng.sample(players, rng.randint(2, 5))], now=0)
+    ratings.flush()
+    assert ratings.top_sql(12) == ratings.board.top(12)
+    assert [ratings.rank_sql(player) for player in players] == [ratings.board.rank(player) for player in players]
+    ratings.close()
+    reopened = Ratings(str(tmp_path / 'ratings.db'))
+    assert reopened.board.top(12) == ratings.board.top(12)
+    reopened.close()
@@ -0,0 +1,63 @@
+# tests/test_replay.py
+import random
+
+import pytest
+
+from engine import LowestPolicy, RandomPolicy
+from replay import MAGIC, ReplayReader, RecordingGame, resimulate
+
+def recorded_games(count, seed):
+    rng = random.Random(seed)
+    games = []
+    for i in range(count):
+        game = RecordingGame(3 + i % 3, random.Random(rng.random()), starting_money=rng.choice((10, 27, 48)))
+        policies = [RandomPolicy(0.2) if seat % 2 else LowestPolicy() for seat in range(game.num_players)]
+        # 몇 게임은 중간에 그만둔 것으로 (끝난 라운드까지만 남는다)
+        game.play_game(policies, max_rounds=1000 if i % 4 else 3)
+        games.append(game)
+    return games
+
+def write(path, games):
+    with open(path, 'wb') as out: out.write(MAGIC + b''.join(game.record() for game in games))
+
+def test_resimulating_a_replay_reproduces_the_game(tmp_path):
+    games = recorded_games(40, 1)
+    path = tmp_path / 'games.lxr'
+    write(path, games)
+    with ReplayReader(str(path)) as reader:
+        assert len(reader) == len(games)
+        for game, replay_game in zip(games, reader):
+            assert (replay_game.num_players, replay_game.finished) == (game.num_players, game.is_over())
+            assert replay_game.num_rounds == game.round_number and list(replay_game.money()) == game.money
+            replayed = resimulate(replay_game)
+            assert replayed.money == game.money and replayed.round_number == game.round_number
+        # 무작위 접근도 순서대로 읽은 것과 같다
+        assert list(reader.game(7).money()) == games[7].money
+
+def test_truncated_last_record_is_ignored(tmp_path):
+    games = recorded_games(3, 2)
+    path = tmp_path / 'cut.lxr'
+    with open(path, 'wb') as out: out.write(MAGIC + b''.join(game.record() for game in games)[:-5])
+    with ReplayReader(str(path)) as reader:
+        assert len(reader) == 2 and len(list(reader)) == 2
+
+def test_resimulate_rejects_a_tampered_replay(tmp_path):
+    game = recorded_games(1, 3)[0]
+    record = bytearray(game.record())
+    path = tmp_path / 'bad.lxr'
+    with open(path, 'wb') as out: out.write(MAGIC + record)
+    with ReplayReader(str(path)) as reader:
+        replay_game = reader.game(0)
+        first_round = next(replay_game.rounds())
+        offset = first_round.actions_offset - len(MAGIC)
+    # 첫 수를 다른 자리가 둔 것으로 바꾼다
+    seat, count = record[offset] >> 3, record[offset] & 7
+    record[offset] = (seat + 1) % game.num_players << 3 | count
+    with open(path, 'wb') as out: out.write(MAGIC + record)
+    with ReplayReader(str(path)) as reader, pytest.raises(ValueError):
+        resimulate(reader.game(0))
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.lxr'
+    path.write_bytes(b'not a replay')
+    with pytest.raises(ValueError): ReplayReader(str(path))
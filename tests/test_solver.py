@@ -0,0 +1,87 @@
+# tests/test_solver.py
+import random
+
+from bots import HeuristicBot
+from engine import Game
+from game_logic import legal_moves
+from solver import PASS, EndgameSolver, settlement
+
+# 남은 장 수 합이 remaining 이 될 때까지 HeuristicBot 끼리 둔 판 (손패는 모두 공개)
+def position(num_players, remaining, rng):
+    game = Game(num_players, random.Random(rng.random()), starting_money=10 ** 6)
+    game.deal()
+    bot = HeuristicBot()
+    while sum(game.hand_counts()) > remaining:
+        move = bot.choose(game, game.current)
+        if move is None: game.pass_turn()
+        elif game.play(move): return None # 그 전에 라운드가 끝났다
+    return game
+
+def positions(count, seed):
+    rng, result = random.Random(seed), []
+    while len(result) < count:
+        game = position(rng.choice((3, 4, 5)), rng.choice((5, 7, 9)), rng)
+        if game is not None: result.append(game)
+    return result
+
+# engine.Game 으로 한 수씩 두는 전치표/가지치기 없는 완전 탐색 (root 는 최대, 나머지는 최소)
+def minimax(game, root):
+    seat = game.current
+    options = list(legal_moves(game.hands[seat], game.last_combo))
+    if game.last_combo[0] is not None: options.append(None)
+    values = []
+    for option in options:
+        sim = game.clone()
+        if option is None:
+            sim.pass_turn()
+            values.append(minimax(sim, root))
+        elif sim.play(option):
+            before = sim.money[root]
+            sim.settle(seat)
+            values.append(sim.money[root] - before)
+        else: values.append(minimax(sim, root))
+    return max(values) if seat == root else min(values)
+
+# 첫 수마다의 완전 탐색 값 (마스크 -> 값, 패스는 PASS)
+def minimax_values(game):
+    seat, values = game.current, {}
+    options = list(legal_moves(game.hands[seat], game.last_combo))
+    if game.last_combo[0] is not None: options.append(None)
+    for option in options:
+        sim = game.clone()
+        if option is None: sim.pass_turn()
+        elif sim.play(option):
+            before = sim.money[seat]
+            sim.settle(seat)
+            values[option.mask] = sim.money[seat] - before
+            continue
+        values[PASS if option is None else option.mask] = minimax(sim, seat)
+    return values
+
+def test_solver_matches_exhaustive_minimax():
+    solver = EndgameSolver(5)
+    for game in positions(25, 1):
+        if solver.num_players != game.num_players: solver = EndgameSolver(game.num_players)
+        hands = list(game.hands)
+        solution = solver.solve(game, time_limit=60)
+        assert game.hands == hands # 탐색 뒤에 판은 그대로
+        assert solution.exact and solution.value == minimax(game.clone(), game.current), game.hands
+        # 같은 판을 다시 풀면 전치표에서 같은 값이 나온다
+        assert solver.solve(game, time_limit=60).value == solution.value
+
+def test_every_first_move_value_matches_minimax():
+    for game in positions(10, 2):
+        solution = EndgameSolver(game.num_players).solve(game, time_limit=60, all_moves=True)
+        expected = minimax_values(game)
+        assert solution.values == expected
+        assert solution.value == max(expected.values())
+        assert (PASS if solution.move is None else solution.move.mask) in [mask for mask, value in expected.items() if value == solution.value]
+
+def test_settlement_matches_the_engine():
+    for game in positions(10, 3):
+        for winner in range(game.num_players):
+            sim = game.clone()
+            sim.hands[winner] = 0
+            before = list(sim.money)
+            sim.settle(winner)
+            assert [settlement(sim.hands, seat, winner) for seat in range(game.num_players)] == [sim.money[seat] - before[seat] for seat in range(game.num_players)]
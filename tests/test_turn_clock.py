@@ -0,0 +1,55 @@
+# tests/test_turn_clock.py
+import random
+
+from turn_clock import TimerWheel
+
+def test_arm_fires_once_at_the_deadline():
+    wheel = TimerWheel(tick=0.1, num_slots=8)
+    wheel.arm('a', 0.3, 'A', now=0.0)
+    assert 'a' in wheel and len(wheel) == 1
+    assert wheel.advance(0.29) == []
+    assert wheel.advance(0.3) == [('a', 'A')]
+    assert 'a' not in wheel and wheel.advance(10.0) == []
+
+def test_cancel_and_rearm():
+    wheel = TimerWheel(tick=0.1, num_slots=8)
+    wheel.arm('a', 0.2, 'A', now=0.0)
+    wheel.arm('b', 0.2, 'B', now=0.0)
+    wheel.cancel('a')
+    wheel.cancel('missing') # 없는 key 는 조용히 넘어간다
+    wheel.arm('b', 0.5, 'B2', now=0.0) # 다시 걸면 예전 마감은 사라진다
+    assert len(wheel) == 1 and wheel.advance(0.4) == []
+    assert wheel.advance(0.5) == [('b', 'B2')]
+
+def test_deadlines_longer_than_one_lap_wait_for_their_own_lap():
+    wheel = TimerWheel(tick=0.1, num_slots=1024)
+    lap = 1024 * 0.1
+    wheel.arm('near', 1.0, 'N', now=0.0)
+    wheel.arm('far', lap + 1.0, 'F', now=0.0)   # 같은 슬롯, 한 바퀴 뒤
+    wheel.arm('farther', 3 * lap + 0.5, 'X', now=0.0)
+    assert wheel.where['near'] == wheel.where['far']
+    assert wheel.advance(1.0) == [('near', 'N')]
+    assert wheel.advance(lap + 0.9) == [] and 'far' in wheel
+    assert wheel.advance(lap + 1.0) == [('far', 'F')]
+    # 오래 멈춰 있다가 한꺼번에 넘어가도 한 바퀴만 훑고 놓치지 않는다
+    assert wheel.advance(10 * lap) == [('farther', 'X')] and len(wheel) == 0
+
+def test_matches_a_sorted_list_of_deadlines():
+    rng = random.Random(3)
+    wheel = TimerWheel(tick=0.1, num_slots=16)
+    deadlines, now = {}, 0.0
+    for step in range(2000):
+        key = rng.randrange(50)
+        if rng.random() < 0.2:
+            wheel.cancel(key)
+            deadlines.pop(key, None)
+        else:
+            delay = round(rng.uniform(0.1, 6.0), 1)
+            wheel.arm(key, delay, step, now)
+            deadlines[key] = (round(now + delay, 1), step)
+        now = round(now + rng.choice((0.0, 0.1, 0.3, 1.0)), 1)
+        fired = sorted(wheel.advance(now))
+        due = sorted((key, step) for key, (at, step) in deadlines.items() if at <= now + 1e-9)
+        assert fired == due
+        for key, _ in due: del deadlines[key]
+        assert len(wheel) == len(deadlines)
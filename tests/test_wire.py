@@ -0,0 +1,94 @@
+# tests/test_wire.py
+import json
+import random
+
+import pytest
+
+import app as server
+import wire
+from game_logic import TILES, combination_table
+from game_room import LOG_PASS, LOG_PLAY, LOG_ROUND_START, GameRoom, LogLine, combo_info_to_dict
+
+# JSON 으로 보냈을 때 클라이언트가 받는 값 (LogLine 은 문장, 튜플은 목록)
+def as_json(payload): return json.loads(json.dumps(payload))
+
+def round_trip(event, payload):
+    frame = wire.encode(event, payload)
+    assert type(frame) is bytes
+    name, decoded = wire.decode(frame)
+    assert name == event and decoded == as_json(payload)
+    return frame
+
+def dealt_room(num_players=4):
+    random.seed(num_players)
+    room = GameRoom('wire')
+    room.configure(num_players)
+    room.start_new_game()
+    return room
+
+def test_every_compact_event_round_trips():
+    room = dealt_room()
+    state = room.public_state()
+    for event in ('game_started', 'game_snapshot'): round_trip(event, state)
+    for seat in range(room.num_players): round_trip('your_hand', room.private_hand(seat))
+    round_trip('turn_timeout', {'seat': 3})
+    flush = next(info for info in combination_table().values() if info[0] == '플러쉬')
+    tiles = [tile.to_dict() for tile in sorted(flush[1])]
+    patches = [
+        {'v': 1, 'turn': 0},
+        {'v': 2, 'turn': 1, 'log': LogLine(LOG_PLAY, 0, 3, 1), 'play': {'seat': 0, 'tiles': [TILES[0].to_dict()], 'combo': combo_info_to_dict(combination_table()[1])}, 'timer': 30},
+        {'v': 3, 'turn': 2, 'log': LogLine(LOG_PLAY, 1, 5, 5), 'play': {'seat': 1, 'tiles': tiles, 'combo': combo_info_to_dict(flush)}, 'timer': None},
+        {'v': 4, 'turn': 1, 'log': LogLine(LOG_PASS, 2), 'passed': 2, 'clear': True, 'timer': 12.3},
+        {'v': 2 ** 32 - 1, 'turn': 1, 'passed': 0, 'clear': False, 'money': [60, -3, 0, 87]},
+    ]
+    for patch in patches: round_trip('game_update', patch)
+
+def test_events_without_a_compact_form_stay_json():
+    assert wire.encode('round_result', {'winner': 1}) is None and wire.encode('error_message', {'message': 'x'}) is None
+
+def test_frames_are_deflated_only_above_the_threshold():
+    small = round_trip('game_update', {'v': 7, 'turn': 1, 'log': LogLine(LOG_PASS, 0), 'passed': 0, 'clear': False})
+    assert not small[0] & wire.DEFLATED and len(small) - 1 <= wire.DEFLATE_THRESHOLD
+    # 되살린 옛 로그(평범한 문장)가 가득 든 스냅샷은 본문이 길어서 deflate 된다
+    state = dealt_room(3).public_state()
+    state['game_log'] = [LogLine(LOG_ROUND_START, 1)] + [f"P{i % 3 + 1}: 패스했습니다." for i in range(14)]
+    big = round_trip('game_snapshot', state)
+    assert big[0] & wire.DEFLATED and big[0] & ~wire.DEFLATED == wire.EVENT_CODES['game_snapshot']
+    body = bytearray()
+    wire.encode_state(state, body)
+    assert len(body) > wire.DEFLATE_THRESHOLD and len(big) - 1 < len(body)
+
+# 같은 방의 JSON 클라이언트와 압축 프로토콜 클라이언트가 같은 순서로 같은 내용을 받는다 (턴 시간 초과로 진행)
+@pytest.fixture
+def compact_table():
+    random.seed(1)
+    clients = [server.socketio.test_client(server.app, auth={'room': 'wire-table'})]
+    clients[0].emit('request_start_game', {'num_players': 3})
+    clients.append(server.socketio.test_client(server.app, auth={'room': 'wire-table', 'wire': wire.WIRE_NAME}))
+    clients.append(server.socketio.test_client(server.app, auth={'room': 'wire-table'}))
+    yield clients
+    for client in clients: client.disconnect()
+    server.reset_game(server.rooms.get('wire-table'))
+
+def test_compact_clients_receive_the_same_events(compact_table):
+    plain, compact, _ = compact_table
+    room = server.rooms.get('wire-table')
+    plain.get_received(); compact.get_received()
+    for _ in range(150): server.handle_turn_timeout(room, room.game_state['current_player_index'])
+    room_events = set(wire.EVENTS) - {'your_hand'}
+    expected = [(m['name'], m['args'][0]) for m in plain.get_received() if m['name'] in room_events]
+    received, hands = [], []
+    for message in compact.get_received():
+        assert message['name'] not in wire.EVENTS # 압축 프로토콜 클라이언트에게는 'b' 로만 온다
+        if message['name'] != wire.EVENT: continue
+        event, payload = wire.decode(message['args'][0])
+        (hands if event == 'your_hand' else received).append((event, payload))
+    assert received == expected and {event for event, _ in received} == room_events - {'game_snapshot'}
+    assert hands and all(payload['seat'] == 1 for _, payload in hands)
+    # game_snapshot 은 다시 맞추기를 요청한 클라이언트에게만 간다
+    for client in (plain, compact): client.emit('request_resync')
+    snapshot = next(m['args'][0] for m in plain.get_received() if m['name'] == 'game_snapshot')
+    frames = [wire.decode(m['args'][0]) for m in compact.get_received() if m['name'] == wire.EVENT]
+    # 남은 시간은 두 요청 사이에 0.1 초 단위로 넘어갈 수 있어서 빼고 본다
+    untimed = lambda state: {key: value for key, value in state.items() if key != 'turn_seconds_left'}
+    assert [untimed(payload) for event, payload in frames if event == 'game_snapshot'] == [untimed(snapshot)]
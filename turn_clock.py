@@ -0,0 +1,51 @@
+# turn_clock.py
+import math
+
+# ===================================================================
+# 턴 시계: 모든 테이블의 차례 마감 시각을 하나의 타이머 휠로 관리한다
+# ===================================================================
+# 슬롯 n 개짜리 해시 휠. 마감 시각을 tick 단위 번호(due)로 바꿔 due % n 슬롯에 넣는다.
+# arm/cancel 은 dict 넣기/빼기 한 번이라 O(1) 이고, advance 는 지나간 tick 의 슬롯만 훑는다.
+# 한 슬롯에는 여러 바퀴 뒤의 항목도 섞일 수 있어서 due 가 지난 항목만 꺼낸다.
+class TimerWheel:
+    def __init__(self, tick=0.1, num_slots=1024, now=0.0):
+        self.tick = tick
+        self.slots = [{} for _ in range(num_slots)]
+        self.where = {} # key -> 슬롯 번호
+        self.current = int(now / tick)
+
+    def __len__(self): return len(self.where)
+
+    def __contains__(self, key): return key in self.where
+
+    # 같은 key 가 이미 걸려 있으면 새 마감으로 바꾼다
+    def arm(self, key, delay, value, now):
+        slots, where = self.slots, self.where
+        old = where.get(key)
+        if old is not None: del slots[old][key]
+        due = math.ceil((now + delay) / self.tick - 1e-9) # 부동소수 오차로 한 tick 밀리지 않게
+        if due <= self.current: due = self.current + 1
+        slot = where[key] = due % len(slots)
+        slots[slot][key] = (due, value)
+
+    def cancel(self, key):
+        slot = self.where.pop(key, None)
+        if slot is not None: del self.slots[slot][key]
+
+    # now 까지 지난 tick 을 처리하고 마감된 (key, value) 목록을 돌려준다.
+    # 오래 멈춰 있었더라도 슬롯은 최대 한 바퀴만 훑으면 된다.
+    def advance(self, now):
+        target = int(now / self.tick + 1e-9)
+        num_slots = len(self.slots)
+        if target - self.current > num_slots: self.current = target - num_slots
+        expired = []
+        while self.current < target:
+            self.current += 1
+            bucket = self.slots[self.current % num_slots]
+            if not bucket: continue
+            for key, (due, value) in list(bucket.items()):
+                if due <= self.current:
+                    del bucket[key]
+                    del self.where[key]
+                    expired.append((key, value))
+        return expired
@@ -0,0 +1,204 @@
+# wire.py
+import struct
+import zlib
+
+from game_logic import TILES, combination_ranking
+from game_room import COMBINATION_NAMES, LOG_FORMATS, LogLine
+
+# ===================================================================
+# 압축 프로토콜: 자주 오가는 게임 이벤트를 바이트로 묶어 socket.io 바이너리 이벤트 하나('b')로 보낸다
+# ===================================================================
+# 접속할 때 auth 에 wire: 'bin1' 을 넣은 클라이언트만 받는다 (main.js 는 ?wire=bin). 그 밖의 이벤트와 관전자는 JSON 그대로.
+# 프레임 = u8 이벤트 번호 (+0x80 이면 본문이 raw deflate) + 본문. 정수는 모두 리틀 엔디언.
+#   타일: Tile.id 한 바이트
+#   조합: 조합 서열 번호(combination_ranking, 없으면 0) + 대표 타일 id. 플러쉬는 0xFF = 낸 타일을 큰 순서로 전부.
+#   로그: 메시지 번호(game_room.LOG_FORMATS) + u16 인자들. 0xFF 는 u16 길이 + UTF-8 문장 (되살린 옛 로그)
+#   시간: u16 0.1초 단위, 0xFFFF 는 None
+# game_update   : u32 v, u8 필드 비트 + 있는 필드만 (turn, log, play, passed, clear, money, timer 순서)
+# game_started / game_snapshot : u32 version, 손패 장 수, 차례, 마지막으로 낸 자리, 패스한 자리, 판의 타일과 조합, 로그, 돈, 남은 시간
+# your_hand     : u32 v, u8 seat, 타일들
+# turn_timeout  : u8 seat
+# 형식을 바꾸면 WIRE_NAME 을 올리고 main.js 의 디코더도 같이 고친다.
+WIRE_NAME = 'bin1'
+EVENT = 'b'
+EVENTS = ['game_update', 'game_started', 'game_snapshot', 'your_hand', 'turn_timeout']
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+DEFLATED = 0x80
+DEFLATE_THRESHOLD = 160 # 본문이 이보다 길면 deflate 해 보고 줄어들 때만 쓴다 (대개 옛 로그가 든 스냅샷)
+FLUSH_REP = 0xFF
+LOG_TEXT = 0xFF
+NO_TIME = 0xFFFF
+TILE_IDS = {(tile.suit, tile.rank): tile.id for tile in TILES}
+LOG_ARITY = {code: fmt.__code__.co_argcount for code, fmt in LOG_FORMATS.items()}
+# game_update 필드 비트. CLEARED 는 clear 의 값이다.
+TURN, LOG, PLAY, PASSED, CLEAR, MONEY, TIMER, CLEARED = (1 << i for i in range(8))
+
+U8, U16, U32, I16 = struct.Struct('<B'), struct.Struct('<H'), struct.Struct('<I'), struct.Struct('<h')
+HEADER = struct.Struct('<IB')
+
+def compact_room(room_id): return f"{room_id}:bin"
+
+# ===================================================================
+# 쓰기
+# ===================================================================
+def pack_tiles(out, tiles):
+    out.append(len(tiles))
+    out += bytes(TILE_IDS[tile['suit'], tile['rank']] for tile in tiles)
+
+def pack_combo(out, combo):
+    name, rep = combo
+    if name is None: out += b'\0\0'
+    else: out += bytes((combination_ranking[name], FLUSH_REP if isinstance(rep, list) else TILE_IDS[rep['suit'], rep['rank']]))
+
+def pack_log(out, line):
+    code = getattr(line, 'code', None)
+    if code is None:
+        text = line.encode()
+        out.append(LOG_TEXT)
+        out += U16.pack(len(text))
+        out += text
+    else:
+        out.append(code)
+        for param in line.params: out += U16.pack(param)
+
+def pack_money(out, money):
+    out.append(len(money))
+    for amount in money: out += I16.pack(amount)
+
+def pack_time(out, seconds): out += U16.pack(NO_TIME if seconds is None else round(seconds * 10))
+
+def encode_patch(patch, out):
+    fields = 0
+    if 'turn' in patch: fields |= TURN
+    if 'log' in patch: fields |= LOG
+    if 'play' in patch: fields |= PLAY
+    if 'passed' in patch: fields |= PASSED
+    if 'clear' in patch: fields |= CLEAR | (CLEARED if patch['clear'] else 0)
+    if 'money' in patch: fields |= MONEY
+    if 'timer' in patch: fields |= TIMER
+    out += HEADER.pack(patch['v'], fields)
+    if fields & TURN: out.append(patch['turn'])
+    if fields & LOG: pack_log(out, patch['log'])
+    if fields & PLAY:
+        play = patch['play']
+        out.append(play['seat'])
+        pack_tiles(out, play['tiles'])
+        pack_combo(out, play['combo'])
+    if fields & PASSED: out.append(patch['passed'])
+    if fields & MONEY: pack_money(out, patch['money'])
+    if fields & TIMER: pack_time(out, patch['timer'])
+
+def encode_state(state, out):
+    out += U32.pack(state['version'])
+    out.append(len(state['hand_counts']))
+    out += bytes(state['hand_counts'])
+    out += bytes((state['current_player_index'], state['last_player_to_act_index'], len(state['players_who_passed_this_round'])))
+    out += bytes(state['players_who_passed_this_round'])
+    pack_tiles(out, state['last_played_tiles'])
+    pack_combo(out, state['last_played_hand_info'])
+    out.append(len(state['game_log']))
+    for line in state['game_log']: pack_log(out, line)
+    pack_money(out, state['player_money'])
+    pack_time(out, state['turn_seconds_left'])
+
+def encode_hand(hand, out):
+    out += HEADER.pack(hand['v'], hand['seat'])
+    pack_tiles(out, hand['hand'])
+
+def encode_timeout(data, out): out.append(data['seat'])
+
+ENCODERS = [encode_patch, encode_state, encode_state, encode_hand, encode_timeout]
+
+# 압축 프로토콜로 보낼 수 없는 이벤트면 None
+def encode(event, payload):
+    code = EVENT_CODES.get(event)
+    if code is None: return None
+    body = bytearray()
+    ENCODERS[code](payload, body)
+    if len(body) > DEFLATE_THRESHOLD:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        deflated = compressor.compress(body) + compressor.flush()
+        if len(deflated) < len(body): return bytes((code | DEFLATED,)) + deflated
+    return bytes((code,)) + body
+
+# ===================================================================
+# 읽기 (main.js 의 decodeFrame 과 같은 일. 벤치마크와 시뮬레이션 클라이언트가 쓴다)
+# ===================================================================
+class Reader:
+    def __init__(self, data): self.data, self.offset = data, 0
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def take(self, fmt): return self.unpack(fmt)[0]
+
+    def u8(self):
+        self.offset += 1
+        return self.data[self.offset - 1]
+
+    def raw(self, n):
+        self.offset += n
+        return self.data[self.offset - n:self.offset]
+
+    def tiles(self): return [TILES[tile_id].to_dict() for tile_id in self.raw(self.u8())]
+
+    def combo(self, tiles):
+        code, rep = self.raw(2)
+        if code == 0: return [None, None]
+        if rep == FLUSH_REP: return [COMBINATION_NAMES[code], sorted(tiles, key=lambda t: TILE_IDS[t['suit'], t['rank']], reverse=True)]
+        return [COMBINATION_NAMES[code], TILES[rep].to_dict()]
+
+    def log(self):
+        code = self.u8()
+        if code == LOG_TEXT: return bytes(self.raw(self.take(U16))).decode()
+        return LogLine(code, *(self.take(U16) for _ in range(LOG_ARITY[code])))
+
+    def money(self): return [self.take(I16) for _ in range(self.u8())]
+
+    def time(self):
+        value = self.take(U16)
+        return None if value == NO_TIME else value / 10
+
+def decode_patch(reader):
+    v, fields = reader.unpack(HEADER)
+    patch = {'v': v}
+    if fields & TURN: patch['turn'] = reader.u8()
+    if fields & LOG: patch['log'] = reader.log()
+    if fields & PLAY:
+        seat = reader.u8()
+        tiles = reader.tiles()
+        patch['play'] = {'seat': seat, 'tiles': tiles, 'combo': reader.combo(tiles)}
+    if fields & PASSED: patch['passed'] = reader.u8()
+    if fields & CLEAR: patch['clear'] = bool(fields & CLEARED)
+    if fields & MONEY: patch['money'] = reader.money()
+    if fields & TIMER: patch['timer'] = reader.time()
+    return patch
+
+def decode_state(reader):
+    state = {'version': reader.take(U32)}
+    state['hand_counts'] = list(reader.raw(reader.u8()))
+    state['current_player_index'], state['last_player_to_act_index'] = reader.u8(), reader.u8()
+    state['players_who_passed_this_round'] = list(reader.raw(reader.u8()))
+    state['last_played_tiles'] = reader.tiles()
+    state['last_played_hand_info'] = reader.combo(state['last_played_tiles'])
+    state['game_log'] = [reader.log() for _ in range(reader.u8())]
+    state['player_money'] = reader.money()
+    state['turn_seconds_left'] = reader.time()
+    return state
+
+def decode_hand(reader):
+    v, seat = reader.unpack(HEADER)
+    return {'v': v, 'seat': seat, 'hand': reader.tiles()}
+
+def decode_timeout(reader): return {'seat': reader.u8()}
+
+DECODERS = [decode_patch, decode_state, decode_state, decode_hand, decode_timeout]
+
+# 프레임 -> (이벤트 이름, JSON 으로 받았을 때와 같은 payload)
+def decode(frame):
+    code, body = frame[0], frame[1:]
+    if code & DEFLATED: body = zlib.decompress(body, -15)
+    code &= ~DEFLATED
+    return EVENTS[code], DECODERS[code](Reader(body))